@@ -0,0 +1,104 @@
+"""
+Memory benchmark for the analysis data model.
+
+Parses the bundled ``test.pgn`` once, clones it N times, fills every move with analysis
+data shaped like the analyser's output (best line + a second Multi-PV
+line) and reports the traced memory per game.  For comparison, the same
+data is also held the way the old plain dataclasses stored it: one
+attribute dict per move, a FEN string per ply and a dict per PV line.
+
+Usage:
+    python benchmarks/bench_model_memory.py            # 1,000 and 10,000 games
+    python benchmarks/bench_model_memory.py 500 2000
+"""
+import gc
+import os
+import pickle
+import sys
+import time
+import tracemalloc
+from dataclasses import fields
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from src.backend.storage.models import MoveAnalysis, PVLine  # noqa: E402
+from src.backend.storage.pgn_parser import PGNParser  # noqa: E402
+
+PGN_PATH = os.path.join(os.path.dirname(__file__), "..", "test.pgn")
+PV_LENGTH = 8
+
+
+def _fill_analysis(game):
+    """Attach analyser-shaped results to every move of *game*."""
+    ucis = [m.uci for m in game.moves]
+    for i, move in enumerate(game.moves):
+        line = ucis[i:i + PV_LENGTH]
+        move.eval_before_cp = 25
+        move.eval_after_cp = 18
+        move.best_move = line[0]
+        move.pv = line
+        move.classification = "Best"
+        move.multi_pvs = [
+            PVLine(line, cp=25, depth=18, move=move),
+            PVLine(line[:1], cp=-40, depth=18, move=move),
+        ]
+
+
+def _as_legacy(game):
+    """The same game as the pre-slots model held it: per-move attribute dicts."""
+    legacy_moves = []
+    for move in game.moves:
+        attrs = {}
+        for f in fields(MoveAnalysis):
+            if f.name == "replay":
+                continue
+            value = getattr(move, f.name)
+            if f.name == "multi_pvs":
+                value = [dict(line) for line in value]
+            attrs[f.name] = value
+        legacy_moves.append(attrs)
+    return legacy_moves
+
+
+def _measure(build, count):
+    gc.collect()
+    tracemalloc.start()
+    start = time.perf_counter()
+    held = [build(i) for i in range(count)]
+    elapsed = time.perf_counter() - start
+    current, _peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del held
+    gc.collect()
+    return current, elapsed
+
+
+def run(count, compact_template, legacy_template):
+    compact_bytes, compact_time = _measure(lambda _i: pickle.loads(compact_template), count)
+    legacy_bytes, _ = _measure(lambda _i: pickle.loads(legacy_template), count)
+    print(f"{count:>7,} games | compact {compact_bytes / 2**20:8.1f} MiB "
+          f"({compact_bytes / count / 1024:6.1f} KiB/game) | "
+          f"legacy {legacy_bytes / 2**20:8.1f} MiB "
+          f"({legacy_bytes / count / 1024:6.1f} KiB/game) | "
+          f"saved {100 * (1 - compact_bytes / legacy_bytes):4.1f}% | "
+          f"load {compact_time:.1f}s")
+
+
+def main(argv):
+    counts = [int(a) for a in argv] or [1_000, 10_000]
+    with open(PGN_PATH, encoding="utf-8") as f:
+        pgn_text = f.read()
+    game = PGNParser.parse_pgn_text(pgn_text)[0]
+    _fill_analysis(game)
+    # Every clone unpickles into an independent object graph (no strings or
+    # lists shared between games), as if each game had been parsed and
+    # analysed separately.
+    compact_template = pickle.dumps(game)
+    legacy_template = pickle.dumps(_as_legacy(game))
+    print(f"Sample game: {len(game.moves)} plies, PV length {PV_LENGTH}, 2 lines per move")
+    for count in counts:
+        run(count, compact_template, legacy_template)
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
@@ -0,0 +1,110 @@
+"""
+PGN parsing benchmark: lists, streaming, header scan and process pool.
+
+Writes a multi-game file made of N copies of the bundled ``test.pgn`` (each
+with its own Round tag, so every game is distinct), then reads it with
+
+    list      PGNParser.parse_pgn_file (every game held at once)
+    stream    PGNParser.iter_pgn_file (one game at a time)
+    scan      pgn_index.scan_pgn (headers, offsets and ply counts only)
+    parallel  pgn_parallel.iter_pgn_file_parallel (a process per CPU)
+
+and reports throughput in games/s and traced peak memory (from a second,
+slower pass under tracemalloc; not shown for the pool, whose workers it
+cannot see).  The parallel speed-up is bounded by the CPU count printed
+first.
+
+Usage:
+    python benchmarks/bench_pgn_parse.py                 # 200 and 1,000 games
+    python benchmarks/bench_pgn_parse.py 5000 --workers 4
+"""
+import argparse
+import gc
+import os
+import re
+import sys
+import tempfile
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from src.backend.storage.pgn_index import scan_pgn  # noqa: E402
+from src.backend.storage.pgn_parallel import iter_pgn_file_parallel  # noqa: E402
+from src.backend.storage.pgn_parser import PGNParser  # noqa: E402
+
+PGN_PATH = os.path.join(os.path.dirname(__file__), "..", "test.pgn")
+
+
+def write_sample(path, count):
+    """Write ``count`` numbered copies of test.pgn to ``path``."""
+    with open(PGN_PATH, encoding="utf-8") as f:
+        template = f.read().strip()
+    with open(path, "w", encoding="utf-8") as out:
+        for i in range(count):
+            out.write(re.sub(r'\[Round "[^"]*"\]', f'[Round "{i + 1}"]', template) + "\n\n")
+
+
+def _measure(consume, path, trace=True):
+    gc.collect()
+    start = time.perf_counter()
+    games = consume(path)
+    elapsed = time.perf_counter() - start
+    if not trace:
+        return games, elapsed, None
+    gc.collect()
+    tracemalloc.start()
+    consume(path)
+    _current, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    gc.collect()
+    return games, elapsed, peak
+
+
+def _parse_list(path):
+    return len(PGNParser.parse_pgn_file(path))
+
+
+def _parse_stream(path):
+    # Keep what the text panel keeps: the PGN text of each game
+    return len([game.pgn_content for game in PGNParser.iter_pgn_file(path)])
+
+
+def _scan(path):
+    return sum(1 for _entry in scan_pgn(path))
+
+
+def _parse_parallel(path, workers):
+    return sum(1 for _game in iter_pgn_file_parallel(path, workers))
+
+
+def run(count, workdir, workers):
+    path = os.path.join(workdir, f"sample_{count}.pgn")
+    write_sample(path, count)
+    size = os.path.getsize(path)
+    print(f"{count:>7,} games, {size / 2**20:6.1f} MiB")
+    modes = (
+        ("list", _parse_list, True),
+        ("stream", _parse_stream, True),
+        ("scan", _scan, True),
+        ("parallel", lambda p: _parse_parallel(p, workers), False),
+    )
+    for label, consume, trace in modes:
+        games, elapsed, peak = _measure(consume, path, trace)
+        memory = f"peak {peak / 2**20:8.1f} MiB ({peak / games / 1024:6.1f} KiB/game)" if trace else "peak -"
+        print(f"    {label:<9} {games / elapsed:8.0f} games/s | {memory}")
+
+
+def main(argv):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("counts", nargs="*", type=int, default=[200, 1_000])
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1, help="processes for 'parallel'")
+    args = parser.parse_args(argv)
+    print(f"CPUs: {os.cpu_count()}, parallel workers: {args.workers}")
+    with tempfile.TemporaryDirectory() as workdir:
+        for count in args.counts:
+            run(count, workdir, args.workers)
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
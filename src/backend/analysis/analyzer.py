@@ -1,9 +1,11 @@
 import chess
 import chess.engine
 import os
-from src.backend.storage.models import GameAnalysis, MoveAnalysis
+import threading
+from contextlib import contextmanager, nullcontext
+from src.backend.storage.models import GameAnalysis, MoveAnalysis, PVLine
 from .engine import EngineManager
-from src.backend.storage.cache import AnalysisCache
+from src.backend.storage.cache import AnalysisCache, configured_base_paths
 from .local_book import LocalBookManager, BookResult
 from .polyglot_book import PolyglotBookManager
 from .opening_db import OpeningDB
@@ -14,7 +16,10 @@ from src.utils.path_utils import get_resource_path, get_user_data_dir
 from typing import Optional, List, Dict
 import math
 
-from src.constants import DEFAULT_MULTI_PV, DEFAULT_ANALYSIS_DEPTH
+from src.constants import (
+    DEFAULT_MULTI_PV, DEFAULT_ANALYSIS_DEPTH,
+    DEFAULT_CACHE_MEMORY_ENTRIES, DEFAULT_CACHE_MEMORY_MB, DEFAULT_CACHE_MAX_MB,
+)
 from .math_utils import (
     get_win_probability,
     calculate_move_accuracy,
@@ -25,25 +30,42 @@ from .math_utils import (
 )
 from .move_classifier import classify_move
 
+
+def serialize_engine_lines(info_list: List, default_depth: int) -> List[Dict]:
+    """Engine InfoDicts -> the ``{"cp"|"mate", "pv", "depth"}`` lines stored in AnalysisCache."""
+    serializable_list = []
+    for info in info_list:
+        s_info = {}
+        score = info.get("score")
+        if score:
+            if score.is_mate():
+                s_info["mate"] = score.relative.mate()
+            else:
+                s_info["cp"] = score.relative.score(mate_score=10000)
+
+        pv = info.get("pv", [])
+        s_info["pv"] = [m.uci() for m in pv]
+        s_info["depth"] = info.get("depth", default_depth)
+        serializable_list.append(s_info)
+    return serializable_list
+
 class Analyzer:
     def __init__(self, engine_manager: EngineManager):
         self.engine_manager = engine_manager
-        self.cache = AnalysisCache()
-        self.history_manager = GameHistoryManager()
         self.config_manager = ConfigManager()
 
-        tsv_dir = get_resource_path("assets/openings")
-        db_path = os.path.join(get_user_data_dir(), "openings.db")
-        self._opening_db = OpeningDB(db_path)
-        try:
-            just_populated = self._opening_db.initialize(tsv_dir)
-        except FileNotFoundError:
-            logger.warning(f"Opening TSV files not found in {tsv_dir}; book detection disabled")
-        self.local_book = LocalBookManager(self._opening_db)
-        polyglot_path = self.config_manager.get("polyglot_book_path", "")
-        self.polyglot_book = PolyglotBookManager(polyglot_path)
-        if just_populated:
-            logger.info(f"Opening book populated: {db_path}")
+        # Cache, history and opening books are built on first use (or by
+        # warm_up() on a background thread) so constructing an Analyzer —
+        # which happens while MainWindow is being built — does no disk work.
+        self._init_lock = threading.RLock()
+        self._cache: Optional[AnalysisCache] = None
+        self._history_manager: Optional[GameHistoryManager] = None
+        self._opening_db: Optional[OpeningDB] = None
+        self._local_book: Optional[LocalBookManager] = None
+        self._polyglot_book: Optional[PolyglotBookManager] = None
+        # Set once warm_up() has finished building every component.
+        self.ready = threading.Event()
+
         self.config = {
             "time_per_move": self.config_manager.get("time_per_move", 1.0),
             "depth": self.config_manager.get("analysis_depth", DEFAULT_ANALYSIS_DEPTH),
@@ -56,6 +78,90 @@ class Analyzer:
             "use_cache": True
         }
 
+    # ---- Lazily constructed dependencies ----
+
+    @property
+    def cache(self) -> AnalysisCache:
+        if self._cache is None:
+            with self._init_lock:
+                if self._cache is None:
+                    self._cache = AnalysisCache(
+                        memory_entries=self.config_manager.get("cache_memory_entries", DEFAULT_CACHE_MEMORY_ENTRIES),
+                        memory_mb=self.config_manager.get("cache_memory_mb", DEFAULT_CACHE_MEMORY_MB),
+                        base_paths=configured_base_paths(self.config_manager),
+                    )
+        return self._cache
+
+    @property
+    def history_manager(self) -> GameHistoryManager:
+        if self._history_manager is None:
+            with self._init_lock:
+                if self._history_manager is None:
+                    self._history_manager = GameHistoryManager()
+        return self._history_manager
+
+    @property
+    def local_book(self) -> LocalBookManager:
+        if self._local_book is None:
+            self._init_books()
+        return self._local_book
+
+    @property
+    def opening_db(self) -> OpeningDB:
+        if self._opening_db is None:
+            self._init_books()
+        return self._opening_db
+
+    @property
+    def polyglot_book(self) -> PolyglotBookManager:
+        if self._polyglot_book is None:
+            self._init_books()
+        return self._polyglot_book
+
+    def _init_books(self):
+        """Open (and on first run, populate) the opening DB and book managers."""
+        with self._init_lock:
+            if self._local_book is not None:
+                return
+            tsv_dir = get_resource_path("assets/openings")
+            db_path = os.path.join(get_user_data_dir(), "openings.db")
+            opening_db = OpeningDB(db_path)
+            try:
+                if opening_db.initialize(tsv_dir):
+                    logger.info(f"Opening book populated: {db_path}")
+            except FileNotFoundError:
+                logger.warning(f"Opening TSV files not found in {tsv_dir}; book detection disabled")
+            polyglot_path = self.config_manager.get("polyglot_book_path", "")
+            self._opening_db = opening_db
+            self._polyglot_book = PolyglotBookManager(polyglot_path)
+            self._local_book = LocalBookManager(opening_db)
+
+    def warm_up(self):
+        """
+        Build every lazily constructed dependency now.
+
+        Meant to run on a background thread right after startup so the
+        opening-book import, schema checks and Polyglot open are done
+        before the first analysis needs them. Safe to call more than once.
+        """
+        try:
+            self.cache
+            self.history_manager
+            self._init_books()
+            # Opens the memory-mapped reader if a book is configured.
+            self._polyglot_book.is_available()
+            self._schedule_cache_maintenance()
+        finally:
+            self.ready.set()
+
+    def is_ready(self) -> bool:
+        return self.ready.is_set()
+
+    def _schedule_cache_maintenance(self):
+        """Enforce the cache size budget on a background thread."""
+        max_mb = self.config_manager.get("cache_max_mb", DEFAULT_CACHE_MAX_MB) or DEFAULT_CACHE_MAX_MB
+        self.cache.schedule_maintenance(int(max_mb * 1024 * 1024))
+
     def analyze_game(self, game_analysis: GameAnalysis, callback=None):
         """
         Analyzes a game structure in-place.
@@ -73,6 +179,9 @@ class Analyzer:
             if game_analysis.pgn_content:
                 self.history_manager.save_game(game_analysis, game_analysis.pgn_content)
                 logger.info("Game saved to history")
+
+            if self.config.get("use_cache", True):
+                self._schedule_cache_maintenance()
             
             logger.info("Analysis complete")
 
@@ -95,6 +204,8 @@ class Analyzer:
         # Update Polyglot book path from settings if changed
         new_polyglot_path = self.config_manager.get("polyglot_book_path", "")
         self.polyglot_book.set_book_path(new_polyglot_path)
+        if self.config.get("use_cache", True):
+            self.cache.set_base_paths(configured_base_paths(self.config_manager))
         
         logger.info(f"Starting analysis for game: {game_analysis.game_id} (Depth: {self.config['depth']}, Multi-PV: {self.config['multi_pv']})")
         self.engine_manager.start_engine()
@@ -123,29 +234,33 @@ class Analyzer:
         in_book = True
         opening_name = "Unknown Opening"
 
-        for i, move_data in enumerate(game_analysis.moves):
-            move_idx = i + 1
-            if move_idx == 1 or move_idx % 10 == 0 or move_idx == total_moves:
-                logger.info(f"Analyzing move {move_idx}/{total_moves}...")
-            
+        # Read the whole game's cache entries in one query and commit new
+        # results together instead of once per position.
+        use_cache = self.config.get("use_cache", True)
+        with self._cache_batch(game_analysis) if use_cache else nullcontext():
+            for i, move_data in enumerate(game_analysis.moves):
+                move_idx = i + 1
+                if move_idx == 1 or move_idx % 10 == 0 or move_idx == total_moves:
+                    logger.info(f"Analyzing move {move_idx}/{total_moves}...")
+            
+                if callback:
+                    callback(i+1, total_moves)
+            
+                # 1. Analyze position BEFORE move
+                board.set_fen(move_data.fen_before)
+                is_white_turn = board.turn
+            
+                # Get Engine/Cache Analysis for this position
+                info_list = self._get_position_analysis(board, move_data)
+            
+                # Process analysis results
+                self._process_analysis_results(move_data, info_list, is_white_turn, board)
+            
+            # Analyze FINAL position
+            logger.info("Analyzing final position...")
             if callback:
-                callback(i+1, total_moves)
-            
-            # 1. Analyze position BEFORE move
-            board.set_fen(move_data.fen_before)
-            is_white_turn = board.turn
-            
-            # Get Engine/Cache Analysis for this position
-            info_list = self._get_position_analysis(board, move_data)
-            
-            # Process analysis results
-            self._process_analysis_results(move_data, info_list, is_white_turn, board)
-            
-        # Analyze FINAL position
-        logger.info("Analyzing final position...")
-        if callback:
-            callback(total_moves + 1, total_moves)
-        final_score = self._analyze_final_position(game_analysis, board)
+                callback(total_moves + 1, total_moves)
+            final_score = self._analyze_final_position(game_analysis, board)
         
         # Classify moves and calculate stats
         self._classify_and_calculate_stats(game_analysis, summary_counts, final_score)
@@ -158,6 +273,18 @@ class Analyzer:
         
         return summary_counts
     
+    @contextmanager
+    def _cache_batch(self, game_analysis: GameAnalysis):
+        """Prefetch the game's positions and group-commit cache writes."""
+        flush_interval = self.config_manager.get("cache_flush_interval", 0.0) or 0.0
+        with self.cache.batch(flush_interval=flush_interval):
+            try:
+                hits = self.cache.prefetch((m.fen_before for m in game_analysis.moves), self.config)
+                logger.debug(f"Cache prefetch: {hits}/{len(game_analysis.moves)} positions cached")
+            except Exception as e:
+                logger.error(f"Cache prefetch failed: {e}")
+            yield
+
     def _log_classification_summary(self, summary_counts: Dict):
         """Logs a summary of move classifications and accuracy."""
         for side in ["white", "black"]:
@@ -197,22 +324,8 @@ class Analyzer:
             info_list = [info_list]
         
         # Serialize and cache
-        serializable_list = []
-        for info in info_list:
-            s_info = {}
-            score = info.get("score")
-            if score:
-                if score.is_mate():
-                    s_info["mate"] = score.relative.mate()
-                else:
-                    s_info["cp"] = score.relative.score(mate_score=10000)
-            
-            pv = info.get("pv", [])
-            s_info["pv"] = [m.uci() for m in pv]
-            s_info["depth"] = info.get("depth", self.config["depth"])
-            serializable_list.append(s_info)
-        
         if self.config.get("use_cache", True):
+            serializable_list = serialize_engine_lines(info_list, self.config["depth"])
             self.cache.save_analysis(move_data.fen_before, self.config, serializable_list)
             
         return info_list
@@ -228,8 +341,6 @@ class Analyzer:
         move_data.multi_pvs = []
         
         for idx, item in enumerate(info_list):
-            pv_data = {}
-            
             if isinstance(item, dict) and "pv" in item and isinstance(item["pv"], list) and len(item["pv"]) > 0 and isinstance(item["pv"][0], str):
                 # Cached format
                 pv_uci = item.get("pv", [])
@@ -251,21 +362,12 @@ class Analyzer:
                         cp = score.relative.score(mate_score=100000)
                 depth = item.get("depth", "?")
                         
-            pv_data["pv"] = pv_uci
-            pv_data["cp"] = cp
-            pv_data["mate"] = mate
-            pv_data["depth"] = depth
-            
-            # Convert PV to SAN
-            try:
-                pv_moves_obj = [chess.Move.from_uci(uci) for uci in pv_uci]
-                pv_data["pv_san"] = board.variation_san(pv_moves_obj)
-            except Exception:
-                pv_data["pv_san"] = " ".join(pv_uci)
-            
-            pv_data["score_value"] = f"M{mate}" if mate is not None else f"{cp/100:.2f}" if cp is not None else "?"
-            
-            move_data.multi_pvs.append(pv_data)
+            # PV SAN and the score label are rendered on demand by PVLine
+            # from the move's position, so only the raw line is kept.
+            move_data.multi_pvs.append(PVLine(
+                pv_uci, cp=cp, mate=mate, depth=depth,
+                move=move_data, chess960=board.chess960,
+            ))
             
             if idx == 0:
                 best_pv_uci = pv_uci
@@ -3,8 +3,10 @@ import sqlite3
 import csv
 import glob
 import os
+import threading
 import chess
-from typing import List, Optional, Tuple
+from collections import deque
+from typing import Dict, List, Optional, Tuple
 
 
 def _normalize_fen(fen: str) -> str:
@@ -12,6 +14,11 @@ def _normalize_fen(fen: str) -> str:
     return " ".join(fen.split()[:4])
 
 
+# Serialises first-run imports: the Explorer view and the analyser warm-up
+# may both initialise the same database at startup.
+_INIT_LOCK = threading.Lock()
+
+
 class OpeningDB:
     """SQLite-backed opening tree keyed by normalized FEN."""
 
@@ -83,16 +90,17 @@ class OpeningDB:
         """Populate the database from TSV files if not already populated.
         Returns True if the DB was populated by this call, False if already populated.
         """
-        self.connect()
-        if self.is_populated():
-            return False
-        self._import_tsvs(tsv_dir)
-        self._conn.execute(
-            "INSERT INTO opening_book_metadata (version, imported_at) VALUES (?, datetime('now'))",
-            (self.CURRENT_VERSION,),
-        )
-        self._conn.commit()
-        return True
+        with _INIT_LOCK:
+            self.connect()
+            if self.is_populated():
+                return False
+            self._import_tsvs(tsv_dir)
+            self._conn.execute(
+                "INSERT INTO opening_book_metadata (version, imported_at) VALUES (?, datetime('now'))",
+                (self.CURRENT_VERSION,),
+            )
+            self._conn.commit()
+            return True
 
     # ---- TSV Import ----
 
@@ -194,3 +202,35 @@ class OpeningDB:
             (node_id,),
         ).fetchall()
         return [r["move_san"] for r in rows]
+
+    def bfs_fens(self, limit: Optional[int] = None) -> List[str]:
+        """Normalized FENs of the tree in breadth-first order from the start position.
+
+        Each ply is ordered by how many named openings pass through the node
+        (most popular first), then by FEN, so the order is stable across runs.
+        """
+        root_id = self.get_node_by_fen(_normalize_fen(chess.STARTING_FEN))
+        if root_id is None:
+            return []
+        children: Dict[int, List[int]] = {}
+        for row in self._conn.execute("SELECT parent_id, child_id FROM opening_edges"):
+            children.setdefault(row["parent_id"], []).append(row["child_id"])
+        fens = dict(self._conn.execute("SELECT id, fen FROM opening_nodes").fetchall())
+        popularity = dict(self._conn.execute(
+            "SELECT node_id, COUNT(*) FROM node_openings GROUP BY node_id"
+        ).fetchall())
+
+        order = []
+        seen = {root_id}
+        level = [root_id]
+        while level and (limit is None or len(order) < limit):
+            level.sort(key=lambda node_id: (-popularity.get(node_id, 0), fens[node_id]))
+            order.extend(fens[node_id] for node_id in level)
+            next_level = []
+            for node_id in level:
+                for child_id in children.get(node_id, ()):
+                    if child_id not in seen:
+                        seen.add(child_id)
+                        next_level.append(child_id)
+            level = next_level
+        return order if limit is None else order[:limit]
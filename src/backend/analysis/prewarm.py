@@ -0,0 +1,129 @@
+"""Idle-time pre-analysis of the opening tree into the analysis cache."""
+import json
+import threading
+from typing import Any, Callable, Dict, Optional
+
+import chess
+
+from src.utils.logger import logger
+from src.constants import DEFAULT_PREWARM_MAX_NODES, DEFAULT_PREWARM_INTERVAL
+from .analyzer import serialize_engine_lines
+
+
+class OpeningPrewarmer:
+    """
+    Walks the opening tree breadth-first and caches an engine search of
+    every node at the configured depth / Multi-PV.
+
+    Progress is stored in the cache's ``cache_meta`` table, so a later run
+    resumes where the previous one stopped; positions already cached deep
+    enough are skipped without an engine search. ``pause()``/``resume()``
+    and ``cancel()`` may be called from any thread and take effect before
+    the next position.
+    """
+
+    STATE_KEY = "opening_prewarm"
+
+    def __init__(self, opening_db, cache, engine_manager, engine_params: Dict[str, Any],
+                 max_nodes: int = DEFAULT_PREWARM_MAX_NODES,
+                 interval: float = DEFAULT_PREWARM_INTERVAL):
+        self.opening_db = opening_db
+        self.cache = cache
+        self.engine_manager = engine_manager
+        self.engine_params = dict(engine_params)
+        self.max_nodes = max_nodes
+        self.interval = interval
+        self._cancelled = threading.Event()
+        self._running = threading.Event()
+        self._running.set()
+
+    # ---- Control (thread-safe) ----
+
+    def pause(self):
+        self._running.clear()
+
+    def resume(self):
+        self._running.set()
+
+    def cancel(self):
+        self._cancelled.set()
+        self._running.set()  # Wake a paused run so it can exit
+
+    def is_paused(self) -> bool:
+        return not self._running.is_set()
+
+    def _wait_turn(self) -> bool:
+        """Block while paused; False once cancelled."""
+        self._running.wait()
+        return not self._cancelled.is_set()
+
+    # ---- Progress state ----
+
+    def _state_signature(self) -> Dict[str, Any]:
+        return {"depth": self.engine_params.get("depth"), "multi_pv": self.engine_params.get("multi_pv")}
+
+    def _load_position(self) -> int:
+        """Index to resume from; restarts when depth or Multi-PV changed."""
+        try:
+            state = json.loads(self.cache.get_meta(self.STATE_KEY) or "{}")
+        except ValueError:
+            return 0
+        if {key: state.get(key) for key in ("depth", "multi_pv")} != self._state_signature():
+            return 0
+        return int(state.get("position", 0))
+
+    def _save_position(self, position: int):
+        self.cache.set_meta(self.STATE_KEY, json.dumps({**self._state_signature(), "position": position}))
+
+    # ---- Run ----
+
+    def run(self, progress_callback: Optional[Callable[[int, int], None]] = None) -> Dict[str, int]:
+        """
+        Analyse tree nodes until all ``max_nodes`` are cached or the run is
+        cancelled. Returns ``analyzed``/``skipped`` counts and the final
+        ``position`` of ``total``.
+        """
+        self.opening_db.connect()
+        fens = self.opening_db.bfs_fens(self.max_nodes)
+        total = len(fens)
+        position = min(self._load_position(), total)
+        stats = {"analyzed": 0, "skipped": 0, "position": position, "total": total}
+        if position >= total:
+            return stats
+
+        depth = self.engine_params.get("depth")
+        multi_pv = self.engine_params.get("multi_pv", 1)
+        time_limit = self.engine_params.get("time_per_move", 1.0)
+        logger.info(f"Opening pre-analysis: resuming at node {position}/{total} (depth {depth})")
+        try:
+            for position in range(position, total):
+                if not self._wait_turn():
+                    break
+                fen = f"{fens[position]} 0 1"
+                searched = not self.cache.has_analysis(fen, self.engine_params)
+                if not searched:
+                    stats["skipped"] += 1
+                else:
+                    if self.engine_manager.engine is None:
+                        self.engine_manager.start_engine()
+                    info = self.engine_manager.analyze_position(
+                        chess.Board(fen), time_limit=time_limit, depth=depth, multi_pv=multi_pv
+                    )
+                    if not isinstance(info, list):
+                        info = [info]
+                    self.cache.save_analysis(fen, self.engine_params, serialize_engine_lines(info, depth))
+                    stats["analyzed"] += 1
+                self._save_position(position + 1)
+                stats["position"] = position + 1
+                if progress_callback:
+                    progress_callback(position + 1, total)
+                # Throttle: rest after each search (returns early on cancel).
+                if searched and self._cancelled.wait(self.interval):
+                    break
+        finally:
+            self.engine_manager.stop_engine()
+        logger.info(
+            f"Opening pre-analysis stopped at {stats['position']}/{total}: "
+            f"{stats['analyzed']} analysed, {stats['skipped']} already cached"
+        )
+        return stats
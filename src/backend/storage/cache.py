@@ -1,20 +1,168 @@
+import os
 import sqlite3
 import json
-import hashlib
-from typing import Optional, Dict, Any
-from src.constants import DEFAULT_MULTI_PV
+import math
+import threading
+import time
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Optional, Dict, Any, Iterable, Iterator, List, Tuple
+from src.constants import (
+    DEFAULT_MULTI_PV, DEFAULT_CACHE_MEMORY_ENTRIES, DEFAULT_CACHE_MEMORY_MB, DEFAULT_CACHE_MAX_MB,
+    BUNDLED_CACHE_BASE_PATH,
+)
+from src.utils.logger import logger
+from .compact import zobrist_key, pack_result, unpack_result
+from .lru import LRUCache
+from .connection import apply_pragmas
+
+# One memory tier per database file, shared by every AnalysisCache opened on
+# it, so clearing the cache from one instance is seen by the others.
+_MEMORY_TIERS: Dict[str, LRUCache] = {}
+_MEMORY_TIERS_LOCK = threading.Lock()
+
+
+def _memory_tier(db_path: str, max_entries: Optional[int], max_bytes: Optional[int]) -> LRUCache:
+    """
+    The tier of ``db_path``. Limits given (not None) resize it; omitted ones
+    keep the existing tier's, or the defaults when it is created.
+    """
+    key = os.path.abspath(db_path)
+    with _MEMORY_TIERS_LOCK:
+        tier = _MEMORY_TIERS.get(key)
+        if tier is None:
+            tier = _MEMORY_TIERS[key] = LRUCache(
+                DEFAULT_CACHE_MEMORY_ENTRIES if max_entries is None else max_entries,
+                int(DEFAULT_CACHE_MEMORY_MB * 1024 * 1024) if max_bytes is None else max_bytes,
+            )
+            return tier
+        limits = (tier.max_entries if max_entries is None else max_entries,
+                  tier.max_bytes if max_bytes is None else max_bytes)
+        if (tier.max_entries, tier.max_bytes) != limits:
+            tier.resize(*limits)
+        return tier
+
+
+def configured_base_paths(config_manager=None) -> List[str]:
+    """Read-only base caches: config ``cache_base_paths`` plus the bundled base, if shipped."""
+    if config_manager is None:
+        from src.utils.config import ConfigManager
+        config_manager = ConfigManager()
+    from src.utils.path_utils import get_resource_path
+    paths = [p for p in (config_manager.get("cache_base_paths") or []) if p]
+    bundled = get_resource_path(BUNDLED_CACHE_BASE_PATH)
+    if os.path.isfile(bundled):
+        paths.append(bundled)
+    return paths
 
 class AnalysisCache:
-    def __init__(self, db_path: Optional[str] = None):
+    # v1: TEXT sha256(fen|multipv) key with fen/engine_params columns.
+    # v2: (zobrist, multipv) INTEGER key in a WITHOUT ROWID table.
+    # v3: result stored as a binary record (compact.pack_result), JSON only
+    #     for results the record layout cannot hold.
+    SCHEMA_VERSION = 3
+
+    ANALYSIS_TABLE_SQL = """
+        CREATE TABLE IF NOT EXISTS analysis (
+            zobrist INTEGER NOT NULL,
+            multipv INTEGER NOT NULL,
+            depth INTEGER NOT NULL DEFAULT 0,
+            result BLOB,
+            hits INTEGER NOT NULL DEFAULT 0,
+            last_access INTEGER NOT NULL DEFAULT 0,
+            PRIMARY KEY (zobrist, multipv)
+        ) WITHOUT ROWID
+    """
+
+    # Keys per IN (...) query; stays under SQLite's default variable limit.
+    PREFETCH_CHUNK = 500
+    # Rows re-encoded per transaction by the v3 migration.
+    MIGRATION_CHUNK = 5000
+    # Buffered hit counts are written once this many positions are pending.
+    TOUCH_FLUSH_THRESHOLD = 1000
+    # Eviction shrinks the table to this fraction of the budget.
+    EVICTION_TARGET = 0.9
+    # Pages released per incremental_vacuum step (lock is dropped in between).
+    VACUUM_STEP_PAGES = 1024
+
+    # Deletes a position's entries covered by a new (multipv, depth) entry.
+    DELETE_COVERED_SQL = "DELETE FROM analysis WHERE zobrist = ? AND multipv < ? AND depth <= ?"
+
+    UPSERT_SQL = """
+        INSERT INTO analysis (zobrist, multipv, depth, result, last_access) VALUES (?, ?, ?, ?, ?)
+        ON CONFLICT (zobrist, multipv) DO UPDATE SET
+            depth = excluded.depth, result = excluded.result, last_access = excluded.last_access
+        WHERE excluded.depth > analysis.depth
+    """
+
+    # Inserts an imported entry unless the position already has one at least
+    # as wide and as deep (run DELETE_COVERED_SQL first, like a save).
+    MERGE_SQL = """
+        INSERT INTO analysis (zobrist, multipv, depth, result, last_access)
+        SELECT ?, ?, ?, ?, ?
+        WHERE NOT EXISTS (
+            SELECT 1 FROM analysis WHERE zobrist = ? AND multipv >= ? AND depth >= ?
+        )
+        ON CONFLICT (zobrist, multipv) DO UPDATE SET
+            depth = excluded.depth, result = excluded.result, last_access = excluded.last_access
+        WHERE excluded.depth > analysis.depth
+    """
+
+    # Eviction order: entries superseded by a wider line at equal or greater
+    # depth first, then the least hit, shallowest and least recently used.
+    EVICTION_SQL = """
+        DELETE FROM analysis WHERE (zobrist, multipv) IN (
+            SELECT a.zobrist, a.multipv FROM analysis a
+            ORDER BY EXISTS (
+                SELECT 1 FROM analysis b
+                WHERE b.zobrist = a.zobrist AND b.multipv > a.multipv AND b.depth >= a.depth
+            ) DESC, a.hits ASC, a.depth ASC, a.last_access ASC
+            LIMIT ?
+        )
+    """
+
+    def __init__(self, db_path: Optional[str] = None,
+                 memory_entries: Optional[int] = None,
+                 memory_mb: Optional[float] = None,
+                 base_paths: Optional[Iterable[str]] = None):
         if db_path is None:
-            import os
             from src.utils.path_utils import get_user_data_dir
             self.db_path = os.path.join(get_user_data_dir(), "analysis_cache.db")
         else:
             self.db_path = db_path
         self.conn = sqlite3.connect(self.db_path, check_same_thread=False)
-        self.conn.execute("PRAGMA journal_mode=WAL")
+        # Must precede the WAL switch to take effect on a new file.
+        self.conn.execute("PRAGMA auto_vacuum=INCREMENTAL")
+        apply_pragmas(self.conn)
+        self._lock = threading.RLock()
+        # Batch state (see batch()/prefetch()):
+        # zobrist -> {multipv: (depth, encoded result)}.
+        # A prefetched position with no entries is a known miss.
+        self._prefetched: Dict[int, Dict[int, Tuple[int, Any]]] = {}
+        self._pending: Dict[int, Dict[int, Tuple[int, Any]]] = {}
+        self._batching = False
+        self._flush_interval = 0.0
+        self._last_flush = 0.0
+        # Decoded (depth, result) records in front of SQLite; writes go through.
+        # Shared per file: only the analyzer passes limits (from its config),
+        # other instances (settings, pre-analysis, CLI) use the tier as is.
+        self.memory = _memory_tier(
+            self.db_path,
+            None if memory_entries is None else int(memory_entries),
+            None if memory_mb is None else int(memory_mb * 1024 * 1024),
+        )
+        self.db_hits = 0
+        # Hit counts not yet written to the hits/last_access columns.
+        self._touches: Dict[Tuple[int, int], int] = {}
+        self._maintenance_thread: Optional[threading.Thread] = None
+        # Read-only layers under this (writable) database, searched in order
+        # after it; see set_base_paths().
+        self.bases: List[Tuple[str, sqlite3.Connection]] = []
+        # Base-layer entries loaded by prefetch(), same shape as _prefetched.
+        self._prefetched_base: Dict[int, Dict[int, Tuple[int, Any]]] = {}
         self._init_db()
+        if base_paths:
+            self.set_base_paths(base_paths)
 
     def __del__(self):
         if hasattr(self, 'conn') and self.conn:
@@ -22,84 +170,682 @@ class AnalysisCache:
                 self.conn.close()
             except:
                 pass
+        for _, base in getattr(self, 'bases', []):
+            try:
+                base.close()
+            except:
+                pass
+
+    # ---- Read-only base layers ----
+
+    def set_base_paths(self, paths: Iterable[str]):
+        """
+        Use the given databases as read-only layers under this cache.
+
+        Bases are opened immutable (no locks, no journal), so they can live
+        on a network share or read-only media and be used by many users at
+        once; they must not be written while in use. Lookups fall through
+        this cache and then each base in order; writes only go here.
+        Unreadable files and older schemas are skipped with a warning.
+        """
+        own_path = os.path.abspath(self.db_path)
+        wanted = []
+        for path in paths:
+            path = os.path.abspath(path)
+            if path != own_path and path not in wanted:
+                wanted.append(path)
+        with self._lock:
+            if wanted == [path for path, _ in self.bases]:
+                return
+            for _, base in self.bases:
+                base.close()
+            self.bases = []
+            self._prefetched_base.clear()
+            # Memory entries may have come from a layer that is now gone.
+            self.memory.clear()
+            for path in wanted:
+                base = self._open_base(path)
+                if base is not None:
+                    self.bases.append((path, base))
+
+    def _open_base(self, path: str) -> Optional[sqlite3.Connection]:
+        if not os.path.isfile(path):
+            logger.warning(f"Analysis cache base not found: {path}")
+            return None
+        try:
+            base = sqlite3.connect(
+                Path(path).resolve().as_uri() + "?mode=ro&immutable=1", uri=True, check_same_thread=False
+            )
+            row = base.execute("SELECT value FROM cache_meta WHERE key = 'schema_version'").fetchone()
+            version = int(row[0]) if row else 0
+            # v2 and v3 share the (zobrist, multipv) layout; _decode() reads both result formats.
+            if version < 2:
+                base.close()
+                logger.warning(f"Analysis cache base {path} uses schema v{version}; open it once with "
+                               f"AnalysisCache to migrate it before sharing")
+                return None
+            base.execute("SELECT zobrist, multipv, depth, result FROM analysis LIMIT 1").fetchall()
+            return base
+        except (sqlite3.Error, ValueError) as e:
+            logger.warning(f"Could not open analysis cache base {path}: {e}")
+            return None
+
+    def _base_entries(self, zobrist: int) -> Dict[int, Tuple[int, Any]]:
+        """multipv -> (depth, stored result) merged over all base layers."""
+        if zobrist in self._prefetched_base:
+            return self._prefetched_base[zobrist]
+        entries: Dict[int, Tuple[int, Any]] = {}
+        for path, base in self.bases:
+            try:
+                rows = base.execute(
+                    "SELECT multipv, depth, result FROM analysis WHERE zobrist = ?", (zobrist,)
+                ).fetchall()
+            except sqlite3.Error as e:
+                logger.error(f"Failed to read analysis cache base {path}: {e}")
+                continue
+            for multipv, depth, result in rows:
+                if not self._covering_entry(entries, multipv, depth or 0):
+                    self._merge_entry(entries, multipv, depth or 0, result)
+        return entries
+
+    def _find_entry(self, zobrist: int, multi_pv: int, min_depth: int):
+        """Covering entry and its touch key (None for base layers, which are never written)."""
+        found = self._covering_entry(self._position_entries(zobrist), multi_pv, min_depth)
+        if found is not None:
+            return found, (zobrist, found[0])
+        if self.bases:
+            found = self._covering_entry(self._base_entries(zobrist), multi_pv, min_depth)
+            if found is not None:
+                return found, None
+        return None, None
 
     def _init_db(self):
         cursor = self.conn.cursor()
-        # Create table with depth column for depth-aware caching
         cursor.execute("""
-            CREATE TABLE IF NOT EXISTS analysis (
-                id TEXT PRIMARY KEY,
-                fen TEXT,
-                engine_params TEXT,
-                depth INTEGER DEFAULT 0,
-                result TEXT
+            CREATE TABLE IF NOT EXISTS cache_meta (
+                key TEXT PRIMARY KEY,
+                value TEXT
             )
         """)
-        # Add depth column if it doesn't exist (migration for existing DBs)
-        try:
-            cursor.execute("ALTER TABLE analysis ADD COLUMN depth INTEGER DEFAULT 0")
-        except sqlite3.OperationalError:
-            pass  # Column already exists
+        row = cursor.execute("SELECT value FROM cache_meta WHERE key = 'schema_version'").fetchone()
+        stored_version = int(row[0]) if row else 0
+        columns = [row[1] for row in cursor.execute("PRAGMA table_info(analysis)")]
+        pending_v1 = cursor.execute(
+            "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'analysis_v1'"
+        ).fetchone() is not None
+        migrated_v1 = self._migrate_v1(rename="id" in columns) if "id" in columns or pending_v1 else False
+        cursor.execute(self.ANALYSIS_TABLE_SQL)
+        # Access statistics used by eviction (migration for v2 tables)
+        for column in ("hits INTEGER NOT NULL DEFAULT 0", "last_access INTEGER NOT NULL DEFAULT 0"):
+            try:
+                cursor.execute(f"ALTER TABLE analysis ADD COLUMN {column}")
+            except sqlite3.OperationalError:
+                pass  # Column already exists
+        if stored_version < 3 or migrated_v1:
+            self._migrate_json_results()
+        cursor.execute(
+            "INSERT OR REPLACE INTO cache_meta (key, value) VALUES ('schema_version', ?)",
+            (str(self.SCHEMA_VERSION),)
+        )
         self.conn.commit()
+        self._enable_incremental_vacuum()
+
+    def _enable_incremental_vacuum(self):
+        """Convert an existing file to auto_vacuum=INCREMENTAL (one full VACUUM)."""
+        if self.conn.execute("PRAGMA auto_vacuum").fetchone()[0] == 2:
+            return
+        try:
+            self.conn.execute("PRAGMA auto_vacuum=INCREMENTAL")
+            self.conn.execute("VACUUM")
+            logger.info("Analysis cache converted to incremental auto-vacuum")
+        except sqlite3.OperationalError as e:
+            logger.warning(f"Could not enable incremental vacuum on analysis cache: {e}")
+
+    def _migrate_v1(self, rename: bool) -> bool:
+        """
+        Re-key a v1 (sha256 TEXT id) cache table into the v2 layout.
+
+        The v1 table is first renamed to ``analysis_v1`` next to a new empty
+        table, then copied across and dropped in one transaction.  If the copy
+        fails ``analysis_v1`` is kept and the copy is retried on the next open.
+        Returns True once the rows have been copied.
+        """
+        cursor = self.conn.cursor()
+        if rename:
+            try:
+                cursor.execute("BEGIN")
+                cursor.execute("ALTER TABLE analysis RENAME TO analysis_v1")
+                cursor.execute(self.ANALYSIS_TABLE_SQL)
+                self.conn.commit()
+            except Exception as e:
+                # Nothing changed; a v1 table cannot serve as the cache, so the open fails
+                self.conn.rollback()
+                logger.error(f"Failed to set the v1 analysis cache aside: {e}")
+                raise
+        logger.info("Migrating analysis cache to Zobrist-keyed schema v2")
+        try:
+            cursor.execute("BEGIN")
+            migrated = skipped = 0
+            rows = cursor.execute("SELECT fen, engine_params, depth, result FROM analysis_v1").fetchall()
+            for fen, engine_params, depth, result in rows:
+                if not fen:
+                    skipped += 1
+                    continue
+                try:
+                    params = json.loads(engine_params) if engine_params else {}
+                    key = zobrist_key(fen)
+                except ValueError:
+                    skipped += 1
+                    continue
+                multi_pv = params.get("multi_pv", DEFAULT_MULTI_PV)
+                # Two FENs differing only in move clocks share a key: keep the deeper one.
+                cursor.execute("""
+                    INSERT INTO analysis (zobrist, multipv, depth, result) VALUES (?, ?, ?, ?)
+                    ON CONFLICT (zobrist, multipv) DO UPDATE SET depth = excluded.depth, result = excluded.result
+                    WHERE excluded.depth > analysis.depth
+                """, (key, multi_pv, depth or 0, result))
+                migrated += 1
+            cursor.execute("DROP TABLE analysis_v1")
+            self.conn.commit()
+            logger.info(f"Analysis cache migrated: {migrated} entries ({skipped} unreadable dropped)")
+        except Exception as e:
+            # analysis_v1 stays as it was: the copy is retried on the next start
+            self.conn.rollback()
+            logger.error(f"Failed to migrate analysis cache, will retry on next start: {e}")
+            return False
+        try:
+            # Reclaim the space held by the old TEXT keys and FEN/params columns.
+            self.conn.execute("VACUUM")
+        except sqlite3.OperationalError as e:
+            logger.warning(f"VACUUM after cache migration skipped: {e}")
+        return True
 
-    def _generate_key(self, fen: str, multi_pv: int) -> str:
-        """Generate cache key based on FEN and multi_pv only (not depth)."""
-        key_str = f"{fen}|multipv:{multi_pv}"
-        return hashlib.sha256(key_str.encode('utf-8')).hexdigest()
+    def _migrate_json_results(self):
+        """Re-encode JSON result rows as binary records (schema v3)."""
+        converted = 0
+        last_key = None
+        while True:
+            if last_key is None:
+                rows = self.conn.execute("""
+                    SELECT zobrist, multipv, depth, result FROM analysis WHERE typeof(result) = 'text'
+                    ORDER BY zobrist, multipv LIMIT ?
+                """, (self.MIGRATION_CHUNK,)).fetchall()
+            else:
+                rows = self.conn.execute("""
+                    SELECT zobrist, multipv, depth, result FROM analysis
+                    WHERE typeof(result) = 'text' AND (zobrist, multipv) > (?, ?)
+                    ORDER BY zobrist, multipv LIMIT ?
+                """, (*last_key, self.MIGRATION_CHUNK)).fetchall()
+            if not rows:
+                break
+            updates = []
+            for zobrist, multipv, depth, result in rows:
+                try:
+                    updates.append((pack_result(json.loads(result), depth or 0), zobrist, multipv))
+                except (ValueError, TypeError, AttributeError):
+                    pass  # Left as JSON; _decode() still reads it
+            with self.conn:
+                self.conn.executemany(
+                    "UPDATE analysis SET result = ? WHERE zobrist = ? AND multipv = ?", updates
+                )
+            converted += len(updates)
+            last_key = rows[-1][:2]
+        if converted:
+            logger.info(f"Analysis cache: {converted} results re-encoded in the binary format")
+
+    @staticmethod
+    def _encode(result: Any, depth: int):
+        """Binary record when the result fits the layout, JSON text otherwise."""
+        try:
+            return pack_result(result, depth)
+        except (ValueError, TypeError, AttributeError):
+            return json.dumps(result)
+
+    @staticmethod
+    def _decode(raw) -> Any:
+        if isinstance(raw, str):
+            return json.loads(raw)
+        return unpack_result(raw)
+
+    @staticmethod
+    def _memory_key(fen: str, multi_pv: int) -> tuple:
+        """Memory-tier key: the FEN's position fields, so a hit needs no board parse."""
+        return " ".join(fen.split(" ", 4)[:4]), multi_pv
+
+    # ---- Multi-PV subsumption ----
+    # An entry analysed at (multipv M, depth D) answers any request with
+    # multipv <= M and depth <= D, truncated to the requested number of lines.
+    # Each position therefore keeps only entries that do not cover each other.
+
+    @staticmethod
+    def _covering_entry(entries: Dict[int, Tuple[int, Any]], multi_pv: int,
+                        min_depth: int) -> Optional[Tuple[int, int, Any]]:
+        """Deepest (then narrowest) entry with multipv >= multi_pv and depth >= min_depth."""
+        best = None
+        for entry_multipv, (depth, value) in entries.items():
+            if entry_multipv >= multi_pv and depth >= min_depth:
+                if best is None or (depth, -entry_multipv) > (best[1], -best[0]):
+                    best = (entry_multipv, depth, value)
+        return best
+
+    @staticmethod
+    def _merge_entry(entries: Dict[int, Tuple[int, Any]], multi_pv: int, depth: int, value: Any):
+        """Add an entry to a position's map, dropping the entries it covers."""
+        for entry_multipv in [m for m, (d, _) in entries.items() if m <= multi_pv and d <= depth]:
+            del entries[entry_multipv]
+        entries[multi_pv] = (depth, value)
+
+    def _position_entries(self, zobrist: int) -> Dict[int, Tuple[int, Any]]:
+        """multipv -> (depth, encoded result) from the prefetch map or the DB, plus pending writes."""
+        if zobrist in self._prefetched:
+            entries = dict(self._prefetched[zobrist])
+        else:
+            cursor = self.conn.cursor()
+            cursor.execute("SELECT multipv, depth, result FROM analysis WHERE zobrist = ?", (zobrist,))
+            entries = {multipv: (depth or 0, result) for multipv, depth, result in cursor.fetchall()}
+        for multipv, (depth, value) in self._pending.get(zobrist, {}).items():
+            self._merge_entry(entries, multipv, depth, value)
+        return entries
 
     def get_analysis(self, fen: str, engine_params: Dict[str, Any]) -> Optional[Dict[str, Any]]:
         """
         Get cached analysis if it exists at sufficient depth.
-        Returns cached result only if cached_depth >= requested_depth.
+        Any entry with multipv >= requested and depth >= requested satisfies
+        the lookup; its lines are truncated to the requested multipv.
         """
         requested_depth = engine_params.get("depth", 0) or 0
         multi_pv = engine_params.get("multi_pv", DEFAULT_MULTI_PV)
-        key = self._generate_key(fen, multi_pv)
-        
-        cursor = self.conn.cursor()
-        cursor.execute("SELECT result, depth FROM analysis WHERE id = ?", (key,))
-        row = cursor.fetchone()
-        
-        if row:
-            cached_result, cached_depth = row[0], row[1] or 0
-            # Only return cached result if it was analyzed at equal or higher depth
-            if cached_depth >= requested_depth:
-                return json.loads(cached_result)
-        return None
+        memory_key = self._memory_key(fen, multi_pv)
+
+        # Results served from memory are shared objects: treat them as read-only.
+        entry = self.memory.get(memory_key)
+        if entry is None or entry[0] < requested_depth:
+            zobrist = zobrist_key(fen)
+            with self._lock:
+                found, key = self._find_entry(zobrist, multi_pv, requested_depth)
+            if found is None:
+                return None
+            _, depth, raw = found
+            self.db_hits += 1
+            result = self._decode(raw)
+            if isinstance(result, list):
+                result = result[:multi_pv]
+            entry = (depth, result, key)
+            self.memory.put(memory_key, entry, len(raw))
+
+        _, cached_result, key = entry
+        if key is not None:
+            self._touch(key)
+        return cached_result
+
+    def has_analysis(self, fen: str, engine_params: Dict[str, Any]) -> bool:
+        """Whether get_analysis() would hit, without counting a hit or loading the result."""
+        multi_pv = engine_params.get("multi_pv", DEFAULT_MULTI_PV)
+        entry = self.memory.peek(self._memory_key(fen, multi_pv))
+        if entry is not None and entry[0] >= (engine_params.get("depth", 0) or 0):
+            return True
+        with self._lock:
+            return self._find_entry(zobrist_key(fen), multi_pv, engine_params.get("depth", 0) or 0)[0] is not None
 
     def save_analysis(self, fen: str, engine_params: Dict[str, Any], result: Dict[str, Any]):
         """
-        Save analysis to cache. Overwrites if new depth is higher than cached depth.
+        Save analysis to cache unless an entry at least as wide and as deep
+        exists. Entries the new one covers are replaced.
+        Inside batch() the write is buffered until the next flush().
         """
         new_depth = engine_params.get("depth", 0) or 0
         multi_pv = engine_params.get("multi_pv", DEFAULT_MULTI_PV)
-        key = self._generate_key(fen, multi_pv)
-        
-        cursor = self.conn.cursor()
-        
-        # Check existing depth
-        cursor.execute("SELECT depth FROM analysis WHERE id = ?", (key,))
-        row = cursor.fetchone()
-        
-        should_save = True
-        if row:
-            cached_depth = row[0] or 0
-            # Only overwrite if new analysis is at higher depth
-            if new_depth <= cached_depth:
-                should_save = False
-        
-        if should_save:
-            cursor.execute("""
-                INSERT OR REPLACE INTO analysis (id, fen, engine_params, depth, result)
-                VALUES (?, ?, ?, ?, ?)
-            """, (key, fen, json.dumps(engine_params, sort_keys=True), new_depth, json.dumps(result)))
-            self.conn.commit()
+        memory_key = self._memory_key(fen, multi_pv)
+        zobrist = zobrist_key(fen)
+
+        with self._lock:
+            if self._find_entry(zobrist, multi_pv, new_depth)[0] is not None:
+                return
+
+            encoded = self._encode(result, new_depth)
+            self.memory.put(memory_key, (new_depth, result, (zobrist, multi_pv)), len(encoded))
+            if self._batching:
+                self._merge_entry(self._pending.setdefault(zobrist, {}), multi_pv, new_depth, encoded)
+                if self._flush_interval > 0 and time.monotonic() - self._last_flush >= self._flush_interval:
+                    self.flush()
+                return
+
+            with self.conn:
+                self.conn.execute(self.DELETE_COVERED_SQL, (zobrist, multi_pv, new_depth))
+                self.conn.execute(self.UPSERT_SQL, (zobrist, multi_pv, new_depth, encoded, int(time.time())))
+
+    # ---- Batch API ----
+
+    def prefetch(self, fens: Iterable[str], engine_params: Dict[str, Any]) -> int:
+        """
+        Load every cached entry for the given positions in bulk.
+
+        Later get_analysis()/save_analysis() calls for these positions are
+        answered from memory until the surrounding batch() ends.
+        Returns the number of positions with an entry wide enough for the
+        requested multipv.
+        """
+        multi_pv = engine_params.get("multi_pv", DEFAULT_MULTI_PV)
+        zobrists = list({zobrist_key(fen) for fen in fens if fen})
+        with self._lock:
+            cursor = self.conn.cursor()
+            for start in range(0, len(zobrists), self.PREFETCH_CHUNK):
+                chunk = zobrists[start:start + self.PREFETCH_CHUNK]
+                for zobrist in chunk:
+                    self._prefetched[zobrist] = {}
+                placeholders = ",".join("?" * len(chunk))
+                cursor.execute(
+                    f"SELECT zobrist, multipv, depth, result FROM analysis WHERE zobrist IN ({placeholders})",
+                    chunk
+                )
+                for zobrist, multipv, depth, result in cursor.fetchall():
+                    self._prefetched[zobrist][multipv] = (depth or 0, result)
+                for path, base in self.bases:
+                    try:
+                        rows = base.execute(
+                            f"SELECT zobrist, multipv, depth, result FROM analysis WHERE zobrist IN ({placeholders})",
+                            chunk
+                        ).fetchall()
+                    except sqlite3.Error as e:
+                        logger.error(f"Failed to read analysis cache base {path}: {e}")
+                        continue
+                    for zobrist, multipv, depth, result in rows:
+                        entries = self._prefetched_base.setdefault(zobrist, {})
+                        if not self._covering_entry(entries, multipv, depth or 0):
+                            self._merge_entry(entries, multipv, depth or 0, result)
+                if self.bases:
+                    for zobrist in chunk:
+                        self._prefetched_base.setdefault(zobrist, {})
+            return sum(
+                1 for zobrist in zobrists
+                if any(multipv >= multi_pv for multipv in self._prefetched[zobrist])
+                or any(multipv >= multi_pv for multipv in self._prefetched_base.get(zobrist, ()))
+            )
+
+    def flush(self):
+        """Write all buffered results in a single transaction."""
+        with self._lock:
+            self._last_flush = time.monotonic()
+            if not self._pending:
+                if self._touches:
+                    try:
+                        with self.conn:
+                            self._write_touches()
+                    except sqlite3.Error as e:
+                        logger.error(f"Failed to record analysis cache hits: {e}")
+                return
+            now = int(time.time())
+            entries = [
+                (zobrist, multipv, depth, value)
+                for zobrist, position in self._pending.items()
+                for multipv, (depth, value) in position.items()
+            ]
+            try:
+                with self.conn:
+                    self.conn.executemany(
+                        self.DELETE_COVERED_SQL, [(z, m, d) for z, m, d, _ in entries]
+                    )
+                    self.conn.executemany(
+                        self.UPSERT_SQL, [(z, m, d, v, now) for z, m, d, v in entries]
+                    )
+                    self._write_touches()
+            except sqlite3.Error as e:
+                # Keep the buffer so the next flush retries.
+                logger.error(f"Failed to flush analysis cache: {e}")
+                return
+            for zobrist, multipv, depth, value in entries:
+                if zobrist in self._prefetched:
+                    self._merge_entry(self._prefetched[zobrist], multipv, depth, value)
+            self._pending.clear()
+
+    @contextmanager
+    def batch(self, flush_interval: float = 0.0):
+        """
+        Buffer save_analysis() writes and commit them together.
+
+        Everything is flushed when the block exits (also on error or
+        cancellation); with flush_interval > 0 pending writes are also
+        flushed once that many seconds have passed since the last flush.
+        Nested batches join the outer one.
+        """
+        with self._lock:
+            if self._batching:
+                nested = True
+            else:
+                nested = False
+                self._batching = True
+                self._flush_interval = flush_interval or 0.0
+                self._last_flush = time.monotonic()
+        if nested:
+            yield self
+            return
+        try:
+            yield self
+        finally:
+            with self._lock:
+                self.flush()
+                self._batching = False
+                self._prefetched.clear()
+                self._prefetched_base.clear()
+
+    # ---- Metadata ----
+
+    def get_meta(self, key: str, default: Optional[str] = None) -> Optional[str]:
+        """Value stored in cache_meta (e.g. background job progress)."""
+        with self._lock:
+            row = self.conn.execute("SELECT value FROM cache_meta WHERE key = ?", (key,)).fetchone()
+        return row[0] if row else default
+
+    def set_meta(self, key: str, value: str):
+        with self._lock:
+            with self.conn:
+                self.conn.execute("INSERT OR REPLACE INTO cache_meta (key, value) VALUES (?, ?)", (key, value))
+
+    # ---- Bulk export / merge (cache packs, see cache_pack.py) ----
+
+    def entry_summary(self, min_depth: int = 0) -> Dict[str, int]:
+        """Count and depth/multipv range of the entries iter_entries() would yield."""
+        with self._lock:
+            self.flush()
+            count, shallowest, deepest, widest = self.conn.execute(
+                "SELECT COUNT(*), MIN(depth), MAX(depth), MAX(multipv) FROM analysis WHERE depth >= ?",
+                (min_depth,)
+            ).fetchone()
+        return {
+            "entries": count,
+            "min_depth": shallowest or 0,
+            "max_depth": deepest or 0,
+            "max_multipv": widest or 0,
+        }
+
+    def iter_entries(self, min_depth: int = 0) -> Iterator[Tuple[int, int, int, Any]]:
+        """
+        Yield every (zobrist, multipv, depth, stored result) row in key order.
+
+        Rows are read in chunks by key, holding the lock only per chunk, so
+        the cache stays usable while a large export runs.
+        """
+        with self._lock:
+            self.flush()
+        last_key = None
+        while True:
+            with self._lock:
+                if last_key is None:
+                    rows = self.conn.execute("""
+                        SELECT zobrist, multipv, depth, result FROM analysis WHERE depth >= ?
+                        ORDER BY zobrist, multipv LIMIT ?
+                    """, (min_depth, self.MIGRATION_CHUNK)).fetchall()
+                else:
+                    rows = self.conn.execute("""
+                        SELECT zobrist, multipv, depth, result FROM analysis
+                        WHERE depth >= ? AND (zobrist, multipv) > (?, ?)
+                        ORDER BY zobrist, multipv LIMIT ?
+                    """, (min_depth, *last_key, self.MIGRATION_CHUNK)).fetchall()
+            if not rows:
+                return
+            yield from rows
+            last_key = rows[-1][:2]
+
+    def merge_entries(self, entries: Iterable[Tuple[int, int, int, Any]]) -> int:
+        """
+        Merge (zobrist, multipv, depth, stored result) rows in one transaction.
+
+        The deeper result wins on conflicts and the multi-PV subsumption
+        rules of save_analysis() apply. Returns the number of rows written.
+        """
+        now = int(time.time())
+        merged = 0
+        with self._lock:
+            self.flush()
+            chunk = []
+            with self.conn:
+                for zobrist, multipv, depth, result in entries:
+                    chunk.append((zobrist, multipv, depth, result))
+                    if len(chunk) >= self.MIGRATION_CHUNK:
+                        merged += self._merge_chunk(chunk, now)
+                        chunk = []
+                if chunk:
+                    merged += self._merge_chunk(chunk, now)
+            # Narrower memory entries may now be covered by deeper rows.
+            self.memory.clear()
+            self._prefetched.clear()
+        return merged
+
+    def _merge_chunk(self, chunk, now: int) -> int:
+        merged = 0
+        for zobrist, multipv, depth, result in chunk:
+            self.conn.execute(self.DELETE_COVERED_SQL, (zobrist, multipv, depth))
+            merged += self.conn.execute(
+                self.MERGE_SQL, (zobrist, multipv, depth, result, now, zobrist, multipv, depth)
+            ).rowcount
+        return merged
+
+    # ---- Access tracking and maintenance ----
+
+    def _touch(self, key: Tuple[int, int]):
+        """Count a hit; counts are written in bulk, never one UPDATE per lookup."""
+        with self._lock:
+            self._touches[key] = self._touches.get(key, 0) + 1
+            if len(self._touches) >= self.TOUCH_FLUSH_THRESHOLD and not self._batching:
+                self.flush()
+
+    def _write_touches(self):
+        """Apply buffered hit counts; caller owns the transaction."""
+        if not self._touches:
+            return
+        now = int(time.time())
+        self.conn.executemany(
+            "UPDATE analysis SET hits = hits + ?, last_access = ? WHERE zobrist = ? AND multipv = ?",
+            [(count, now, *key) for key, count in self._touches.items()]
+        )
+        self._touches.clear()
+
+    def _page_stats(self) -> Tuple[int, int, int]:
+        page_size = self.conn.execute("PRAGMA page_size").fetchone()[0]
+        page_count = self.conn.execute("PRAGMA page_count").fetchone()[0]
+        freelist = self.conn.execute("PRAGMA freelist_count").fetchone()[0]
+        return page_size, page_count, freelist
+
+    def _table_bytes(self) -> int:
+        """Bytes used by the analysis table (dbstat when available, else an estimate)."""
+        try:
+            row = self.conn.execute("SELECT SUM(pgsize) FROM dbstat WHERE name = 'analysis'").fetchone()
+            return row[0] or 0
+        except sqlite3.OperationalError:
+            count, avg_result = self.conn.execute(
+                "SELECT COUNT(*), AVG(length(result)) FROM analysis"
+            ).fetchone()
+            # ~32 bytes of key, header and cell overhead per row
+            return int(count * ((avg_result or 0) + 32))
+
+    def run_maintenance(self, max_bytes: int) -> Dict[str, int]:
+        """
+        Keep the cache within ``max_bytes``.
+
+        Writes pending results and hit counts, evicts the lowest-value
+        entries when the analysis table is over budget, then returns free
+        pages to the file system with incremental VACUUM. The lock is
+        released between vacuum steps so lookups are not stalled.
+        """
+        evicted = 0
+        with self._lock:
+            self.flush()
+            page_size, page_count, freelist = self._page_stats()
+            # Cheap upper bound first: the whole file's used pages.
+            if (page_count - freelist) * page_size > max_bytes:
+                table_bytes = self._table_bytes()
+                other_bytes = (page_count - freelist) * page_size - table_bytes
+                target = max(0, int(max_bytes * self.EVICTION_TARGET) - other_bytes)
+                if table_bytes > target:
+                    rows = self.conn.execute("SELECT COUNT(*) FROM analysis").fetchone()[0]
+                    to_delete = math.ceil(rows * (table_bytes - target) / table_bytes) if table_bytes else 0
+                    if to_delete:
+                        with self.conn:
+                            evicted = self.conn.execute(self.EVICTION_SQL, (to_delete,)).rowcount
+                        logger.info(f"Analysis cache over budget: evicted {evicted} entries")
+
+        freed_pages = 0
+        while True:
+            with self._lock:
+                freelist = self.conn.execute("PRAGMA freelist_count").fetchone()[0]
+                if not freelist:
+                    break
+                self.conn.execute(f"PRAGMA incremental_vacuum({self.VACUUM_STEP_PAGES})").fetchall()
+                released = freelist - self.conn.execute("PRAGMA freelist_count").fetchone()[0]
+            if released <= 0:
+                break
+            freed_pages += released
+        return {"evicted": evicted, "freed_bytes": freed_pages * page_size}
+
+    def schedule_maintenance(self, max_bytes: int = DEFAULT_CACHE_MAX_MB * 1024 * 1024):
+        """Run run_maintenance() on a daemon thread unless a run is in progress."""
+        with self._lock:
+            if self._maintenance_thread is not None and self._maintenance_thread.is_alive():
+                return
+            def _run():
+                try:
+                    self.run_maintenance(max_bytes)
+                except Exception as e:
+                    logger.error(f"Analysis cache maintenance failed: {e}")
+            self._maintenance_thread = threading.Thread(
+                target=_run, name="analysis-cache-maintenance", daemon=True
+            )
+            self._maintenance_thread.start()
+
+    def disk_stats(self) -> Dict[str, int]:
+        """Entry count and on-disk footprint, for the Data Settings panel."""
+        with self._lock:
+            page_size, page_count, freelist = self._page_stats()
+            entries, shallowest, deepest = self.conn.execute(
+                "SELECT COUNT(*), MIN(depth), MAX(depth) FROM analysis"
+            ).fetchone()
+            return {
+                "entries": entries,
+                "table_bytes": self._table_bytes(),
+                "file_bytes": page_count * page_size,
+                "free_bytes": freelist * page_size,
+                "min_depth": shallowest or 0,
+                "max_depth": deepest or 0,
+                "base_layers": len(self.bases),
+            }
+
+    def stats(self) -> Dict[str, int]:
+        """Memory-tier counters plus lookups answered by SQLite (or a prefetch)."""
+        stats = self.memory.stats()
+        stats["db_hits"] = self.db_hits
+        return stats
 
     def clear_cache(self):
         """Clears all cached analysis."""
         try:
-            cursor = self.conn.cursor()
-            cursor.execute("DELETE FROM analysis")
-            self.conn.commit()
+            with self._lock:
+                self._pending.clear()
+                self._prefetched.clear()
+                self._prefetched_base.clear()
+                self._touches.clear()
+                self.memory.clear()
+                cursor = self.conn.cursor()
+                cursor.execute("DELETE FROM analysis")
+                self.conn.commit()
         except Exception as e:
             print(f"Failed to clear cache: {e}")
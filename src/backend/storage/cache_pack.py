@@ -0,0 +1,268 @@
+"""Portable analysis-cache packs.
+
+A pack carries cached engine results from one ``analysis_cache.db`` to
+another so machines analysing the same games do not each repeat the engine
+work.  Layout::
+
+    magic     b"CAPACK"
+    version   <H   pack format version
+    header    <I   length, then UTF-8 JSON (engine, limits, entry count)
+    body      zlib stream of records
+              <qHBBI  zobrist, multipv, depth, encoding, result length
+              bytes   stored result (binary record or JSON text)
+    checksum  SHA-256 of everything before it
+
+Importing merges the records into the local cache: the deeper result wins on
+conflicts and the usual multi-PV subsumption rules apply.
+
+Command line::
+
+    python -m src.backend.storage.cache_pack export shared.capack --min-depth 16
+    python -m src.backend.storage.cache_pack import shared.capack
+    python -m src.backend.storage.cache_pack info shared.capack
+"""
+import argparse
+import hashlib
+import json
+import os
+import struct
+import sys
+import time
+import zlib
+from typing import Any, Callable, Dict, Iterator, Optional, Tuple
+
+from src.utils.logger import logger
+
+PACK_MAGIC = b"CAPACK"
+PACK_FORMAT_VERSION = 1
+PACK_EXTENSION = ".capack"
+
+_PREFIX = struct.Struct("<6sHI")
+_RECORD = struct.Struct("<qHBBI")
+_ENCODING_BINARY, _ENCODING_JSON = 0, 1
+_DIGEST_SIZE = hashlib.sha256().digest_size
+_READ_BLOCK = 1024 * 1024
+# Records between progress callbacks.
+_PROGRESS_EVERY = 5000
+
+ProgressCallback = Optional[Callable[[int, int], None]]
+
+
+class PackError(ValueError):
+    """The file is not a readable cache pack (bad magic, version or checksum)."""
+
+
+def engine_identity(config_manager=None) -> str:
+    """Name recorded in packs for the configured engine (executable name)."""
+    if config_manager is None:
+        from src.utils.config import ConfigManager
+        config_manager = ConfigManager()
+    path = config_manager.get("engine_path", "") or ""
+    name = os.path.splitext(os.path.basename(path))[0]
+    return name.lower() or "unknown"
+
+
+def export_pack(cache, path: str, engine: str, min_depth: int = 0,
+                progress_callback: ProgressCallback = None) -> Dict[str, Any]:
+    """
+    Write the cache's entries with depth >= ``min_depth`` to ``path``.
+
+    The file is written next to the target and renamed into place, so a
+    failed export never leaves a truncated pack behind. Returns the header.
+    """
+    summary = cache.entry_summary(min_depth)
+    header = {
+        "engine": engine,
+        "created": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime()),
+        "schema_version": cache.SCHEMA_VERSION,
+        "min_depth": summary["min_depth"],
+        "max_depth": summary["max_depth"],
+        "max_multipv": summary["max_multipv"],
+        "entries": summary["entries"],
+    }
+    header_bytes = json.dumps(header, sort_keys=True).encode("utf-8")
+    digest = hashlib.sha256()
+    compressor = zlib.compressobj(9)
+    tmp_path = path + ".tmp"
+    written = 0
+    try:
+        with open(tmp_path, "wb") as f:
+            def _write(data: bytes):
+                if data:
+                    digest.update(data)
+                    f.write(data)
+
+            _write(_PREFIX.pack(PACK_MAGIC, PACK_FORMAT_VERSION, len(header_bytes)) + header_bytes)
+            for zobrist, multipv, depth, result in cache.iter_entries(min_depth):
+                if isinstance(result, str):
+                    encoding, payload = _ENCODING_JSON, result.encode("utf-8")
+                else:
+                    encoding, payload = _ENCODING_BINARY, bytes(result)
+                _write(compressor.compress(
+                    _RECORD.pack(zobrist, multipv, depth, encoding, len(payload)) + payload
+                ))
+                written += 1
+                if progress_callback and written % _PROGRESS_EVERY == 0:
+                    progress_callback(written, header["entries"])
+            _write(compressor.flush())
+            f.write(digest.digest())
+        os.replace(tmp_path, path)
+    except Exception:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+    if progress_callback:
+        progress_callback(written, header["entries"])
+    header["entries"] = written
+    logger.info(f"Exported {written} cache entries to {path}")
+    return header
+
+
+def _read_prefix(f) -> Tuple[Dict[str, Any], int]:
+    prefix = f.read(_PREFIX.size)
+    if len(prefix) < _PREFIX.size:
+        raise PackError("File is too short to be a cache pack")
+    magic, version, header_len = _PREFIX.unpack(prefix)
+    if magic != PACK_MAGIC:
+        raise PackError("Not an analysis cache pack")
+    if version != PACK_FORMAT_VERSION:
+        raise PackError(f"Unsupported cache pack version {version}")
+    try:
+        header = json.loads(f.read(header_len).decode("utf-8"))
+    except (UnicodeDecodeError, ValueError) as e:
+        raise PackError(f"Corrupt cache pack header: {e}") from None
+    return header, _PREFIX.size + header_len
+
+
+def read_pack_header(path: str) -> Dict[str, Any]:
+    """Header of a pack (engine, limits, entry count) without reading the body."""
+    with open(path, "rb") as f:
+        header, _ = _read_prefix(f)
+    return header
+
+
+def verify_pack(path: str):
+    """Raise PackError unless the trailing SHA-256 matches the file contents."""
+    size = os.path.getsize(path)
+    if size < _PREFIX.size + _DIGEST_SIZE:
+        raise PackError("File is too short to be a cache pack")
+    digest = hashlib.sha256()
+    remaining = size - _DIGEST_SIZE
+    with open(path, "rb") as f:
+        while remaining:
+            block = f.read(min(_READ_BLOCK, remaining))
+            if not block:
+                raise PackError("Cache pack is truncated")
+            digest.update(block)
+            remaining -= len(block)
+        if f.read(_DIGEST_SIZE) != digest.digest():
+            raise PackError("Cache pack checksum mismatch (file is corrupt or incomplete)")
+
+
+def iter_pack(path: str) -> Iterator[Tuple[int, int, int, Any]]:
+    """Yield (zobrist, multipv, depth, stored result) records; call verify_pack() first."""
+    body_end = os.path.getsize(path) - _DIGEST_SIZE
+    with open(path, "rb") as f:
+        _, offset = _read_prefix(f)
+        decompressor = zlib.decompressobj()
+        buffer = b""
+        remaining = body_end - offset
+        while remaining or buffer:
+            if remaining:
+                block = f.read(min(_READ_BLOCK, remaining))
+                if not block:
+                    raise PackError("Cache pack is truncated")
+                remaining -= len(block)
+                try:
+                    buffer += decompressor.decompress(block)
+                    if not remaining:
+                        buffer += decompressor.flush()
+                except zlib.error as e:
+                    raise PackError(f"Corrupt cache pack body: {e}") from None
+            pos = 0
+            while len(buffer) - pos >= _RECORD.size:
+                zobrist, multipv, depth, encoding, length = _RECORD.unpack_from(buffer, pos)
+                start = pos + _RECORD.size
+                if len(buffer) - start < length:
+                    break
+                payload = buffer[start:start + length]
+                pos = start + length
+                yield zobrist, multipv, depth, payload.decode("utf-8") if encoding == _ENCODING_JSON else payload
+            buffer = buffer[pos:]
+            if not remaining and buffer:
+                raise PackError("Cache pack ends inside a record")
+
+
+def import_pack(cache, path: str, expected_engine: Optional[str] = None,
+                progress_callback: ProgressCallback = None) -> Dict[str, Any]:
+    """
+    Verify ``path`` and merge its entries into ``cache``.
+
+    With ``expected_engine`` set, a pack made with a different engine is
+    rejected. Returns the pack header plus ``read`` and ``merged`` counts.
+    """
+    header = read_pack_header(path)
+    if expected_engine and header.get("engine") != expected_engine:
+        raise PackError(
+            f"Cache pack was made with engine '{header.get('engine')}', not '{expected_engine}'"
+        )
+    verify_pack(path)
+    total = header.get("entries", 0)
+    read = 0
+
+    def _records():
+        nonlocal read
+        for record in iter_pack(path):
+            read += 1
+            if progress_callback and read % _PROGRESS_EVERY == 0:
+                progress_callback(read, total)
+            yield record
+
+    merged = cache.merge_entries(_records())
+    if progress_callback:
+        progress_callback(read, total)
+    logger.info(f"Imported cache pack {path}: {merged} of {read} entries merged")
+    return {**header, "read": read, "merged": merged}
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(
+        prog="python -m src.backend.storage.cache_pack",
+        description="Export, import or inspect analysis cache packs."
+    )
+    parser.add_argument("--db", help="analysis_cache.db to use (default: the user data directory)")
+    sub = parser.add_subparsers(dest="command", required=True)
+    export_cmd = sub.add_parser("export", help="write cached results to a pack")
+    export_cmd.add_argument("path")
+    export_cmd.add_argument("--min-depth", type=int, default=0, help="skip entries shallower than this")
+    export_cmd.add_argument("--engine", help="engine name recorded in the pack (default: configured engine)")
+    import_cmd = sub.add_parser("import", help="merge a pack into the cache")
+    import_cmd.add_argument("path")
+    import_cmd.add_argument("--force", action="store_true", help="import even if the engine differs")
+    info_cmd = sub.add_parser("info", help="show a pack's header and verify its checksum")
+    info_cmd.add_argument("path")
+    args = parser.parse_args(argv)
+
+    try:
+        if args.command == "info":
+            header = read_pack_header(args.path)
+            verify_pack(args.path)
+            print(json.dumps(header, indent=2, sort_keys=True))
+            return 0
+
+        from .cache import AnalysisCache
+        cache = AnalysisCache(args.db)
+        if args.command == "export":
+            header = export_pack(cache, args.path, args.engine or engine_identity(), args.min_depth)
+            print(f"Exported {header['entries']} entries to {args.path}")
+        else:
+            result = import_pack(cache, args.path, None if args.force else engine_identity())
+            print(f"Merged {result['merged']} of {result['read']} entries from {args.path}")
+        return 0
+    except (OSError, PackError) as e:
+        print(f"error: {e}", file=sys.stderr)
+        return 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,212 @@
+"""Compact integer encodings for chess moves and positions.
+
+A move is packed into 16 bits as ``from | to << 6 | promotion << 12`` where
+``promotion`` is the python-chess piece type (0 = none).  The null move
+(``0000``) packs to 0.  Sequences of moves are stored as ``array('H')`` so
+a PV or a whole game costs two bytes per ply instead of one Python string
+object per move.
+
+Positions are keyed by their 64-bit Polyglot Zobrist hash, folded into the
+signed range so it fits an SQLite ``INTEGER`` column.
+
+Cached engine results (a list of ``{"cp"|"mate", "pv", "depth"}`` lines) are
+stored as a small binary record::
+
+    header  <BBB   version, line count, entry depth
+    line    <BBiH  score kind, line depth, score, PV length
+            <H*n   PV move codes
+"""
+import struct
+import sys
+from array import array
+from typing import Any, Dict, Iterable, List, Union
+
+import chess
+import chess.polyglot
+
+_SQUARE_INDEX = {name: index for index, name in enumerate(chess.SQUARE_NAMES)}
+_PROMOTION_INDEX = {symbol: chess.PIECE_SYMBOLS.index(symbol) for symbol in "nbrq"}
+
+
+def encode_move(move: chess.Move) -> int:
+    """Pack a python-chess move into a 16-bit integer."""
+    if move.drop:
+        raise ValueError(f"Drop moves cannot be packed: {move.uci()}")
+    return move.from_square | (move.to_square << 6) | ((move.promotion or 0) << 12)
+
+
+def decode_move(code: int) -> chess.Move:
+    """Inverse of :func:`encode_move`."""
+    promotion = (code >> 12) & 0x7
+    return chess.Move(code & 0x3F, (code >> 6) & 0x3F, promotion or None)
+
+
+def encode_uci(uci: str) -> int:
+    """Pack a UCI string without building a ``chess.Move`` (hot path)."""
+    if uci == "0000":
+        return 0
+    try:
+        code = _SQUARE_INDEX[uci[0:2]] | (_SQUARE_INDEX[uci[2:4]] << 6)
+        if len(uci) == 5:
+            code |= _PROMOTION_INDEX[uci[4]] << 12
+        elif len(uci) != 4:
+            raise KeyError(uci)
+    except KeyError:
+        raise ValueError(f"Invalid UCI move: {uci!r}") from None
+    return code
+
+
+def decode_uci(code: int) -> str:
+    if not code:
+        return "0000"
+    uci = chess.SQUARE_NAMES[code & 0x3F] + chess.SQUARE_NAMES[(code >> 6) & 0x3F]
+    promotion = (code >> 12) & 0x7
+    return uci + chess.PIECE_SYMBOLS[promotion] if promotion else uci
+
+
+def pack_moves(moves: Iterable) -> array:
+    """Pack UCI strings or ``chess.Move`` objects into an ``array('H')``."""
+    packed = array("H")
+    for move in moves:
+        if isinstance(move, str):
+            packed.append(encode_uci(move))
+        else:
+            packed.append(encode_move(move))
+    return packed
+
+
+# Code -> UCI string, filled as codes are seen (at most ~20k distinct moves).
+_UCI_CACHE: Dict[int, str] = {}
+
+
+def unpack_moves(codes: Iterable[int]) -> List[str]:
+    """Return the UCI strings for a packed move sequence."""
+    cache = _UCI_CACHE
+    try:
+        return [cache[code] for code in codes]
+    except KeyError:
+        for code in codes:
+            if code not in cache:
+                cache[code] = decode_uci(code)
+        return [cache[code] for code in codes]
+
+def zobrist_key(position: Union[str, chess.Board]) -> int:
+    """Signed 64-bit Zobrist hash of a FEN or board (move clocks are ignored)."""
+    if isinstance(position, str):
+        # Chess960 parsing keeps Shredder/X-FEN castling rights intact and
+        # reads standard castling rights the same way.
+        position = chess.Board(position, chess960=True)
+    key = chess.polyglot.zobrist_hash(position)
+    return key - (1 << 64) if key >= (1 << 63) else key
+
+
+_HASHER = chess.polyglot.ZobristHasher(chess.polyglot.POLYGLOT_RANDOM_ARRAY)
+
+
+def _piece_boards(board: chess.Board) -> List[int]:
+    # In Polyglot piece-index order: (type - 1) * 2 + (0 black, 1 white)
+    black, white = board.occupied_co
+    return [pieces & color
+            for pieces in (board.pawns, board.knights, board.bishops, board.rooks, board.queens, board.kings)
+            for color in (black, white)]
+
+
+def zobrist_keys(board: chess.Board, moves: Iterable[chess.Move]) -> List[int]:
+    """
+    :func:`zobrist_key` of ``board`` and of the position after each of
+    ``moves``.  The piece part of the hash is updated from the squares each
+    move changes instead of rehashing the whole board per position.
+    """
+    board = board.copy(stack=False)
+    array = _HASHER.array
+    pieces = _HASHER.hash_board(board)
+    boards = _piece_boards(board)
+    keys = []
+    for move in moves:
+        key = pieces ^ _HASHER.hash_castling(board) ^ _HASHER.hash_ep_square(board) ^ _HASHER.hash_turn(board)
+        keys.append(key - (1 << 64) if key >= (1 << 63) else key)
+        board.push(move)
+        after = _piece_boards(board)
+        for index, (old, new) in enumerate(zip(boards, after)):
+            if old != new:
+                for square in chess.scan_reversed(old ^ new):
+                    pieces ^= array[64 * index + square]
+        boards = after
+    key = pieces ^ _HASHER.hash_castling(board) ^ _HASHER.hash_ep_square(board) ^ _HASHER.hash_turn(board)
+    keys.append(key - (1 << 64) if key >= (1 << 63) else key)
+    return keys
+
+
+RESULT_FORMAT_VERSION = 1
+_RESULT_HEADER = struct.Struct("<BBB")
+_RESULT_LINE = struct.Struct("<BBiH")
+_SCORE_NONE, _SCORE_CP, _SCORE_MATE = 0, 1, 2
+_RESULT_KEYS = frozenset(("cp", "mate", "pv", "depth"))
+_BIG_ENDIAN = sys.byteorder == "big"
+
+
+def pack_result(lines: List[Dict[str, Any]], depth: int = 0) -> bytes:
+    """
+    Encode a cached engine result as a binary record.
+
+    The encoding is lossless: anything the fixed layout cannot reproduce
+    exactly (unknown or missing keys, None values, both cp and mate, depths
+    outside 0-255) raises ValueError and callers fall back to JSON.
+    """
+    if not 0 <= depth <= 255 or len(lines) > 255:
+        raise ValueError("Result does not fit the binary record layout")
+    parts = [_RESULT_HEADER.pack(RESULT_FORMAT_VERSION, len(lines), depth)]
+    for line in lines:
+        if not _RESULT_KEYS.issuperset(line) or "pv" not in line or "depth" not in line:
+            raise ValueError(f"Unsupported result keys: {sorted(line)}")
+        if "cp" in line and "mate" in line:
+            raise ValueError("Result line has both cp and mate")
+        if "mate" in line:
+            kind, score = _SCORE_MATE, line["mate"]
+        elif "cp" in line:
+            kind, score = _SCORE_CP, line["cp"]
+        else:
+            kind, score = _SCORE_NONE, 0
+        line_depth = line["depth"]
+        if type(score) is not int or type(line_depth) is not int or not 0 <= line_depth <= 255:
+            raise ValueError(f"Unsupported score/depth: {score!r}, {line_depth!r}")
+        pv = pack_moves(line["pv"])
+        if _BIG_ENDIAN:
+            pv.byteswap()
+        try:
+            parts.append(_RESULT_LINE.pack(kind, line_depth, score, len(pv)))
+        except struct.error as e:
+            raise ValueError(str(e)) from None
+        parts.append(pv.tobytes())
+    return b"".join(parts)
+
+
+def unpack_result(blob: bytes) -> List[Dict[str, Any]]:
+    """Inverse of :func:`pack_result`."""
+    version, count, _ = _RESULT_HEADER.unpack_from(blob, 0)
+    if version != RESULT_FORMAT_VERSION:
+        raise ValueError(f"Unknown result format version {version}")
+    offset = _RESULT_HEADER.size
+    lines = []
+    for _ in range(count):
+        kind, line_depth, score, length = _RESULT_LINE.unpack_from(blob, offset)
+        offset += _RESULT_LINE.size
+        pv = array("H")
+        pv.frombytes(blob[offset:offset + 2 * length])
+        offset += 2 * length
+        if _BIG_ENDIAN:
+            pv.byteswap()
+        line = {}
+        if kind == _SCORE_CP:
+            line["cp"] = score
+        elif kind == _SCORE_MATE:
+            line["mate"] = score
+        line["pv"] = unpack_moves(pv)
+        line["depth"] = line_depth
+        lines.append(line)
+    return lines
+
+
+def result_depth(blob: bytes) -> int:
+    """Entry depth stored in a binary record header."""
+    return blob[2]
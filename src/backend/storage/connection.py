@@ -0,0 +1,105 @@
+"""Shared SQLite connections for the storage layer.
+
+Opening a connection per call re-parses the schema, re-prepares every
+statement and throws away the page cache.  ``ConnectionManager`` keeps one
+long-lived connection per thread and database file instead, tuned with the
+pragmas below; Python's sqlite3 module caches the prepared statements of
+each connection, so repeated queries skip the SQL compiler.
+"""
+import os
+import sqlite3
+import threading
+from contextlib import contextmanager
+from typing import Dict, Iterator, List
+
+from src.constants import SQLITE_BUSY_TIMEOUT, SQLITE_CACHE_SIZE_KB, SQLITE_MMAP_SIZE
+
+# Prepared statements kept per connection (sqlite3 default: 128).
+CACHED_STATEMENTS = 256
+
+
+def apply_pragmas(conn: sqlite3.Connection):
+    """
+    Per-connection tuning shared by every storage class.
+
+    WAL with synchronous=NORMAL only syncs at checkpoints (a power loss can
+    drop the last commits but never corrupts the file); mmap and a larger
+    page cache serve reads without read() system calls.
+    """
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.execute("PRAGMA synchronous=NORMAL")
+    conn.execute(f"PRAGMA mmap_size={int(SQLITE_MMAP_SIZE)}")
+    conn.execute(f"PRAGMA cache_size=-{int(SQLITE_CACHE_SIZE_KB)}")
+    conn.execute("PRAGMA temp_store=MEMORY")
+    conn.execute(f"PRAGMA busy_timeout={int(SQLITE_BUSY_TIMEOUT * 1000)}")
+
+
+class ConnectionManager:
+    """One tuned connection per thread for a single database file."""
+
+    def __init__(self, db_path: str):
+        self.db_path = db_path
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        # Every connection opened, so close_all() can reach other threads'.
+        self._connections: List[sqlite3.Connection] = []
+
+    def connection(self) -> sqlite3.Connection:
+        """This thread's connection, opened on first use."""
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            # check_same_thread is off only so close_all() may close it;
+            # the connection is never handed to another thread.
+            conn = sqlite3.connect(
+                self.db_path, timeout=SQLITE_BUSY_TIMEOUT,
+                cached_statements=CACHED_STATEMENTS, check_same_thread=False,
+            )
+            apply_pragmas(conn)
+            self._local.conn = conn
+            with self._lock:
+                self._connections.append(conn)
+        return conn
+
+    @contextmanager
+    def transaction(self) -> Iterator[sqlite3.Connection]:
+        """
+        Write transaction on this thread's connection.
+
+        Starts with BEGIN IMMEDIATE so the write lock is taken up front:
+        a deferred transaction that reads first and then writes can fail
+        with SQLITE_BUSY under concurrent writers without waiting.
+        """
+        conn = self.connection()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            yield conn
+        except BaseException:
+            conn.rollback()
+            raise
+        else:
+            conn.commit()
+
+    def close_all(self):
+        """Close every thread's connection (they reopen on next use)."""
+        with self._lock:
+            connections, self._connections = self._connections, []
+            self._local = threading.local()
+        for conn in connections:
+            try:
+                conn.close()
+            except sqlite3.Error:
+                pass
+
+
+_MANAGERS: Dict[str, ConnectionManager] = {}
+_MANAGERS_LOCK = threading.Lock()
+
+
+def connection_manager(db_path: str) -> ConnectionManager:
+    """The process-wide ConnectionManager for ``db_path``."""
+    key = os.path.abspath(db_path)
+    with _MANAGERS_LOCK:
+        manager = _MANAGERS.get(key)
+        if manager is None:
+            manager = _MANAGERS[key] = ConnectionManager(db_path)
+        return manager
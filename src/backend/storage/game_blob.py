@@ -0,0 +1,88 @@
+"""Compact per-game storage of analysed moves for the game history.
+
+``pack_game_moves`` turns the analysed ``MoveAnalysis`` list of one game into
+a zlib-compressed JSON document; ``unpack_game_moves`` rebuilds the list
+without touching the PGN parser or the engine.  Layout of the document::
+
+    v        format version
+    fields   names of the scalar MoveAnalysis fields, in row order
+    chess960 variant flag used to render PV SAN
+    replay   [starting FEN, [move codes]] shared by all moves, or null
+    moves    one row per move: scalar values..., pv codes,
+             multi-PV lines as [pv codes, cp, mate, depth], fen_before
+
+Field names are stored with the data, so moves written before a field was
+added to ``MoveAnalysis`` load with that field's default, and fields that no
+longer exist are ignored.
+"""
+import json
+import zlib
+from array import array
+from typing import Any, Dict, List, Optional
+
+from .compact import pack_moves, unpack_moves
+from .models import GameReplay, MoveAnalysis, PVLine
+
+GAME_BLOB_VERSION = 1
+
+# Stored separately (packed, shared or rebuilt) rather than as plain values.
+_SPECIAL_FIELDS = frozenset(("fen_before", "pv", "multi_pvs", "replay"))
+_SCALAR_FIELDS = tuple(name for name in MoveAnalysis.__slots__ if name not in _SPECIAL_FIELDS)
+
+
+def _line_row(line) -> list:
+    return [list(pack_moves(line.get("pv") or ())), line.get("cp"), line.get("mate"), line.get("depth")]
+
+
+def pack_game_moves(moves: List[MoveAnalysis]) -> bytes:
+    """Encode a game's moves, including all analysis fields."""
+    replay: Optional[GameReplay] = moves[0].replay if moves else None
+    if replay is not None and any(move.replay is not replay for move in moves):
+        replay = None
+    rows = []
+    for move in moves:
+        row = [getattr(move, name) for name in _SCALAR_FIELDS]
+        row.append(list(pack_moves(move.pv)))
+        row.append([_line_row(line) for line in move.multi_pvs])
+        row.append(None if replay is not None else move.fen_before)
+        rows.append(row)
+    document = {
+        "v": GAME_BLOB_VERSION,
+        "fields": list(_SCALAR_FIELDS),
+        "chess960": bool(replay.chess960) if replay is not None else False,
+        "replay": [replay.starting_fen, list(replay.moves)] if replay is not None else None,
+        "moves": rows,
+    }
+    return zlib.compress(json.dumps(document, separators=(",", ":"), default=str).encode("utf-8"))
+
+
+def unpack_game_moves(data: bytes) -> List[MoveAnalysis]:
+    """Inverse of :func:`pack_game_moves`; raises ValueError on unreadable data."""
+    try:
+        document = json.loads(zlib.decompress(data).decode("utf-8"))
+    except (zlib.error, UnicodeDecodeError) as e:
+        raise ValueError(f"Corrupt game analysis blob: {e}") from None
+    if document.get("v") != GAME_BLOB_VERSION:
+        raise ValueError(f"Unsupported game analysis blob version {document.get('v')}")
+
+    chess960 = bool(document.get("chess960"))
+    replay = None
+    if document.get("replay"):
+        starting_fen, codes = document["replay"]
+        replay = GameReplay(starting_fen, chess960=chess960)
+        replay.moves = array("H", codes)
+
+    known = set(_SCALAR_FIELDS)
+    fields = [(index, name) for index, name in enumerate(document["fields"]) if name in known]
+    width = len(document["fields"])
+    moves = []
+    for row in document["moves"]:
+        values: Dict[str, Any] = {name: row[index] for index, name in fields}
+        pv_codes, lines, fen_before = row[width:width + 3]
+        move = MoveAnalysis(fen_before=fen_before, pv=unpack_moves(pv_codes), replay=replay, **values)
+        move.multi_pvs = [
+            PVLine(unpack_moves(codes), cp=cp, mate=mate, depth=depth, move=move, chess960=chess960)
+            for codes, cp, mate, depth in lines
+        ]
+        moves.append(move)
+    return moves
@@ -1,12 +1,161 @@
 import sqlite3
+import csv
+import itertools
 import json
+import os
+import re
 import uuid
 import time
-from typing import List, Optional, Dict, Any
+from typing import List, Optional, Dict, Any, Callable, Iterable, Iterator, Tuple
 from .models import GameAnalysis, GameMetadata, MoveAnalysis
+from .compact import decode_uci, zobrist_key
+from .connection import connection_manager
+from .game_blob import GAME_BLOB_VERSION, pack_game_moves, unpack_game_moves
+from .pgn_blob import PGN_COLUMNS, PGN_FORMAT, PGN_JOIN, pack_pgn, row_pgn, unpack_pgn
+from . import player_stats, position_index
 from src.utils.logger import logger
+from src.constants import HISTORY_PAGE_SIZE
+
+# Keyset pagination cursor: the sort key of the last row of a page,
+# e.g. (timestamp, id) for the date orders.
+PageCursor = Tuple[Any, ...]
+
+# History CSV backup columns (export header; import reads them by name)
+CSV_FIELDS = ["id", "white", "black", "result", "date", "event", "white_elo", "black_elo",
+              "time_control", "eco", "termination", "opening", "source", "pgn", "summary_json",
+              "timestamp", "starting_fen", "chess960", "ply_count"]
+# Rows per executemany batch on import, and between progress callbacks
+_CSV_BATCH = 1000
+
+ProgressCallback = Optional[Callable[[int, int], None]]
+# Games per transaction when indexing positions of existing games
+_POSITION_BATCH = 200
+# Version of the data derived from stored games (player keys, move counts
+# and user columns); run_backfills() brings older files up to it.
+HISTORY_DATA_VERSION = 1
+# Games per transaction in run_backfills()
+_BACKFILL_BATCH = 500
+# history_meta keys holding the last games rowid counted into player_stats /
+# indexed in games_fts while they are built from existing games
+_STATS_MARK = "player_stats_rowid"
+_SEARCH_MARK = "search_index_rowid"
+
+# get_games_page() orders: name -> (key columns, SQL direction)
+HISTORY_ORDERS = {
+    "newest": (("timestamp", "id"), "DESC"),
+    "oldest": (("timestamp", "id"), "ASC"),
+    "most_moves": (("ply_count", "timestamp", "id"), "DESC"),
+    "fewest_moves": (("ply_count", "timestamp", "id"), "ASC"),
+}
+
+
+# Metadata columns indexed by the games_fts full-text table
+SEARCH_COLUMNS = ("white", "black", "event", "opening", "eco", "date")
+
+
+def search_match_query(text: str) -> Optional[str]:
+    """
+    FTS5 query for free text typed by the user: every word must match the
+    start of a token (``"carl"*`` finds Carlsen). None if there are no words.
+    """
+    terms = re.findall(r"\w+", text or "")
+    return " ".join(f'"{term}"*' for term in terms) or None
+
+
+def player_key(name: Optional[str]) -> str:
+    """Normalized player name stored in the indexed white_key/black_key columns."""
+    return (name or "").strip().lower()
+
+
+def _page_clauses(order: str, after, outcome: Optional[str], source: Optional[str],
+                  keyed: bool = False, table: str = "") -> Tuple[List[str], List[Any], str]:
+    """
+    WHERE conditions, their parameters and the ORDER BY of one keyset page
+    in HISTORY_ORDERS ``order`` after cursor ``after``, keeping ``outcome``
+    and ``source``. With ``keyed`` the caller has already matched wins and
+    losses on the players' own columns. ``table`` qualifies the columns.
+    """
+    key_columns, direction = HISTORY_ORDERS[order]
+    prefix = f"{table}." if table else ""
+    clauses, params = [], []
+    if outcome == "draw":
+        clauses.append(f"{prefix}result = '1/2-1/2'")
+    elif outcome in ("win", "loss") and not keyed:
+        clauses.append(f"{prefix}user_outcome = ?")
+        params.append(outcome)
+    if source:
+        clauses.append(f"{prefix}source = ?")
+        params.append(source)
+    columns = [prefix + column for column in key_columns]
+    if after is not None:
+        marks = ", ".join("?" for _ in columns)
+        clauses.append(f"({', '.join(columns)}) {'<' if direction == 'DESC' else '>'} ({marks})")
+        params += list(after)
+    return clauses, params, ", ".join(f"{column} {direction}" for column in columns)
+
+
+# A whole whitespace-delimited SAN move (annotation glyphs allowed)
+_SAN_TOKEN = re.compile(
+    r"(?<!\S)(?:[KQRBN]?[a-h]?[1-8]?x?[a-h][1-8](?:=?[QRBN])?|[O0]-[O0](?:-[O0])?|--)[+#]?[!?]*(?!\S)"
+)
+
+
+def pgn_ply_count(pgn: Optional[str]) -> int:
+    """
+    Half-moves in the mainline of a PGN's movetext, counted from the text
+    (headers, comments, variations, NAGs and move numbers skipped) rather
+    than by replaying the game.
+    """
+    if not pgn:
+        return 0
+    text = re.sub(r"^\s*\[[^\]]*\]\s*$", " ", pgn, flags=re.MULTILINE)
+    text = re.sub(r"\{[^}]*\}|;[^\n]*", " ", text)
+    # Variations nest: strip innermost parentheses until none are left
+    while True:
+        stripped = re.sub(r"\([^()]*\)", " ", text)
+        if stripped == text:
+            break
+        text = stripped
+    text = re.sub(r"\$\d+|1-0|0-1|1/2-1/2|\d+\.+", " ", text)
+    return len(_SAN_TOKEN.findall(text))
+
+
+def move_count_for(ply_count: int) -> int:
+    """Full moves shown for a game of ``ply_count`` half-moves."""
+    return (ply_count + 1) // 2
 
 class GameHistoryManager:
+    # Fixed SQL text, so each thread's connection prepares a statement once
+    # and reuses it from the sqlite3 statement cache.
+    INSERT_GAME_SQL = """
+        INSERT OR REPLACE INTO games (
+            id, white, black, result, date, event, pgn, summary_json, timestamp,
+            white_elo, black_elo, time_control, eco, termination, opening, starting_fen, source,
+            chess960, white_key, black_key, ply_count, move_count
+        )
+        VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+    """
+    # user_color/user_outcome of games from the perspective of the players
+    # in history_users (the configured accounts); append a WHERE clause to
+    # limit it to some games.
+    USER_COLUMNS_SQL = """
+        UPDATE games SET
+            user_color = CASE
+                WHEN white_key IN (SELECT player FROM history_users) THEN 'white'
+                WHEN black_key IN (SELECT player FROM history_users) THEN 'black'
+            END,
+            user_outcome = CASE
+                WHEN white_key NOT IN (SELECT player FROM history_users)
+                     AND black_key NOT IN (SELECT player FROM history_users) THEN NULL
+                WHEN result = '1/2-1/2' THEN 'draw'
+                WHEN result = CASE WHEN white_key IN (SELECT player FROM history_users)
+                                   THEN '1-0' ELSE '0-1' END THEN 'win'
+                WHEN result IN ('1-0', '0-1') THEN 'loss'
+            END
+    """
+    INSERT_MOVES_SQL = "INSERT OR REPLACE INTO game_moves (game_id, format, data) VALUES (?, ?, ?)"
+    INSERT_PGN_SQL = "INSERT OR REPLACE INTO game_pgn (game_id, format, data) VALUES (?, ?, ?)"
+
     def __init__(self, db_path: Optional[str] = None):
         if db_path is None:
             import os
@@ -14,11 +163,31 @@ class GameHistoryManager:
             self.db_path = os.path.join(get_user_data_dir(), "analysis_cache.db")
         else:
             self.db_path = db_path
+        # Per-thread connections, shared by every manager on this file.
+        self._db = connection_manager(self.db_path)
+        # Set by _init_db once the games_fts index exists (SQLite built with FTS5).
+        self.has_search_index = False
         self._init_db()
 
+    def _fetch_rows(self, sql: str, params=()) -> List[Dict[str, Any]]:
+        cursor = self._db.connection().cursor()
+        cursor.row_factory = sqlite3.Row
+        return [dict(row) for row in cursor.execute(sql, params)]
+
     def _init_db(self):
         try:
-            conn = sqlite3.connect(self.db_path)
+            self._create_schema()
+        except Exception as e:
+            logger.error(f"Failed to initialize game history DB: {e}")
+            return
+        try:
+            self._create_search_index()
+            self.has_search_index = True
+        except sqlite3.Error as e:
+            logger.warning(f"Full-text history search unavailable, using plain matching: {e}")
+
+    def _create_schema(self):
+        with self._db.transaction() as conn:
             cursor = conn.cursor()
             
             # 1. Create table with basic schema if not exists
@@ -35,6 +204,16 @@ class GameHistoryManager:
                     timestamp REAL
                 )
             """)
+            # The PGN of each game, compressed (see pgn_blob.py); games.pgn
+            # only holds text saved before this table existed. Kept out of
+            # `games` so listing history never reads it.
+            cursor.execute("""
+                CREATE TABLE IF NOT EXISTS game_pgn (
+                    game_id TEXT PRIMARY KEY,
+                    format INTEGER NOT NULL,
+                    data BLOB NOT NULL
+                )
+            """)
             
             # 2. Schema Migration: Ensure new columns exist
             # List of (column_name, column_type)
@@ -47,7 +226,13 @@ class GameHistoryManager:
                 ("opening", "TEXT"),
                 ("starting_fen", "TEXT"),
                 ("source", "TEXT"),
-                ("chess960", "INTEGER")
+                ("chess960", "INTEGER"),
+                ("white_key", "TEXT"),
+                ("black_key", "TEXT"),
+                ("ply_count", "INTEGER"),
+                ("move_count", "INTEGER"),
+                ("user_color", "TEXT"),
+                ("user_outcome", "TEXT")
             ]
             
             # Check existing columns
@@ -61,54 +246,189 @@ class GameHistoryManager:
                         cursor.execute(f"ALTER TABLE games ADD COLUMN {col_name} {col_type}")
                     except Exception as e:
                         logger.error(f"Failed to add column {col_name}: {e}")
-            
-            conn.commit()
-            conn.close()
-        except Exception as e:
-            logger.error(f"Failed to initialize game history DB: {e}")
+
+            # Data version and backfill progress (see run_backfills). Player
+            # keys and move counts of rows saved before those columns existed
+            # are filled in there, not here, so opening the file stays quick.
+            cursor.execute(
+                "CREATE TABLE IF NOT EXISTS history_meta (key TEXT PRIMARY KEY, value INTEGER NOT NULL) WITHOUT ROWID"
+            )
+            has_games = cursor.execute("SELECT 1 FROM games LIMIT 1").fetchone() is not None
+            if not has_games:
+                cursor.execute(
+                    "INSERT OR IGNORE INTO history_meta (key, value) VALUES ('data_version', ?)",
+                    (HISTORY_DATA_VERSION,)
+                )
+
+            # The user's accounts, for the user_color/user_outcome columns
+            # (see set_history_users)
+            cursor.execute("CREATE TABLE IF NOT EXISTS history_users (player TEXT PRIMARY KEY) WITHOUT ROWID")
+
+            # Newest-first listing, per-player lookups, the user's results
+            # and move-count sorting, all in keyset order
+            cursor.execute("CREATE INDEX IF NOT EXISTS idx_games_timestamp ON games(timestamp, id)")
+            cursor.execute("CREATE INDEX IF NOT EXISTS idx_games_white_key ON games(white_key, timestamp, id)")
+            cursor.execute("CREATE INDEX IF NOT EXISTS idx_games_black_key ON games(black_key, timestamp, id)")
+            cursor.execute("CREATE INDEX IF NOT EXISTS idx_games_user_outcome ON games(user_outcome, timestamp, id)")
+            cursor.execute("CREATE INDEX IF NOT EXISTS idx_games_ply_count ON games(ply_count, timestamp, id)")
+
+            # 3. Per-move analysis, one compressed blob per game (see
+            # game_blob.py), kept out of `games` so listing history never
+            # reads it.
+            cursor.execute("""
+                CREATE TABLE IF NOT EXISTS game_moves (
+                    game_id TEXT PRIMARY KEY,
+                    format INTEGER NOT NULL,
+                    data BLOB NOT NULL
+                )
+            """)
+
+            # 4. Per-player aggregates for the metrics dashboard (see
+            # player_stats.py); existing games are counted by run_backfills().
+            has_stats = cursor.execute(
+                "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'player_stats'"
+            ).fetchone()
+            player_stats.create_tables(cursor)
+            if not has_stats and has_games:
+                cursor.execute("INSERT OR REPLACE INTO history_meta (key, value) VALUES (?, 0)", (_STATS_MARK,))
+
+            # 5. Positions reached by each game (see position_index.py);
+            # existing games are indexed by index_positions().
+            position_index.create_tables(cursor)
+
+    def _create_search_index(self):
+        """
+        External-content FTS5 table over the searchable metadata. It stores
+        only the index (rows are read from ``games``); save_game, delete_game
+        and clear_history keep it in step.
+        """
+        columns = ", ".join(SEARCH_COLUMNS)
+        with self._db.transaction() as conn:
+            exists = conn.execute(
+                "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'games_fts'"
+            ).fetchone()
+            if exists:
+                return
+            conn.execute(f"""
+                CREATE VIRTUAL TABLE games_fts USING fts5(
+                    {columns},
+                    content='games', content_rowid='rowid',
+                    tokenize='unicode61 remove_diacritics 2', prefix='2 3'
+                )
+            """)
+            # Games saved before the table existed are indexed by run_backfills()
+            if conn.execute("SELECT 1 FROM games LIMIT 1").fetchone():
+                conn.execute("INSERT OR REPLACE INTO history_meta (key, value) VALUES (?, 0)", (_SEARCH_MARK,))
+            logger.info("Migrating DB: Created history search index")
+
+    @staticmethod
+    def _mark(conn: sqlite3.Connection, key: str) -> Optional[int]:
+        """A history_meta value (e.g. a backfill's progress), None if unset."""
+        row = conn.execute("SELECT value FROM history_meta WHERE key = ?", (key,)).fetchone()
+        return row[0] if row else None
+
+    def _built(self, conn: sqlite3.Connection, key: str, game_id: str) -> bool:
+        """
+        Whether the stored game ``game_id`` is already covered by the table
+        that run_backfills() is building under ``key`` (always, once built):
+        saves and deletes update only what the backfill has reached.
+        """
+        mark = self._mark(conn, key)
+        if mark is None:
+            return True
+        row = conn.execute("SELECT rowid FROM games WHERE id = ?", (game_id,)).fetchone()
+        return row is not None and row[0] <= mark
+
+    def _unindex_game(self, conn: sqlite3.Connection, game_id: str):
+        """Remove a stored game from games_fts (call before it is replaced or deleted)."""
+        if not self.has_search_index or not self._built(conn, _SEARCH_MARK, game_id):
+            return
+        columns = ", ".join(SEARCH_COLUMNS)
+        row = conn.execute(f"SELECT rowid, {columns} FROM games WHERE id = ?", (game_id,)).fetchone()
+        if row:
+            placeholders = ", ".join(["?"] * len(row))
+            conn.execute(
+                f"INSERT INTO games_fts(games_fts, rowid, {columns}) VALUES ('delete', {placeholders})", row
+            )
+
+    def _index_game(self, conn: sqlite3.Connection, game_id: str):
+        if not self.has_search_index or not self._built(conn, _SEARCH_MARK, game_id):
+            return
+        columns = ", ".join(SEARCH_COLUMNS)
+        conn.execute(
+            f"INSERT INTO games_fts(rowid, {columns}) SELECT rowid, {columns} FROM games WHERE id = ?",
+            (game_id,)
+        )
 
     def save_game(self, game_analysis: GameAnalysis, pgn_content: str):
         """Saves a completed game analysis to the history."""
         try:
-            conn = sqlite3.connect(self.db_path)
-            cursor = conn.cursor()
-            
             # Generate ID if not present (though GameAnalysis usually has one)
             game_id = game_analysis.game_id or str(uuid.uuid4())
             
             # Serialize summary
             summary_json = json.dumps(game_analysis.summary)
-            
-            cursor.execute("""
-                INSERT OR REPLACE INTO games (
-                    id, white, black, result, date, event, pgn, summary_json, timestamp,
-                    white_elo, black_elo, time_control, eco, termination, opening, starting_fen, source,
-                    chess960
+            # Analysed moves, so reopening the game needs no reparse or re-analysis
+            moves_blob = pack_game_moves(game_analysis.moves) if game_analysis.moves else None
+            # PGN text goes to game_pgn, compressed; games.pgn stays NULL
+            pgn_blob = pack_pgn(pgn_content) if pgn_content else None
+            # Derived columns, so history sorts and filters never re-read the PGN
+            plies = len(game_analysis.moves) if game_analysis.moves else pgn_ply_count(pgn_content)
+            timestamp = time.time()
+            try:
+                positions = position_index.game_rows(
+                    game_id, timestamp, game_analysis.metadata.result, pgn_content,
+                    game_analysis.metadata.starting_fen, game_analysis.metadata.chess960,
+                    game_analysis.moves[0].replay if game_analysis.moves else None
                 )
-                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-            """, (
-                game_id,
-                game_analysis.metadata.white,
-                game_analysis.metadata.black,
-                game_analysis.metadata.result,
-                game_analysis.metadata.date,
-                game_analysis.metadata.event,
-                pgn_content,
-                summary_json,
-                time.time(),
-                game_analysis.metadata.white_elo,
-                game_analysis.metadata.black_elo,
-                game_analysis.metadata.time_control,
-                game_analysis.metadata.eco,
-                game_analysis.metadata.termination,
-                game_analysis.metadata.opening,
-                game_analysis.metadata.starting_fen,
-                game_analysis.metadata.source,
-                int(game_analysis.metadata.chess960)
-            ))
+            except Exception as e:
+                # Left to index_positions(); the game itself is still saved
+                logger.warning(f"Could not index positions of game {game_id}: {e}")
+                positions = []
             
-            conn.commit()
-            conn.close()
+            with self._db.transaction() as conn:
+                self._unindex_game(conn, game_id)
+                if self._built(conn, _STATS_MARK, game_id):
+                    player_stats.remove_game(conn, game_id)
+                position_index.remove_game(conn, game_id)
+                conn.execute(self.INSERT_GAME_SQL, (
+                    game_id,
+                    game_analysis.metadata.white,
+                    game_analysis.metadata.black,
+                    game_analysis.metadata.result,
+                    game_analysis.metadata.date,
+                    game_analysis.metadata.event,
+                    None,
+                    summary_json,
+                    timestamp,
+                    game_analysis.metadata.white_elo,
+                    game_analysis.metadata.black_elo,
+                    game_analysis.metadata.time_control,
+                    game_analysis.metadata.eco,
+                    game_analysis.metadata.termination,
+                    game_analysis.metadata.opening,
+                    game_analysis.metadata.starting_fen,
+                    game_analysis.metadata.source,
+                    int(game_analysis.metadata.chess960),
+                    player_key(game_analysis.metadata.white),
+                    player_key(game_analysis.metadata.black),
+                    plies,
+                    move_count_for(plies)
+                ))
+                conn.execute(self.USER_COLUMNS_SQL + " WHERE id = ?", (game_id,))
+                if pgn_blob is not None:
+                    conn.execute(self.INSERT_PGN_SQL, (game_id, PGN_FORMAT, pgn_blob))
+                else:
+                    conn.execute("DELETE FROM game_pgn WHERE game_id = ?", (game_id,))
+                self._index_game(conn, game_id)
+                if self._built(conn, _STATS_MARK, game_id):
+                    player_stats.add_game(conn, game_id)
+                position_index.index_game(conn, positions)
+                if moves_blob is not None:
+                    conn.execute(self.INSERT_MOVES_SQL, (game_id, GAME_BLOB_VERSION, moves_blob))
+                else:
+                    # Stale analysed moves would win over the new PGN on load
+                    conn.execute("DELETE FROM game_moves WHERE game_id = ?", (game_id,))
             logger.info(f"Game saved to history: {game_id}")
         except Exception as e:
             logger.error(f"Failed to save game to history: {e}")
@@ -117,17 +437,7 @@ class GameHistoryManager:
         """Returns a list of all games (metadata + summary) sorted by timestamp desc."""
         games = []
         try:
-            conn = sqlite3.connect(self.db_path)
-            conn.row_factory = sqlite3.Row
-            cursor = conn.cursor()
-            
-            cursor.execute("SELECT * FROM games ORDER BY timestamp DESC LIMIT 200")
-            rows = cursor.fetchall()
-            
-            for row in rows:
-                games.append(dict(row))
-                
-            conn.close()
+            games = self._fetch_rows("SELECT * FROM games ORDER BY timestamp DESC, id DESC")
         except Exception as e:
             logger.error(f"Failed to fetch games from history: {e}")
             
@@ -137,76 +447,566 @@ class GameHistoryManager:
         """Returns games where either white or black player matches one of the usernames."""
         if not usernames:
             return []
-            
-        games = []
+        return list(self.iter_games(usernames))
+
+    def set_history_users(self, usernames: List[str]) -> bool:
+        """
+        Store the user's accounts and, if they changed, recompute every
+        game's user_color/user_outcome in one statement. Returns whether
+        anything changed.
+        """
+        keys = sorted({player_key(u) for u in usernames if player_key(u)})
         try:
-            conn = sqlite3.connect(self.db_path)
-            conn.row_factory = sqlite3.Row
-            cursor = conn.cursor()
-            
-            # Case-insensitive matching
-            placeholders = ','.join(['?'] * len(usernames))
-            query = f"""
-                SELECT * FROM games 
-                WHERE LOWER(white) IN ({placeholders}) 
-                   OR LOWER(black) IN ({placeholders})
-                ORDER BY timestamp DESC LIMIT 200
-            """
-            
-            # Duplicate params for both IN clauses
-            lower_usernames = [u.lower() for u in usernames]
-            params = lower_usernames + lower_usernames
-            
-            cursor.execute(query, params)
-            rows = cursor.fetchall()
-            
-            for row in rows:
-                games.append(dict(row))
-                
-            conn.close()
+            with self._db.transaction() as conn:
+                current = [row[0] for row in conn.execute("SELECT player FROM history_users ORDER BY player")]
+                if current == keys:
+                    return False
+                conn.execute("DELETE FROM history_users")
+                conn.executemany("INSERT INTO history_users (player) VALUES (?)", [(k,) for k in keys])
+                conn.execute(self.USER_COLUMNS_SQL)
+            logger.info(f"History users set to {keys}")
+            return True
         except Exception as e:
-            logger.error(f"Failed to fetch user games: {e}")
-            
-        return games
+            logger.error(f"Failed to set history users: {e}")
+            return False
+
+    def get_games_page(self, usernames: Optional[List[str]] = None, after: Optional[PageCursor] = None,
+                       limit: int = HISTORY_PAGE_SIZE, outcome: Optional[str] = None,
+                       source: Optional[str] = None,
+                       order: str = "newest") -> Tuple[List[Dict[str, Any]], Optional[PageCursor]]:
+        """
+        One page of games, optionally only those of ``usernames``
+        (case-insensitive). Pass the returned cursor as ``after`` to get the
+        next page; it is None after the last page. Each page is an index range
+        scan from the cursor, so it costs the same however deep it is.
+
+        ``outcome`` ("win", "loss" or "draw") keeps games with that result for
+        ``usernames``, or without usernames for the accounts given to
+        set_history_users() (draws: any draw when no usernames are given);
+        ``source`` keeps games from one source ("chesscom", "lichess", "file").
+        ``order`` is one of HISTORY_ORDERS (newest/oldest first, most/fewest
+        moves).
+        """
+        try:
+            if usernames is not None and not usernames:
+                return [], None
+            key_columns = HISTORY_ORDERS[order][0]
+            keys = sorted({player_key(u) for u in usernames}) if usernames else []
+            # One branch per (colour, player): each walks an index range that
+            # is already in keyset order, and UNION merges them (a game the
+            # user played on both sides is listed once). Without usernames
+            # the single branch walks one index.
+            branches = []
+            for column, won in (("white_key", "1-0"), ("black_key", "0-1")):
+                lost = "0-1" if won == "1-0" else "1-0"
+                for key in keys:
+                    condition, values = [f"{column} = ?"], [key]
+                    if outcome in ("win", "loss"):
+                        condition.append("result = ?")
+                        values.append(won if outcome == "win" else lost)
+                    branches.append((condition, values))
+            if not branches:
+                branches = [([], [])]
+
+            common, common_params, order_by = _page_clauses(order, after, outcome, source, keyed=bool(keys))
+
+            selects, params = [], []
+            for condition, values in branches:
+                clauses = condition + common
+                where = f"WHERE {' AND '.join(clauses)}" if clauses else ""
+                selects.append(f"SELECT * FROM (SELECT * FROM games {where} ORDER BY {order_by} LIMIT ?)")
+                params += values + common_params + [limit]
+            query = " UNION ".join(selects) + f" ORDER BY {order_by} LIMIT ?"
+            rows = self._fetch_rows(query, params + [limit])
+        except Exception as e:
+            logger.error(f"Failed to fetch history page: {e}")
+            return [], None
+        cursor = tuple(rows[-1][column] for column in key_columns) if len(rows) == limit else None
+        return rows, cursor
+
+    def search_games(self, text: str, after: Optional[PageCursor] = None,
+                     limit: int = HISTORY_PAGE_SIZE, outcome: Optional[str] = None,
+                     source: Optional[str] = None,
+                     order: str = "newest") -> Tuple[List[Dict[str, Any]], Optional[PageCursor]]:
+        """
+        One page of the games whose players, event, opening, ECO or date
+        match ``text`` (prefix match on every word). ``after``, ``outcome``,
+        ``source`` and ``order`` work as in get_games_page() (without
+        usernames), so the filters and order apply to every match, not to
+        one page of them.
+        """
+        match = search_match_query(text)
+        if match is None:
+            return [], None
+        key_columns = HISTORY_ORDERS[order][0]
+        try:
+            common, params, order_by = _page_clauses(order, after, outcome, source, table="games")
+            # Until run_backfills() has indexed every existing game, match in the table
+            conn = self._db.connection()
+            if self.has_search_index and self._mark(conn, _SEARCH_MARK) is None:
+                where = " AND ".join(["games_fts MATCH ?"] + common)
+                rows = self._fetch_rows(f"""
+                    SELECT games.* FROM games_fts
+                    JOIN games ON games.rowid = games_fts.rowid
+                    WHERE {where}
+                    ORDER BY {order_by}
+                    LIMIT ?
+                """, [match] + params + [limit])
+            else:
+                # No FTS5 (or index still being built): substring match on every word
+                words = re.findall(r"\w+", text.lower())
+                any_column = " OR ".join(f"LOWER({column}) LIKE ?" for column in SEARCH_COLUMNS)
+                where = " AND ".join([f"({any_column})" for _ in words] + common)
+                like = [f"%{word}%" for word in words for _ in SEARCH_COLUMNS]
+                rows = self._fetch_rows(
+                    f"SELECT * FROM games WHERE {where} ORDER BY {order_by} LIMIT ?", like + params + [limit]
+                )
+        except Exception as e:
+            logger.error(f"History search failed: {e}")
+            return [], None
+        cursor = tuple(rows[-1][column] for column in key_columns) if len(rows) == limit else None
+        return rows, cursor
+
+    def iter_games(self, usernames: Optional[Iterable[str]] = None,
+                   page_size: int = HISTORY_PAGE_SIZE, **filters) -> Iterator[Dict[str, Any]]:
+        """
+        All games (or those of ``usernames``) newest first, read one page at
+        a time. ``filters`` are passed on to get_games_page().
+        """
+        names = list(usernames) if usernames is not None else None
+        cursor = None
+        while True:
+            rows, cursor = self.get_games_page(names, cursor, page_size, **filters)
+            yield from rows
+            if cursor is None:
+                return
+
+    def export_csv(self, path: str, progress_callback: ProgressCallback = None) -> int:
+        """
+        Write every game to a CSV backup (CSV_FIELDS), newest first, read
+        a page at a time with the PGNs of each batch decompressed together.
+        Reports (games written, total); returns the count.
+        """
+        total = self._db.connection().execute("SELECT COUNT(*) FROM games").fetchone()[0]
+        written = 0
+        with open(path, mode="w", newline="", encoding="utf-8") as csvfile:
+            writer = csv.DictWriter(csvfile, fieldnames=CSV_FIELDS, extrasaction="ignore")
+            writer.writeheader()
+            batch: List[Dict[str, Any]] = []
+            for game in itertools.chain(self.iter_games(), [None]):
+                if game is not None:
+                    batch.append(game)
+                if len(batch) < _CSV_BATCH and (game is not None or not batch):
+                    continue
+                texts = self._pgn_texts([row["id"] for row in batch])
+                for row in batch:
+                    row["pgn"] = texts.get(row["id"], "")
+                writer.writerows(batch)
+                written += len(batch)
+                batch = []
+                if progress_callback:
+                    progress_callback(written, total)
+        if progress_callback:
+            progress_callback(written, total)
+        logger.info(f"Exported {written} games to {path}")
+        return written
+
+    def _csv_row_values(self, row: Dict[str, str]) -> tuple:
+        """
+        INSERT_GAME_SQL values for one CSV row, then its PGN text; raises
+        ValueError if unusable.
+        """
+        summary_json = row.get("summary_json") or "{}"
+        json.loads(summary_json)
+        try:
+            timestamp = float(row.get("timestamp") or "")
+        except ValueError:
+            timestamp = time.time()
+        pgn = row.get("pgn") or ""
+        # Backups written before ply_count was exported are counted here
+        plies = int(row["ply_count"]) if (row.get("ply_count") or "").isdigit() else pgn_ply_count(pgn)
+        return (
+            row["id"], row.get("white"), row.get("black"), row.get("result"), row.get("date"),
+            row.get("event"), None, summary_json, timestamp, row.get("white_elo") or None,
+            row.get("black_elo") or None, row.get("time_control") or None, row.get("eco") or None,
+            row.get("termination") or None, row.get("opening") or None, row.get("starting_fen") or None,
+            row.get("source") or "file", int(row.get("chess960") == "1"),
+            player_key(row.get("white")), player_key(row.get("black")), plies, move_count_for(plies)
+        ), pgn
+
+    def _insert_csv_batch(self, conn: sqlite3.Connection, batch: List[Dict[str, str]],
+                          counts: Dict[str, int]):
+        """Insert the rows of ``batch`` whose id is not stored yet, updating ``counts``."""
+        ids = [row["id"] for row in batch]
+        marks = ", ".join("?" * len(ids))
+        existing = {row[0] for row in conn.execute(f"SELECT id FROM games WHERE id IN ({marks})", ids)}
+        counts["skipped"] += len(existing)
+        new_rows = []
+        pgn_rows = []
+        for row in batch:
+            if row["id"] in existing:
+                continue
+            try:
+                values, pgn = self._csv_row_values(row)
+                new_rows.append(values)
+                if pgn:
+                    pgn_rows.append((row["id"], PGN_FORMAT, pack_pgn(pgn)))
+            except ValueError as e:
+                counts["failed"] += 1
+                logger.warning(f"Skipping history CSV row {row['id']}: {e}")
+        if not new_rows:
+            return
+        new_ids = [values[0] for values in new_rows]
+        marks = ", ".join("?" * len(new_ids))
+        conn.executemany(self.INSERT_GAME_SQL, new_rows)
+        conn.executemany(self.INSERT_PGN_SQL, pgn_rows)
+        # What save_game does per game, once per batch (new rows are past
+        # any backfill in progress, which will reach them)
+        conn.execute(self.USER_COLUMNS_SQL + f" WHERE id IN ({marks})", new_ids)
+        if self.has_search_index and self._mark(conn, _SEARCH_MARK) is None:
+            columns = ", ".join(SEARCH_COLUMNS)
+            conn.execute(
+                f"INSERT INTO games_fts(rowid, {columns}) SELECT rowid, {columns} FROM games WHERE id IN ({marks})",
+                new_ids
+            )
+        if self._mark(conn, _STATS_MARK) is None:
+            player_stats.add_games(conn, new_ids)
+        counts["imported"] += len(new_rows)
+
+    def import_csv(self, path: str, progress_callback: ProgressCallback = None) -> Dict[str, int]:
+        """
+        Add the games of a CSV backup (as written by export_csv) in a single
+        transaction, streamed in executemany batches. Games whose id is
+        already stored, or repeated in the file, are skipped; rows without
+        an id or with an unreadable summary count as failed. Reports
+        (characters read, file size). Returns read/imported/skipped/failed
+        counts. On error nothing is imported and the exception propagates.
+        """
+        counts = {"read": 0, "imported": 0, "skipped": 0, "failed": 0}
+        seen = set()
+        with open(path, mode="r", newline="", encoding="utf-8") as csvfile:
+            total = os.fstat(csvfile.fileno()).st_size
+            consumed = 0
+
+            def lines():
+                nonlocal consumed
+                for line in csvfile:
+                    consumed += len(line)
+                    yield line
+
+            with self._db.transaction() as conn:
+                batch: List[Dict[str, str]] = []
+                for row in csv.DictReader(lines()):
+                    counts["read"] += 1
+                    game_id = row.get("id")
+                    if not game_id:
+                        counts["failed"] += 1
+                        continue
+                    if game_id in seen:
+                        counts["skipped"] += 1
+                        continue
+                    seen.add(game_id)
+                    batch.append(row)
+                    if len(batch) >= _CSV_BATCH:
+                        self._insert_csv_batch(conn, batch, counts)
+                        batch = []
+                        if progress_callback:
+                            progress_callback(min(consumed, total), total)
+                if batch:
+                    self._insert_csv_batch(conn, batch, counts)
+        if progress_callback:
+            progress_callback(total, total)
+        logger.info(f"Imported history CSV {path}: {counts}")
+        return counts
 
     def delete_game(self, game_id: str):
         """Deletes a game from history."""
         try:
-            conn = sqlite3.connect(self.db_path)
-            cursor = conn.cursor()
-            cursor.execute("DELETE FROM games WHERE id = ?", (game_id,))
-            conn.commit()
-            conn.close()
+            with self._db.transaction() as conn:
+                self._unindex_game(conn, game_id)
+                if self._built(conn, _STATS_MARK, game_id):
+                    player_stats.remove_game(conn, game_id)
+                position_index.remove_game(conn, game_id)
+                conn.execute("DELETE FROM games WHERE id = ?", (game_id,))
+                conn.execute("DELETE FROM game_moves WHERE game_id = ?", (game_id,))
+                conn.execute("DELETE FROM game_pgn WHERE game_id = ?", (game_id,))
             logger.info(f"Game deleted from history: {game_id}")
         except Exception as e:
             logger.error(f"Failed to delete game from history: {e}")
 
+    def get_player_stats(self, usernames: List[str]) -> Dict[str, Any]:
+        """
+        Dashboard statistics over the games of ``usernames`` (results, colour
+        split, terminations, move quality, openings, accuracy trend), read
+        from the aggregates kept up to date by save_game/delete_game.
+        Empty dict on failure.
+        """
+        try:
+            keys = sorted({player_key(u) for u in usernames if player_key(u)})
+            return player_stats.load_stats(self._db.connection(), keys)
+        except Exception as e:
+            logger.error(f"Failed to load player statistics: {e}")
+            return {}
+
+    def rebuild_player_stats(self):
+        """Recompute the dashboard aggregates from scratch."""
+        try:
+            with self._db.transaction() as conn:
+                player_stats.rebuild(conn)
+                conn.execute("DELETE FROM history_meta WHERE key = ?", (_STATS_MARK,))
+        except Exception as e:
+            logger.error(f"Failed to rebuild player statistics: {e}")
+
+    def backfills_pending(self) -> bool:
+        """Whether run_backfills() has work left (a file from an older version)."""
+        conn = self._db.connection()
+        return (self._mark(conn, "data_version") != HISTORY_DATA_VERSION
+                or self._mark(conn, _STATS_MARK) is not None or self._mark(conn, _SEARCH_MARK) is not None)
+
+    def run_backfills(self, should_stop: Optional[Callable[[], bool]] = None) -> bool:
+        """
+        Fill in what older files lack for games already stored: normalized
+        player names and user columns, move counts, the player_stats
+        aggregates and the games_fts index. Runs a batch per transaction so
+        saves are not held up (call it off the GUI thread); progress is kept
+        in history_meta, so a run stopped between batches by
+        ``should_stop()`` resumes where it left off. Returns True once
+        everything is done.
+        """
+        if not self.backfills_pending():
+            return True
+        logger.info("Migrating DB: Backfilling existing history games")
+        steps = (
+            self._backfill_player_keys,
+            self._backfill_move_counts,
+            lambda: self._backfill_by_rowid(_STATS_MARK, player_stats.add_games),
+            lambda: self._backfill_by_rowid(_SEARCH_MARK, self._index_search_batch),
+        )
+        for step in steps:
+            while not step():
+                if should_stop and should_stop():
+                    return False
+        with self._db.transaction() as conn:
+            conn.execute(
+                "INSERT OR REPLACE INTO history_meta (key, value) VALUES ('data_version', ?)",
+                (HISTORY_DATA_VERSION,)
+            )
+        logger.info("Migrating DB: History backfill done")
+        return True
+
+    def _backfill_player_keys(self) -> bool:
+        """One batch of rows saved before white_key/black_key existed; True when none are left."""
+        with self._db.transaction() as conn:
+            stale = conn.execute(
+                "SELECT id, white, black FROM games WHERE white_key IS NULL OR black_key IS NULL LIMIT ?",
+                (_BACKFILL_BATCH,)
+            ).fetchall()
+            conn.executemany(
+                "UPDATE games SET white_key = ?, black_key = ? WHERE id = ?",
+                [(player_key(white), player_key(black), game_id) for game_id, white, black in stale]
+            )
+            if stale:
+                marks = ", ".join("?" * len(stale))
+                conn.execute(self.USER_COLUMNS_SQL + f" WHERE id IN ({marks})", [row[0] for row in stale])
+        return len(stale) < _BACKFILL_BATCH
+
+    def _backfill_move_counts(self) -> bool:
+        """One batch of rows without move counts, counted from the stored PGN; True when none are left."""
+        rows = self._db.connection().execute(
+            f"SELECT g.id, g.pgn, p.format, p.data FROM {PGN_JOIN} WHERE g.ply_count IS NULL LIMIT ?",
+            (_BACKFILL_BATCH,)
+        ).fetchall()
+        counts = []
+        for game_id, text, fmt, data in rows:
+            plies = pgn_ply_count(unpack_pgn(fmt, data) if data is not None else text)
+            counts.append((plies, move_count_for(plies), game_id))
+        with self._db.transaction() as conn:
+            # Games re-saved meanwhile already have their count
+            conn.executemany(
+                "UPDATE games SET ply_count = ?, move_count = ? WHERE id = ? AND ply_count IS NULL", counts
+            )
+        return len(rows) < _BACKFILL_BATCH
+
+    def _backfill_by_rowid(self, key: str, apply: Callable[[sqlite3.Connection, List[str]], None]) -> bool:
+        """
+        Pass the ids of the next batch of games past the rowid stored under
+        ``key`` to ``apply(conn, ids)`` and advance it; the
+        mark is dropped (True) after the last batch. Games saved meanwhile
+        get a higher rowid, so they are reached too.
+        """
+        with self._db.transaction() as conn:
+            mark = self._mark(conn, key)
+            if mark is None:
+                return True
+            rows = conn.execute(
+                "SELECT rowid, id FROM games WHERE rowid > ? ORDER BY rowid LIMIT ?", (mark, _BACKFILL_BATCH)
+            ).fetchall()
+            if rows:
+                apply(conn, [row[1] for row in rows])
+            if len(rows) < _BACKFILL_BATCH:
+                conn.execute("DELETE FROM history_meta WHERE key = ?", (key,))
+                return True
+            conn.execute("UPDATE history_meta SET value = ? WHERE key = ?", (rows[-1][0], key))
+        return False
+
+    def _index_search_batch(self, conn: sqlite3.Connection, game_ids: List[str]):
+        if not self.has_search_index:
+            return
+        columns = ", ".join(SEARCH_COLUMNS)
+        marks = ", ".join("?" * len(game_ids))
+        conn.execute(
+            f"INSERT INTO games_fts(rowid, {columns}) SELECT rowid, {columns} FROM games WHERE id IN ({marks})",
+            game_ids
+        )
+
+    def index_positions(self, progress_callback: ProgressCallback = None,
+                        should_stop: Optional[Callable[[], bool]] = None) -> int:
+        """
+        Index the positions of games that have none yet (saved before the
+        index existed, or imported from CSV), a batch per transaction so
+        saves are not held up. Reports (games done, games to index); stops
+        between batches once ``should_stop()`` is true. Returns the number
+        of games indexed.
+        """
+        ids = position_index.unindexed_game_ids(self._db.connection())
+        total = len(ids)
+        indexed = 0
+        for start in range(0, total, _POSITION_BATCH):
+            if should_stop and should_stop():
+                break
+            batch = ids[start:start + _POSITION_BATCH]
+            marks = ", ".join("?" * len(batch))
+            rows = self._fetch_rows(
+                f"SELECT {PGN_COLUMNS} FROM {PGN_JOIN} WHERE g.id IN ({marks})", batch
+            )
+            positions = {}
+            for row in rows:
+                try:
+                    positions[row["id"]] = position_index.game_rows(
+                        row["id"], row["timestamp"] or 0.0, row["result"], row_pgn(row),
+                        row["starting_fen"], row["chess960"]
+                    )
+                except Exception as e:
+                    logger.warning(f"Could not index positions of game {row['id']}: {e}")
+            with self._db.transaction() as conn:
+                # Skip games saved (already indexed) or deleted meanwhile
+                pending = [row[0] for row in conn.execute(
+                    f"SELECT id FROM games g WHERE id IN ({marks}) AND NOT EXISTS "
+                    "(SELECT 1 FROM game_positions p WHERE p.game_id = g.id)", batch
+                )]
+                for game_id in pending:
+                    if game_id in positions:
+                        position_index.index_game(conn, positions[game_id])
+                        indexed += 1
+            if progress_callback:
+                progress_callback(start + len(batch), total)
+        if indexed:
+            logger.info(f"Indexed positions of {indexed} history games")
+        return indexed
+
+    def get_position_games(self, position, limit: int = HISTORY_PAGE_SIZE) -> List[Dict[str, Any]]:
+        """
+        History rows of the games that reached ``position`` (FEN or board),
+        newest first, each with the ``ply`` it was (first) reached at and the
+        ``next_move`` played there (UCI, None if the game ended there).
+        """
+        try:
+            hits = {game_id: (ply, code) for game_id, ply, code
+                    in position_index.games_at(self._db.connection(), zobrist_key(position), limit)}
+            if not hits:
+                return []
+            marks = ", ".join("?" * len(hits))
+            rows = {row["id"]: row for row in
+                    self._fetch_rows(f"SELECT * FROM games WHERE id IN ({marks})", list(hits))}
+            games = []
+            for game_id, (ply, code) in hits.items():
+                row = rows.get(game_id)
+                if row is not None:
+                    row["ply"] = ply
+                    row["next_move"] = decode_uci(code) if code is not None else None
+                    games.append(row)
+            return games
+        except Exception as e:
+            logger.error(f"Failed to look up games by position: {e}")
+            return []
+
+    def get_position_moves(self, position) -> List[Dict[str, Any]]:
+        """
+        Moves played from ``position`` in the history, most played first:
+        ``uci`` (None for games that ended there), ``games`` and the
+        ``white_wins``/``draws``/``black_wins`` among them.
+        """
+        try:
+            return [
+                {"uci": decode_uci(code) if code is not None else None, "games": games,
+                 "white_wins": white_wins, "draws": draws, "black_wins": black_wins}
+                for code, games, white_wins, draws, black_wins
+                in position_index.moves_at(self._db.connection(), zobrist_key(position))
+            ]
+        except Exception as e:
+            logger.error(f"Failed to look up moves by position: {e}")
+            return []
+
     def get_game(self, game_id: str) -> Optional[Dict[str, Any]]:
-        """Retrieves a single game record."""
+        """Retrieves a single game record, with its PGN text in ``pgn``."""
         try:
-            conn = sqlite3.connect(self.db_path)
-            conn.row_factory = sqlite3.Row
-            cursor = conn.cursor()
-            cursor.execute("SELECT * FROM games WHERE id = ?", (game_id,))
-            row = cursor.fetchone()
-            conn.close()
-            
-            if row:
-                return dict(row)
-            return None
+            rows = self._fetch_rows(f"SELECT {PGN_COLUMNS} FROM {PGN_JOIN} WHERE g.id = ?", (game_id,))
+            if not rows:
+                return None
+            row = rows[0]
+            row["pgn"] = row_pgn(row)
+            del row["pgn_format"], row["pgn_data"]
+            return row
         except Exception as e:
             logger.error(f"Failed to get game {game_id}: {e}")
             return None
 
+    def get_game_pgn(self, game_id: str) -> Optional[str]:
+        """
+        The PGN text of a game (one primary-key read and a decompression);
+        list and page rows leave ``pgn`` empty. None if there is none.
+        """
+        try:
+            return self._pgn_texts([game_id]).get(game_id)
+        except Exception as e:
+            logger.error(f"Failed to load PGN for game {game_id}: {e}")
+            return None
+
+    def _pgn_texts(self, game_ids: List[str]) -> Dict[str, str]:
+        """PGN text by game id, for the games among ``game_ids`` that have one."""
+        texts = {}
+        for start in range(0, len(game_ids), _CSV_BATCH):
+            batch = game_ids[start:start + _CSV_BATCH]
+            marks = ", ".join("?" * len(batch))
+            rows = self._db.connection().execute(
+                f"SELECT g.id, g.pgn, p.format, p.data FROM {PGN_JOIN} WHERE g.id IN ({marks})", batch
+            ).fetchall()
+            for game_id, text, fmt, data in rows:
+                if data is not None:
+                    texts[game_id] = unpack_pgn(fmt, data)
+                elif text:
+                    texts[game_id] = text
+        return texts
+
+    def get_game_moves(self, game_id: str) -> Optional[List[MoveAnalysis]]:
+        """
+        The analysed moves saved with a game (one primary-key read), or None
+        if the game was saved without moves or the blob cannot be read.
+        """
+        try:
+            row = self._db.connection().execute(
+                "SELECT data FROM game_moves WHERE game_id = ?", (game_id,)
+            ).fetchone()
+            return unpack_game_moves(row[0]) if row else None
+        except Exception as e:
+            logger.error(f"Failed to load moves for game {game_id}: {e}")
+            return None
+
     def game_exists(self, game_id: str) -> bool:
         """Checks if a game with the given ID already exists."""
         try:
-            conn = sqlite3.connect(self.db_path)
-            cursor = conn.cursor()
-            cursor.execute("SELECT 1 FROM games WHERE id = ?", (game_id,))
-            exists = cursor.fetchone() is not None
-            conn.close()
-            return exists
+            row = self._db.connection().execute("SELECT 1 FROM games WHERE id = ?", (game_id,)).fetchone()
+            return row is not None
         except Exception as e:
             logger.error(f"Failed to check game existence: {e}")
             return False
@@ -214,11 +1014,88 @@ class GameHistoryManager:
     def clear_history(self):
         """Clears all games from history."""
         try:
-            conn = sqlite3.connect(self.db_path)
-            cursor = conn.cursor()
-            cursor.execute("DELETE FROM games")
-            conn.commit()
-            conn.close()
+            with self._db.transaction() as conn:
+                conn.execute("DELETE FROM games")
+                if self.has_search_index:
+                    conn.execute("INSERT INTO games_fts(games_fts) VALUES ('delete-all')")
+                conn.execute("DELETE FROM game_moves")
+                conn.execute("DELETE FROM game_pgn")
+                player_stats.clear(conn)
+                position_index.clear(conn)
+                # Nothing left to backfill
+                conn.execute("DELETE FROM history_meta WHERE key IN (?, ?)", (_STATS_MARK, _SEARCH_MARK))
             logger.info("Game history cleared.")
         except Exception as e:
             logger.error(f"Failed to clear history: {e}")
+
+    def compress_pgns(self, progress_callback: ProgressCallback = None) -> int:
+        """
+        Move PGN text still held in ``games.pgn`` (rows saved before
+        game_pgn existed) into game_pgn, compressed, a batch per
+        transaction. Reports (games done, games to move); returns the count.
+        The freed pages are reused by later saves; vacuum() returns them to
+        the file system.
+        """
+        ids = [row[0] for row in self._db.connection().execute(
+            "SELECT id FROM games WHERE pgn IS NOT NULL ORDER BY id"
+        )]
+        total = len(ids)
+        moved = 0
+        for start in range(0, total, _CSV_BATCH):
+            batch = ids[start:start + _CSV_BATCH]
+            marks = ", ".join("?" * len(batch))
+            with self._db.transaction() as conn:
+                rows = conn.execute(
+                    f"SELECT id, pgn FROM games WHERE id IN ({marks}) AND pgn IS NOT NULL", batch
+                ).fetchall()
+                conn.executemany(self.INSERT_PGN_SQL, [
+                    (game_id, PGN_FORMAT, pack_pgn(pgn)) for game_id, pgn in rows if pgn
+                ])
+                conn.executemany("UPDATE games SET pgn = NULL WHERE id = ?", [(row[0],) for row in rows])
+            moved += len(rows)
+            if progress_callback:
+                progress_callback(start + len(batch), total)
+        if moved:
+            logger.info(f"Compressed the PGN of {moved} history games")
+        return moved
+
+    def vacuum(self):
+        """Rewrite the database file without its free pages (needs no open transaction)."""
+        self._db.connection().execute("VACUUM")
+
+    def storage_report(self) -> Dict[str, Any]:
+        """
+        Where the history database's bytes go: ``games`` counted, PGN text
+        size (``pgn_text_bytes``) against what is stored for it
+        (``pgn_stored_bytes``, with ``uncompressed_pgns`` games still held as
+        text), analysed-move blobs (``moves_bytes``), the file size and its
+        free pages (``file_bytes``, ``free_bytes``), and the bytes used by
+        each table and index (``tables``; empty if SQLite lacks dbstat).
+        """
+        conn = self._db.connection()
+        games = conn.execute("SELECT COUNT(*) FROM games").fetchone()[0]
+        legacy_games, legacy_bytes = conn.execute(
+            "SELECT COUNT(*), COALESCE(SUM(LENGTH(CAST(pgn AS BLOB))), 0) FROM games WHERE pgn IS NOT NULL"
+        ).fetchone()
+        text_bytes, stored_bytes = legacy_bytes, legacy_bytes
+        for fmt, data in conn.execute("SELECT format, data FROM game_pgn"):
+            stored_bytes += len(data)
+            text_bytes += len(unpack_pgn(fmt, data).encode("utf-8"))
+        moves_bytes = conn.execute("SELECT COALESCE(SUM(LENGTH(data)), 0) FROM game_moves").fetchone()[0]
+        page_size = conn.execute("PRAGMA page_size").fetchone()[0]
+        try:
+            tables = dict(conn.execute(
+                "SELECT name, SUM(pgsize) FROM dbstat GROUP BY name ORDER BY 2 DESC"
+            ).fetchall())
+        except sqlite3.OperationalError:
+            tables = {}
+        return {
+            "games": games,
+            "pgn_text_bytes": text_bytes,
+            "pgn_stored_bytes": stored_bytes,
+            "uncompressed_pgns": legacy_games,
+            "moves_bytes": moves_bytes,
+            "file_bytes": conn.execute("PRAGMA page_count").fetchone()[0] * page_size,
+            "free_bytes": conn.execute("PRAGMA freelist_count").fetchone()[0] * page_size,
+            "tables": tables,
+        }
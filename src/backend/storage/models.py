@@ -1,27 +1,160 @@
+import sys
+import threading
+from array import array
+from collections.abc import Mapping
 from dataclasses import dataclass, field
-from typing import List, Optional, Dict, Any
+from typing import List, Optional, Dict, Any, Iterator
 import chess
 
-@dataclass
+from .compact import decode_move, encode_move, pack_moves, unpack_moves
+
+
+class GameReplay:
+    """
+    Packed mainline of one parsed game.
+
+    Every MoveAnalysis of the game points at the same replay instead of
+    carrying its own ``fen_before`` string; the FEN is rebuilt from the
+    packed moves when it is read.  The last produced position is remembered,
+    so walking the game in order (analyser, board widget) costs one push
+    per ply, and the FEN of every CHECKPOINT_PLIES-th ply passed is kept, so
+    stepping backwards replays at most that many moves.
+    """
+
+    # Plies between the kept FENs: ~60 bytes each against 16 pushes at most
+    CHECKPOINT_PLIES = 16
+
+    __slots__ = ("starting_fen", "chess960", "start_ply", "moves",
+                 "_cursor", "_cursor_fen", "_checkpoints", "_lock")
+
+    def __init__(self, starting_fen: str = chess.STARTING_FEN, chess960: bool = False):
+        self.starting_fen = starting_fen
+        self.chess960 = chess960
+        self.start_ply = chess.Board(starting_fen, chess960=chess960).ply()
+        self.moves = array("H")
+        self._cursor = 0
+        self._cursor_fen = starting_fen
+        self._checkpoints = [starting_fen]
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self.moves)
+
+    def __getstate__(self):
+        return (self.starting_fen, self.chess960, self.start_ply, self.moves)
+
+    def __setstate__(self, state):
+        self.starting_fen, self.chess960, self.start_ply, self.moves = state
+        self._cursor = 0
+        self._cursor_fen = self.starting_fen
+        self._checkpoints = [self.starting_fen]
+        self._lock = threading.Lock()
+
+    def append(self, move: chess.Move):
+        self.moves.append(encode_move(move))
+
+    def fen_at(self, index: int) -> str:
+        """FEN of the position before the ``index``-th move (0-based)."""
+        if not 0 <= index <= len(self.moves):
+            raise IndexError(f"Replay has no position {index} (game has {len(self.moves)} moves)")
+        with self._lock:
+            if index < self._cursor:
+                # Every checkpoint up to the cursor has been passed already
+                checkpoint = index // self.CHECKPOINT_PLIES
+                self._cursor = checkpoint * self.CHECKPOINT_PLIES
+                self._cursor_fen = self._checkpoints[checkpoint]
+            if index > self._cursor:
+                board = chess.Board(self._cursor_fen, chess960=self.chess960)
+                while self._cursor < index:
+                    board.push(decode_move(self.moves[self._cursor]))
+                    self._cursor += 1
+                    if self._cursor == len(self._checkpoints) * self.CHECKPOINT_PLIES:
+                        self._checkpoints.append(board.fen())
+                self._cursor_fen = board.fen()
+            return self._cursor_fen
+
+
+class PVLine(Mapping):
+    """
+    One engine line stored in ``MoveAnalysis.multi_pvs``.
+
+    Reads like the dict the analyser used to build (``line["pv_san"]``,
+    ``line.get("score_value")``) but keeps the PV packed and renders the SAN
+    text and score label only when they are asked for.
+    """
+
+    __slots__ = ("_moves", "cp", "mate", "depth", "_move", "_chess960")
+
+    KEYS = ("pv", "cp", "mate", "depth", "pv_san", "score_value")
+
+    def __init__(self, pv=(), cp: Optional[int] = None, mate: Optional[int] = None,
+                 depth: Any = None, move: Optional["MoveAnalysis"] = None,
+                 chess960: bool = False):
+        self._moves = pack_moves(pv)
+        self.cp = cp
+        self.mate = mate
+        self.depth = depth
+        # Owning move — only used to look up the position for pv_san.
+        self._move = move
+        self._chess960 = chess960
+
+    @property
+    def pv(self) -> List[str]:
+        return unpack_moves(self._moves)
+
+    @property
+    def pv_san(self) -> str:
+        fen = self._move.fen_before if self._move is not None else None
+        try:
+            board = chess.Board(fen, chess960=self._chess960)
+            return board.variation_san([decode_move(code) for code in self._moves])
+        except Exception:
+            return " ".join(self.pv)
+
+    @property
+    def score_value(self) -> str:
+        if self.mate is not None:
+            return f"M{self.mate}"
+        if self.cp is not None:
+            return f"{self.cp/100:.2f}"
+        return "?"
+
+    def __getitem__(self, key: str) -> Any:
+        if key not in self.KEYS:
+            raise KeyError(key)
+        return getattr(self, key)
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self.KEYS)
+
+    def __len__(self) -> int:
+        return len(self.KEYS)
+
+    def __repr__(self) -> str:
+        return f"PVLine(pv={self.pv!r}, cp={self.cp!r}, mate={self.mate!r}, depth={self.depth!r})"
+
+
+@dataclass(slots=True)
 class MoveAnalysis:
     move_number: int
     ply: int
     san: str
     uci: str
-    fen_before: str
+    # None when the position is derived from ``replay`` (see GameReplay).
+    fen_before: Optional[str]
     eval_before_cp: Optional[int] = None
     eval_before_mate: Optional[int] = None
     best_move: Optional[str] = None
     best_eval_cp: Optional[int] = None
     best_eval_mate: Optional[int] = None
-    pv: List[str] = field(default_factory=list)
+    pv: List[str] = field(default_factory=list)  # Stored packed, read back as UCI strings
     eval_after_cp: Optional[int] = None
     eval_after_mate: Optional[int] = None
     win_chance_before: float = 0.5
     win_chance_after: float = 0.5
     classification: str = ""  # Set by analyser: Brilliant, Best, Excellent, Good, Inaccuracy, Mistake, Blunder, Miss, Book; empty = unanalysed
     explanation: str = ""
-    multi_pvs: List[Dict[str, Any]] = field(default_factory=list)
+    multi_pvs: List[Dict[str, Any]] = field(default_factory=list)  # PVLine entries (dict-compatible)
     summary: Dict[str, Any] = field(default_factory=dict)
     # Clock information parsed from PGN [%clk] / [%timestamp] comments.
     # time_left   = remaining clock for the side that played this move, in seconds
@@ -37,8 +170,64 @@ class MoveAnalysis:
     eco: str = ""
     opening_name: str = ""
     candidate_continuations: List[str] = field(default_factory=list)
+    replay: Optional[GameReplay] = field(default=None, repr=False, compare=False)
+
+    def __post_init__(self):
+        # SAN/UCI strings repeat across thousands of games; share one copy.
+        if type(self.san) is str:
+            self.san = sys.intern(self.san)
+        if type(self.uci) is str:
+            self.uci = sys.intern(self.uci)
+
+
+# fen_before and pv are slots with a view in front of them: fen_before falls
+# back to the game replay when no FEN was stored, and pv is kept as packed
+# 16-bit move codes.
+_fen_before_slot = MoveAnalysis.fen_before
+_pv_slot = MoveAnalysis.pv
+
+
+def _get_fen_before(move: MoveAnalysis) -> Optional[str]:
+    fen = _fen_before_slot.__get__(move, MoveAnalysis)
+    if fen is None and move.replay is not None:
+        return move.replay.fen_at(move.ply - move.replay.start_ply)
+    return fen
+
+
+def _get_pv(move: MoveAnalysis) -> List[str]:
+    return unpack_moves(_pv_slot.__get__(move, MoveAnalysis))
+
+
+def _set_pv(move: MoveAnalysis, moves):
+    _pv_slot.__set__(move, pack_moves(moves or ()))
+
+
+# Pickle the raw slot values so fen_before stays lazy and pv stays packed.
+_RAW_SLOTS = {"fen_before": _fen_before_slot, "pv": _pv_slot}
+
+
+def _getstate(move: MoveAnalysis) -> tuple:
+    return tuple(
+        _RAW_SLOTS[name].__get__(move, MoveAnalysis) if name in _RAW_SLOTS else getattr(move, name)
+        for name in MoveAnalysis.__slots__
+    )
+
+
+def _setstate(move: MoveAnalysis, state: tuple):
+    for name, value in zip(MoveAnalysis.__slots__, state):
+        if name in _RAW_SLOTS:
+            _RAW_SLOTS[name].__set__(move, value)
+        else:
+            object.__setattr__(move, name, value)
+
+
+MoveAnalysis.fen_before = property(_get_fen_before, _fen_before_slot.__set__)
+MoveAnalysis.pv = property(_get_pv, _set_pv)
+MoveAnalysis.__getstate__ = _getstate
+MoveAnalysis.__setstate__ = _setstate
+
 
-@dataclass
+@dataclass(slots=True)
 class GameMetadata:
     white: str = "?"
     black: str = "?"
@@ -56,7 +245,7 @@ class GameMetadata:
     source: str = "file" # file, chesscom, lichess
     chess960: bool = False
 
-@dataclass
+@dataclass(slots=True)
 class GameAnalysis:
     game_id: str
     metadata: GameMetadata
@@ -64,3 +253,5 @@ class GameAnalysis:
     summary: Dict[str, Any] = field(default_factory=dict)
     ai_summary: Optional[str] = None
     pgn_content: Optional[str] = None
+    # Raw API payload (Chess.com / Lichess) used to enrich metadata on load.
+    source_data: Optional[Dict[str, Any]] = field(default=None, repr=False, compare=False)
@@ -0,0 +1,138 @@
+"""Compressed storage of game PGN text for the game history.
+
+The PGN of a saved game lives in ``game_pgn`` (``format``, ``data``) instead
+of the ``games.pgn`` column, so listing, filtering and the metrics never
+page it in; it is decompressed only when a game is opened or exported.
+
+Formats::
+
+    1   zlib (level 9) primed with PGN_DICTIONARY
+
+The preset dictionary holds the header tags, termination phrases and clock
+comments that every PGN from chess.com / lichess repeats, which short
+games otherwise pay for in full.  Rows written before ``game_pgn`` existed
+keep their text in ``games.pgn`` until
+``GameHistoryManager.compress_pgns`` moves them.
+
+Command line::
+
+    python -m src.backend.storage.pgn_blob report
+    python -m src.backend.storage.pgn_blob compress --vacuum
+"""
+import argparse
+import sqlite3
+import sys
+import zlib
+from typing import Any, Mapping, Optional
+
+PGN_FORMAT = 1
+
+# Never edit: format 1 blobs can only be read back with these exact bytes.
+# Add a new format (and keep this one) to change the dictionary.  zlib
+# matches nearby strings more cheaply, so the most common ones come last.
+PGN_DICTIONARY = "".join((
+    "Nf3 Nc6 Bc4 Bb5 Nxe5 Bxf7+ exd5 cxd4 Qxd8 Rxd8 Kxf7 Qe2 Be7 Bd6 Nbd7 Nge2 Re1 Rfe1 ",
+    "1-0\n", "0-1\n", "1/2-1/2\n",
+    ' won by resignation"]\n', ' won on time"]\n', ' won by checkmate"]\n', ' won by abandonment"]\n',
+    ' drawn by repetition"]\n', ' drawn by agreement"]\n', ' drawn by stalemate"]\n',
+    '[Event "Rated Blitz game"]\n', '[Event "Rated Rapid game"]\n', '[Event "Rated Bullet game"]\n',
+    '[Site "https://lichess.org/', '[UTCDate "', '[UTCTime "', '[WhiteRatingDiff "', '[BlackRatingDiff "',
+    '[WhiteTitle "', '[BlackTitle "', '[Variant "Standard"]\n', '[Termination "Normal"]\n',
+    '[Termination "Time forfeit"]\n', '[Opening "', '[Annotator "', '[SetUp "1"]\n[FEN "',
+    '[CurrentPosition "', '[Timezone "UTC"]\n', '[StartTime "', '[EndDate "',
+    '[Link "https://www.chess.com/game/live/', '[Event "Live Chess"]\n[Site "Chess.com"]\n[Date "',
+    '"]\n[Round "?"]\n[White "', '"]\n[Black "', '"]\n[Result "', '"]\n[TimeControl "', '"]\n[WhiteElo "',
+    '"]\n[BlackElo "', '"]\n[Termination "', '"]\n[ECO "', '"]\n[EndTime "', ' GMT+0000"]\n',
+    " { [%clk 0:00:", " { [%clk 0:01:", " { [%eval ", "] [%clk 0:0", " {[%clk 0:01:", " {[%clk 0:02:",
+    "][%timestamp ", "} ", "... ", "} 1... ",
+)).encode("utf-8")
+
+
+def pack_pgn(text: str) -> bytes:
+    """Compress PGN text as format PGN_FORMAT."""
+    compressor = zlib.compressobj(9, zlib.DEFLATED, 15, 9, zlib.Z_DEFAULT_STRATEGY, PGN_DICTIONARY)
+    return compressor.compress(text.encode("utf-8")) + compressor.flush()
+
+
+def unpack_pgn(fmt: int, data: bytes) -> str:
+    """Inverse of :func:`pack_pgn`; raises ValueError on unreadable data."""
+    if fmt != PGN_FORMAT:
+        raise ValueError(f"Unsupported PGN blob format {fmt}")
+    try:
+        decompressor = zlib.decompressobj(15, PGN_DICTIONARY)
+        return (decompressor.decompress(data) + decompressor.flush()).decode("utf-8")
+    except (zlib.error, UnicodeDecodeError) as e:
+        raise ValueError(f"Corrupt PGN blob: {e}") from None
+
+
+def row_pgn(row: Mapping[str, Any]) -> str:
+    """
+    PGN text of a games row selected with ``PGN_COLUMNS``/``PGN_JOIN``
+    (compressed copy first, then a legacy ``pgn`` value), "" if none.
+    """
+    data: Optional[bytes] = row["pgn_data"]
+    if data is not None:
+        return unpack_pgn(row["pgn_format"], data)
+    return row["pgn"] or ""
+
+
+# Select "g.*" plus the compressed PGN of each games row, for row_pgn()
+PGN_COLUMNS = "g.*, p.format AS pgn_format, p.data AS pgn_data"
+PGN_JOIN = "games g LEFT JOIN game_pgn p ON p.game_id = g.id"
+
+
+def _size(n: int) -> str:
+    for unit in ("B", "KB", "MB"):
+        if n < 1024:
+            return f"{n:.0f} {unit}" if unit == "B" else f"{n:.1f} {unit}"
+        n /= 1024
+    return f"{n:.1f} GB"
+
+
+def print_report(report: Mapping[str, Any]):
+    """Print a GameHistoryManager.storage_report() for people."""
+    text, stored = report["pgn_text_bytes"], report["pgn_stored_bytes"]
+    print(f"Games:          {report['games']}")
+    print(f"PGN text:       {_size(text)}")
+    saved = f" ({100 * (1 - stored / text):.0f}% saved)" if text else ""
+    print(f"PGN stored:     {_size(stored)}{saved}")
+    if report["uncompressed_pgns"]:
+        print(f"                {report['uncompressed_pgns']} games not compressed yet (run 'compress')")
+    print(f"Analysed moves: {_size(report['moves_bytes'])}")
+    print(f"File:           {_size(report['file_bytes'])} ({_size(report['free_bytes'])} free)")
+    for name, size in report["tables"].items():
+        print(f"  {name:<32}{_size(size):>12}")
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(
+        prog="python -m src.backend.storage.pgn_blob",
+        description="Report on or compress the PGN storage of the game history."
+    )
+    parser.add_argument("--db", help="history database to use (default: analysis_cache.db in the user data directory)")
+    sub = parser.add_subparsers(dest="command", required=True)
+    sub.add_parser("report", help="show how much space PGNs, analysis and indexes take")
+    compress_cmd = sub.add_parser("compress", help="compress PGN text saved by older versions")
+    compress_cmd.add_argument("--vacuum", action="store_true", help="shrink the file afterwards")
+    args = parser.parse_args(argv)
+
+    try:
+        from .game_history import GameHistoryManager
+        history = GameHistoryManager(args.db)
+        if args.command == "compress":
+            before = history.storage_report()
+            moved = history.compress_pgns()
+            if args.vacuum:
+                history.vacuum()
+            after = history.storage_report()
+            print(f"Compressed {moved} games; file {_size(before['file_bytes'])} -> {_size(after['file_bytes'])}")
+            return 0
+        print_report(history.storage_report())
+        return 0
+    except (OSError, sqlite3.Error, ValueError) as e:
+        print(f"error: {e}", file=sys.stderr)
+        return 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,229 @@
+"""Header-only index of multi-game PGN files.
+
+``scan_pgn`` reads a PGN file as bytes without building any game: for each
+game it records the byte range of its text, the header tags the game
+pickers show (INDEX_TAGS) and its mainline ply count (``pgn_ply_count``
+over the movetext).  ``read_pgn_game`` reads one game's text back by
+seeking to its offset, so only the game the user picks is parsed.
+
+Games are split where ``chess.pgn.read_game`` splits them: a game starts at
+its first non-blank line, may have one blank line between header lines,
+and ends at the first blank line of its movetext outside a ``{}`` comment.
+Like ``PGNParser``, games without moves are left out.
+
+``iter_pgn_index`` / ``load_pgn_index`` keep each file's index on disk in
+the user data directory, keyed by the file's path and rebuilt when its size
+or modification time changes, so reopening a large file skips the scan.
+"""
+import gzip
+import hashlib
+import json
+import os
+import re
+from typing import Callable, Dict, Iterator, List, NamedTuple, Optional
+
+from .game_history import pgn_ply_count
+from src.constants import PGN_INDEX_CACHE_FILES
+from src.utils.logger import logger
+
+PGN_INDEX_VERSION = 1
+
+# Header tags kept per game (what the Load Game pickers display)
+INDEX_TAGS = ("Event", "Date", "White", "Black", "Result", "WhiteElo", "BlackElo", "TimeControl")
+
+# Called with (bytes scanned, file size)
+ProgressCallback = Optional[Callable[[int, int], None]]
+
+# chess.pgn.TAG_REGEX, for bytes
+_TAG_RE = re.compile(rb'^\[([A-Za-z0-9][A-Za-z0-9_+#=:-]*)\s+"([^\r]*)"\]\s*$')
+_BOM = b"\xef\xbb\xbf"
+# Lines between progress callbacks
+_PROGRESS_LINES = 16384
+
+
+class PgnIndexEntry(NamedTuple):
+    offset: int  # byte offset of the game's first line
+    length: int  # bytes up to the blank line that ends it
+    plies: int
+    tags: Dict[str, str]  # INDEX_TAGS present in the headers
+
+
+class _Game:
+    __slots__ = ("offset", "tags", "movetext", "blank_headers")
+
+    def __init__(self, offset: int):
+        self.offset = offset
+        self.tags: Dict[str, str] = {}
+        self.movetext: List[bytes] = []
+        self.blank_headers = 0
+
+    def entry(self, end: int) -> Optional[PgnIndexEntry]:
+        plies = pgn_ply_count(b"".join(self.movetext).decode("utf-8", "replace"))
+        return PgnIndexEntry(self.offset, end - self.offset, plies, self.tags) if plies else None
+
+
+def _comment_state(line: bytes, in_comment: bool) -> bool:
+    """Whether a ``{}`` comment is still open at the end of a movetext line."""
+    if b";" not in line:
+        # Comments do not nest: the last brace on the line decides
+        last_open, last_close = line.rfind(b"{"), line.rfind(b"}")
+        return in_comment if last_open == last_close else last_open > last_close
+    pos = 0
+    while True:
+        if in_comment:
+            close = line.find(b"}", pos)
+            if close < 0:
+                return True
+            in_comment, pos = False, close + 1
+        else:
+            open_ = line.find(b"{", pos)
+            semi = line.find(b";", pos)
+            if open_ < 0 or 0 <= semi < open_:
+                return False
+            in_comment, pos = True, open_ + 1
+
+
+def scan_pgn(path: str, progress_callback: ProgressCallback = None) -> Iterator[PgnIndexEntry]:
+    """Yield an index entry per game of a PGN file, reading headers and movetext as bytes."""
+    size = os.path.getsize(path)
+    wanted = {tag.encode("ascii"): tag for tag in INDEX_TAGS}
+    game: Optional[_Game] = None
+    in_moves = in_comment = False
+    offset = 0
+    with open(path, "rb") as f:
+        for count, line in enumerate(f, 1):
+            start = offset
+            offset += len(line)
+            if count == 1 and line.startswith(_BOM):
+                line, start = line[len(_BOM):], start + len(_BOM)
+            if progress_callback and count % _PROGRESS_LINES == 0:
+                progress_callback(offset, size)
+
+            if in_comment:
+                game.movetext.append(line)
+                in_comment = _comment_state(line, True)
+                continue
+            if line.startswith((b"%", b";")):
+                continue
+            blank = line.isspace()
+            if game is None:
+                if blank:
+                    continue
+                game, in_moves = _Game(start), False
+            if not in_moves:
+                if blank and game.blank_headers < 1:
+                    game.blank_headers += 1
+                    continue
+                if line.startswith(b"["):
+                    game.blank_headers = 0
+                    match = _TAG_RE.match(line)
+                    if match and match.group(1) in wanted:
+                        game.tags[wanted[match.group(1)]] = match.group(2).decode("utf-8", "replace")
+                    continue
+                in_moves = True
+            if blank:
+                entry = game.entry(start)
+                if entry:
+                    yield entry
+                game = None
+                continue
+            game.movetext.append(line)
+            in_comment = _comment_state(line, False)
+    if game is not None:
+        entry = game.entry(offset)
+        if entry:
+            yield entry
+    if progress_callback:
+        progress_callback(size, size)
+
+
+def read_pgn_game(path: str, entry: PgnIndexEntry) -> str:
+    """The PGN text of one indexed game."""
+    with open(path, "rb") as f:
+        f.seek(entry.offset)
+        return f.read(entry.length).decode("utf-8")
+
+
+# ── On-disk cache ─────────────────────────────────────────────────────────────
+
+def _cache_dir() -> str:
+    from src.utils.path_utils import get_user_data_dir
+    return os.path.join(get_user_data_dir(), "pgn_index")
+
+
+def _cache_path(cache_dir: str, path: str) -> str:
+    digest = hashlib.sha1(os.path.abspath(path).encode("utf-8")).hexdigest()
+    return os.path.join(cache_dir, f"{digest}.json.gz")
+
+
+def _read_cache(cache_file: str, stat: os.stat_result) -> Optional[List[PgnIndexEntry]]:
+    try:
+        with gzip.open(cache_file, "rt", encoding="utf-8") as f:
+            document = json.load(f)
+        if (document["version"], document["size"], document["mtime_ns"], tuple(document["tags"])) != \
+                (PGN_INDEX_VERSION, stat.st_size, stat.st_mtime_ns, INDEX_TAGS):
+            return None
+        return [
+            PgnIndexEntry(offset, length, plies, {tag: value for tag, value in zip(INDEX_TAGS, values) if value})
+            for offset, length, plies, values in document["games"]
+        ]
+    except FileNotFoundError:
+        return None
+    except (OSError, ValueError, KeyError, TypeError) as e:
+        logger.warning(f"Ignoring unreadable PGN index {cache_file}: {e}")
+        return None
+
+
+def _write_cache(cache_dir: str, cache_file: str, path: str, stat: os.stat_result,
+                 entries: List[PgnIndexEntry]):
+    document = {
+        "version": PGN_INDEX_VERSION,
+        "path": os.path.abspath(path),
+        "size": stat.st_size,
+        "mtime_ns": stat.st_mtime_ns,
+        "tags": INDEX_TAGS,
+        "games": [[e.offset, e.length, e.plies, [e.tags.get(tag, "") for tag in INDEX_TAGS]] for e in entries],
+    }
+    try:
+        os.makedirs(cache_dir, exist_ok=True)
+        tmp = cache_file + ".tmp"
+        with gzip.open(tmp, "wt", encoding="utf-8", compresslevel=6) as f:
+            json.dump(document, f, separators=(",", ":"))
+        os.replace(tmp, cache_file)
+        # Keep the most recently written indexes
+        files = sorted(
+            (os.path.join(cache_dir, name) for name in os.listdir(cache_dir) if name.endswith(".json.gz")),
+            key=os.path.getmtime, reverse=True
+        )
+        for old in files[PGN_INDEX_CACHE_FILES:]:
+            os.remove(old)
+    except OSError as e:
+        logger.warning(f"Could not save PGN index for {path}: {e}")
+
+
+def iter_pgn_index(path: str, progress_callback: ProgressCallback = None,
+                   cache_dir: Optional[str] = None) -> Iterator[PgnIndexEntry]:
+    """
+    Index entries of a PGN file: from its cached index when the file's
+    size and modification time still match, otherwise scanned (and cached
+    once the scan has run to the end).
+    """
+    cache_dir = cache_dir or _cache_dir()
+    stat = os.stat(path)
+    cache_file = _cache_path(cache_dir, path)
+    cached = _read_cache(cache_file, stat)
+    if cached is not None:
+        yield from cached
+        if progress_callback:
+            progress_callback(stat.st_size, stat.st_size)
+        return
+    entries = []
+    for entry in scan_pgn(path, progress_callback):
+        entries.append(entry)
+        yield entry
+    _write_cache(cache_dir, cache_file, path, stat, entries)
+
+
+def load_pgn_index(path: str, progress_callback: ProgressCallback = None,
+                   cache_dir: Optional[str] = None) -> List[PgnIndexEntry]:
+    return list(iter_pgn_index(path, progress_callback, cache_dir))
@@ -0,0 +1,104 @@
+"""Multi-process parsing of large PGN files.
+
+Converting games into ``GameAnalysis`` objects is CPU-bound Python, so a
+single process parses a tournament database at one core's pace.
+``iter_pgn_file_parallel`` splits the file at the game boundaries of its
+index (``pgn_index.load_pgn_index``: the cached index when the file is
+unchanged, else a header scan, a small fraction of the parse time), hands
+chunks of whole games to a process pool that reads its byte range and runs
+``PGNParser``, and yields the games back in file order.  At most a few
+chunks per worker are in flight, so memory stays bounded however large the
+file is.
+
+Small files (or ``workers=1``) are parsed in-process: starting a pool
+costs more than it saves.
+
+The app itself never parses a whole file into games (the Load Game dialog
+lists index entries and parses the one picked), so this is library code
+for bulk conversions, exercised by the tests and
+``benchmarks/bench_pgn_parse.py``.
+"""
+import os
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from typing import Callable, Deque, Iterator, List, Optional, Tuple
+
+from .models import GameAnalysis
+from .pgn_index import load_pgn_index
+from .pgn_parser import PGNParser
+
+# Called with (bytes parsed, file size)
+ProgressCallback = Optional[Callable[[int, int], None]]
+
+# Games per chunk sent to a worker: large enough to amortise the pickling
+# round trip, small enough to spread a file over every core.
+CHUNK_GAMES = 200
+# Chunks queued per worker beyond the one it is parsing
+_CHUNKS_AHEAD = 2
+
+
+def _parse_range(path: str, offset: int, length: int) -> List[GameAnalysis]:
+    with open(path, "rb") as f:
+        f.seek(offset)
+        text = f.read(length).decode("utf-8")
+    return PGNParser.parse_pgn_text(text)
+
+
+def game_chunks(path: str, chunk_games: int = CHUNK_GAMES) -> List[Tuple[int, int]]:
+    """
+    (offset, length) byte ranges of consecutive whole games, ``chunk_games``
+    per range, from the file's (cached) index.
+    """
+    entries = load_pgn_index(path)
+    chunks = []
+    for start in range(0, len(entries), chunk_games):
+        first, last = entries[start], entries[min(start + chunk_games, len(entries)) - 1]
+        chunks.append((first.offset, last.offset + last.length - first.offset))
+    return chunks
+
+
+def iter_pgn_file_parallel(path: str, workers: Optional[int] = None, chunk_games: int = CHUNK_GAMES,
+                           progress_callback: ProgressCallback = None) -> Iterator[GameAnalysis]:
+    """
+    Yield the games of a PGN file in file order, parsed by ``workers``
+    processes (default: one per CPU). Reports (bytes parsed, file size)
+    after each chunk.
+    """
+    workers = workers or os.cpu_count() or 1
+    size = os.path.getsize(path)
+    chunks = game_chunks(path, chunk_games) if workers > 1 else []
+    if len(chunks) < 2:
+        yield from PGNParser.iter_pgn_file(path, progress_callback)
+        return
+
+    done = 0
+    pending: Deque = deque()
+
+    def oldest() -> List[GameAnalysis]:
+        nonlocal done
+        (_offset, length), future = pending.popleft()
+        games = future.result()
+        done += length
+        if progress_callback:
+            progress_callback(done, size)
+        return games
+
+    with ProcessPoolExecutor(max_workers=min(workers, len(chunks))) as pool:
+        try:
+            for chunk in chunks:
+                pending.append((chunk, pool.submit(_parse_range, path, *chunk)))
+                if len(pending) >= workers * (_CHUNKS_AHEAD + 1):
+                    yield from oldest()
+            while pending:
+                yield from oldest()
+        finally:
+            # Stopped early (or failed): drop the chunks not started yet
+            for _chunk, future in pending:
+                future.cancel()
+    if progress_callback:
+        progress_callback(size, size)
+
+
+def parse_pgn_file_parallel(path: str, workers: Optional[int] = None,
+                            chunk_games: int = CHUNK_GAMES) -> List[GameAnalysis]:
+    return list(iter_pgn_file_parallel(path, workers, chunk_games))
@@ -1,8 +1,9 @@
 import chess.pgn
 import io
+import os
 import re
-from typing import List, Optional, Tuple
-from .models import GameAnalysis, GameMetadata, MoveAnalysis
+from typing import Callable, Iterator, List, Optional, TextIO, Tuple
+from .models import GameAnalysis, GameMetadata, GameReplay, MoveAnalysis
 import uuid
 
 
@@ -43,36 +44,55 @@ def _parse_clk(comment: Optional[str]) -> Tuple[Optional[str], Optional[float]]:
     return m.group(0).split()[-1].rstrip("]"), seconds
 
 
+# Called with (amount read, total): bytes of a file, characters of a text.
+ProgressCallback = Optional[Callable[[int, int], None]]
+
+
 class PGNParser:
     @staticmethod
     def parse_pgn_file(file_path: str) -> List[GameAnalysis]:
-        games = []
-        with open(file_path, 'r', encoding='utf-8') as f:
-            while True:
-                game = chess.pgn.read_game(f)
-                if game is None:
-                    break
-                # Skip games with no moves — garbage input like SQL text
-                # produces a default game object from python-chess but has
-                # no actual moves.
-                if game.next() is None:
-                    continue
-                games.append(PGNParser._convert_to_game_analysis(game))
-        return games
+        return list(PGNParser.iter_pgn_file(file_path))
 
     @staticmethod
     def parse_pgn_text(text: str) -> List[GameAnalysis]:
-        games = []
+        return list(PGNParser.iter_pgn_text(text))
+
+    @staticmethod
+    def iter_pgn_file(file_path: str, progress_callback: ProgressCallback = None) -> Iterator[GameAnalysis]:
+        """
+        Yield the games of a PGN file one at a time, so only the game being
+        consumed is held in memory. Reports (bytes read, file size) after
+        each game.
+        """
+        size = os.path.getsize(file_path)
+        with open(file_path, 'r', encoding='utf-8') as f:
+            # The binary buffer's position: cheap, unlike TextIOWrapper.tell(),
+            # and ahead of the parser by at most one read chunk.
+            yield from PGNParser._iter_games(f, f.buffer.tell, size, progress_callback)
+
+    @staticmethod
+    def iter_pgn_text(text: str, progress_callback: ProgressCallback = None) -> Iterator[GameAnalysis]:
+        """Like iter_pgn_file() for PGN text; progress counts characters."""
         pgn_io = io.StringIO(text)
+        yield from PGNParser._iter_games(pgn_io, pgn_io.tell, len(text), progress_callback)
+
+    @staticmethod
+    def _iter_games(handle: TextIO, position: Callable[[], int], total: int,
+                    progress_callback: ProgressCallback) -> Iterator[GameAnalysis]:
         while True:
-            game = chess.pgn.read_game(pgn_io)
+            game = chess.pgn.read_game(handle)
             if game is None:
                 break
-            # Skip games with no moves (see comment above).
+            if progress_callback:
+                progress_callback(min(position(), total), total)
+            # Skip games with no moves — garbage input like SQL text
+            # produces a default game object from python-chess but has
+            # no actual moves.
             if game.next() is None:
                 continue
-            games.append(PGNParser._convert_to_game_analysis(game))
-        return games
+            yield PGNParser._convert_to_game_analysis(game)
+        if progress_callback:
+            progress_callback(total, total)
 
     @staticmethod
     def _convert_to_game_analysis(game: chess.pgn.Game) -> GameAnalysis:
@@ -143,11 +163,16 @@ class PGNParser:
 
         start_clock = _initial_clock_seconds()
 
+        # Positions are rebuilt from the packed mainline on demand rather
+        # than storing a FEN string per ply.
+        replay = GameReplay(board.fen(), chess960=board.chess960)
+
         for i, node in enumerate(game.mainline()):
             move = node.move
-            san = node.san()
+            # From the board kept in step here: node.san() replays the game
+            # from its root on every call.
+            san = board.san(move)
             uci = move.uci()
-            fen_before = board.fen()
             side_to_move = board.turn  # who is about to play this move
 
             # node.comment is a free-form string.  We look for [%clk]
@@ -177,12 +202,14 @@ class PGNParser:
                 ply=board.ply(),
                 san=san,
                 uci=uci,
-                fen_before=fen_before,
+                fen_before=None,
                 time_left=time_left,
                 time_spent=time_spent,
                 raw_clk=raw_clk,
+                replay=replay,
             )
             moves.append(move_analysis)
+            replay.append(move)
             board.push(move)
             
         # Use hash of PGN content as ID to prevent duplicates
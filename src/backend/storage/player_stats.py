@@ -0,0 +1,384 @@
+"""Per-player aggregates behind the metrics dashboard.
+
+Instead of decoding every saved game each time the dashboard opens, the
+history keeps running totals per (player, colour) that ``save_game`` and
+``delete_game`` adjust inside their own transaction:
+
+    player_stats     results, accuracy sum/count, best win, termination and
+                     move-quality counts
+    player_openings  games and wins per opening family
+    player_accuracy  one row per game with an accuracy, for the trend chart
+
+A game's contribution is computed once, from its stored row, by
+:func:`game_contributions`; it is added when the game is saved and
+subtracted when it is replaced or deleted.  Players are the normalized
+``white_key``/``black_key`` names.
+"""
+import json
+import re
+import sqlite3
+from typing import Any, Dict, Iterable, List, Mapping
+
+from .pgn_blob import PGN_COLUMNS, PGN_JOIN, row_pgn
+
+# Dashboard bucket -> player_stats column
+TERMINATION_COLUMNS = {
+    "Checkmate": "term_checkmate",
+    "Resignation": "term_resignation",
+    "Time": "term_time",
+    "Abandon": "term_abandon",
+    "Draw": "term_draw",
+}
+QUALITY_COLUMNS = {
+    "Best": "quality_best",
+    "Inaccuracy": "quality_inaccuracy",
+    "Mistake": "quality_mistake",
+    "Blunder": "quality_blunder",
+}
+# Summary classifications counted as "Best" on the dashboard
+BEST_CLASSES = ("Best", "Brilliant", "Great")
+
+# Additive columns of player_stats, in the order of the upsert below
+SUM_COLUMNS = (
+    ("games", "wins", "draws", "losses", "accuracy_sum", "accuracy_count")
+    + tuple(TERMINATION_COLUMNS.values())
+    + tuple(QUALITY_COLUMNS.values())
+)
+
+_SIDES = (
+    # colour, player column, opponent rating column, winning result
+    ("white", "white_key", "black_elo", "1-0"),
+    ("black", "black_key", "white_elo", "0-1"),
+)
+
+_UPSERT_STATS_SQL = f"""
+    INSERT INTO player_stats (player, color, {", ".join(SUM_COLUMNS)}, best_win_elo)
+    VALUES (?, ?, {", ".join("?" for _ in SUM_COLUMNS)}, ?)
+    ON CONFLICT(player, color) DO UPDATE SET
+        {", ".join(f"{c} = {c} + excluded.{c}" for c in SUM_COLUMNS)},
+        best_win_elo = MAX(best_win_elo, excluded.best_win_elo)
+"""
+_UPSERT_OPENING_SQL = """
+    INSERT INTO player_openings (player, opening, games, wins) VALUES (?, ?, ?, ?)
+    ON CONFLICT(player, opening) DO UPDATE SET
+        games = games + excluded.games, wins = wins + excluded.wins
+"""
+
+
+def create_tables(cursor: sqlite3.Cursor):
+    int_columns = ",\n".join(f"{c} INTEGER NOT NULL DEFAULT 0" for c in SUM_COLUMNS if c != "accuracy_sum")
+    cursor.execute(f"""
+        CREATE TABLE IF NOT EXISTS player_stats (
+            player TEXT NOT NULL,
+            color TEXT NOT NULL,
+            accuracy_sum REAL NOT NULL DEFAULT 0,
+            {int_columns},
+            best_win_elo INTEGER NOT NULL DEFAULT 0,
+            PRIMARY KEY (player, color)
+        ) WITHOUT ROWID
+    """)
+    cursor.execute("""
+        CREATE TABLE IF NOT EXISTS player_openings (
+            player TEXT NOT NULL,
+            opening TEXT NOT NULL,
+            games INTEGER NOT NULL DEFAULT 0,
+            wins INTEGER NOT NULL DEFAULT 0,
+            PRIMARY KEY (player, opening)
+        ) WITHOUT ROWID
+    """)
+    cursor.execute("""
+        CREATE TABLE IF NOT EXISTS player_accuracy (
+            player TEXT NOT NULL,
+            color TEXT NOT NULL,
+            timestamp REAL,
+            game_id TEXT NOT NULL,
+            accuracy REAL NOT NULL,
+            PRIMARY KEY (player, color, timestamp, game_id)
+        ) WITHOUT ROWID
+    """)
+
+
+def _pgn(row: Mapping[str, Any]) -> str:
+    # Rows read below carry the compressed PGN; it is only unpacked when
+    # the metadata columns leave a question open.
+    return row_pgn(row) if "pgn_data" in row else row.get("pgn") or ""
+
+
+def _termination(row: Mapping[str, Any]) -> str:
+    term = (row.get("termination") or "").lower()
+    if row.get("result") == "1/2-1/2":
+        return "Draw"
+    if "time" in term:
+        return "Time"
+    if "resign" in term:
+        return "Resignation"
+    if "abandon" in term:
+        return "Abandon"
+    if "mate" in term:
+        return "Checkmate"
+    return "Checkmate" if "#" in _pgn(row) else "Resignation"
+
+
+def _opening_family(row: Mapping[str, Any]) -> str:
+    name = row.get("opening")
+    if not name:
+        match = re.search(r'\[Opening "([^"]+)"\]', _pgn(row))
+        name = match.group(1) if match else ""
+    return name.split(":")[0].split(",")[0].strip()
+
+
+def _rating(value) -> int:
+    try:
+        return int(value)
+    except (TypeError, ValueError):
+        return 0
+
+
+def game_contributions(row: Mapping[str, Any]) -> List[Dict[str, Any]]:
+    """What one games row adds to the aggregates of each of its two players."""
+    try:
+        summary = json.loads(row.get("summary_json") or "{}")
+    except ValueError:
+        summary = {}
+    if not isinstance(summary, dict):
+        summary = {}
+    result = row.get("result")
+    termination = TERMINATION_COLUMNS[_termination(row)]
+    opening = _opening_family(row)
+
+    contributions = []
+    for color, key_column, opponent_elo, winning in _SIDES:
+        player = row.get(key_column)
+        if not player:
+            continue
+        won = result == winning
+        lost = not won and result in ("1-0", "0-1")
+        values = dict.fromkeys(SUM_COLUMNS, 0)
+        values.update(games=1, wins=int(won), losses=int(lost), draws=int(not won and not lost))
+        values[termination] = 1
+
+        side = summary.get(color) or {}
+        accuracy = 0
+        if isinstance(side, dict):
+            accuracy = side.get("accuracy") or 0
+            values["quality_best"] = sum(side.get(name, 0) or 0 for name in BEST_CLASSES)
+            for bucket in ("Inaccuracy", "Mistake", "Blunder"):
+                values[QUALITY_COLUMNS[bucket]] = side.get(bucket, 0) or 0
+        if accuracy > 0:
+            values["accuracy_sum"] = accuracy
+            values["accuracy_count"] = 1
+
+        contributions.append({
+            "player": player,
+            "color": color,
+            "values": values,
+            "accuracy": accuracy,
+            "best_win_elo": _rating(row.get(opponent_elo)) if won else 0,
+            "opening": opening,
+            "won": won,
+        })
+    return contributions
+
+
+def _game_row(conn: sqlite3.Connection, game_id: str):
+    cursor = conn.cursor()
+    cursor.row_factory = sqlite3.Row
+    row = cursor.execute(f"SELECT {PGN_COLUMNS} FROM {PGN_JOIN} WHERE g.id = ?", (game_id,)).fetchone()
+    return dict(row) if row else None
+
+
+def _apply(conn: sqlite3.Connection, row: Mapping[str, Any], sign: int):
+    for c in game_contributions(row):
+        player, color = c["player"], c["color"]
+        conn.execute(
+            _UPSERT_STATS_SQL,
+            [player, color] + [c["values"][col] * sign for col in SUM_COLUMNS]
+            + [c["best_win_elo"] if sign > 0 else 0],
+        )
+        if c["opening"]:
+            conn.execute(_UPSERT_OPENING_SQL, (player, c["opening"], sign, int(c["won"]) * sign))
+        if c["accuracy"] > 0:
+            if sign > 0:
+                conn.execute(
+                    "INSERT OR REPLACE INTO player_accuracy VALUES (?, ?, ?, ?, ?)",
+                    (player, color, row.get("timestamp"), row["id"], c["accuracy"]),
+                )
+            else:
+                conn.execute(
+                    "DELETE FROM player_accuracy WHERE player = ? AND color = ? AND game_id = ?",
+                    (player, color, row["id"]),
+                )
+        if sign > 0:
+            continue
+        # Taking a game away: drop emptied rows, and find the next best win
+        # if this game held it (an index range scan over the player's games).
+        if c["best_win_elo"] > 0:
+            side = next(s for s in _SIDES if s[0] == color)
+            _, key_column, opponent_elo, winning = side
+            conn.execute(f"""
+                UPDATE player_stats SET best_win_elo = COALESCE((
+                    SELECT MAX(CAST({opponent_elo} AS INTEGER)) FROM games
+                    WHERE {key_column} = ? AND result = ? AND id != ?
+                ), 0)
+                WHERE player = ? AND color = ? AND best_win_elo <= ?
+            """, (player, winning, row["id"], player, color, c["best_win_elo"]))
+        conn.execute("DELETE FROM player_stats WHERE player = ? AND color = ? AND games <= 0", (player, color))
+        conn.execute("DELETE FROM player_openings WHERE player = ? AND games <= 0", (player,))
+
+
+def add_game(conn: sqlite3.Connection, game_id: str):
+    """Count a stored game (call after it is inserted)."""
+    row = _game_row(conn, game_id)
+    if row:
+        _apply(conn, row, 1)
+
+
+def add_games(conn: sqlite3.Connection, game_ids: List[str]):
+    """
+    Count a batch of stored games (bulk imports): contributions are summed
+    in memory first, so each player's rows are written once per batch.
+    """
+    if not game_ids:
+        return
+    cursor = conn.cursor()
+    cursor.row_factory = sqlite3.Row
+    marks = ", ".join("?" for _ in game_ids)
+    stats: Dict[tuple, List] = {}
+    openings: Dict[tuple, List[int]] = {}
+    accuracy = []
+    for row in cursor.execute(f"SELECT {PGN_COLUMNS} FROM {PGN_JOIN} WHERE g.id IN ({marks})", game_ids).fetchall():
+        row = dict(row)
+        for c in game_contributions(row):
+            key = (c["player"], c["color"])
+            entry = stats.setdefault(key, [0] * len(SUM_COLUMNS) + [0])
+            for index, col in enumerate(SUM_COLUMNS):
+                entry[index] += c["values"][col]
+            entry[-1] = max(entry[-1], c["best_win_elo"])
+            if c["opening"]:
+                counts = openings.setdefault((c["player"], c["opening"]), [0, 0])
+                counts[0] += 1
+                counts[1] += int(c["won"])
+            if c["accuracy"] > 0:
+                accuracy.append((c["player"], c["color"], row["timestamp"], row["id"], c["accuracy"]))
+    conn.executemany(_UPSERT_STATS_SQL, [list(key) + values for key, values in stats.items()])
+    conn.executemany(_UPSERT_OPENING_SQL, [key + tuple(values) for key, values in openings.items()])
+    conn.executemany("INSERT OR REPLACE INTO player_accuracy VALUES (?, ?, ?, ?, ?)", accuracy)
+
+
+def remove_game(conn: sqlite3.Connection, game_id: str):
+    """Uncount a stored game (call before it is replaced or deleted)."""
+    row = _game_row(conn, game_id)
+    if row:
+        _apply(conn, row, -1)
+
+
+def clear(conn: sqlite3.Connection):
+    for table in ("player_stats", "player_openings", "player_accuracy"):
+        conn.execute(f"DELETE FROM {table}")
+
+
+def rebuild(conn: sqlite3.Connection) -> int:
+    """Recompute every aggregate from the games table; returns the game count."""
+    clear(conn)
+    cursor = conn.cursor()
+    cursor.row_factory = sqlite3.Row
+    count = 0
+    for row in cursor.execute(f"SELECT {PGN_COLUMNS} FROM {PGN_JOIN}"):
+        _apply(conn, dict(row), 1)
+        count += 1
+    return count
+
+
+def _shared_games(conn: sqlite3.Connection, players: List[str], marks: str) -> List[Dict[str, Any]]:
+    """Games where both sides are among ``players`` (e.g. two of the user's accounts)."""
+    cursor = conn.cursor()
+    cursor.row_factory = sqlite3.Row
+    return [dict(row) for row in cursor.execute(
+        f"SELECT {PGN_COLUMNS} FROM {PGN_JOIN} WHERE g.white_key IN ({marks}) AND g.black_key IN ({marks})",
+        players + players,
+    )]
+
+
+def load_stats(conn: sqlite3.Connection, players: Iterable[str]) -> Dict[str, Any]:
+    """
+    Dashboard statistics of ``players`` (normalized names), summed over
+    them, in the layout the metrics cards read.  A game between two of
+    ``players`` counts once, for White (as the dashboard always did).
+    """
+    players = list(players)
+    marks = ", ".join("?" for _ in players) or "NULL"
+    # Their Black side is taken back out of the sums below
+    shared = _shared_games(conn, players, marks) if players else []
+    shared_black = [c for row in shared for c in game_contributions(row) if c["color"] == "black"]
+    totals = {col: 0 for col in SUM_COLUMNS}
+    color_stats = {color: {"wins": 0, "draws": 0, "losses": 0, "total": 0} for color in ("white", "black")}
+    best_win = 0
+    sums = ", ".join(f"SUM({col})" for col in SUM_COLUMNS)
+    for color, *values in conn.execute(
+        f"SELECT color, {sums}, MAX(best_win_elo) FROM player_stats WHERE player IN ({marks}) GROUP BY color",
+        players,
+    ):
+        *sums_row, best = values
+        row = {col: value or 0 for col, value in zip(SUM_COLUMNS, sums_row)}
+        for c in shared_black:
+            if color == "black":
+                for col in SUM_COLUMNS:
+                    row[col] -= c["values"][col]
+        for col in SUM_COLUMNS:
+            totals[col] += row[col]
+        color_stats[color] = {
+            "wins": row["wins"], "draws": row["draws"], "losses": row["losses"], "total": row["games"]
+        }
+        if color == "black" and any(c["best_win_elo"] for c in shared_black):
+            # The best Black win may be one of the shared games: look again without them
+            (best,) = conn.execute(
+                f"SELECT MAX(CAST(white_elo AS INTEGER)) FROM games"
+                f" WHERE black_key IN ({marks}) AND result = '0-1' AND white_key NOT IN ({marks})",
+                players + players,
+            ).fetchone()
+        best_win = max(best_win, best or 0)
+
+    opening_counts = {}
+    for opening, games, wins in conn.execute(
+        f"SELECT opening, SUM(games), SUM(wins) FROM player_openings WHERE player IN ({marks})"
+        " GROUP BY opening",
+        players,
+    ):
+        opening_counts[opening] = [games, wins]
+    for c in shared_black:
+        if c["opening"] in opening_counts:
+            opening_counts[c["opening"]][0] -= 1
+            opening_counts[c["opening"]][1] -= int(c["won"])
+    openings, opening_wins = {}, {}
+    for opening, (games, wins) in sorted(opening_counts.items(), key=lambda item: (-item[1][0], item[0])):
+        if games > 0:
+            openings[opening] = games
+        if wins > 0:
+            opening_wins[opening] = wins
+
+    shared_ids = [row["id"] for row in shared]
+    skip_shared = (
+        f" AND NOT (color = 'black' AND game_id IN ({', '.join('?' for _ in shared_ids)}))" if shared_ids else ""
+    )
+    accuracy_history = [acc for (acc,) in conn.execute(
+        f"SELECT accuracy FROM player_accuracy WHERE player IN ({marks}){skip_shared}"
+        " ORDER BY timestamp DESC, game_id DESC",
+        players + shared_ids,
+    )]
+
+    total = totals["games"]
+    return {
+        "total": total,
+        "wins": totals["wins"],
+        "losses": totals["losses"],
+        "draws": totals["draws"],
+        "win_rate": (totals["wins"] / total * 100) if total else 0,
+        "avg_accuracy": (totals["accuracy_sum"] / totals["accuracy_count"]) if totals["accuracy_count"] else 0,
+        "best_win": str(best_win) if best_win > 0 else "N/A",
+        "term_counts": {bucket: totals[col] for bucket, col in TERMINATION_COLUMNS.items()},
+        "quality_counts": {bucket: totals[col] for bucket, col in QUALITY_COLUMNS.items()},
+        "accuracy_history": accuracy_history,
+        "openings": openings,
+        "opening_wins": opening_wins,
+        "color_stats": color_stats,
+    }
@@ -0,0 +1,174 @@
+"""Index of the positions reached in the saved games.
+
+One row per position reached in each game's mainline, keyed by the
+position's Zobrist hash (see compact.zobrist_key), so "which of my games
+reached this position, and what was played next" is one index range read
+instead of a replay of the whole history:
+
+    game_positions   zobrist, timestamp, game_id, ply, next_move, result
+
+``timestamp`` is the game's save time, copied so matches come out newest
+first straight from the primary key.  A position repeated in a game is
+indexed at its first occurrence only, so counting rows counts games.
+``ply`` counts from the game's starting position (0).  ``next_move`` is the
+packed code of the move played from the position (compact.encode_move),
+NULL after the last move, and
+``result`` is 1 / 0 / -1 for a white win / draw / black win, NULL otherwise.
+
+``save_game`` indexes a game inside its own transaction; games stored
+before the table existed or imported from CSV are indexed by
+``GameHistoryManager.index_positions``.
+"""
+import io
+import sqlite3
+from typing import List, Optional, Sequence, Tuple
+
+import chess
+import chess.pgn
+
+from .compact import decode_move, encode_move, zobrist_keys
+
+RESULT_CODES = {"1-0": 1, "1/2-1/2": 0, "0-1": -1}
+
+# zobrist, timestamp, game_id, ply, next_move, result
+PositionRow = Tuple[int, float, str, int, Optional[int], Optional[int]]
+
+INSERT_SQL = "INSERT INTO game_positions VALUES (?, ?, ?, ?, ?, ?)"
+
+
+def create_tables(cursor: sqlite3.Cursor):
+    cursor.execute("""
+        CREATE TABLE IF NOT EXISTS game_positions (
+            zobrist INTEGER NOT NULL,
+            timestamp REAL NOT NULL,
+            game_id TEXT NOT NULL,
+            ply INTEGER NOT NULL,
+            next_move INTEGER,
+            result INTEGER,
+            PRIMARY KEY (zobrist, timestamp, game_id)
+        ) WITHOUT ROWID
+    """)
+    # Removing a game's rows on re-save/delete, and finding unindexed games
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_game_positions_game ON game_positions(game_id)")
+
+
+class _MainlineVisitor(chess.pgn.BaseVisitor):
+    """Collects the starting board and mainline moves without building a game tree."""
+
+    def begin_game(self):
+        self.board: Optional[chess.Board] = None
+        self.moves: List[chess.Move] = []
+        self.failed = False
+
+    def visit_board(self, board: chess.Board):
+        # Also called with the final position at the end of the movetext
+        if self.board is None:
+            self.board = board.copy(stack=False)
+
+    def begin_variation(self):
+        return chess.pgn.SKIP
+
+    def visit_move(self, board: chess.Board, move: chess.Move):
+        if not self.failed:
+            self.moves.append(move)
+
+    def handle_error(self, error: Exception):
+        # Keep the moves before the first illegal one
+        self.failed = True
+
+    def result(self) -> Optional[Tuple[chess.Board, List[chess.Move]]]:
+        return (self.board, self.moves) if self.board is not None else None
+
+
+def pgn_mainline(pgn: Optional[str]) -> Optional[Tuple[chess.Board, List[chess.Move]]]:
+    """
+    Starting board and mainline moves of a PGN (up to the first illegal
+    move, if any), or None if it holds no game.
+    """
+    if not pgn:
+        return None
+    return chess.pgn.read_game(io.StringIO(pgn), Visitor=_MainlineVisitor)
+
+
+def replay_mainline(replay) -> Tuple[chess.Board, List[chess.Move]]:
+    """Starting board and mainline moves of a ``models.GameReplay``."""
+    board = chess.Board(replay.starting_fen, chess960=replay.chess960)
+    return board, [decode_move(code) for code in replay.moves]
+
+
+def position_rows(game_id: str, timestamp: float, result: Optional[str],
+                  board: chess.Board, moves: Sequence[chess.Move]) -> List[PositionRow]:
+    """
+    Index rows for a game whose mainline is ``moves`` played from ``board``,
+    one per distinct position (its first occurrence).
+    """
+    code = RESULT_CODES.get(result)
+    next_moves = [encode_move(move) for move in moves] + [None]
+    rows = {}
+    for ply, (key, next_move) in enumerate(zip(zobrist_keys(board, moves), next_moves)):
+        if key not in rows:
+            rows[key] = (key, timestamp, game_id, ply, next_move, code)
+    return list(rows.values())
+
+
+def index_game(conn: sqlite3.Connection, rows: List[PositionRow]):
+    conn.executemany(INSERT_SQL, rows)
+
+
+def remove_game(conn: sqlite3.Connection, game_id: str):
+    conn.execute("DELETE FROM game_positions WHERE game_id = ?", (game_id,))
+
+
+def clear(conn: sqlite3.Connection):
+    conn.execute("DELETE FROM game_positions")
+
+
+def unindexed_game_ids(conn: sqlite3.Connection) -> List[str]:
+    """Ids of stored games that have no position rows yet."""
+    return [row[0] for row in conn.execute("""
+        SELECT id FROM games g
+        WHERE NOT EXISTS (SELECT 1 FROM game_positions p WHERE p.game_id = g.id)
+        ORDER BY id
+    """)]
+
+
+def games_at(conn: sqlite3.Connection, key: int, limit: int) -> List[Tuple[str, int, Optional[int]]]:
+    """(game_id, ply, next_move) of the games that reached ``key``, newest first."""
+    return conn.execute(
+        "SELECT game_id, ply, next_move FROM game_positions WHERE zobrist = ?"
+        " ORDER BY timestamp DESC, game_id DESC LIMIT ?",
+        (key, limit)
+    ).fetchall()
+
+
+def moves_at(conn: sqlite3.Connection, key: int) -> List[Tuple[Optional[int], int, int, int, int]]:
+    """
+    (next_move, games, white wins, draws, black wins) per move played from
+    ``key``; ``next_move`` is None for games that ended there.  Most played
+    first.
+    """
+    return conn.execute("""
+        SELECT next_move, COUNT(*), COUNT(result = 1 OR NULL),
+               COUNT(result = 0 OR NULL), COUNT(result = -1 OR NULL)
+        FROM game_positions WHERE zobrist = ?
+        GROUP BY next_move
+        ORDER BY 2 DESC, next_move
+    """, (key,)).fetchall()
+
+
+def game_rows(game_id: str, timestamp: float, result: Optional[str], pgn: Optional[str],
+              starting_fen: Optional[str] = None, chess960: bool = False, replay=None) -> List[PositionRow]:
+    """
+    Index rows for a stored game, from its packed ``replay`` when the
+    analysed moves are at hand, otherwise from the PGN.  A PGN without a
+    readable game indexes just its starting position, so the backfill does
+    not retry it forever.
+    """
+    if replay is not None:
+        board, moves = replay_mainline(replay)
+    else:
+        mainline = pgn_mainline(pgn)
+        if mainline is None:
+            mainline = chess.Board(starting_fen or chess.STARTING_FEN, chess960=bool(chess960)), []
+        board, moves = mainline
+    return position_rows(game_id, timestamp, result, board, moves)
@@ -56,6 +56,32 @@ DEFAULT_MULTI_PV = 2
 DEFAULT_LIVE_ANALYSIS_TIME = 0.5
 DEFAULT_ANALYSIS_DEPTH = 18
 
+# Analysis cache in-memory tier limits
+DEFAULT_CACHE_MEMORY_ENTRIES = 20000
+DEFAULT_CACHE_MEMORY_MB = 32
+# On-disk budget for the analysis cache (entries are evicted past it)
+DEFAULT_CACHE_MAX_MB = 512
+# Pre-analysed read-only cache shipped with the app, used as a base layer if present
+BUNDLED_CACHE_BASE_PATH = "assets/cache/analysis_base.db"
+
+# SQLite connection tuning (see storage/connection.py)
+SQLITE_MMAP_SIZE = 256 * 1024 * 1024
+SQLITE_CACHE_SIZE_KB = 16 * 1024  # page cache per connection
+SQLITE_BUSY_TIMEOUT = 10.0  # seconds a writer waits for the lock
+
+# Rows per keyset page when reading the game history
+HISTORY_PAGE_SIZE = 500
+
+# Header indexes of opened PGN files kept on disk (see storage/pgn_index.py)
+PGN_INDEX_CACHE_FILES = 32
+
+# Background pre-analysis of the opening tree (breadth-first, idle time only)
+DEFAULT_PREWARM_MAX_NODES = 2000
+DEFAULT_PREWARM_INTERVAL = 1.0  # seconds of rest after each engine search
+PREWARM_ENGINE_THREADS = 1
+PREWARM_ENGINE_HASH_MB = 32
+PREWARM_IDLE_SECONDS = 60  # without input or engine activity before it resumes
+
 # LLM Providers Catalogue
 PROVIDERS = {
     "groq": {
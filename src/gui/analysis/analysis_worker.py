@@ -31,3 +31,54 @@ class AnalysisWorker(QThread):
 
     def stop(self):
         self._is_running = False
+
+
+class AnalyzerWarmupWorker(QThread):
+    """
+    Builds the analyzer's cache, history and opening books off the UI thread,
+    then brings the data of existing history games up to date (stops
+    between batches on requestInterruption(); resumed next start).
+    """
+    ready = pyqtSignal()
+    backfilled = pyqtSignal()
+    error = pyqtSignal(str)
+
+    def __init__(self, analyzer: Analyzer):
+        super().__init__()
+        self.analyzer = analyzer
+
+    def run(self):
+        try:
+            self.analyzer.warm_up()
+            self.ready.emit()
+            history = self.analyzer.history_manager
+            if history.backfills_pending() and history.run_backfills(should_stop=self.isInterruptionRequested):
+                self.backfilled.emit()
+        except Exception as e:
+            self.error.emit(str(e))
+
+
+class OpeningPrewarmWorker(QThread):
+    """Runs an OpeningPrewarmer (opening-tree pre-analysis) in the background."""
+    progress = pyqtSignal(int, int)  # nodes done, total
+    done = pyqtSignal(object)  # run stats
+    error = pyqtSignal(str)
+
+    def __init__(self, prewarmer):
+        super().__init__()
+        self.prewarmer = prewarmer
+
+    def run(self):
+        try:
+            self.done.emit(self.prewarmer.run(progress_callback=self.progress.emit))
+        except Exception as e:
+            self.error.emit(str(e))
+
+    def pause(self):
+        self.prewarmer.pause()
+
+    def resume(self):
+        self.prewarmer.resume()
+
+    def stop(self):
+        self.prewarmer.cancel()
@@ -0,0 +1,283 @@
+"""
+History Games Panel - The user's own games that reached the explorer position.
+
+Backed by the history position index (see position_index.py): each lookup
+is a couple of index range reads, so the panel refreshes on every move.
+Games saved before the index existed are indexed by a background worker
+the first time the panel is shown.
+"""
+import chess
+from PyQt6.QtWidgets import QWidget, QVBoxLayout, QHBoxLayout, QLabel, QPushButton, QScrollArea
+from PyQt6.QtCore import Qt, QThread, pyqtSignal
+
+from src.gui.styles import Styles
+from src.gui.components.game_list_model import game_from_row
+from src.utils.logger import logger
+
+
+class PositionIndexWorker(QThread):
+    """Indexes the positions of history games that have none yet."""
+    progress = pyqtSignal(int, int)  # games done, games to index
+    done = pyqtSignal(int)  # games indexed
+    error = pyqtSignal(str)
+
+    def __init__(self, history_manager, parent=None):
+        super().__init__(parent)
+        self.history_manager = history_manager
+
+    def run(self):
+        try:
+            indexed = self.history_manager.index_positions(
+                progress_callback=self.progress.emit, should_stop=self.isInterruptionRequested
+            )
+            self.done.emit(indexed)
+        except Exception as e:
+            self.error.emit(str(e))
+
+
+class _ClickableRow(QWidget):
+    clicked = pyqtSignal()
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.setCursor(Qt.CursorShape.PointingHandCursor)
+
+    def mousePressEvent(self, event):
+        if event.button() == Qt.MouseButton.LeftButton:
+            self.clicked.emit()
+        super().mousePressEvent(event)
+
+
+class HistoryGamesPanel(QWidget):
+    """
+    Collapsible "My Games" section: the moves played from the current
+    position in the history with their results, then the most recent games
+    that reached it. Clicking a move emits ``move_clicked(uci)``; clicking a
+    game emits ``game_selected(GameAnalysis)``.
+    """
+    move_clicked = pyqtSignal(str)
+    game_selected = pyqtSignal(object)
+
+    # Recent games listed under the moves
+    GAME_LIMIT = 20
+
+    def __init__(self, history_manager=None, parent=None):
+        super().__init__(parent)
+        # A default manager is opened on first use when not given.
+        self.history_manager = history_manager
+        self._board = chess.Board()
+        # Position changed while hidden: looked up when shown
+        self._stale = True
+        self._game_count = 0
+        self._rows = []
+        self._index_worker = None
+
+        layout = QVBoxLayout(self)
+        layout.setContentsMargins(0, 0, 0, 0)
+        layout.setSpacing(4)
+
+        self.toggle = QPushButton("▶  My Games")
+        self.toggle.setCheckable(True)
+        self.toggle.setChecked(True)
+        self.toggle.setCursor(Qt.CursorShape.PointingHandCursor)
+        self.toggle.toggled.connect(self._on_toggled)
+        layout.addWidget(self.toggle)
+
+        self.status_label = QLabel("")
+        self.status_label.hide()
+        layout.addWidget(self.status_label)
+
+        self.scroll = QScrollArea()
+        self.scroll.setWidgetResizable(True)
+        self.container = QWidget()
+        self.rows_layout = QVBoxLayout(self.container)
+        self.rows_layout.setContentsMargins(0, 0, 0, 0)
+        self.rows_layout.setSpacing(0)
+        self.rows_layout.setAlignment(Qt.AlignmentFlag.AlignTop)
+        self.scroll.setWidget(self.container)
+        layout.addWidget(self.scroll, stretch=1)
+
+        self.refresh_styles()
+        self._update_toggle()
+
+    # ── Public API ────────────────────────────────────────────────────────────
+
+    def set_position(self, board: chess.Board):
+        """Show the history games that reached ``board``."""
+        self._board = board.copy(stack=False)
+        self._stale = True
+        if self.isVisible():
+            self.refresh()
+
+    def refresh(self):
+        self._stale = False
+        self._clear_rows()
+        manager = self._manager()
+        moves = manager.get_position_moves(self._board)
+        games = manager.get_position_games(self._board, limit=self.GAME_LIMIT)
+        self._game_count = sum(m["games"] for m in moves)
+
+        for stats in moves:
+            if stats["uci"] is not None:
+                self._add_move_row(stats)
+        if games:
+            self._add_section_label("Recent games")
+            for row in games:
+                self._add_game_row(row)
+        self._update_toggle()
+
+    def ensure_indexed(self):
+        """Index, in the background, history games that have no positions yet."""
+        if self._index_worker is not None and self._index_worker.isRunning():
+            return
+        self._index_worker = PositionIndexWorker(self._manager(), self)
+        self._index_worker.progress.connect(self._on_index_progress)
+        self._index_worker.done.connect(self._on_index_done)
+        self._index_worker.error.connect(self._on_index_error)
+        self._index_worker.start()
+
+    def stop(self):
+        """Stop a running index worker between batches and wait for it."""
+        if self._index_worker is not None and self._index_worker.isRunning():
+            self._index_worker.requestInterruption()
+            self._index_worker.wait()
+
+    def showEvent(self, event):
+        super().showEvent(event)
+        if self._stale:
+            self.refresh()
+        self.ensure_indexed()
+
+    # ── Rows ──────────────────────────────────────────────────────────────────
+
+    def _manager(self):
+        if self.history_manager is None:
+            from src.backend.storage.game_history import GameHistoryManager
+            self.history_manager = GameHistoryManager()
+        return self.history_manager
+
+    def _san(self, uci):
+        try:
+            return self._board.san(chess.Move.from_uci(uci))
+        except (ValueError, AssertionError):
+            return uci
+
+    def _clear_rows(self):
+        for widget in self._rows:
+            self.rows_layout.removeWidget(widget)
+            widget.deleteLater()
+        self._rows = []
+
+    def _add_row(self, primary, secondary, on_click=None):
+        row = _ClickableRow(self.container) if on_click else QWidget(self.container)
+        if on_click:
+            row.clicked.connect(on_click)
+        row.setStyleSheet(f"""
+            QWidget {{
+                border-bottom: 1px solid {Styles.COLOR_BORDER};
+            }}
+            QWidget:hover {{
+                background-color: {Styles.COLOR_SURFACE_LIGHT};
+            }}
+        """)
+        row_layout = QHBoxLayout(row)
+        row_layout.setContentsMargins(14, 8, 14, 8)
+        row_layout.setSpacing(8)
+        lbl_primary = QLabel(primary)
+        lbl_primary.setStyleSheet(f"color: {Styles.COLOR_TEXT_PRIMARY}; font-weight: bold; font-size: 14px; border: none; background: transparent;")
+        row_layout.addWidget(lbl_primary)
+        lbl_secondary = QLabel(secondary)
+        lbl_secondary.setStyleSheet(f"color: {Styles.COLOR_TEXT_SECONDARY}; font-size: 12px; border: none; background: transparent;")
+        lbl_secondary.setMinimumWidth(0)
+        row_layout.addWidget(lbl_secondary, stretch=1)
+        self.rows_layout.addWidget(row)
+        self._rows.append(row)
+
+    def _add_section_label(self, text):
+        label = QLabel(text)
+        label.setStyleSheet(f"color: {Styles.COLOR_TEXT_MUTED}; font-size: 11px; font-weight: 600; padding: 8px 14px 4px 14px; background: transparent; border: none;")
+        self.rows_layout.addWidget(label)
+        self._rows.append(label)
+
+    def _add_move_row(self, stats):
+        count = stats["games"]
+        white, draws, black = (round(100 * stats[key] / count) for key in ("white_wins", "draws", "black_wins"))
+        # White wins / draws / black wins, as on opening explorers
+        info = f"{count} game{'' if count == 1 else 's'}  ·  {white}% / {draws}% / {black}%"
+        uci = stats["uci"]
+        self._add_row(self._san(uci), info, lambda: self.move_clicked.emit(uci))
+
+    def _add_game_row(self, row):
+        parts = [row.get("result") or "*", row.get("date") or ""]
+        if row.get("next_move"):
+            parts.append(f"then {self._san(row['next_move'])}")
+        title = f"{row.get('white') or '?'} – {row.get('black') or '?'}"
+        self._add_row(title, "  ·  ".join(p for p in parts if p), lambda: self.game_selected.emit(game_from_row(row)))
+
+    # ── Indexing ──────────────────────────────────────────────────────────────
+
+    def _on_index_progress(self, done, total):
+        if done < total:
+            self.status_label.setText(f"Indexing your games… {done:,} / {total:,}")
+            self.status_label.show()
+
+    def _on_index_done(self, indexed):
+        self.status_label.hide()
+        if indexed:
+            self._stale = True
+            if self.isVisible():
+                self.refresh()
+
+    def _on_index_error(self, message):
+        self.status_label.hide()
+        logger.error(f"Indexing history positions failed: {message}")
+
+    # ── Collapse / styles ─────────────────────────────────────────────────────
+
+    def _on_toggled(self, checked):
+        self.scroll.setVisible(checked and bool(self._rows))
+        self._update_toggle()
+
+    def _update_toggle(self):
+        arrow = "▼" if self.toggle.isChecked() else "▶"
+        self.toggle.setText(f"{arrow}  My Games  ({self._game_count})")
+        self.scroll.setVisible(self.toggle.isChecked() and bool(self._rows))
+
+    def refresh_styles(self):
+        self.toggle.setStyleSheet(f"""
+            QPushButton {{
+                background: transparent;
+                border: none;
+                text-align: left;
+                font-size: 14px;
+                font-weight: bold;
+                color: {Styles.COLOR_TEXT_PRIMARY};
+                padding: 2px 0px;
+            }}
+            QPushButton:hover {{
+                color: {Styles.COLOR_ACCENT};
+            }}
+        """)
+        self.status_label.setStyleSheet(f"font-size: 11px; color: {Styles.COLOR_TEXT_MUTED}; padding: 2px 0px;")
+        self.scroll.setStyleSheet(f"""
+            QScrollArea {{
+                background-color: {Styles.COLOR_SURFACE};
+                border: 1px solid {Styles.COLOR_BORDER};
+                border-radius: 8px;
+            }}
+            QScrollBar:vertical {{
+                background-color: {Styles.COLOR_BACKGROUND};
+                width: 10px;
+                margin: 0px 0px 0px 0px;
+                border-radius: 5px;
+            }}
+            QScrollBar::handle:vertical {{
+                background-color: {Styles.COLOR_BORDER_LIGHT};
+                min-height: 20px;
+                border-radius: 5px;
+            }}
+            QScrollBar::add-line:vertical, QScrollBar::sub-line:vertical {{
+                height: 0px;
+            }}
+        """)
+        self.container.setStyleSheet(f"background-color: {Styles.COLOR_SURFACE};")
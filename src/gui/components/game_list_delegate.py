@@ -0,0 +1,405 @@
+"""
+Game List Delegate - Paints history rows (players, result, opening, metadata)
+straight from database rows, without a widget per game.
+"""
+import json
+import os
+import re
+from typing import Any, Dict, List, Optional, Tuple
+
+from PyQt6.QtWidgets import QStyledItemDelegate, QStyle
+from PyQt6.QtCore import Qt, QRect, QSize
+from PyQt6.QtGui import QColor, QFont, QFontMetrics, QIcon, QPainter, QPixmap
+
+from ..styles import Styles
+from ...utils.logger import logger
+from ...utils.path_utils import get_resource_path
+
+try:
+    import qtawesome as qta
+    HAS_QTAWESOME = True
+except ImportError:
+    HAS_QTAWESOME = False
+    logger.warning("qtawesome not installed. Using text fallbacks for icons.")
+
+ROW_HEIGHT = 96
+_MARGIN_X, _MARGIN_Y = 16, 12
+_ICON = 16
+
+# Events that only repeat the time control and are not worth a line.
+SKIP_EVENTS = ["?", "Live Chess", "Rated Bullet game", "Rated Blitz game",
+               "Rated Rapid game", "rated bullet game", "rated blitz game",
+               "rated rapid game", "Casual Bullet game", "Casual Blitz game"]
+
+# Standard starting FEN (Chess960 games differ from this)
+_STANDARD_START_FEN = "rnbqkbnr/pppppppp/8/8/8/8/PPPPPPPP/RNBQKBNR w KQkq - 0 1"
+
+
+# ── Row text helpers ──────────────────────────────────────────────────────────
+
+def format_time_control(time_control):
+    """Format time control string from seconds to minutes (e.g. 180+2 -> 3+2, 600 -> 10)."""
+    if not time_control or time_control in ("-", "?"):
+        return time_control
+
+    tc = time_control.strip()
+    match = re.match(r"^(\d+)(?:\+(\d+))?$", tc)
+    if match:
+        try:
+            base_seconds = int(match.group(1))
+            increment = int(match.group(2)) if match.group(2) else 0
+
+            # Format base time
+            if base_seconds < 60:
+                base_str = f"{base_seconds}s"
+            elif base_seconds % 60 == 0:
+                base_str = str(base_seconds // 60)
+            else:
+                base_str = f"{base_seconds / 60:.1f}".rstrip('0').rstrip('.')
+
+            # Format increment
+            if increment > 0:
+                return f"{base_str}+{increment}"
+            else:
+                return base_str
+        except ValueError:
+            pass
+
+    # Handle FIDE complex formats like "40/7200:1800+30"
+    if "/" in tc or ":" in tc:
+        base_time = 0
+        increment = 0
+        periods = tc.split(":")
+        for p in periods:
+            parts = p.split("+")
+            base_part = parts[0]
+            if len(parts) > 1:
+                try:
+                    increment = int(parts[1])
+                except ValueError:
+                    pass
+
+            sec_part = base_part.split("/")[-1]
+            try:
+                base_time += int(sec_part)
+            except ValueError:
+                pass
+
+        if base_time > 0:
+            base_mins = base_time // 60
+            if increment > 0:
+                return f"{base_mins}+{increment}"
+            return f"{base_mins}"
+
+    return time_control
+
+
+def classify_time_control(time_control):
+    """Classify time control into bullet, blitz, rapid, or classical.
+
+    Thresholds match Chess.com / Lichess conventions:
+      Bullet   < 3 min  total (base + 40 × increment)
+      Blitz    < 10 min total
+      Rapid    < 30 min total
+      Classical ≥ 30 min total, or no / unknown time control
+
+    Example: 2+1 → 120 + 40 = 160 s → bullet  ✓
+             3+0 → 180 s → blitz  ✓
+    """
+    if not time_control or time_control in ("-", "?", "*", ""):
+        return "classical"
+
+    # Standard numeric format: "<base_sec>" or "<base_sec>+<inc_sec>"
+    match = re.match(r"^(\d+)(?:\+(\d+))?$", time_control.strip())
+    if match:
+        try:
+            base_seconds = int(match.group(1))
+            increment = int(match.group(2)) if match.group(2) else 0
+
+            # Estimate total time over a 40-move game
+            total_time = base_seconds + 40 * increment
+
+            if total_time < 180:    # < 3 min  → bullet
+                return "bullet"
+            elif total_time < 600:  # < 10 min → blitz
+                return "blitz"
+            elif total_time < 1800: # < 30 min → rapid
+                return "rapid"
+            else:
+                return "classical"
+        except ValueError:
+            pass
+
+    # Keyword fallback (e.g. Lichess exports "bullet", "blitz", etc.)
+    tc_lower = time_control.lower()
+    if "bullet" in tc_lower:
+        return "bullet"
+    elif "blitz" in tc_lower:
+        return "blitz"
+    elif "rapid" in tc_lower:
+        return "rapid"
+    elif any(k in tc_lower for k in ("classical", "daily", "correspondence", "unlimited", "infinite")):
+        return "classical"
+
+    # Unknown format — treat as classical (no time pressure assumed)
+    return "classical"
+
+
+def termination_icon(termination):
+    """Return icon name based on termination type."""
+    term_lower = termination.lower()
+    if "checkmate" in term_lower or "mate" in term_lower:
+        return "assets/images/checkmate.svg"
+    elif "resign" in term_lower:
+        return "assets/images/resign.svg"
+    elif "time" in term_lower or "timeout" in term_lower or "forfeit" in term_lower:
+        return "assets/images/timeout.svg"
+    elif "abandon" in term_lower:
+        return "fa5s.door-open"
+    elif "draw" in term_lower or "stalemate" in term_lower or "repetition" in term_lower:
+        return "assets/images/draw_black.svg"
+    return "fa5s.circle"
+
+
+def is_chess960(row) -> bool:
+    """Chess960 flag of a history row, or a non-standard starting position."""
+    if row.get("chess960"):
+        return True
+    fen = row.get("starting_fen")
+    return bool(fen and fen.split()[0:4] != _STANDARD_START_FEN.split()[0:4])
+
+
+def summary_accuracy(summary) -> Tuple[Optional[float], Optional[float]]:
+    """(white, black) accuracy from a game summary, in either stored layout."""
+    if not isinstance(summary, dict):
+        return None, None
+    # Try nested dictionary format first (default format from analyzer.py)
+    if 'white' in summary and isinstance(summary['white'], dict):
+        white_acc = summary['white'].get('accuracy')
+    else:
+        white_acc = summary.get('white_accuracy')
+    if 'black' in summary and isinstance(summary['black'], dict):
+        black_acc = summary['black'].get('accuracy')
+    else:
+        black_acc = summary.get('black_accuracy')
+    return white_acc, black_acc
+
+
+def result_color(result_text, white, black, usernames):
+    """Determine result color based on user perspective."""
+    if not usernames:
+        if result_text == "1-0":
+            return Styles.COLOR_BEST
+        elif result_text == "0-1":
+            return Styles.COLOR_BLUNDER
+        return Styles.COLOR_TEXT_SECONDARY
+
+    known_users = [u.lower() for u in usernames]
+    user_is_white = (white or "").lower() in known_users
+    user_is_black = (black or "").lower() in known_users
+
+    if result_text == "1-0":
+        return Styles.COLOR_BEST if user_is_white else Styles.COLOR_BLUNDER
+    elif result_text == "0-1":
+        return Styles.COLOR_BEST if user_is_black else Styles.COLOR_BLUNDER
+    return Styles.COLOR_TEXT_SECONDARY
+
+
+def outcome_color(outcome) -> Optional[str]:
+    """Color of a stored user_outcome ("win"/"loss"/"draw"), None for other players' games."""
+    if outcome == "win":
+        return Styles.COLOR_BEST
+    if outcome == "loss":
+        return Styles.COLOR_BLUNDER
+    if outcome == "draw":
+        return Styles.COLOR_TEXT_SECONDARY
+    return None
+
+
+# ── Pixmaps ───────────────────────────────────────────────────────────────────
+
+_PIXMAPS: Dict[Tuple[str, int, str], Optional[QPixmap]] = {}
+
+
+def _pixmap(icon: str, size: int, color: str = "") -> Optional[QPixmap]:
+    """Pixmap for an asset path or qtawesome name, cached per size/colour."""
+    key = (icon, size, color)
+    if key not in _PIXMAPS:
+        pixmap = None
+        if icon.endswith(".svg") or icon.endswith(".png"):
+            path = get_resource_path(icon)
+            if os.path.exists(path):
+                pixmap = QIcon(path).pixmap(size, size)
+        elif HAS_QTAWESOME and icon.startswith("fa5s."):
+            pixmap = qta.icon(icon, color=color or Styles.COLOR_TEXT_SECONDARY).pixmap(size, size)
+        _PIXMAPS[key] = pixmap if pixmap is not None and not pixmap.isNull() else None
+    return _PIXMAPS[key]
+
+
+def _source_icon(source: str) -> Optional[QPixmap]:
+    return _pixmap(f"assets/icons/{source}.png", _ICON) or _pixmap("assets/icons/file.png", _ICON)
+
+
+class GameListDelegate(QStyledItemDelegate):
+    """
+    Paints one history row from the database row returned by
+    ``GameListModel.ROW_ROLE``. Rows have a fixed height, so the view only
+    paints (and measures) the rows that are on screen.
+    """
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.usernames: List[str] = []
+
+    def sizeHint(self, option, index):
+        return QSize(option.rect.width(), ROW_HEIGHT)
+
+    # ── Row data ──────────────────────────────────────────────────────────────
+
+    @staticmethod
+    def card(row: Dict[str, Any]) -> Dict[str, Any]:
+        """Display strings for a row, computed on first paint and kept on the row."""
+        card = row.get("_card")
+        if card is None:
+            summary = {}
+            if row.get("summary_json"):
+                try:
+                    summary = json.loads(row["summary_json"])
+                except ValueError:
+                    pass
+            white_acc, black_acc = summary_accuracy(summary)
+            move_count = row.get("move_count")
+            eco, opening = row.get("eco") or "", row.get("opening") or ""
+            meta = []
+            if row.get("date"):
+                meta.append(("fa5s.calendar-alt", row["date"]))
+            time_control = row.get("time_control")
+            meta.append((f"assets/images/{classify_time_control(time_control)}.svg",
+                         format_time_control(time_control) or ""))
+            if is_chess960(row):
+                meta.append(("assets/images/chess960.svg", "Chess960"))
+            if move_count:
+                meta.append(("fa5s.chess-pawn", f"{move_count} moves"))
+            if row.get("termination"):
+                meta.append((termination_icon(row["termination"]), row["termination"]))
+            if white_acc is not None and black_acc is not None:
+                meta.append(("fa5s.bullseye", f"{white_acc:.0f}% / {black_acc:.0f}%"))
+            white_elo = f" ({row['white_elo']})" if row.get("white_elo") else ""
+            black_elo = f" ({row['black_elo']})" if row.get("black_elo") else ""
+            event = row.get("event")
+            card = row["_card"] = {
+                "white": f"{row.get('white')}{white_elo}",
+                "black": f"{row.get('black')}{black_elo}",
+                "opening": f"{eco}: {opening}" if eco and opening else (opening or eco),
+                "meta": meta,
+                "event": event if event and event not in SKIP_EVENTS else "",
+            }
+        return card
+
+    # ── Painting ──────────────────────────────────────────────────────────────
+
+    def paint(self, painter: QPainter, option, index):
+        from .game_list_model import GameListModel
+        row = index.data(GameListModel.ROW_ROLE)
+        if row is None:
+            return
+        card = self.card(row)
+        rect = option.rect
+        painter.save()
+        painter.setRenderHint(QPainter.RenderHint.Antialiasing)
+
+        hovered = bool(option.state & QStyle.StateFlag.State_MouseOver)
+        painter.fillRect(rect, QColor(Styles.COLOR_SURFACE if hovered else Styles.COLOR_BACKGROUND))
+        painter.setPen(QColor(Styles.COLOR_SURFACE_LIGHT))
+        painter.drawLine(rect.left(), rect.bottom(), rect.right(), rect.bottom())
+
+        left = rect.left() + _MARGIN_X
+        right = rect.right() - _MARGIN_X
+        y = rect.top() + _MARGIN_Y
+
+        # Row 1: source, players (winner crowned), result pill
+        line_height = 20
+        result = row.get("result") or ""
+        bold = QFont(option.font)
+        bold.setPixelSize(14)
+        bold.setBold(True)
+        pill_width = QFontMetrics(bold).horizontalAdvance(result) + 16
+        pill = QRect(right - pill_width, y, pill_width, line_height)
+        painter.setPen(Qt.PenStyle.NoPen)
+        painter.setBrush(QColor(Styles.COLOR_SURFACE_LIGHT))
+        painter.drawRoundedRect(pill, 4, 4)
+        painter.setFont(bold)
+        # Stored user-perspective outcome; rows of other players fall back to the result
+        color = outcome_color(row.get("user_outcome"))
+        if color is None:
+            color = result_color(result, row.get("white"), row.get("black"), self.usernames)
+        painter.setPen(QColor(color))
+        painter.drawText(pill, Qt.AlignmentFlag.AlignCenter, result)
+
+        x = left
+        source_icon = _source_icon(row.get("source") or "file")
+        if source_icon is not None:
+            painter.drawPixmap(x, y + (line_height - _ICON) // 2, source_icon)
+            x += _ICON + 8
+        crown = _pixmap("assets/images/winner-crown.svg", 14)
+        small = QFont(option.font)
+        small.setPixelSize(12)
+        for name, won in ((card["white"], result == "1-0"), ("vs", False), (card["black"], result == "0-1")):
+            is_vs = name == "vs"
+            painter.setFont(small if is_vs else bold)
+            painter.setPen(QColor(Styles.COLOR_TEXT_MUTED if is_vs else Styles.COLOR_TEXT_PRIMARY))
+            metrics = painter.fontMetrics()
+            text = metrics.elidedText(name, Qt.TextElideMode.ElideRight, max(0, pill.left() - 8 - x))
+            width = metrics.horizontalAdvance(text)
+            painter.drawText(QRect(x, y, width, line_height), Qt.AlignmentFlag.AlignVCenter, text)
+            x += width + 8
+            if won and crown is not None:
+                painter.drawPixmap(x, y + (line_height - 14) // 2, crown)
+                x += 14 + 8
+        y += line_height + 6
+
+        # Row 2: opening
+        if card["opening"]:
+            book = _pixmap("assets/images/book.svg", _ICON) or _pixmap("fa5s.book-open", _ICON, Styles.COLOR_TEXT_MUTED)
+            if book is not None:
+                painter.drawPixmap(left, y, book)
+            italic = QFont(option.font)
+            italic.setPixelSize(12)
+            italic.setItalic(True)
+            painter.setFont(italic)
+            painter.setPen(QColor(Styles.COLOR_TEXT_MUTED))
+            text_rect = QRect(left + _ICON + 6, y, right - left - _ICON - 6, _ICON)
+            text = painter.fontMetrics().elidedText(card["opening"], Qt.TextElideMode.ElideRight, text_rect.width())
+            painter.drawText(text_rect, Qt.AlignmentFlag.AlignVCenter, text)
+        y += _ICON + 6
+
+        # Row 3: date, time control, variant, moves, termination, accuracy
+        meta_font = QFont(option.font)
+        meta_font.setPixelSize(11)
+        painter.setFont(meta_font)
+        painter.setPen(QColor(Styles.COLOR_TEXT_SECONDARY))
+        metrics = painter.fontMetrics()
+        x = left
+        for icon, text in card["meta"]:
+            pixmap = _pixmap(icon, _ICON)
+            if pixmap is not None:
+                painter.drawPixmap(x, y, pixmap)
+                x += _ICON + 4
+            width = metrics.horizontalAdvance(text)
+            painter.drawText(QRect(x, y, width, _ICON), Qt.AlignmentFlag.AlignVCenter, text)
+            x += width + 12
+            if x >= right:
+                break
+        y += _ICON + 4
+
+        # Row 4: event (if meaningful)
+        if card["event"]:
+            trophy = _pixmap("fa5s.trophy", 11, Styles.COLOR_TEXT_MUTED)
+            text_left = left
+            if trophy is not None:
+                painter.drawPixmap(left, y + 2, trophy)
+                text_left += 14
+            painter.setPen(QColor(Styles.COLOR_TEXT_MUTED))
+            painter.drawText(QRect(text_left, y, right - text_left, 14), Qt.AlignmentFlag.AlignVCenter,
+                             metrics.elidedText(card["event"], Qt.TextElideMode.ElideRight, right - text_left))
+        painter.restore()
@@ -0,0 +1,138 @@
+"""
+Game List Model - History rows fetched from SQLite a page at a time.
+"""
+import json
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from PyQt6.QtCore import QAbstractListModel, QModelIndex, Qt
+
+from src.backend.storage.models import GameAnalysis, GameMetadata
+
+# pager(cursor) -> (rows, next cursor or None after the last page)
+Pager = Callable[[Any], Tuple[List[Dict[str, Any]], Any]]
+
+
+def game_from_row(g_dict: Dict[str, Any]) -> GameAnalysis:
+    """Build a (move-less) GameAnalysis from a history row."""
+    metadata = GameMetadata(
+        white=g_dict["white"],
+        black=g_dict["black"],
+        result=g_dict["result"],
+        date=g_dict["date"],
+        event=g_dict["event"],
+        white_elo=g_dict.get("white_elo"),
+        black_elo=g_dict.get("black_elo"),
+        time_control=g_dict.get("time_control"),
+        eco=g_dict.get("eco"),
+        opening=g_dict.get("opening"),
+        termination=g_dict.get("termination"),
+        starting_fen=g_dict.get("starting_fen"),
+        source=g_dict.get("source", "file"),
+        chess960=bool(g_dict.get("chess960", 0))
+    )
+
+    summary = {}
+    if g_dict.get("summary_json"):
+        try:
+            summary = json.loads(g_dict["summary_json"])
+        except ValueError:
+            pass
+
+    return GameAnalysis(
+        game_id=g_dict["id"],
+        metadata=metadata,
+        pgn_content=g_dict.get("pgn"),
+        summary=summary
+    )
+
+
+class GameListModel(QAbstractListModel):
+    """
+    List model over history rows (plain dicts from GameHistoryManager).
+
+    With a pager the model starts empty and the view pulls pages through
+    ``canFetchMore``/``fetchMore`` as it scrolls; ``set_rows`` shows a fixed
+    list (e.g. search results). ``GameAnalysis`` objects are only built for
+    the game the user opens.
+    """
+
+    ROW_ROLE = Qt.ItemDataRole.UserRole + 1
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self._rows: List[Dict[str, Any]] = []
+        self._pager: Optional[Pager] = None
+        self._cursor: Any = None
+
+    # ── Sources ───────────────────────────────────────────────────────────────
+
+    def set_pager(self, pager: Optional[Pager]):
+        """Show the rows ``pager`` returns, fetched page by page on demand."""
+        self.beginResetModel()
+        self._rows = []
+        self._pager = pager
+        self._cursor = None
+        self.endResetModel()
+
+    def set_rows(self, rows: List[Dict[str, Any]]):
+        """Show a fixed list of rows."""
+        self.beginResetModel()
+        self._rows = list(rows)
+        self._pager = None
+        self._cursor = None
+        self.endResetModel()
+
+    # ── Qt model interface ────────────────────────────────────────────────────
+
+    def rowCount(self, parent=QModelIndex()) -> int:
+        return 0 if parent.isValid() else len(self._rows)
+
+    def data(self, index, role=Qt.ItemDataRole.DisplayRole):
+        if not index.isValid() or not 0 <= index.row() < len(self._rows):
+            return None
+        row = self._rows[index.row()]
+        if role == self.ROW_ROLE:
+            return row
+        if role == Qt.ItemDataRole.DisplayRole:
+            return f"{row.get('white')} vs {row.get('black')}"
+        if role == Qt.ItemDataRole.ToolTipRole:
+            return row.get("opening") or None
+        return None
+
+    def canFetchMore(self, parent=QModelIndex()) -> bool:
+        return not parent.isValid() and self._pager is not None
+
+    def fetchMore(self, parent=QModelIndex()):
+        if not self.canFetchMore(parent):
+            return
+        rows, cursor = self._pager(self._cursor)
+        # Last page: nothing more to fetch.
+        if cursor is None:
+            self._pager = None
+        self._cursor = cursor
+        if rows:
+            start = len(self._rows)
+            self.beginInsertRows(QModelIndex(), start, start + len(rows) - 1)
+            self._rows.extend(rows)
+            self.endInsertRows()
+
+    # ── Helpers ───────────────────────────────────────────────────────────────
+
+    def has_more(self) -> bool:
+        return self._pager is not None
+
+    def row_data(self, row: int) -> Optional[Dict[str, Any]]:
+        return self._rows[row] if 0 <= row < len(self._rows) else None
+
+    def game_at(self, row: int) -> Optional[GameAnalysis]:
+        data = self.row_data(row)
+        return game_from_row(data) if data is not None else None
+
+    def remove_game(self, game_id: str) -> bool:
+        for row, data in enumerate(self._rows):
+            if data.get("id") == game_id:
+                self.beginRemoveRows(QModelIndex(), row, row)
+                del self._rows[row]
+                self.endRemoveRows()
+                return True
+        return False
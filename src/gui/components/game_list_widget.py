@@ -1,22 +1,28 @@
 """
-Game List Widget - Paginated list container for chess games.
+Game List Widget - Virtualized list of chess games backed by a paged model.
 """
-from PyQt6.QtWidgets import QWidget, QVBoxLayout, QHBoxLayout, QListWidget, QListWidgetItem, QFrame, QLabel, QPushButton
+from PyQt6.QtWidgets import QWidget, QVBoxLayout, QHBoxLayout, QListView, QFrame, QLabel, QAbstractItemView
 from PyQt6.QtCore import pyqtSignal, Qt
 from ..styles import Styles
-from .game_list_item_widget import GameListItemWidget
+from .game_list_delegate import GameListDelegate
+from .game_list_model import GameListModel
 
 class GameListWidget(QWidget):
-    """Container widget for the game list with pagination (10 games per page)."""
+    """
+    Container widget for the game list.
+
+    A QListView over ``GameListModel`` painted by ``GameListDelegate``: rows
+    are fetched from the database as the list scrolls and only visible rows
+    are painted, so a history of any size opens instantly.
+    """
 
     game_selected = pyqtSignal(object)
-    _PAGE_SIZE = 10
 
-    def __init__(self):
+    def __init__(self, history_manager=None):
         super().__init__()
-        self._all_games: list = []
-        self._current_page: int = 0
         self.usernames: list = []
+        # Used to delete games; a default manager is opened when not given.
+        self.history_manager = history_manager
 
         root = QVBoxLayout(self)
         root.setContentsMargins(0, 0, 0, 0)
@@ -28,132 +34,117 @@ class GameListWidget(QWidget):
         root.addWidget(self.title_label)
 
         # ── List ─────────────────────────────────────────────────────────────
-        self.list_widget = QListWidget()
-        self.list_widget.setFrameShape(QFrame.Shape.NoFrame)
-        self.list_widget.setSpacing(0)
+        self.model = GameListModel(self)
+        self.delegate = GameListDelegate(self)
+        self.list_view = QListView()
+        self.list_view.setModel(self.model)
+        self.list_view.setItemDelegate(self.delegate)
+        self.list_view.setUniformItemSizes(True)
+        self.list_view.setFrameShape(QFrame.Shape.NoFrame)
+        self.list_view.setVerticalScrollMode(QAbstractItemView.ScrollMode.ScrollPerPixel)
+        self.list_view.setSelectionMode(QAbstractItemView.SelectionMode.NoSelection)
+        self.list_view.setMouseTracking(True)  # hover highlight
+        self.list_view.setContextMenuPolicy(Qt.ContextMenuPolicy.CustomContextMenu)
+        self.list_view.customContextMenuRequested.connect(self._on_context_menu)
+        self.list_view.clicked.connect(self._on_item_clicked)
         self._apply_list_style()
-        self.list_widget.itemClicked.connect(self._on_item_clicked)
-        root.addWidget(self.list_widget, stretch=1)
-
-        # ── Pagination bar ───────────────────────────────────────────────────
-        self._pagination_bar = QWidget()
-        self._pagination_bar.setFixedHeight(52)
-        self._pagination_bar.setStyleSheet(
-            f"background-color: {Styles.COLOR_SURFACE}; border-top: 1px solid {Styles.COLOR_BORDER};"
+        root.addWidget(self.list_view, stretch=1)
+
+        # ── Footer ───────────────────────────────────────────────────────────
+        self._footer = QWidget()
+        self._footer.setFixedHeight(40)
+        self._apply_footer_style()
+        footer_layout = QHBoxLayout(self._footer)
+        footer_layout.setContentsMargins(16, 0, 16, 0)
+        self.counter_label = QLabel()
+        self.counter_label.setStyleSheet(
+            f"color: {Styles.COLOR_TEXT_SECONDARY}; font-size: 12px;"
+            " background: transparent; border: none;"
         )
-        self._page_bar_layout = QHBoxLayout(self._pagination_bar)
-        self._page_bar_layout.setContentsMargins(16, 0, 16, 0)
-        self._page_bar_layout.setSpacing(6)
-        root.addWidget(self._pagination_bar)
+        footer_layout.addWidget(self.counter_label)
+        footer_layout.addStretch()
+        root.addWidget(self._footer)
+
+        self.model.modelReset.connect(self._update_counter)
+        self.model.rowsInserted.connect(self._update_counter)
+        self.model.rowsRemoved.connect(self._update_counter)
 
         # Alias kept for history_view.py refresh_styles() call
         self.layout = root
 
-        self._render_page()
+        self._update_counter()
 
     # ── Public API ────────────────────────────────────────────────────────────
 
-    def set_games(self, games, usernames=None):
-        """Replace the game list and jump back to page 1."""
-        self._all_games = list(games)
+    def set_pager(self, pager, usernames=None):
+        """Show the rows returned by ``pager(cursor)``, loaded while scrolling."""
+        self._set_usernames(usernames)
+        self.model.set_pager(pager)
+        # Fill the first screen; further pages follow the scroll bar.
+        if self.model.canFetchMore():
+            self.model.fetchMore()
+        self.list_view.scrollToTop()
+
+    def set_rows(self, rows, usernames=None):
+        """Show a fixed list of history rows."""
+        self._set_usernames(usernames)
+        self.model.set_rows(rows)
+        self.list_view.scrollToTop()
+
+    def _set_usernames(self, usernames):
         if usernames is not None:
             self.usernames = usernames
-        self._current_page = 0
-        self._render_page()
-
-    @property
-    def games(self):
-        """Compatibility shim — callers that read .games get the full list."""
-        return self._all_games
-
-    @games.setter
-    def games(self, value):
-        self._all_games = list(value)
-
-    # ── Rendering ─────────────────────────────────────────────────────────────
+            self.delegate.usernames = usernames
 
-    def _total_pages(self) -> int:
-        if not self._all_games:
-            return 1
-        import math
-        return math.ceil(len(self._all_games) / self._PAGE_SIZE)
+    # ── Footer ────────────────────────────────────────────────────────────────
 
-    def _render_page(self):
-        """Populate the list widget with the current page's games."""
-        self.list_widget.clear()
-
-        start = self._current_page * self._PAGE_SIZE
-        end = start + self._PAGE_SIZE
-        page_games = self._all_games[start:end]
-
-        for game in page_games:
-            item = QListWidgetItem(self.list_widget)
-            widget = GameListItemWidget(game, self.usernames)
-            widget.delete_requested.connect(self._on_delete_requested)
-            item.setSizeHint(widget.sizeHint())
-            self.list_widget.addItem(item)
-            self.list_widget.setItemWidget(item, widget)
-
-        self._rebuild_pagination()
-
-    def _rebuild_pagination(self):
-        """Rebuild the pagination button bar to reflect the current state."""
-        # Clear existing widgets
-        while self._page_bar_layout.count():
-            child = self._page_bar_layout.takeAt(0)
-            if child.widget():
-                child.widget().deleteLater()
-
-        total = self._total_pages()
-        current = self._current_page
-
-        # ── Page counter label (left) ────────────────────────────────────────
-        start = current * self._PAGE_SIZE + 1
-        end = min(start + self._PAGE_SIZE - 1, len(self._all_games))
-        total_games = len(self._all_games)
-
-        if total_games == 0:
-            counter_text = "No games"
+    def _update_counter(self, *_):
+        count = self.model.rowCount()
+        if count == 0:
+            text = "No games"
+        elif self.model.has_more():
+            text = f"{count}+ games"
         else:
-            counter_text = f"{start}–{end} of {total_games}"
-
-        counter = QLabel(counter_text)
-        counter.setStyleSheet(
-            f"color: {Styles.COLOR_TEXT_SECONDARY}; font-size: 12px;"
-            " background: transparent; border: none;"
-        )
-        self._page_bar_layout.addWidget(counter)
-        self._page_bar_layout.addStretch()
-
-        # ── Prev button ──────────────────────────────────────────────────────
-        btn_prev = self._make_page_btn("‹ Prev", enabled=(current > 0))
-        btn_prev.clicked.connect(self._go_prev)
-        self._page_bar_layout.addWidget(btn_prev)
-
-        # ── Page number buttons (show up to 5 around current) ────────────────
-        window = 2
-        lo = max(0, current - window)
-        hi = min(total - 1, current + window)
-
-        if lo > 0:
-            self._page_bar_layout.addWidget(self._make_page_num_btn(0))
-            if lo > 1:
-                self._page_bar_layout.addWidget(self._make_ellipsis())
-
-        for p in range(lo, hi + 1):
-            self._page_bar_layout.addWidget(self._make_page_num_btn(p))
-
-        if hi < total - 1:
-            if hi < total - 2:
-                self._page_bar_layout.addWidget(self._make_ellipsis())
-            self._page_bar_layout.addWidget(self._make_page_num_btn(total - 1))
-
-        # ── Next button ──────────────────────────────────────────────────────
-        btn_next = self._make_page_btn("Next ›", enabled=(current < total - 1))
-        btn_next.clicked.connect(self._go_next)
-        self._page_bar_layout.addWidget(btn_next)
-
-    # ── Navigation ────────────────────────────────────────────────────────────
+            text = f"{count} game" + ("" if count == 1 else "s")
+        self.counter_label.setText(text)
+
+    # ── Interaction ───────────────────────────────────────────────────────────
+
+    def _on_item_clicked(self, index):
+        game = self.model.game_at(index.row())
+        if game is not None:
+            self.game_selected.emit(game)
+
+    def _on_context_menu(self, pos):
+        """Right-click context menu with a Delete option."""
+        from PyQt6.QtWidgets import QMenu
+        index = self.list_view.indexAt(pos)
+        row = self.model.row_data(index.row()) if index.isValid() else None
+        if not row:
+            return
+        menu = QMenu(self)
+        menu.setStyleSheet(f"""
+            QMenu {{
+                background-color: {Styles.COLOR_SURFACE};
+                border: 1px solid {Styles.COLOR_BORDER};
+                border-radius: 6px;
+                padding: 4px;
+            }}
+            QMenu::item {{
+                color: {Styles.COLOR_TEXT_PRIMARY};
+                padding: 8px 20px;
+                border-radius: 4px;
+                font-size: 13px;
+            }}
+            QMenu::item:selected {{
+                background-color: {Styles.COLOR_BLUNDER};
+                color: white;
+            }}
+        """)
+        act_delete = menu.addAction("🗑  Delete from history")
+        chosen = menu.exec(self.list_view.viewport().mapToGlobal(pos))
+        if chosen is act_delete:
+            self._on_delete_requested(row["id"])
 
     def _on_delete_requested(self, game_id: str):
         """Delete a single game from history after confirmation."""
@@ -171,103 +162,14 @@ class GameListWidget(QWidget):
             return
 
         try:
-            GameHistoryManager().delete_game(game_id)
+            (self.history_manager or GameHistoryManager()).delete_game(game_id)
         except Exception as e:
             from ...utils.logger import logger
             logger.error(f"Failed to delete game {game_id}: {e}")
             return
 
-        # Remove from the local list and re-render without reloading from DB
-        self._all_games = [g for g in self._all_games if g.game_id != game_id]
-
-        # Stay on the current page unless it no longer exists
-        max_page = max(0, self._total_pages() - 1)
-        if self._current_page > max_page:
-            self._current_page = max_page
-
-        self._render_page()
-
-    def _go_prev(self):
-        if self._current_page > 0:
-            self._current_page -= 1
-            self._render_page()
-
-    def _go_next(self):
-        if self._current_page < self._total_pages() - 1:
-            self._current_page += 1
-            self._render_page()
-
-    def _go_to_page(self, page: int):
-        if 0 <= page < self._total_pages():
-            self._current_page = page
-            self._render_page()
-
-    def _on_item_clicked(self, item):
-        index = self.list_widget.row(item)
-        start = self._current_page * self._PAGE_SIZE
-        absolute_index = start + index
-        if 0 <= absolute_index < len(self._all_games):
-            self.game_selected.emit(self._all_games[absolute_index])
-
-    # ── Button factories ──────────────────────────────────────────────────────
-
-    def _make_page_btn(self, text: str, enabled: bool) -> QPushButton:
-        btn = QPushButton(text)
-        btn.setFixedHeight(30)
-        btn.setEnabled(enabled)
-        btn.setCursor(Qt.CursorShape.PointingHandCursor if enabled else Qt.CursorShape.ArrowCursor)
-        btn.setStyleSheet(f"""
-            QPushButton {{
-                background-color: {Styles.COLOR_SURFACE_LIGHT if enabled else 'transparent'};
-                color: {Styles.COLOR_TEXT_PRIMARY if enabled else Styles.COLOR_TEXT_MUTED};
-                border: 1px solid {Styles.COLOR_BORDER};
-                border-radius: 6px;
-                padding: 0 12px;
-                font-size: 13px;
-                font-weight: 600;
-            }}
-            QPushButton:hover {{
-                background-color: {Styles.COLOR_ACCENT};
-                color: {Styles.COLOR_TEXT_PRIMARY};
-                border-color: {Styles.COLOR_ACCENT};
-            }}
-            QPushButton:disabled {{
-                opacity: 0.4;
-            }}
-        """)
-        return btn
-
-    def _make_page_num_btn(self, page: int) -> QPushButton:
-        is_current = (page == self._current_page)
-        btn = QPushButton(str(page + 1))
-        btn.setFixedSize(30, 30)
-        btn.setCursor(Qt.CursorShape.PointingHandCursor)
-        btn.setStyleSheet(f"""
-            QPushButton {{
-                background-color: {Styles.COLOR_ACCENT if is_current else Styles.COLOR_SURFACE_LIGHT};
-                color: {Styles.COLOR_TEXT_PRIMARY};
-                border: 1px solid {Styles.COLOR_ACCENT if is_current else Styles.COLOR_BORDER};
-                border-radius: 6px;
-                font-size: 12px;
-                font-weight: {'700' if is_current else '400'};
-            }}
-            QPushButton:hover {{
-                background-color: {Styles.COLOR_ACCENT};
-                border-color: {Styles.COLOR_ACCENT};
-            }}
-        """)
-        btn.clicked.connect(lambda _, p=page: self._go_to_page(p))
-        return btn
-
-    def _make_ellipsis(self) -> QLabel:
-        lbl = QLabel("…")
-        lbl.setFixedSize(20, 30)
-        lbl.setAlignment(Qt.AlignmentFlag.AlignCenter)
-        lbl.setStyleSheet(
-            f"color: {Styles.COLOR_TEXT_MUTED}; font-size: 13px;"
-            " background: transparent; border: none;"
-        )
-        return lbl
+        # Remove the row without reloading from DB
+        self.model.remove_game(game_id)
 
     # ── Style refresh ─────────────────────────────────────────────────────────
 
@@ -282,29 +184,23 @@ class GameListWidget(QWidget):
         """)
 
     def _apply_list_style(self):
-        self.list_widget.setStyleSheet(f"""
-            QListWidget {{
+        self.list_view.setStyleSheet(f"""
+            QListView {{
                 background-color: {Styles.COLOR_BACKGROUND};
                 border: none;
                 outline: none;
             }}
-            QListWidget::item {{
-                background-color: {Styles.COLOR_BACKGROUND};
-                border: none;
-                border-bottom: 1px solid {Styles.COLOR_SURFACE_LIGHT};
-                padding: 0px;
-                margin: 0px;
-            }}
-            QListWidget::item:hover {{
-                background-color: {Styles.COLOR_SURFACE};
-            }}
         """)
 
+    def _apply_footer_style(self):
+        self._footer.setStyleSheet(
+            f"background-color: {Styles.COLOR_SURFACE}; border-top: 1px solid {Styles.COLOR_BORDER};"
+        )
+
     def refresh_styles(self):
         """Re-applies styles on theme change."""
         self._apply_title_style()
         self._apply_list_style()
-        self._pagination_bar.setStyleSheet(
-            f"background-color: {Styles.COLOR_SURFACE}; border-top: 1px solid {Styles.COLOR_BORDER};"
-        )
-        self._render_page()
+        self._apply_footer_style()
+        # The delegate reads Styles at paint time
+        self.list_view.viewport().update()
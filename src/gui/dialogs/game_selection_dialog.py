@@ -3,6 +3,7 @@ from PyQt6.QtWidgets import (QDialog, QVBoxLayout, QListWidget, QListWidgetItem,
 from PyQt6.QtCore import Qt
 from src.gui.styles import Styles
 from src.gui.utils.gui_utils import create_button
+from src.backend.storage.game_history import move_count_for, pgn_ply_count
 
 class GameSelectionDialog(QDialog):
     def __init__(self, games_data, parent=None):
@@ -104,17 +105,11 @@ class GameSelectionDialog(QDialog):
             end_time = game.get("end_time", 0)
             date_str = datetime.datetime.fromtimestamp(end_time).strftime('%Y-%m-%d %H:%M')
             
-            # Move count (estimate from PGN if available)
+            # Move count (counted from the PGN if available)
             move_count = ""
-            pgn = game.get("pgn", "")
-            if pgn:
-                import re
-                # Match: whitespace + 1-3 digits + dot + space + letter (actual move like "1. e4")
-                moves = re.findall(r'(?:^|\s)(\d{1,3})\.\s+[A-Za-z]', pgn, re.MULTILINE)
-                if moves:
-                    move_nums = [int(m) for m in moves if int(m) <= 500]
-                    if move_nums:
-                        move_count = f" • {max(move_nums)} moves"
+            plies = pgn_ply_count(game.get("pgn", ""))
+            if plies:
+                move_count = f" • {move_count_for(plies)} moves"
             
             # Build display text
             line1 = f"{date_str}  •  {time_class}  •  {result_str}{move_count}"
@@ -6,6 +6,7 @@ from .drop_zone import DropZone
 from .game_card import GameCard
 from .inline_game_list import InlineGameList
 from .api_worker import ApiWorker, register_worker, remove_worker
+from .pgn_load_worker import PgnLoadWorker
 from .pgn_file_panel import PgnFilePanel
 from .pgn_text_panel import PgnTextPanel
 from .chesscom_panel import ChessComPanel
@@ -20,6 +21,7 @@ __all__ = [
     'ApiWorker',
     'register_worker',
     'remove_worker',
+    'PgnLoadWorker',
     'PgnFilePanel',
     'PgnTextPanel',
     'ChessComPanel',
@@ -31,3 +31,30 @@ def classify_time_control(tc: str) -> str:
         return "Classical"
     except Exception:
         return tc
+
+def _row_lines(tags, plies: int) -> tuple:
+    white = tags.get("White") or "?"
+    black = tags.get("Black") or "?"
+    w_elo = tags.get("WhiteElo") or "?"
+    b_elo = tags.get("BlackElo") or "?"
+    result = tags.get("Result") or "?"
+    date = tags.get("Date") or "?"
+    tc_label = classify_time_control(tags.get("TimeControl", ""))
+    move_count = (plies + 1) // 2
+
+    line1 = f"{date}  ·  {tc_label}  ·  {result}  ·  {move_count} moves"
+    line2 = f"{white} ({w_elo})  vs  {black} ({b_elo})"
+    return line1, line2
+
+def pgn_game_row(game) -> tuple:
+    """The two picker lines (date · speed · result · moves, players) of a parsed game."""
+    md = game.metadata
+    tags = dict(md.headers)
+    tags.update({"White": md.white, "Black": md.black, "Result": md.result, "Date": md.date,
+                 "WhiteElo": md.white_elo or md.headers.get("WhiteElo"),
+                 "BlackElo": md.black_elo or md.headers.get("BlackElo")})
+    return _row_lines(tags, len(game.moves))
+
+def pgn_entry_row(entry) -> tuple:
+    """The picker lines of a game from a PGN file's header index (pgn_index.PgnIndexEntry)."""
+    return _row_lines(entry.tags, entry.plies)
@@ -1,7 +1,7 @@
 """
 Inline game list component for the Load Game dialog.
 """
-from PyQt6.QtWidgets import QWidget, QVBoxLayout, QHBoxLayout, QLabel, QPushButton, QScrollArea
+from PyQt6.QtWidgets import QWidget, QVBoxLayout, QHBoxLayout, QLabel, QPushButton, QScrollArea, QProgressBar
 from PyQt6.QtCore import pyqtSignal, Qt
 from ...styles import Styles
 from .game_card import GameCard
@@ -11,10 +11,13 @@ class InlineGameList(QWidget):
     Scrollable list of GameCard rows with 10-games pagination.
     Emits game_chosen(index) when a card is clicked.
     Emits cleared() when the Clear button is clicked.
-    Also supports pre-selecting the first item.
+    Also supports pre-selecting the first item, and growing while games are
+    still being read (append() plus a progress bar with a Cancel button that
+    emits cancel_requested()).
     """
     game_chosen = pyqtSignal(int)
     cleared = pyqtSignal()
+    cancel_requested = pyqtSignal()
 
     def __init__(self, parent=None):
         super().__init__(parent)
@@ -117,6 +120,43 @@ class InlineGameList(QWidget):
 
         root.addWidget(self._pagination_widget)
 
+        # Reading progress (shown while games are still arriving)
+        self._loading_widget = QWidget()
+        loading_layout = QHBoxLayout(self._loading_widget)
+        loading_layout.setContentsMargins(2, 4, 2, 4)
+        loading_layout.setSpacing(10)
+
+        self._progress = QProgressBar()
+        self._progress.setRange(0, 1000)
+        self._progress.setTextVisible(False)
+        self._progress.setFixedHeight(6)
+        self._progress.setStyleSheet(f"""
+            QProgressBar {{
+                background-color: {Styles.COLOR_SURFACE};
+                border: none;
+                border-radius: 3px;
+            }}
+            QProgressBar::chunk {{
+                background-color: {Styles.COLOR_ACCENT};
+                border-radius: 3px;
+            }}
+        """)
+        loading_layout.addWidget(self._progress, stretch=1)
+
+        self.lbl_progress = QLabel("")
+        self.lbl_progress.setStyleSheet(f"font-size: 12px; color: {Styles.COLOR_TEXT_SECONDARY};")
+        loading_layout.addWidget(self.lbl_progress)
+
+        self.btn_cancel = QPushButton("Cancel")
+        self.btn_cancel.setFocusPolicy(Qt.FocusPolicy.NoFocus)
+        self.btn_cancel.setCursor(Qt.CursorShape.PointingHandCursor)
+        self.btn_cancel.setStyleSheet(self._button_style())
+        self.btn_cancel.clicked.connect(self.cancel_requested.emit)
+        loading_layout.addWidget(self.btn_cancel)
+
+        self._loading_widget.setVisible(False)
+        root.addWidget(self._loading_widget)
+
         self._all_rows: list[tuple[str, str]] = []
         self._cards: list[GameCard] = []
         self._selected_index: int = -1
@@ -152,20 +192,36 @@ class InlineGameList(QWidget):
         self._selected_index = -1
         self._update_page()
 
-    def _update_page(self):
-        # Clear old cards
-        for card in self._cards:
-            self._cards_layout.removeWidget(card)
-            card.deleteLater()
-        self._cards.clear()
+    def append(self, rows: list[tuple[str, str]]):
+        """Add rows at the end, keeping the page and selection the user is on."""
+        page_end = (self._current_page + 1) * self._games_per_page
+        page_had_room = len(self._all_rows) < page_end
+        self._all_rows = self._all_rows + rows
+        if page_had_room:
+            self._update_page()
+        else:
+            self._update_header()
 
-        total_games = len(self._all_rows)
-        total_pages = (total_games + self._games_per_page - 1) // self._games_per_page
+    def set_header(self, header: str):
+        self._header_template = header
+        self._update_header()
 
-        start_idx = self._current_page * self._games_per_page
-        end_idx = min(start_idx + self._games_per_page, total_games)
+    def start_loading(self):
+        self._progress.setValue(0)
+        self.lbl_progress.setText("")
+        self._loading_widget.setVisible(True)
 
-        # Update Header
+    def set_progress(self, text: str, done: int, total: int):
+        if total > 0:
+            self._progress.setValue(min(1000, done * 1000 // total))
+        self.lbl_progress.setText(text)
+
+    def finish_loading(self):
+        self._loading_widget.setVisible(False)
+
+    def _update_header(self):
+        total_games = len(self._all_rows)
+        total_pages = (total_games + self._games_per_page - 1) // self._games_per_page
         if total_pages > 1:
             header_text = f"{self._header_template} - Page {self._current_page + 1} of {total_pages}"
             self._pagination_widget.setVisible(True)
@@ -179,6 +235,18 @@ class InlineGameList(QWidget):
         self._header.setText(header_text)
         self._header.setVisible(bool(header_text))
 
+    def _update_page(self):
+        # Clear old cards
+        for card in self._cards:
+            self._cards_layout.removeWidget(card)
+            card.deleteLater()
+        self._cards.clear()
+
+        start_idx = self._current_page * self._games_per_page
+        end_idx = min(start_idx + self._games_per_page, len(self._all_rows))
+
+        self._update_header()
+
         # Add cards for current page
         for i in range(start_idx, end_idx):
             line1, line2 = self._all_rows[i]
@@ -224,4 +292,5 @@ class InlineGameList(QWidget):
             self._update_page()
 
     def clear(self):
+        self.finish_loading()
         self.populate([], "")
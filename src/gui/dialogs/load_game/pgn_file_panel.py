@@ -5,21 +5,27 @@ from PyQt6.QtWidgets import QWidget, QVBoxLayout, QFileDialog, QMessageBox
 from PyQt6.QtCore import pyqtSignal, Qt
 from .drop_zone import DropZone
 from .inline_game_list import InlineGameList
-from .helpers import classify_time_control
+from .pgn_load_worker import PgnLoadWorker
+from .helpers import pgn_entry_row
 from src.gui.utils.gui_utils import create_button
+from src.utils.logger import logger
 
 class PgnFilePanel(QWidget):
     """
     Right-panel page for 'PGN File' source.
     Handles drag & drop and browse. For multi-game files shows an inline
     game picker; for single-game files sets the game ready immediately.
+    The file is indexed on a PgnLoadWorker: the picker fills as games are
+    found and the first one is ready before the scan ends.
     """
     pgn_ready     = pyqtSignal(str, object)   # (pgn_text, None)
     pending_cleared = pyqtSignal()
 
     def __init__(self, parent=None):
         super().__init__(parent)
-        self._parsed_games: list = []          # GameAnalysis objects
+        self._path: str = ""
+        self._entries: list = []               # pgn_index.PgnIndexEntry per listed game
+        self._worker: PgnLoadWorker | None = None
         self._setup_ui()
 
     def _setup_ui(self):
@@ -45,6 +51,7 @@ class PgnFilePanel(QWidget):
         self._game_list.setVisible(False)
         self._game_list.game_chosen.connect(self._on_game_chosen)
         self._game_list.cleared.connect(self._clear)
+        self._game_list.cancel_requested.connect(self.cancel_loading)
         root.addWidget(self._game_list, stretch=1)
 
     # ── File loading ────────────────────────────────────────────────────────
@@ -56,58 +63,96 @@ class PgnFilePanel(QWidget):
             self._load_file(path)
 
     def _load_file(self, path: str):
-        from src.backend.storage.pgn_parser import PGNParser
-        try:
-            games = PGNParser.parse_pgn_file(path)
-        except Exception as e:
-            msg = QMessageBox(self)
-            msg.setIcon(QMessageBox.Icon.Warning)
-            msg.setWindowTitle("Could Not Read PGN")
-            msg.setText("Could not read this PGN.\nIt may be empty or corrupted.")
-            try_again = msg.addButton("Try Another File", QMessageBox.ButtonRole.ActionRole)
-            msg.addButton("Cancel", QMessageBox.ButtonRole.RejectRole)
-            msg.exec()
-            if msg.clickedButton() == try_again:
-                self._browse()
-            return
+        from src.backend.storage.pgn_index import iter_pgn_index
+        self.stop_worker()
+        self._path = path
+        self._entries = []
+
+        self._drop_zone.setVisible(False)
+        self._game_list.populate([], "Reading games…")
+        self._game_list.start_loading()
+        self._game_list.setVisible(True)
 
-        if not games:
-            QMessageBox.warning(self, "No Games", "No valid games found in this file.")
+        # Headers and offsets only (cached per file): the chosen game is
+        # read and parsed when picked
+        self._worker = PgnLoadWorker(iter_pgn_index, path, parent=self)
+        self._worker.games_found.connect(self._on_entries_found)
+        self._worker.progress.connect(self._on_load_progress)
+        self._worker.done.connect(self._on_load_done)
+        self._worker.error.connect(self._on_load_error)
+        self._worker.start()
+
+    def _on_entries_found(self, entries: list):
+        if self.sender() is not self._worker:  # results of a replaced file
             return
+        self._entries.extend(entries)
+        self._game_list.append([pgn_entry_row(entry) for entry in entries])
+        self._game_list.set_header(f"Select a game ({len(self._entries)} found so far):")
 
-        self._parsed_games = games
-        n = len(games)
-        
-        self._drop_zone.setVisible(False)
+    def _on_load_progress(self, games: int, done: int, total: int):
+        if self.sender() is not self._worker:
+            return
+        self._game_list.set_progress(
+            f"{games:,} games · {done / 2**20:.1f} of {total / 2**20:.1f} MB", done, total
+        )
 
-        rows = []
-        for g in games:
-            md = g.metadata
-            white = md.white or "?"
-            black = md.black or "?"
-            w_elo = md.white_elo or md.headers.get("WhiteElo", "?")
-            b_elo = md.black_elo or md.headers.get("BlackElo", "?")
-            result = md.result or "?"
-            date = md.date or md.headers.get("Date", "?")
-            time_ctrl = md.headers.get("TimeControl", "")
-            tc_label = classify_time_control(time_ctrl)
-            move_count = (len(g.moves) + 1) // 2
-
-            line1 = f"{date}  ·  {tc_label}  ·  {result}  ·  {move_count} moves"
-            line2 = f"{white} ({w_elo})  vs  {black} ({b_elo})"
-            rows.append((line1, line2))
-
-        header_text = "1 game ready to load:" if n == 1 else f"Select a game ({n} found):"
-        self._game_list.populate(rows, header_text)
-        self._game_list.setVisible(True)
+    def _on_load_done(self, complete: bool):
+        if self.sender() is not self._worker:
+            return
+        self._game_list.finish_loading()
+        n = len(self._entries)
+        if not n:
+            self._clear()
+            if complete:
+                QMessageBox.warning(self, "No Games", "No valid games found in this file.")
+            return
+        if not complete:
+            header_text = f"Select a game ({n} read before cancelling):"
+        else:
+            header_text = "1 game ready to load:" if n == 1 else f"Select a game ({n} found):"
+        self._game_list.set_header(header_text)
+
+    def _on_load_error(self, err_msg: str):
+        if self.sender() is not self._worker:
+            return
+        logger.error(f"Could not read PGN file {self._path}: {err_msg}")
+        self._clear()
+        msg = QMessageBox(self)
+        msg.setIcon(QMessageBox.Icon.Warning)
+        msg.setWindowTitle("Could Not Read PGN")
+        msg.setText("Could not read this PGN.\nIt may be empty or corrupted.")
+        try_again = msg.addButton("Try Another File", QMessageBox.ButtonRole.ActionRole)
+        msg.addButton("Cancel", QMessageBox.ButtonRole.RejectRole)
+        msg.exec()
+        if msg.clickedButton() == try_again:
+            self._browse()
+
+    def cancel_loading(self):
+        """Stop reading the file; the games found so far stay listed."""
+        if self._worker is not None and self._worker.isRunning():
+            self._worker.requestInterruption()
+
+    def stop_worker(self):
+        """Stop reading and wait for the worker; its pending results are ignored."""
+        worker, self._worker = self._worker, None
+        if worker is not None:
+            worker.requestInterruption()
+            worker.wait()
 
     def _on_game_chosen(self, index: int):
-        if 0 <= index < len(self._parsed_games):
-            game = self._parsed_games[index]
-            self.pgn_ready.emit(game.pgn_content or "", None)
+        if 0 <= index < len(self._entries):
+            from src.backend.storage.pgn_index import read_pgn_game
+            try:
+                pgn_text = read_pgn_game(self._path, self._entries[index])
+            except (OSError, UnicodeDecodeError):
+                QMessageBox.warning(self, "Could Not Read PGN", "This file could not be read again.\nIt may have been moved or changed.")
+                return
+            self.pgn_ready.emit(pgn_text, None)
 
     def _clear(self):
-        self._parsed_games = []
+        self.stop_worker()
+        self._path = ""
+        self._entries = []
         self._game_list.setVisible(False)
         self._game_list.clear()
         self._drop_zone.setVisible(True)
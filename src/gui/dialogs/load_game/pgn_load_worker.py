@@ -0,0 +1,66 @@
+"""
+Worker thread that reads the games of a PGN file or text off the GUI thread.
+"""
+import time
+
+from PyQt6.QtCore import QThread, pyqtSignal
+
+# Seconds between batches of games sent to the GUI thread
+_EMIT_INTERVAL = 0.1
+
+
+class PgnLoadWorker(QThread):
+    """
+    Runs ``iter_func(*args, progress_callback=...)`` (a generator of games or
+    index entries) and hands its items to the GUI in batches as they arrive.
+    requestInterruption() stops it after the current game; the games read
+    until then are still sent, then done(False) reports the stop (error()
+    likewise follows the games read before the failure).
+    """
+    games_found = pyqtSignal(list)         # next batch of items, in order
+    progress = pyqtSignal(int, int, int)   # items so far, position read, total
+    done = pyqtSignal(bool)                # True when the whole input was read
+    error = pyqtSignal(str)
+
+    def __init__(self, iter_func, *args, parent=None):
+        super().__init__(parent)
+        self.iter_func = iter_func
+        self.args = args
+        self._position = (0, 0)
+
+    def _on_progress(self, done: int, total: int):
+        self._position = (done, total)
+
+    def run(self):
+        batch, count = [], 0
+        last_emit = 0.0
+        items = self.iter_func(*self.args, progress_callback=self._on_progress)
+        completed = False
+        try:
+            for item in items:
+                batch.append(item)
+                count += 1
+                if self.isInterruptionRequested():
+                    break
+                # The first game is sent at once, the rest a few times a second
+                if time.monotonic() - last_emit >= _EMIT_INTERVAL:
+                    self.games_found.emit(batch)
+                    self.progress.emit(count, *self._position)
+                    batch, last_emit = [], time.monotonic()
+            else:
+                completed = True
+        except Exception as e:
+            self._flush(batch, count)
+            self.error.emit(str(e))
+            return
+        finally:
+            items.close()
+        # Stopped or not, the games read so far are kept
+        self._flush(batch, count)
+        self.done.emit(completed)
+
+    def _flush(self, batch: list, count: int):
+        """Send the games not sent yet and the final progress."""
+        if batch:
+            self.games_found.emit(batch)
+        self.progress.emit(count, *self._position)
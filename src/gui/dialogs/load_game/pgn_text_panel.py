@@ -5,21 +5,32 @@ from PyQt6.QtWidgets import QWidget, QVBoxLayout, QTextEdit, QMessageBox
 from PyQt6.QtCore import pyqtSignal, Qt
 from src.gui.styles import Styles
 from src.gui.utils.gui_utils import create_button
+from src.utils.logger import logger
 from .inline_game_list import InlineGameList
-from .helpers import classify_time_control
+from .pgn_load_worker import PgnLoadWorker
+from .helpers import pgn_game_row
+
+
+def _text_games(text: str, progress_callback=None):
+    """(display row, PGN text) of each game in pasted text (runs on the worker)."""
+    from src.backend.storage.pgn_parser import PGNParser
+    for game in PGNParser.iter_pgn_text(text, progress_callback):
+        yield pgn_game_row(game), game.pgn_content or ""
 
 class PgnTextPanel(QWidget):
     """
     Right-panel page for 'PGN Text' source.
     Handles pasting PGN text and parsing it. Like the file panel,
-    single games load immediately, multiple games show a picker.
+    single games load immediately, multiple games show a picker that
+    fills while a PgnLoadWorker parses the rest.
     """
     pgn_ready     = pyqtSignal(str, object)   # (pgn_text, None)
     pending_cleared = pyqtSignal()
 
     def __init__(self, parent=None):
         super().__init__(parent)
-        self._parsed_games: list = []
+        self._game_pgns: list = []  # PGN text of each listed game
+        self._worker: PgnLoadWorker | None = None
         self._setup_ui()
 
     def _setup_ui(self):
@@ -63,6 +74,7 @@ class PgnTextPanel(QWidget):
         self._game_list.setVisible(False)
         self._game_list.game_chosen.connect(self._on_game_chosen)
         self._game_list.cleared.connect(self._clear)
+        self._game_list.cancel_requested.connect(self.cancel_loading)
         root.addWidget(self._game_list, stretch=1)
 
     # ── Text parsing ────────────────────────────────────────────────────────
@@ -72,65 +84,94 @@ class PgnTextPanel(QWidget):
             QMessageBox.warning(self, "Empty", "Please paste some PGN text first.")
             return
 
-        from src.backend.storage.pgn_parser import PGNParser
-        try:
-            games = PGNParser.parse_pgn_text(text)
-        except Exception as e:
-            msg = QMessageBox(self)
-            msg.setIcon(QMessageBox.Icon.Warning)
-            msg.setWindowTitle("Could Not Read PGN")
-            msg.setText("Could not read this PGN.\nIt may be empty or corrupted.")
-            try_again = msg.addButton("Try Again", QMessageBox.ButtonRole.ActionRole)
-            msg.addButton("Cancel", QMessageBox.ButtonRole.RejectRole)
-            msg.exec()
-            if msg.clickedButton() == try_again:
-                self._text_edit.clear()
-                self._text_edit.setFocus()
-            return
+        self.stop_worker()
+        self._game_pgns = []
 
-        if not games:
-            QMessageBox.warning(self, "No Games", "No valid games found in this text.")
-            return
+        self._input_widget.setVisible(False)
+        self._game_list.populate([], "Reading games…")
+        self._game_list.start_loading()
+        self._game_list.setVisible(True)
 
-        self._parsed_games = games
-        n = len(games)
+        self._worker = PgnLoadWorker(_text_games, text, parent=self)
+        self._worker.games_found.connect(self._on_games_found)
+        self._worker.progress.connect(self._on_parse_progress)
+        self._worker.done.connect(self._on_parse_done)
+        self._worker.error.connect(self._on_parse_error)
+        self._worker.start()
 
-        self._input_widget.setVisible(False)
+    def _on_games_found(self, games: list):
+        if self.sender() is not self._worker:  # results of replaced text
+            return
+        self._game_pgns.extend(pgn for _row, pgn in games)
+        self._game_list.append([row for row, _pgn in games])
+        self._game_list.set_header(f"Select a game ({len(self._game_pgns)} found so far):")
 
-        rows = []
-        for g in games:
-            md = g.metadata
-            white = md.white or "?"
-            black = md.black or "?"
-            w_elo = md.white_elo or md.headers.get("WhiteElo", "?")
-            b_elo = md.black_elo or md.headers.get("BlackElo", "?")
-            result = md.result or "?"
-            date = md.date or md.headers.get("Date", "?")
-            time_ctrl = md.headers.get("TimeControl", "")
-            tc_label = classify_time_control(time_ctrl)
-            move_count = (len(g.moves) + 1) // 2
-
-            line1 = f"{date}  ·  {tc_label}  ·  {result}  ·  {move_count} moves"
-            line2 = f"{white} ({w_elo})  vs  {black} ({b_elo})"
-            rows.append((line1, line2))
-
-        header_text = "1 game ready to load:" if n == 1 else f"Select a game ({n} found):"
-        self._game_list.populate(rows, header_text)
-        self._game_list.setVisible(True)
+    def _on_parse_progress(self, games: int, done: int, total: int):
+        if self.sender() is not self._worker:
+            return
+        self._game_list.set_progress(f"{games:,} games", done, total)
+
+    def _on_parse_done(self, complete: bool):
+        if self.sender() is not self._worker:
+            return
+        self._game_list.finish_loading()
+        n = len(self._game_pgns)
+        if not n:
+            self._show_input()
+            if complete:
+                QMessageBox.warning(self, "No Games", "No valid games found in this text.")
+            return
+        if not complete:
+            header_text = f"Select a game ({n} read before cancelling):"
+        else:
+            header_text = "1 game ready to load:" if n == 1 else f"Select a game ({n} found):"
+        self._game_list.set_header(header_text)
+
+    def _on_parse_error(self, err_msg: str):
+        if self.sender() is not self._worker:
+            return
+        logger.error(f"Could not parse pasted PGN: {err_msg}")
+        self._show_input()
+        msg = QMessageBox(self)
+        msg.setIcon(QMessageBox.Icon.Warning)
+        msg.setWindowTitle("Could Not Read PGN")
+        msg.setText("Could not read this PGN.\nIt may be empty or corrupted.")
+        try_again = msg.addButton("Try Again", QMessageBox.ButtonRole.ActionRole)
+        msg.addButton("Cancel", QMessageBox.ButtonRole.RejectRole)
+        msg.exec()
+        if msg.clickedButton() == try_again:
+            self._text_edit.clear()
+            self._text_edit.setFocus()
+
+    def cancel_loading(self):
+        """Stop parsing; the games found so far stay listed."""
+        if self._worker is not None and self._worker.isRunning():
+            self._worker.requestInterruption()
+
+    def stop_worker(self):
+        """Stop parsing and wait for the worker; its pending results are ignored."""
+        worker, self._worker = self._worker, None
+        if worker is not None:
+            worker.requestInterruption()
+            worker.wait()
 
     def _on_game_chosen(self, index: int):
-        if 0 <= index < len(self._parsed_games):
-            game = self._parsed_games[index]
-            self.pgn_ready.emit(game.pgn_content or self._text_edit.toPlainText(), None)
+        if 0 <= index < len(self._game_pgns):
+            self.pgn_ready.emit(self._game_pgns[index] or self._text_edit.toPlainText(), None)
 
-    def _clear(self):
-        self._parsed_games = []
-        self._text_edit.clear()
+    def _show_input(self):
+        """Back to the text box, keeping the pasted text."""
+        self.stop_worker()
+        self._game_pgns = []
         self._game_list.setVisible(False)
         self._game_list.clear()
         self._input_widget.setVisible(True)
         self.pending_cleared.emit()
 
+    def _clear(self):
+        self._show_input()
+        self._text_edit.clear()
+
     def reset(self):
         """Called when the user switches away from this source tab."""
         self._clear()
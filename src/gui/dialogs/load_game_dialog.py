@@ -271,3 +271,6 @@ class LoadGameDialog(QDialog):
                     panel._worker.error.disconnect()
                 except (TypeError, RuntimeError):
                     pass
+        # PGN reading stops after the current game
+        self._pgn_file_panel.stop_worker()
+        self._pgn_text_panel.stop_worker()
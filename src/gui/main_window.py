@@ -5,7 +5,7 @@ from PyQt6.QtWidgets import (QApplication, QMainWindow, QWidget, QVBoxLayout,
                              QStatusBar, QMessageBox, QInputDialog, QDialog,
                              QListWidget, QListWidgetItem, QPushButton, QLineEdit, QLabel, QStackedWidget, QTextEdit, QFrame)
 
-from PyQt6.QtCore import Qt, QThread, pyqtSignal, QTimer
+from PyQt6.QtCore import Qt, QThread, pyqtSignal, QTimer, QEvent
 from PyQt6.QtGui import QAction, QIcon, QShortcut, QKeySequence, QPalette, QColor
 from PyQt6.QtWidgets import QMenu
 import shutil
@@ -47,6 +47,12 @@ class MainWindow(QMainWindow):
         # State
         self.games = []
         self.current_game = None
+        # Opening pre-analysis runs only while nothing else uses an engine and
+        # the user has been idle: reasons it is held, and the idle countdown
+        self._prewarm_holds = set()
+        self._prewarm_idle_timer = QTimer(self)
+        self._prewarm_idle_timer.setSingleShot(True)
+        self._prewarm_idle_timer.timeout.connect(self._resume_prewarm_if_idle)
         self.config_manager = ConfigManager()
         resolved = resolve_engine_path(self.config_manager)
         self.engine_path = resolved or self.config_manager.get("engine_path", "stockfish")
@@ -137,6 +143,122 @@ class MainWindow(QMainWindow):
         # Check for updates (in background)
         self.check_for_updates()
 
+        # Hold the opening pre-analysis while the explorer's engine thinks
+        self.explorer_view.live_worker.thinking_started.connect(lambda: self._set_prewarm_hold("explorer", True))
+        self.explorer_view.live_worker.thinking_stopped.connect(lambda: self._set_prewarm_hold("explorer", False))
+        self.settings_view.opening_prewarm_changed.connect(self.set_opening_prewarm_enabled)
+
+        # Build the analyzer's cache / opening book once the window is up
+        QTimer.singleShot(0, self._start_analyzer_warmup)
+
+    def _start_analyzer_warmup(self):
+        """Initialise the analyzer's storage and books on a worker thread."""
+        from src.gui.analysis.analysis_worker import AnalyzerWarmupWorker
+
+        self.warmup_worker = AnalyzerWarmupWorker(self.analyzer)
+        self.warmup_worker.ready.connect(lambda: logger.info("Analyzer ready"))
+        self.warmup_worker.ready.connect(self._start_opening_prewarm)
+        self.warmup_worker.backfilled.connect(self._on_history_backfilled)
+        self.warmup_worker.error.connect(lambda msg: logger.error(f"Analyzer warm-up failed: {msg}"))
+        self.warmup_worker.start()
+
+    def _on_history_backfilled(self):
+        """Show the move counts, statistics and search index filled in for older games."""
+        if hasattr(self, 'metrics_view'):
+            self.metrics_view.refresh()
+        if hasattr(self, 'history_view'):
+            self.history_view.load_history()
+
+    def _start_opening_prewarm(self):
+        """Pre-analyse opening-tree positions into the cache while the app is idle."""
+        if not self.config_manager.get("opening_prewarm_enabled", False):
+            return
+        if getattr(self, 'prewarm_worker', None) is not None and self.prewarm_worker.isRunning():
+            return
+        if not self.analyzer.config.get("use_cache", True):
+            return
+        engine_path = resolve_engine_path(self.config_manager)
+        if not engine_path:
+            return
+        from src.gui.analysis.analysis_worker import OpeningPrewarmWorker
+        from src.backend.analysis.prewarm import OpeningPrewarmer
+        from src.backend.analysis.opening_db import OpeningDB
+        from src.backend.storage.cache import AnalysisCache, configured_base_paths
+        from src.constants import (
+            DEFAULT_PREWARM_MAX_NODES, DEFAULT_PREWARM_INTERVAL, PREWARM_ENGINE_THREADS, PREWARM_ENGINE_HASH_MB,
+            PREWARM_IDLE_SECONDS,
+        )
+
+        try:
+            # Own engine process (one thread, small hash) and connections,
+            # so a game analysis never waits on the pre-warm job.
+            engine = EngineManager(engine_path)
+            engine.apply_settings(PREWARM_ENGINE_THREADS, PREWARM_ENGINE_HASH_MB)
+            prewarmer = OpeningPrewarmer(
+                OpeningDB(self.analyzer.opening_db.db_path),
+                AnalysisCache(base_paths=configured_base_paths(self.config_manager)),
+                engine,
+                self.analyzer.config,
+                max_nodes=self.config_manager.get("opening_prewarm_max_nodes", DEFAULT_PREWARM_MAX_NODES),
+                interval=self.config_manager.get("opening_prewarm_interval", DEFAULT_PREWARM_INTERVAL),
+            )
+        except Exception as e:
+            logger.error(f"Could not start opening pre-analysis: {e}")
+            return
+        # Starts paused: it resumes once the app has been idle long enough
+        prewarmer.pause()
+        self._prewarm_idle_timer.setInterval(int(PREWARM_IDLE_SECONDS * 1000))
+        self.prewarm_worker = OpeningPrewarmWorker(prewarmer)
+        self.prewarm_worker.error.connect(lambda msg: logger.error(f"Opening pre-analysis failed: {msg}"))
+        self.prewarm_worker.start()
+        # Any keyboard or mouse input restarts the idle countdown
+        QApplication.instance().installEventFilter(self)
+        self._update_prewarm_pause()
+
+    def set_opening_prewarm_enabled(self, enabled: bool):
+        """Start or stop the opening pre-analysis after the setting changed."""
+        if enabled:
+            # Before the warm-up is done, its ready signal starts it
+            warmup = getattr(self, 'warmup_worker', None)
+            if warmup is None or not warmup.isRunning():
+                self._start_opening_prewarm()
+            return
+        self._prewarm_idle_timer.stop()
+        QApplication.instance().removeEventFilter(self)
+        worker = getattr(self, 'prewarm_worker', None)
+        if worker is not None and worker.isRunning():
+            # Returns after the current search; closeEvent waits for it
+            worker.stop()
+
+    def _set_prewarm_hold(self, reason: str, held: bool):
+        """Hold the pre-analysis while ``reason`` (an analysis, a live engine) is active."""
+        if held:
+            self._prewarm_holds.add(reason)
+        else:
+            self._prewarm_holds.discard(reason)
+        self._update_prewarm_pause()
+
+    def _update_prewarm_pause(self):
+        """Pause now; resume after PREWARM_IDLE_SECONDS without holds or input."""
+        worker = getattr(self, 'prewarm_worker', None)
+        if worker is None or not worker.isRunning():
+            return
+        worker.pause()
+        if self._prewarm_holds:
+            self._prewarm_idle_timer.stop()
+        else:
+            self._prewarm_idle_timer.start()
+
+    def _resume_prewarm_if_idle(self):
+        worker = getattr(self, 'prewarm_worker', None)
+        if worker is not None and worker.isRunning() and not self._prewarm_holds:
+            worker.resume()
+
+    def eventFilter(self, obj, event):
+        if event.type() in (QEvent.Type.KeyPress, QEvent.Type.MouseButtonPress, QEvent.Type.Wheel):
+            self._update_prewarm_pause()
+        return super().eventFilter(obj, event)
+
     def check_for_updates(self):
         """Start background update check after a delay (max once per day)."""
         from PyQt6.QtCore import QTimer
@@ -256,6 +378,8 @@ class MainWindow(QMainWindow):
                 self.explorer_view.live_worker.stop()
             except Exception as e:
                 logger.error(f"Failed to stop explorer live worker: {e}")
+            # Position indexing stops between batches; finished games stay indexed
+            self.explorer_view.history_games.stop()
 
         # Stop full analysis worker if it is running
         if hasattr(self, 'worker') and self.worker and self.worker.isRunning():
@@ -277,13 +401,6 @@ class MainWindow(QMainWindow):
 
         # Stop metrics workers if running
         if hasattr(self, 'metrics_view') and self.metrics_view:
-            if hasattr(self.metrics_view, 'stats_worker') and self.metrics_view.stats_worker and self.metrics_view.stats_worker.isRunning():
-                try:
-                    self.metrics_view.stats_worker.finished.disconnect()
-                except (TypeError, RuntimeError):
-                    pass
-                self.metrics_view.stats_worker.quit()
-                self.metrics_view.stats_worker.wait()
             if hasattr(self.metrics_view, 'worker') and self.metrics_view.worker and self.metrics_view.worker.isRunning():
                 try:
                     self.metrics_view.worker.finished.disconnect()
@@ -293,6 +410,12 @@ class MainWindow(QMainWindow):
                 self.metrics_view.worker.quit()
                 self.metrics_view.worker.wait()
 
+        # Let a history CSV import/export finish (it runs in one transaction)
+        if hasattr(self, 'history_view') and self.history_view:
+            csv_worker = getattr(self.history_view, "_csv_worker", None)
+            if csv_worker is not None and csv_worker.isRunning():
+                csv_worker.wait()
+
         # Stop SettingsView test worker if running
         if hasattr(self, 'settings_view') and self.settings_view:
             prev = getattr(self.settings_view, "_test_worker", None)
@@ -304,6 +427,30 @@ class MainWindow(QMainWindow):
                 prev.quit()
                 prev.wait(1000)
 
+        # Cancel the opening pre-analysis (returns after the current search)
+        if hasattr(self, 'prewarm_worker') and self.prewarm_worker and self.prewarm_worker.isRunning():
+            try:
+                self.prewarm_worker.stop()
+                self.prewarm_worker.wait()
+            except Exception as e:
+                logger.error(f"Failed to stop opening pre-analysis: {e}")
+
+        # Wait for the analyzer warm-up (opening book import) to finish; a
+        # history backfill stops after its current batch
+        if hasattr(self, 'warmup_worker') and self.warmup_worker and self.warmup_worker.isRunning():
+            try:
+                self.warmup_worker.requestInterruption()
+                self.warmup_worker.wait()
+            except Exception as e:
+                logger.error(f"Failed to stop analyzer warm-up worker: {e}")
+
+        # Wait for a running cache compaction / statistics scan / pack export or import
+        if hasattr(self, 'settings_view') and self.settings_view:
+            for name in ("_cache_worker", "_pack_worker"):
+                cache_worker = getattr(self.settings_view.data_settings, name, None)
+                if cache_worker is not None and cache_worker.isRunning():
+                    cache_worker.wait()
+
         # Stop update worker if running
         if hasattr(self, 'update_worker') and self.update_worker and self.update_worker.isRunning():
             try:
@@ -335,7 +482,8 @@ class MainWindow(QMainWindow):
         self.stack.addWidget(self.analysis_page)
         
         # --- Page 1: Explorer View ---
-        self.explorer_view = ExplorerView(self.config_manager)
+        self.explorer_view = ExplorerView(self.config_manager, self.history_manager)
+        self.explorer_view.history_game_selected.connect(self.load_game_from_history)
         self.stack.addWidget(self.explorer_view)
         
         # --- Page 2: History View ---
@@ -464,11 +612,13 @@ class MainWindow(QMainWindow):
 
     def _on_live_thinking_started(self):
         """Live engine started computing — show Calculating unless full analysis is running."""
+        self._set_prewarm_hold("live", True)
         if not getattr(self, '_full_analysis_running', False):
             self._set_engine_state("calculating")
 
     def _on_live_thinking_stopped(self):
         """Live engine finished computing — revert to Ready unless full analysis is running."""
+        self._set_prewarm_hold("live", False)
         if not getattr(self, '_full_analysis_running', False):
             self._set_engine_state("ready")
 
@@ -539,6 +689,10 @@ class MainWindow(QMainWindow):
             )
             if hasattr(self, 'move_list_panel'):
                 self.move_list_panel.update_engine_path(new_path)
+                # The panel built a new live worker
+                self._set_prewarm_hold("live", False)
+                self.move_list_panel.live_worker.thinking_started.connect(self._on_live_thinking_started)
+                self.move_list_panel.live_worker.thinking_stopped.connect(self._on_live_thinking_stopped)
             self.show_toast("Engine path updated. Future analyses will use the new engine.", "info")
         except Exception as e:
             logger.error(f"Failed to update engine: {e}")
@@ -776,7 +930,7 @@ class MainWindow(QMainWindow):
         # so the tour retriggers on next visit once data becomes available).
         if page_index == 0 and self.current_game is None:
             return
-        if page_index == 2 and hasattr(self, 'history_view') and not self.history_view.games:
+        if page_index == 2 and hasattr(self, 'history_view') and self.history_view.game_list.model.rowCount() == 0:
             return
         if page_index == 3 and hasattr(self, 'metrics_view'):
             mv = self.metrics_view
@@ -1130,9 +1284,12 @@ class MainWindow(QMainWindow):
         """
         Common pattern: Parse PGN text, attach source data, load first game.
         Returns True on success, False on failure.
+        Only the first game is parsed: the Load Game dialog reads multi-game
+        files and pasted text on a worker and hands over the chosen game.
         """
         from src.backend.storage.pgn_parser import PGNParser
-        self.games = PGNParser.parse_pgn_text(pgn_text)
+        first = next(PGNParser.iter_pgn_text(pgn_text), None)
+        self.games = [first] if first else []
         if self.games:
             if source_data:
                 for g in self.games:
@@ -1146,7 +1303,16 @@ class MainWindow(QMainWindow):
             return False
 
     def load_game(self, game):
-        # If game has no moves but has PGN content (loaded from history), parse it
+        # Loaded from history: use the analysed moves saved with the game
+        if not game.moves and game.game_id:
+            stored_moves = self.history_manager.get_game_moves(game.game_id)
+            if stored_moves:
+                game.moves = stored_moves
+        # History rows leave the (compressed) PGN out: fetch it for this game
+        if not game.pgn_content and game.game_id:
+            game.pgn_content = self.history_manager.get_game_pgn(game.game_id)
+
+        # If game still has no moves but has PGN content, parse it
         if not game.moves and game.pgn_content:
             try:
                 from src.backend.storage.pgn_parser import PGNParser
@@ -1303,6 +1469,7 @@ class MainWindow(QMainWindow):
         self.worker.error.connect(self.on_analysis_error)
 
         self._full_analysis_running = True
+        self._set_prewarm_hold("analysis", True)
         self._set_engine_state("calculating", "Starting...")
         self._set_status("Starting analysis...", "progress")
         
@@ -1322,6 +1489,7 @@ class MainWindow(QMainWindow):
 
     def on_analysis_finished(self, game):
         self._full_analysis_running = False
+        self._set_prewarm_hold("analysis", False)
         self._set_engine_state("ready")
         self._set_status("Analysis complete", "success")
         self.show_toast("Analysis complete!", "success")
@@ -1339,6 +1507,7 @@ class MainWindow(QMainWindow):
 
     def on_analysis_error(self, error_msg):
         self._full_analysis_running = False
+        self._set_prewarm_hold("analysis", False)
         self._set_engine_state("ready")
         self._set_status(f"Analysis failed: {error_msg}", "error")
         logger.error(f"Analysis error: {error_msg}")
@@ -1,14 +1,14 @@
 """
 Metrics package - Dashboard widgets and statistics.
 """
-from .workers import InsightWorker, StatsWorker
+from .workers import InsightWorker
 from .charts import (
     create_donut_figure, create_line_chart_figure, 
     fig_to_pixmap, fig_to_label, fig_to_canvas, create_legend_widget
 )
 
 __all__ = [
-    'InsightWorker', 'StatsWorker',
+    'InsightWorker',
     'create_donut_figure', 'create_line_chart_figure',
     'fig_to_pixmap', 'fig_to_label', 'fig_to_canvas', 'create_legend_widget'
 ]
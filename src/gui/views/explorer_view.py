@@ -5,7 +5,7 @@ from PyQt6.QtWidgets import (
     QWidget, QVBoxLayout, QHBoxLayout, QLabel, QFrame, QSplitter, 
     QScrollArea, QCheckBox, QLineEdit, QPushButton, QSizePolicy
 )
-from PyQt6.QtCore import Qt, QTimer, QByteArray
+from PyQt6.QtCore import Qt, QTimer, QByteArray, pyqtSignal
 from PyQt6.QtGui import QColor, QPixmap, QPainter, QIcon
 from PyQt6.QtSvg import QSvgRenderer
 import chess
@@ -15,6 +15,7 @@ from src.gui.board.explorer_board_widget import ExplorerBoardWidget
 from src.gui.analysis.analysis_lines_widget import AnalysisLinesWidget
 from src.gui.analysis.live_analysis import LiveAnalysisWorker
 from src.gui.analysis.explorer_move_list import ExplorerMoveListWidget
+from src.gui.analysis.history_games_panel import HistoryGamesPanel
 from src.backend.analysis.opening_db import OpeningDB, _normalize_fen
 from src.backend.analysis.polyglot_book import PolyglotBookManager
 from src.backend.analysis.math_utils import get_win_probability
@@ -59,9 +60,12 @@ class BookRowWidget(QWidget):
                 p = p.parent()
 
 class ExplorerView(QWidget):
-    def __init__(self, config_manager, parent=None):
+    history_game_selected = pyqtSignal(object)  # GameAnalysis picked in "My Games"
+
+    def __init__(self, config_manager, history_manager=None, parent=None):
         super().__init__(parent)
         self.config_manager = config_manager
+        self.history_manager = history_manager
         resolved = resolve_engine_path(self.config_manager)
         self.engine_path = resolved or self.config_manager.get("engine_path", "stockfish")
         self.live_worker = LiveAnalysisWorker(self.engine_path, config_manager=self.config_manager)
@@ -338,6 +342,12 @@ class ExplorerView(QWidget):
         
         right_layout.addWidget(self.book_scroll, stretch=1)
         
+        # The user's games that reached this position (history position index)
+        self.history_games = HistoryGamesPanel(self.history_manager)
+        self.history_games.move_clicked.connect(self.on_engine_line_clicked)
+        self.history_games.game_selected.connect(self.history_game_selected)
+        right_layout.addWidget(self.history_games, stretch=1)
+        
         # Move List Header (inline with move input)
         moves_header = QHBoxLayout()
         moves_header.setContentsMargins(0, 0, 0, 0)
@@ -797,6 +807,8 @@ class ExplorerView(QWidget):
         else:
             self.book_toggle.hide()
             self.book_scroll.hide()
+        
+        self.history_games.set_position(self.board_widget.board)
             
         self.board_widget.draw_interactive_overlays()
 
@@ -1141,6 +1153,7 @@ class ExplorerView(QWidget):
 
     def closeEvent(self, event):
         self.live_worker.stop()
+        self.history_games.stop()
         super().closeEvent(event)
 
     def refresh_styles(self):
@@ -1240,6 +1253,7 @@ class ExplorerView(QWidget):
             }}
         """)
         self.book_container.setStyleSheet(f"background-color: {Styles.COLOR_SURFACE};")
+        self.history_games.refresh_styles()
         self.move_input.setStyleSheet(f"""
             QLineEdit {{
                 background-color: {Styles.COLOR_SURFACE};
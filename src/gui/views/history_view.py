@@ -1,14 +1,11 @@
-from PyQt6.QtWidgets import QWidget, QVBoxLayout, QHBoxLayout, QLabel, QMessageBox, QStyle, QComboBox, QLineEdit, QPushButton, QFrame
-from PyQt6.QtCore import pyqtSignal, Qt
+from PyQt6.QtWidgets import QWidget, QVBoxLayout, QHBoxLayout, QLabel, QMessageBox, QStyle, QComboBox, QLineEdit, QPushButton, QFrame, QProgressDialog
+from PyQt6.QtCore import pyqtSignal, Qt, QThread
 from PyQt6.QtGui import QIcon
 from src.gui.components.game_list_widget import GameListWidget
 from src.gui.styles import Styles
 from src.gui.utils.gui_utils import create_button, create_combobox
 from src.backend.storage.game_history import GameHistoryManager
-from src.backend.storage.models import GameAnalysis, GameMetadata
-import json
 import logging
-import re
 
 try:
     import qtawesome as qta
@@ -16,14 +13,58 @@ try:
 except ImportError:
     HAS_QTAWESOME = False
 
+class HistoryCsvWorker(QThread):
+    """Exports the history to a CSV backup, or imports one, off the GUI thread."""
+    progress = pyqtSignal(int, int)  # done, total (games on export, characters read on import)
+    done = pyqtSignal(object)  # games written, or the import counts dict
+    error = pyqtSignal(str)
+
+    def __init__(self, history_manager, mode: str, path: str, parent=None):
+        super().__init__(parent)
+        self.history_manager = history_manager
+        self.mode = mode  # "export" or "import"
+        self.path = path
+
+    def run(self):
+        try:
+            if self.mode == "export":
+                result = self.history_manager.export_csv(self.path, progress_callback=self.progress.emit)
+            else:
+                result = self.history_manager.import_csv(self.path, progress_callback=self.progress.emit)
+            self.done.emit(result)
+        except Exception as e:
+            self.error.emit(str(e))
+
+
 class HistoryView(QWidget):
     game_selected = pyqtSignal(object) # Emits GameAnalysis object
 
+    # Rows per fetch as the list scrolls (a few screens' worth)
+    PAGE_SIZE = 100
+
+    # Source filter labels -> stored `source` values
+    SOURCE_MAP = {
+        "Chess.com": "chesscom",
+        "Lichess": "lichess",
+        "File": "file"
+    }
+
+    # Sort labels -> GameHistoryManager.get_games_page()/search_games() orders
+    SORT_ORDERS = {
+        "Newest First": "newest",
+        "Oldest First": "oldest",
+        "Most Moves": "most_moves",
+        "Fewest Moves": "fewest_moves"
+    }
+
     def __init__(self, config_manager=None):
         super().__init__()
         self.config_manager = config_manager
         self.history_manager = GameHistoryManager()
-        self.games = []
+        self.usernames = []
+        # CSV import/export in progress (HistoryCsvWorker) and its dialog
+        self._csv_worker = None
+        self._csv_progress = None
         
         self.layout = QVBoxLayout(self)
         self.layout.setContentsMargins(0, 0, 0, 0)
@@ -132,7 +173,7 @@ class HistoryView(QWidget):
         content_layout.addLayout(filter_layout)
         
         # Game List
-        self.game_list = GameListWidget()
+        self.game_list = GameListWidget(self.history_manager)
         self.game_list.game_selected.connect(self.on_game_selected)
         content_layout.addWidget(self.game_list)
         
@@ -207,45 +248,13 @@ class HistoryView(QWidget):
 
     def load_history(self):
         try:
-            history_games = self.history_manager.get_all_games()
-            self.games = []
-            for g_dict in history_games:
-                metadata = GameMetadata(
-                    white=g_dict["white"],
-                    black=g_dict["black"],
-                    result=g_dict["result"],
-                    date=g_dict["date"],
-                    event=g_dict["event"],
-                    white_elo=g_dict.get("white_elo"),
-                    black_elo=g_dict.get("black_elo"),
-                    time_control=g_dict.get("time_control"),
-                    eco=g_dict.get("eco"),
-                    opening=g_dict.get("opening"),
-                    termination=g_dict.get("termination"),
-                    source=g_dict.get("source", "file"),
-                    chess960=bool(g_dict.get("chess960", 0))
-                )
-                
-                summary = {}
-                if g_dict["summary_json"]:
-                    try:
-                        summary = json.loads(g_dict["summary_json"])
-                    except:
-                        pass
-                        
-                game = GameAnalysis(
-                    game_id=g_dict["id"],
-                    metadata=metadata,
-                    pgn_content=g_dict["pgn"],
-                    summary=summary
-                )
-                self.games.append(game)
-            
             self.usernames = []
             if self.config_manager:
                 chesscom = self.config_manager.get("chesscom_username", "")
                 lichess = self.config_manager.get("lichess_username", "")
                 self.usernames = [u for u in [chesscom, lichess] if u]
+            # Stored per game as user_color/user_outcome (recomputed on change)
+            self.history_manager.set_history_users(self.usernames)
             
             # Apply filters after loading
             self.apply_filters()
@@ -259,110 +268,28 @@ class HistoryView(QWidget):
         source_filter = self.source_filter.currentText()
         sort_option = self.sort_dropdown.currentText()
         
-        filtered_games = self.games.copy()
-        
-        # Apply Search Filter first
+        # Filters and order run in SQL, a page at a time; a search narrows
+        # the same pages to the games matching it (full-text index)
+        filters = self._query_filters(result_filter, source_filter)
+        filters["order"] = self.SORT_ORDERS.get(sort_option, "newest")
+        manager = self.history_manager
         if search_query:
-            filtered_games = self._filter_by_search(filtered_games, search_query)
-        
-        # Apply Result Filter
-        if result_filter != "All":
-            filtered_games = self._filter_by_result(filtered_games, result_filter)
-        
-        # Apply Source Filter
+            fetch = lambda cursor: manager.search_games(search_query, after=cursor, limit=self.PAGE_SIZE, **filters)
+        else:
+            fetch = lambda cursor: manager.get_games_page(after=cursor, limit=self.PAGE_SIZE, **filters)
+        self.game_list.set_pager(fetch, self.usernames)
+
+    def _query_filters(self, result_filter, source_filter):
+        """get_games_page()/search_games() keyword arguments for the result and source filters."""
+        filters = {}
+        if result_filter in ("Wins", "Losses"):
+            # From the user's perspective (the stored user_outcome column)
+            filters["outcome"] = "win" if result_filter == "Wins" else "loss"
+        elif result_filter == "Draws":
+            filters["outcome"] = "draw"
         if source_filter != "All":
-            filtered_games = self._filter_by_source(filtered_games, source_filter)
-        
-        # Apply Sorting
-        filtered_games = self._sort_games(filtered_games, sort_option)
-        
-        self.game_list.set_games(filtered_games, self.usernames)
-    
-    def _filter_by_search(self, games, query):
-        """Filter games by search query matching player names, opening, event, or date."""
-        filtered = []
-        
-        for game in games:
-            # Get searchable fields
-            white = (game.metadata.white or "").lower()
-            black = (game.metadata.black or "").lower()
-            opening = (game.metadata.opening or "").lower()
-            event = (game.metadata.event or "").lower()
-            date = (game.metadata.date or "").lower()
-            eco = (game.metadata.eco or "").lower()
-            
-            # Check if query matches any field
-            if (query in white or 
-                query in black or 
-                query in opening or 
-                query in event or 
-                query in date or
-                query in eco):
-                filtered.append(game)
-        
-        return filtered
-    
-    def _filter_by_result(self, games, result_filter):
-        """Filter games by result (wins/losses/draws from user perspective)."""
-        filtered = []
-        usernames_lower = [u.lower() for u in self.usernames] if self.usernames else []
-        
-        for game in games:
-            result = game.metadata.result
-            white = game.metadata.white.lower() if game.metadata.white else ""
-            black = game.metadata.black.lower() if game.metadata.black else ""
-            
-            # Determine user color
-            user_is_white = white in usernames_lower
-            user_is_black = black in usernames_lower
-            
-            if result_filter == "Wins":
-                if (result == "1-0" and user_is_white) or (result == "0-1" and user_is_black):
-                    filtered.append(game)
-            elif result_filter == "Losses":
-                if (result == "0-1" and user_is_white) or (result == "1-0" and user_is_black):
-                    filtered.append(game)
-            elif result_filter == "Draws":
-                if result == "1/2-1/2":
-                    filtered.append(game)
-        
-        return filtered
-    
-    def _filter_by_source(self, games, source_filter):
-        """Filter games by source platform."""
-        source_map = {
-            "Chess.com": "chesscom",
-            "Lichess": "lichess",
-            "File": "file"
-        }
-        target_source = source_map.get(source_filter, "")
-        
-        return [g for g in games if getattr(g.metadata, 'source', 'file') == target_source]
-    
-    def _sort_games(self, games, sort_option):
-        """Sort games based on selected option."""
-        if sort_option == "Newest First":
-            # Sort by timestamp descending (default order from DB)
-            return games  # Already sorted by timestamp DESC
-        elif sort_option == "Oldest First":
-            return list(reversed(games))
-        elif sort_option == "Most Moves" or sort_option == "Fewest Moves":
-            # Calculate move count for sorting
-            def get_move_count(game):
-                if hasattr(game, 'moves') and game.moves:
-                    return (len(game.moves) + 1) // 2
-                elif hasattr(game, 'pgn_content') and game.pgn_content:
-                    moves = re.findall(r'(?:^|\s)(\d{1,3})\.\s+[A-Za-z]', game.pgn_content, re.MULTILINE)
-                    if moves:
-                        move_nums = [int(m) for m in moves if int(m) <= 500]
-                        if move_nums:
-                            return max(move_nums)
-                return 0
-            
-            reverse = (sort_option == "Most Moves")
-            return sorted(games, key=get_move_count, reverse=reverse)
-        
-        return games
+            filters["source"] = self.SOURCE_MAP.get(source_filter, "")
+        return filters
 
     def on_game_selected(self, game):
         self.game_selected.emit(game)
@@ -379,108 +306,73 @@ class HistoryView(QWidget):
             self.load_history()
 
     def export_games(self):
-        try:
-            from PyQt6.QtWidgets import QFileDialog
-            import csv
-            
-            file_name, _ = QFileDialog.getSaveFileName(self, "Export Games", "games.csv", "CSV Files (*.csv)")
-            if not file_name:
-                return
-                
+        from PyQt6.QtWidgets import QFileDialog
+        file_name, _ = QFileDialog.getSaveFileName(self, "Export Games", "games.csv", "CSV Files (*.csv)")
+        if not file_name:
+            return
+        if not self.history_manager.get_games_page(limit=1)[0]:
             from src.gui.main_window import MainWindow
-            history_games = self.history_manager.get_all_games()
-            if not history_games:
-                MainWindow.toast_from_widget(self, "No games to export.", "warning")
-                return
-
-            # Determine fields. We'll use database keys as headers.
-            # Sample first game to get keys, but ensure consistent order
-            fieldnames = ["id", "white", "black", "result", "date", "event", "white_elo", "black_elo", 
-                          "time_control", "eco", "termination", "opening", "source", "pgn", "summary_json", "timestamp", "starting_fen", "chess960"]
-            
-            with open(file_name, mode='w', newline='', encoding='utf-8') as csvfile:
-                writer = csv.DictWriter(csvfile, fieldnames=fieldnames)
-                writer.writeheader()
-                
-                for game_dict in history_games:
-                    # Filter dict to only fieldnames (in case of extras)
-                    row = {k: game_dict.get(k) for k in fieldnames}
-                    writer.writerow(row)
-                    
-            MainWindow.toast_from_widget(self, f"Exported {len(history_games)} games.", "success")
-            
-        except Exception as e:
-            logging.error(f"Export failed: {e}")
-            QMessageBox.critical(self, "Export Error", f"Failed to export games: {e}")
+            MainWindow.toast_from_widget(self, "No games to export.", "warning")
+            return
+        self._start_csv_worker("export", file_name)
 
     def import_games(self):
-        try:
-            from PyQt6.QtWidgets import QFileDialog
-            import csv
-            import time
-            
-            file_name, _ = QFileDialog.getOpenFileName(self, "Import Games", "", "CSV Files (*.csv)")
-            if not file_name:
-                return
-                
-            imported_count = 0
-            skipped_count = 0
-            
-            with open(file_name, mode='r', newline='', encoding='utf-8') as csvfile:
-                reader = csv.DictReader(csvfile)
-                
-                for row in reader:
-                    game_id = row.get("id")
-                    if not game_id:
-                        continue # Skip invalid rows
-                        
-                    # Check existence
-                    if self.history_manager.game_exists(game_id):
-                        skipped_count += 1
-                        continue
-                        
-                    
-                    try:
-                        summary = {}
-                        if row.get("summary_json"):
-                            summary = json.loads(row.get("summary_json"))
-                            
-                        metadata = GameMetadata(
-                            white=row.get("white"),
-                            black=row.get("black"),
-                            result=row.get("result"),
-                            date=row.get("date"),
-                            event=row.get("event"),
-                            white_elo=row.get("white_elo"),
-                            black_elo=row.get("black_elo"),
-                            time_control=row.get("time_control"),
-                            eco=row.get("eco"),
-                            termination=row.get("termination"),
-                            opening=row.get("opening"),
-                            starting_fen=row.get("starting_fen"),
-                            source=row.get("source", "file"),
-                            chess960=row.get("chess960") == "1"
-                        )
-                        
-                        game = GameAnalysis(
-                            game_id=game_id,
-                            metadata=metadata,
-                            pgn_content=row.get("pgn"),
-                            summary=summary
-                        )
-                        
-                        self.history_manager.save_game(game, row.get("pgn"))
-                        imported_count += 1
-                        
-                    except Exception as row_e:
-                        logging.warning(f"Failed to parse row {game_id}: {row_e}")
-                        
+        from PyQt6.QtWidgets import QFileDialog
+        file_name, _ = QFileDialog.getOpenFileName(self, "Import Games", "", "CSV Files (*.csv)")
+        if not file_name:
+            return
+        self._start_csv_worker("import", file_name)
+
+    def _start_csv_worker(self, mode, path):
+        if self._csv_worker is not None and self._csv_worker.isRunning():
+            return
+        self.btn_export.setEnabled(False)
+        self.btn_import.setEnabled(False)
+        self._csv_progress = QProgressDialog(
+            "Exporting games..." if mode == "export" else "Importing games...", None, 0, 0, self
+        )
+        self._csv_progress.setWindowTitle("Export Games" if mode == "export" else "Import Games")
+        self._csv_progress.setWindowModality(Qt.WindowModality.WindowModal)
+        self._csv_progress.setMinimumDuration(300)
+        worker = HistoryCsvWorker(self.history_manager, mode, path, self)
+        worker.progress.connect(self._on_csv_progress)
+        worker.done.connect(self._on_csv_done)
+        worker.error.connect(self._on_csv_error)
+        worker.finished.connect(self._on_csv_worker_finished)
+        self._csv_worker = worker
+        worker.start()
+
+    def _on_csv_progress(self, done, total):
+        if self._csv_progress is None or total <= 0:
+            return
+        # File positions can exceed the int range of the dialog: show per mille
+        self._csv_progress.setRange(0, 1000)
+        self._csv_progress.setValue(min(1000, done * 1000 // total))
+
+    def _on_csv_done(self, result):
+        from src.gui.main_window import MainWindow
+        if isinstance(result, dict):
+            message = f"Imported: {result['imported']}, Skipped: {result['skipped']}"
+            if result["failed"]:
+                message += f", Failed: {result['failed']}"
             self.load_history()
-            MainWindow.toast_from_widget(self, f"Imported: {imported_count}, Skipped: {skipped_count}", "success")
-            
-        except Exception as e:
-            logging.error(f"Import failed: {e}")
-            QMessageBox.critical(self, "Import Error", f"Failed to import games: {e}")
+        else:
+            message = f"Exported {result} games."
+        MainWindow.toast_from_widget(self, message, "success")
+
+    def _on_csv_error(self, msg):
+        logging.error(f"History CSV transfer failed: {msg}")
+        if self._csv_worker is not None and self._csv_worker.mode == "export":
+            QMessageBox.critical(self, "Export Error", f"Failed to export games: {msg}")
+        else:
+            QMessageBox.critical(self, "Import Error", f"Failed to import games: {msg}")
+
+    def _on_csv_worker_finished(self):
+        if self._csv_progress is not None:
+            self._csv_progress.close()
+            self._csv_progress = None
+        self.btn_export.setEnabled(True)
+        self.btn_import.setEnabled(True)
 
     def refresh_styles(self):
         """Re-apply styles with the updated accent color."""
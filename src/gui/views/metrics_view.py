@@ -1,12 +1,11 @@
 import json
-from PyQt6.QtWidgets import QWidget, QVBoxLayout, QHBoxLayout, QLabel, QFrame, QScrollArea, QProgressBar, QPushButton
+from PyQt6.QtWidgets import QWidget, QVBoxLayout, QHBoxLayout, QLabel, QFrame, QScrollArea, QPushButton
 from PyQt6.QtCore import Qt, pyqtSignal
 
 from src.gui.styles import Styles
 from src.gui.utils.gui_utils import clear_layout, create_button
 from src.gui.components import StatCard, StatsLayout, MasonryLayout
 from src.backend.services.groq_service import GroqService
-from src.gui.metrics.workers import StatsWorker
 
 # Import modular cards
 from src.gui.views.metrics import (
@@ -27,7 +26,6 @@ class MetricsWidget(QWidget):
         self.config_manager = config_manager
         self.history_manager = history_manager
         self.usernames = []
-        self.games_data = []
         
         self._groq_service = GroqService()
         
@@ -119,50 +117,14 @@ class MetricsWidget(QWidget):
             self.show_setup_required()
             return
             
-        self.games_data = self.history_manager.get_games_for_users(self.usernames)
+        # Aggregates maintained on every save/delete: one query, any history size
+        stats = self.history_manager.get_player_stats(self.usernames)
         
-        if not self.games_data:
+        if not stats.get('total'):
             self.show_no_data()
             return
             
-        # Show Loading
-        loading_widget = QWidget()
-        l_layout = QVBoxLayout(loading_widget)
-        l_layout.setAlignment(Qt.AlignmentFlag.AlignCenter)
-        
-        spinner = QProgressBar()
-        spinner.setRange(0, 0) # Infinite loading
-        spinner.setFixedWidth(200)
-        spinner.setStyleSheet(f"""
-            QProgressBar {{
-                border: 2px solid {Styles.COLOR_BORDER};
-                border-radius: 5px;
-                background-color: {Styles.COLOR_SURFACE};
-            }}
-            QProgressBar::chunk {{
-                background-color: {Styles.COLOR_ACCENT};
-            }}
-        """)
-        l_layout.addWidget(spinner)
-        
-        lbl = QLabel("Calculating Statistics...")
-        lbl.setStyleSheet(f"color: {Styles.COLOR_TEXT_PRIMARY}; font-size: 16px; margin-top: 10px;")
-        l_layout.addWidget(lbl)
-        
-        self.content_layout.addWidget(loading_widget)
-        
-        # Start Worker
-        if hasattr(self, 'stats_worker') and self.stats_worker is not None and self.stats_worker.isRunning():
-            try:
-                self.stats_worker.finished.disconnect()
-            except (TypeError, RuntimeError):
-                pass
-            self.stats_worker.quit()
-            self.stats_worker.wait()
-
-        self.stats_worker = StatsWorker(self.games_data, self.usernames)
-        self.stats_worker.finished.connect(self.on_stats_ready)
-        self.stats_worker.start()
+        self.on_stats_ready(stats)
 
     def on_stats_ready(self, stats):
         self.current_stats = stats
@@ -1,14 +1,104 @@
 """
 Data Management Settings group component.
 """
-from PyQt6.QtWidgets import QGroupBox, QGridLayout, QMessageBox
+import os
+from PyQt6.QtWidgets import QGroupBox, QGridLayout, QMessageBox, QLabel, QLineEdit, QFileDialog, QCheckBox
+from PyQt6.QtCore import QThread, pyqtSignal
+from PyQt6.QtGui import QIntValidator
 from ...styles import Styles
 from .helpers import create_icon_button
+from ....utils.path_utils import get_resource_path
+from src.constants import DEFAULT_CACHE_MAX_MB
+
+
+def _format_bytes(size: int) -> str:
+    for unit in ("B", "KB", "MB"):
+        if size < 1024:
+            return f"{size:.0f} {unit}" if unit == "B" else f"{size:.1f} {unit}"
+        size /= 1024
+    return f"{size:.2f} GB"
+
+
+def format_cache_stats(stats: dict, budget_mb: int) -> str:
+    """Human-readable summary of AnalysisCache disk and memory statistics."""
+    lookups = stats.get("hits", 0) + stats.get("misses", 0)
+    hit_rate = f"{100 * stats.get('hits', 0) / lookups:.0f}%" if lookups else "n/a"
+    lines = [
+        f"Positions cached: {stats.get('entries', 0):,} (depth {stats.get('min_depth', 0)}–{stats.get('max_depth', 0)})",
+        f"Engine results: {_format_bytes(stats.get('table_bytes', 0))} of {budget_mb} MB budget",
+        f"Database file: {_format_bytes(stats.get('file_bytes', 0))} ({_format_bytes(stats.get('free_bytes', 0))} reclaimable)",
+        f"Memory tier: {stats.get('memory_entries', 0):,} entries, {hit_rate} hit rate",
+    ]
+    if stats.get("base_layers"):
+        lines.append(f"Shared base caches: {stats['base_layers']} (read-only)")
+    if stats.get("evicted") or stats.get("freed_bytes"):
+        lines.append(
+            f"Last compaction: {stats.get('evicted', 0):,} evicted, {_format_bytes(stats.get('freed_bytes', 0))} freed"
+        )
+    return "\n".join(lines)
+
+
+class CacheMaintenanceWorker(QThread):
+    """Collects cache statistics, optionally enforcing the size budget first."""
+    done = pyqtSignal(object)  # stats dict
+    error = pyqtSignal(str)
+
+    def __init__(self, max_bytes: int = 0, parent=None):
+        super().__init__(parent)
+        self.max_bytes = max_bytes
+
+    def run(self):
+        try:
+            from src.backend.storage.cache import AnalysisCache, configured_base_paths
+            cache = AnalysisCache(base_paths=configured_base_paths())
+            stats = {}
+            if self.max_bytes:
+                stats.update(cache.run_maintenance(self.max_bytes))
+            stats.update(cache.disk_stats())
+            memory = cache.stats()
+            stats.update(hits=memory["hits"], misses=memory["misses"], memory_entries=memory["entries"])
+            self.done.emit(stats)
+        except Exception as e:
+            self.error.emit(str(e))
+
+
+class CachePackWorker(QThread):
+    """Exports the analysis cache to a pack, or merges a pack into it."""
+    progress = pyqtSignal(int, int)  # entries done, total
+    done = pyqtSignal(object)  # pack header (+ read/merged counts on import)
+    error = pyqtSignal(str)
+
+    def __init__(self, mode: str, path: str, engine: str = "", parent=None):
+        super().__init__(parent)
+        self.mode = mode  # "export" or "import"
+        self.path = path
+        # Export: engine recorded in the pack. Import: engine the pack must
+        # come from ("" accepts any, like the CLI's --force).
+        self.engine = engine
+
+    def run(self):
+        try:
+            from src.backend.storage.cache import AnalysisCache
+            from src.backend.storage.cache_pack import export_pack, import_pack
+            cache = AnalysisCache()
+            if self.mode == "export":
+                result = export_pack(cache, self.path, self.engine, progress_callback=self.progress.emit)
+            else:
+                result = import_pack(cache, self.path, self.engine or None, progress_callback=self.progress.emit)
+            self.done.emit(result)
+        except Exception as e:
+            self.error.emit(str(e))
+
 
 class DataSettings(QGroupBox):
-    def __init__(self, parent=None):
+    def __init__(self, config_manager, parent=None):
         super().__init__("Data Management", parent)
+        self.config_manager = config_manager
         self.setStyleSheet(Styles.get_group_box_style())
+        self._cache_worker = None
+        self._pack_worker = None
+        self._compact_after_clear = False
+        self._stats_loaded = False
         
         self.setup_ui()
 
@@ -23,6 +113,212 @@ class DataSettings(QGroupBox):
         self.clear_data_btn = create_icon_button("Reset All Data", "fa5s.trash-alt", self.clear_all_data, self, danger=True)
         data_layout.addWidget(self.clear_data_btn, 0, 1)
 
+        # --- Cache size budget and statistics ---
+        budget_lbl = QLabel("Cache size limit (MB):")
+        budget_lbl.setStyleSheet(f"color: {Styles.COLOR_TEXT_PRIMARY}; font-size: 13px; background: transparent;")
+        data_layout.addWidget(budget_lbl, 1, 0)
+        self.cache_budget_input = QLineEdit()
+        self.cache_budget_input.setValidator(QIntValidator(16, 1024 * 1024, self.cache_budget_input))
+        self.cache_budget_input.setText(str(self.config_manager.get("cache_max_mb", DEFAULT_CACHE_MAX_MB)))
+        self.cache_budget_input.setStyleSheet(Styles.get_input_style())
+        self.cache_budget_input.setMaximumWidth(140)
+        data_layout.addWidget(self.cache_budget_input, 1, 1)
+
+        self.cache_stats_label = QLabel("Cache statistics not loaded")
+        self.cache_stats_label.setWordWrap(True)
+        self.cache_stats_label.setStyleSheet(f"color: {Styles.COLOR_TEXT_SECONDARY}; font-size: 12px; background: transparent;")
+        data_layout.addWidget(self.cache_stats_label, 2, 0, 1, 2)
+
+        self.refresh_stats_btn = create_icon_button("Refresh Stats", "fa5s.sync", self.refresh_cache_stats, self)
+        data_layout.addWidget(self.refresh_stats_btn, 3, 0)
+
+        self.compact_cache_btn = create_icon_button("Compact Cache", "fa5s.compress-arrows-alt", self.compact_cache, self)
+        data_layout.addWidget(self.compact_cache_btn, 3, 1)
+
+        # --- Cache packs: share engine results between machines ---
+        self.export_pack_btn = create_icon_button("Export Cache Pack", "fa5s.file-export", self.export_cache_pack, self)
+        data_layout.addWidget(self.export_pack_btn, 4, 0)
+
+        self.import_pack_btn = create_icon_button("Import Cache Pack", "fa5s.file-import", self.import_cache_pack, self)
+        data_layout.addWidget(self.import_pack_btn, 4, 1)
+
+        # --- Read-only base caches searched after the user's own cache ---
+        base_lbl = QLabel("Shared base caches:")
+        base_lbl.setStyleSheet(f"color: {Styles.COLOR_TEXT_PRIMARY}; font-size: 13px; background: transparent;")
+        data_layout.addWidget(base_lbl, 5, 0)
+        self.cache_base_input = QLineEdit()
+        self.cache_base_input.setPlaceholderText(f"Paths separated by '{os.pathsep}'")
+        self.cache_base_input.setText(os.pathsep.join(self.config_manager.get("cache_base_paths") or []))
+        self.cache_base_input.setStyleSheet(Styles.get_input_style())
+        data_layout.addWidget(self.cache_base_input, 5, 1)
+
+        self.add_base_btn = create_icon_button("Add Base Cache", "fa5s.layer-group", self.add_cache_base, self)
+        data_layout.addWidget(self.add_base_btn, 6, 1)
+
+        # --- Opening pre-analysis (a second engine process, so opt-in) ---
+        self.prewarm_checkbox = QCheckBox("Pre-analyse popular openings while the app is idle")
+        self.prewarm_checkbox.setToolTip(
+            "Runs a one-thread engine in the background to fill the analysis cache.\n"
+            "It pauses while any analysis runs and until the app has been idle for a while."
+        )
+        self.prewarm_checkbox.setStyleSheet(self._checkbox_style())
+        self.prewarm_checkbox.setChecked(self.config_manager.get("opening_prewarm_enabled", False))
+        data_layout.addWidget(self.prewarm_checkbox, 7, 0, 1, 2)
+
+    def _checkbox_style(self):
+        tick_path = get_resource_path("assets/images/tick.svg").replace("\\", "/")
+        return f"""
+            QCheckBox {{
+                color: {Styles.COLOR_TEXT_PRIMARY};
+                font-size: 13px;
+                background: transparent;
+                spacing: 8px;
+            }}
+            QCheckBox::indicator {{
+                width: 18px;
+                height: 18px;
+                border: 1px solid {Styles.COLOR_BORDER};
+                border-radius: 4px;
+                background-color: {Styles.COLOR_SURFACE_LIGHT};
+            }}
+            QCheckBox::indicator:checked {{
+                background-color: {Styles.COLOR_ACCENT};
+                border-color: {Styles.COLOR_ACCENT};
+                image: url('{tick_path}');
+            }}
+        """
+
+    def showEvent(self, event):
+        super().showEvent(event)
+        # Statistics need a table scan, so load them only once the panel is shown.
+        if not self._stats_loaded:
+            self._stats_loaded = True
+            self.refresh_cache_stats()
+
+    def cache_budget_mb(self) -> int:
+        try:
+            return max(16, int(self.cache_budget_input.text().strip()))
+        except ValueError:
+            return self.config_manager.get("cache_max_mb", DEFAULT_CACHE_MAX_MB)
+
+    def cache_base_paths(self) -> list:
+        return [p.strip() for p in self.cache_base_input.text().split(os.pathsep) if p.strip()]
+
+    def add_cache_base(self):
+        path, _ = QFileDialog.getOpenFileName(
+            self, "Select Base Analysis Cache", "", "Analysis Caches (*.db);;All Files (*)"
+        )
+        if path and path not in self.cache_base_paths():
+            self.cache_base_input.setText(os.pathsep.join(self.cache_base_paths() + [path]))
+
+    def refresh_cache_stats(self):
+        self._start_cache_worker(0)
+
+    def compact_cache(self):
+        """Evict down to the budget and release free pages, off the UI thread."""
+        self._start_cache_worker(self.cache_budget_mb() * 1024 * 1024)
+
+    def _start_cache_worker(self, max_bytes: int):
+        if self._cache_worker is not None and self._cache_worker.isRunning():
+            return
+        if max_bytes:
+            self._compact_after_clear = False
+        self.refresh_stats_btn.setEnabled(False)
+        self.compact_cache_btn.setEnabled(False)
+        self.cache_stats_label.setText("Compacting cache..." if max_bytes else "Loading cache statistics...")
+        worker = CacheMaintenanceWorker(max_bytes, self)
+        worker.done.connect(self._on_cache_stats)
+        worker.error.connect(self._on_cache_error)
+        worker.finished.connect(self._on_cache_worker_finished)
+        self._cache_worker = worker
+        worker.start()
+
+    def _on_cache_stats(self, stats):
+        self.cache_stats_label.setText(format_cache_stats(stats, self.cache_budget_mb()))
+
+    def _on_cache_error(self, msg):
+        self.cache_stats_label.setText(f"Cache statistics unavailable: {msg}")
+
+    def _on_cache_worker_finished(self):
+        self.refresh_stats_btn.setEnabled(True)
+        self.compact_cache_btn.setEnabled(True)
+        # The cache was cleared while statistics were loading: compact now
+        if self._compact_after_clear:
+            self.compact_cache()
+
+    def export_cache_pack(self):
+        from src.backend.storage.cache_pack import PACK_EXTENSION, engine_identity
+        path, _ = QFileDialog.getSaveFileName(
+            self, "Export Cache Pack", f"analysis_cache{PACK_EXTENSION}",
+            f"Cache Packs (*{PACK_EXTENSION})"
+        )
+        if not path:
+            return
+        if not path.endswith(PACK_EXTENSION):
+            path += PACK_EXTENSION
+        self._start_pack_worker("export", path, engine_identity(self.config_manager))
+
+    def import_cache_pack(self):
+        from src.backend.storage.cache_pack import PACK_EXTENSION, PackError, engine_identity, read_pack_header
+        path, _ = QFileDialog.getOpenFileName(
+            self, "Import Cache Pack", "", f"Cache Packs (*{PACK_EXTENSION});;All Files (*)"
+        )
+        if not path:
+            return
+        try:
+            header = read_pack_header(path)
+        except (OSError, PackError) as e:
+            QMessageBox.warning(self, "Import Cache Pack", f"Cannot read {os.path.basename(path)}: {e}")
+            return
+        # The worker rejects packs from another engine unless the user
+        # confirms the import here (the CLI's --force)
+        engine = engine_identity(self.config_manager)
+        if header.get("engine") != engine:
+            reply = QMessageBox.question(
+                self, "Import Cache Pack",
+                f"This pack was made with '{header.get('engine')}' but your engine is '{engine}'. "
+                "Cached evaluations would be reused as if they came from your engine. Import anyway?",
+                QMessageBox.StandardButton.Yes | QMessageBox.StandardButton.No
+            )
+            if reply != QMessageBox.StandardButton.Yes:
+                return
+            engine = ""
+        self._start_pack_worker("import", path, engine)
+
+    def _start_pack_worker(self, mode: str, path: str, engine: str = ""):
+        if self._pack_worker is not None and self._pack_worker.isRunning():
+            return
+        self.export_pack_btn.setEnabled(False)
+        self.import_pack_btn.setEnabled(False)
+        self.cache_stats_label.setText("Exporting cache pack..." if mode == "export" else "Importing cache pack...")
+        worker = CachePackWorker(mode, path, engine, self)
+        worker.progress.connect(self._on_pack_progress)
+        worker.done.connect(self._on_pack_done)
+        worker.error.connect(self._on_pack_error)
+        worker.finished.connect(self._on_pack_worker_finished)
+        self._pack_worker = worker
+        worker.start()
+
+    def _on_pack_progress(self, done, total):
+        verb = "Exporting" if self._pack_worker.mode == "export" else "Importing"
+        self.cache_stats_label.setText(f"{verb} cache pack... {done:,} of {total:,} entries")
+
+    def _on_pack_done(self, result):
+        from src.gui.main_window import MainWindow
+        if "merged" in result:
+            message = f"Merged {result['merged']:,} of {result['read']:,} cached positions."
+        else:
+            message = f"Exported {result['entries']:,} cached positions."
+        MainWindow.toast_from_widget(self, message, "success")
+
+    def _on_pack_error(self, msg):
+        QMessageBox.warning(self, "Cache Pack", f"Cache pack operation failed: {msg}")
+
+    def _on_pack_worker_finished(self):
+        self.export_pack_btn.setEnabled(True)
+        self.import_pack_btn.setEnabled(True)
+        self.refresh_cache_stats()
+
     def clear_cache(self):
         reply = QMessageBox.question(self, "Confirm", "Are you sure you want to clear the analysis cache? This will not delete your game history.",
                                      QMessageBox.StandardButton.Yes | QMessageBox.StandardButton.No)
@@ -30,6 +326,9 @@ class DataSettings(QGroupBox):
             from src.backend.storage.cache import AnalysisCache
             cache = AnalysisCache()
             cache.clear_cache()
+            # Releasing the freed pages can take a while on a large file
+            self._compact_after_clear = True
+            self._start_cache_worker(self.cache_budget_mb() * 1024 * 1024)
             from src.gui.main_window import MainWindow
             MainWindow.toast_from_widget(self, "Analysis cache cleared.", "success")
 
@@ -65,3 +364,9 @@ class DataSettings(QGroupBox):
         self.setStyleSheet(Styles.get_group_box_style())
         self.clear_cache_btn.setStyleSheet(default_style)
         self.clear_data_btn.setStyleSheet(danger_style)
+        self.refresh_stats_btn.setStyleSheet(default_style)
+        self.compact_cache_btn.setStyleSheet(default_style)
+        self.export_pack_btn.setStyleSheet(default_style)
+        self.import_pack_btn.setStyleSheet(default_style)
+        self.add_base_btn.setStyleSheet(default_style)
+        self.prewarm_checkbox.setStyleSheet(self._checkbox_style())
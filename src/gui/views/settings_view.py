@@ -34,6 +34,7 @@ class SettingsView(QWidget):
     engine_settings_changed = pyqtSignal()  # emitted when Threads/Hash change
     llm_config_changed = pyqtSignal()   # emitted after LLM settings are saved
     usernames_changed = pyqtSignal()
+    opening_prewarm_changed = pyqtSignal(bool)  # background opening pre-analysis toggled
 
     def __init__(self):
         super().__init__()
@@ -96,7 +97,7 @@ class SettingsView(QWidget):
         self.api_settings = ApiSettings(self.config_manager, self)
         self.player_settings = PlayerSettings(self.config_manager, self)
         self.appearance_settings = AppearanceSettings(self.config_manager, self)
-        self.data_settings = DataSettings(self)
+        self.data_settings = DataSettings(self.config_manager, self)
         self.links_settings = LinksSettings(self)
 
         # Add components to layout
@@ -155,6 +156,7 @@ class SettingsView(QWidget):
         self.api_settings._reload_profile_combo()
         self.api_settings.lichess_token_input.setText(self.config_manager.get("lichess_token", ""))
         self.appearance_settings.theme_combo.setCurrentText(self.config_manager.get("board_theme", "Green"))
+        self.data_settings.prewarm_checkbox.setChecked(self.config_manager.get("opening_prewarm_enabled", False))
         self.api_settings._update_active_label()
 
     def _create_save_button(self):
@@ -345,6 +347,11 @@ class SettingsView(QWidget):
         self.config_manager.config["chesscom_username"] = chesscom
         self.config_manager.config["lichess_username"] = lichess
         self.config_manager.config["api_games_limit"] = limit
+        self.config_manager.config["cache_max_mb"] = self.data_settings.cache_budget_mb()
+        self.config_manager.config["cache_base_paths"] = self.data_settings.cache_base_paths()
+        prewarm_enabled = self.data_settings.prewarm_checkbox.isChecked()
+        prewarm_changed = self.config_manager.get("opening_prewarm_enabled", False) != prewarm_enabled
+        self.config_manager.config["opening_prewarm_enabled"] = prewarm_enabled
 
         # Save to disk
         self.config_manager.save_config()
@@ -360,6 +367,8 @@ class SettingsView(QWidget):
         else:
             logger.info("SettingsView: Engine settings (Threads, Hash) were NOT modified during this save.")
 
+        if prewarm_changed:
+            self.opening_prewarm_changed.emit(prewarm_enabled)
         self.llm_config_changed.emit()
         self.usernames_changed.emit()
 
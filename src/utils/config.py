@@ -2,7 +2,11 @@ import json
 import os
 from .logger import logger
 from .path_utils import get_app_path, get_user_data_dir
-from src.constants import DEFAULT_ANALYSIS_DEPTH, DEFAULT_MULTI_PV, DEFAULT_LIVE_ANALYSIS_TIME
+from src.constants import (
+    DEFAULT_ANALYSIS_DEPTH, DEFAULT_MULTI_PV, DEFAULT_LIVE_ANALYSIS_TIME,
+    DEFAULT_CACHE_MEMORY_ENTRIES, DEFAULT_CACHE_MEMORY_MB, DEFAULT_CACHE_MAX_MB,
+    DEFAULT_PREWARM_MAX_NODES, DEFAULT_PREWARM_INTERVAL,
+)
 
 class ConfigManager:
     CONFIG_FILE = "config.json"
@@ -35,6 +39,24 @@ class ConfigManager:
         # wins over a `.get(key, default)` fallback).
         "multi_pv": DEFAULT_MULTI_PV,
         "live_analysis_time": DEFAULT_LIVE_ANALYSIS_TIME,
+        # Seconds between group commits of new engine results while a game
+        # is analysed; 0 commits once when the game finishes.
+        "cache_flush_interval": 0.0,
+        # Limits of the in-memory LRU tier in front of the analysis cache.
+        "cache_memory_entries": DEFAULT_CACHE_MEMORY_ENTRIES,
+        "cache_memory_mb": DEFAULT_CACHE_MEMORY_MB,
+        # On-disk budget (MB) for analysis_cache.db's engine results.
+        "cache_max_mb": DEFAULT_CACHE_MAX_MB,
+        # Read-only analysis cache databases (e.g. on a network share) searched
+        # after the user's own cache; new results are never written to them.
+        "cache_base_paths": [],
+        # Idle-time pre-analysis of the opening tree into the analysis cache:
+        # most popular positions first, paused while any engine is analysing
+        # or the user is active. Opt-in (Settings > Data Management): it runs
+        # a second engine process.
+        "opening_prewarm_enabled": False,
+        "opening_prewarm_max_nodes": DEFAULT_PREWARM_MAX_NODES,
+        "opening_prewarm_interval": DEFAULT_PREWARM_INTERVAL,
         # Last known main window geometry (x, y, width, height).
         # Any field may be None, meaning "use Qt's default for that dimension".
         "window_state": {"x": None, "y": None, "width": None, "height": None},
@@ -306,3 +306,39 @@ def test_check_book_move_merging(mocker, mock_engine):
 
 
 
+
+def test_analyzer_dependencies_are_lazy(tmp_path, monkeypatch, mocker):
+    """Constructing an Analyzer must not touch the cache/history/opening databases."""
+    monkeypatch.setattr("src.backend.analysis.analyzer.get_user_data_dir", lambda: str(tmp_path))
+    cache_cls = mocker.patch("src.backend.analysis.analyzer.AnalysisCache")
+    history_cls = mocker.patch("src.backend.analysis.analyzer.GameHistoryManager")
+    opening_cls = mocker.patch("src.backend.analysis.analyzer.OpeningDB")
+
+    analyzer = Analyzer(engine_manager=None)
+    assert not analyzer.is_ready()
+    cache_cls.assert_not_called()
+    history_cls.assert_not_called()
+    opening_cls.assert_not_called()
+
+    # First access builds the component exactly once
+    assert analyzer.cache is analyzer.cache
+    cache_cls.assert_called_once()
+    opening_cls.assert_not_called()
+
+def test_analyzer_warm_up(tmp_path, monkeypatch, mocker):
+    """warm_up() builds every dependency and signals readiness."""
+    monkeypatch.setattr("src.backend.analysis.analyzer.get_user_data_dir", lambda: str(tmp_path))
+    mocker.patch("src.backend.analysis.analyzer.AnalysisCache")
+    mocker.patch("src.backend.analysis.analyzer.GameHistoryManager")
+    opening_cls = mocker.patch("src.backend.analysis.analyzer.OpeningDB")
+    opening_cls.return_value.initialize.side_effect = FileNotFoundError("no tsv")
+
+    analyzer = Analyzer(engine_manager=None)
+    analyzer.warm_up()
+
+    assert analyzer.is_ready()
+    assert analyzer._cache is not None
+    assert analyzer._history_manager is not None
+    assert analyzer._local_book is not None
+    assert analyzer._polyglot_book is not None
+    opening_cls.return_value.initialize.assert_called_once()
@@ -0,0 +1,418 @@
+import pytest
+import json
+import hashlib
+import sqlite3
+import chess
+from src.backend.storage.cache import AnalysisCache
+
+@pytest.fixture
+def temp_db(tmp_path):
+    return str(tmp_path / "test_cache.db")
+
+PARAMS = {"depth": 18, "multi_pv": 1, "time_per_move": 1.0}
+RESULT = [{"cp": 30, "pv": ["e2e4", "e7e5"], "depth": 18}]
+
+def test_save_and_get_analysis(temp_db):
+    """Test depth-aware save and lookup."""
+    cache = AnalysisCache(temp_db)
+    cache.save_analysis(chess.STARTING_FEN, PARAMS, RESULT)
+
+    assert cache.get_analysis(chess.STARTING_FEN, PARAMS) == RESULT
+    # Shallower requests are served, deeper ones miss
+    assert cache.get_analysis(chess.STARTING_FEN, {**PARAMS, "depth": 10}) == RESULT
+    assert cache.get_analysis(chess.STARTING_FEN, {**PARAMS, "depth": 20}) is None
+    # multi_pv is part of the key
+    assert cache.get_analysis(chess.STARTING_FEN, {**PARAMS, "multi_pv": 3}) is None
+
+def test_save_keeps_deeper_result(temp_db):
+    """A shallower save must not overwrite a deeper entry."""
+    cache = AnalysisCache(temp_db)
+    cache.save_analysis(chess.STARTING_FEN, PARAMS, RESULT)
+    cache.save_analysis(chess.STARTING_FEN, {**PARAMS, "depth": 10}, [{"pv": ["d2d4"]}])
+    assert cache.get_analysis(chess.STARTING_FEN, PARAMS) == RESULT
+
+def test_move_clocks_share_key(temp_db):
+    """Positions are keyed by Zobrist hash, so move clocks do not matter."""
+    cache = AnalysisCache(temp_db)
+    cache.save_analysis(chess.STARTING_FEN, PARAMS, RESULT)
+    assert cache.get_analysis(chess.STARTING_FEN.replace(" 0 1", " 4 9"), PARAMS) == RESULT
+
+def test_schema_is_without_rowid(temp_db):
+    """The v2 table uses an integer composite key without a rowid."""
+    AnalysisCache(temp_db)
+    conn = sqlite3.connect(temp_db)
+    sql = conn.execute("SELECT sql FROM sqlite_master WHERE name = 'analysis'").fetchone()[0]
+    version = conn.execute("SELECT value FROM cache_meta WHERE key = 'schema_version'").fetchone()[0]
+    conn.close()
+    assert "WITHOUT ROWID" in sql
+    assert version == str(AnalysisCache.SCHEMA_VERSION)
+
+def test_migrates_v1_cache(temp_db):
+    """A v1 (sha256 TEXT key) cache is re-keyed on open."""
+    board = chess.Board()
+    board.push_san("e4")
+    conn = sqlite3.connect(temp_db)
+    conn.execute("CREATE TABLE analysis (id TEXT PRIMARY KEY, fen TEXT, engine_params TEXT, depth INTEGER DEFAULT 0, result TEXT)")
+    for fen, params, depth, result in [
+        (chess.STARTING_FEN, PARAMS, 18, RESULT),
+        (board.fen(), {**PARAMS, "multi_pv": 3}, 12, [{"pv": ["c7c5"]}]),
+        ("not a fen", PARAMS, 18, RESULT),
+    ]:
+        key = hashlib.sha256(f"{fen}|multipv:{params['multi_pv']}".encode()).hexdigest()
+        conn.execute("INSERT INTO analysis VALUES (?, ?, ?, ?, ?)",
+                     (key, fen, json.dumps(params), depth, json.dumps(result)))
+    conn.commit()
+    conn.close()
+
+    cache = AnalysisCache(temp_db)
+    assert cache.get_analysis(chess.STARTING_FEN, PARAMS) == RESULT
+    assert cache.get_analysis(board.fen(), {"depth": 12, "multi_pv": 3}) == [{"pv": ["c7c5"]}]
+    assert cache.conn.execute("SELECT COUNT(*) FROM analysis").fetchone()[0] == 2
+
+    # Re-opening a migrated cache is a no-op
+    cache = AnalysisCache(temp_db)
+    assert cache.get_analysis(chess.STARTING_FEN, PARAMS) == RESULT
+
+def test_failed_v1_migration_keeps_old_rows(temp_db, monkeypatch):
+    """A migration that fails part-way keeps the v1 rows and is retried on the next open."""
+    from src.backend.storage import cache as cache_module
+    conn = sqlite3.connect(temp_db)
+    conn.execute("CREATE TABLE analysis (id TEXT PRIMARY KEY, fen TEXT, engine_params TEXT, depth INTEGER DEFAULT 0, result TEXT)")
+    conn.execute("INSERT INTO analysis VALUES ('k', ?, ?, 18, ?)",
+                 (chess.STARTING_FEN, json.dumps(PARAMS), json.dumps(RESULT)))
+    conn.commit()
+    conn.close()
+
+    def fail(_fen):
+        raise sqlite3.OperationalError("database or disk is full")
+    monkeypatch.setattr(cache_module, "zobrist_key", fail)
+    cache = AnalysisCache(temp_db)
+    monkeypatch.undo()
+    assert cache.conn.execute("SELECT COUNT(*) FROM analysis_v1").fetchone()[0] == 1
+    assert cache.get_analysis(chess.STARTING_FEN, PARAMS) is None
+    cache.conn.close()
+
+    cache = AnalysisCache(temp_db)
+    assert cache.get_analysis(chess.STARTING_FEN, PARAMS) == RESULT
+    assert cache.conn.execute("SELECT COUNT(*) FROM sqlite_master WHERE name = 'analysis_v1'").fetchone()[0] == 0
+
+def test_batch_buffers_writes_until_exit(temp_db):
+    """Writes inside batch() are visible to the cache but committed on exit."""
+    cache = AnalysisCache(temp_db)
+    with cache.batch():
+        cache.save_analysis(chess.STARTING_FEN, PARAMS, RESULT)
+        assert cache.get_analysis(chess.STARTING_FEN, PARAMS) == RESULT
+        other = sqlite3.connect(temp_db)
+        assert other.execute("SELECT COUNT(*) FROM analysis").fetchone()[0] == 0
+    assert other.execute("SELECT COUNT(*) FROM analysis").fetchone()[0] == 1
+    other.close()
+
+def test_batch_flush_interval(temp_db, mocker):
+    """With a flush interval, pending writes are committed once it elapses."""
+    clock = mocker.patch("src.backend.storage.cache.time.monotonic", return_value=100.0)
+    cache = AnalysisCache(temp_db)
+    board = chess.Board()
+    with cache.batch(flush_interval=5.0):
+        cache.save_analysis(board.fen(), PARAMS, RESULT)
+        assert cache._pending
+        clock.return_value = 106.0
+        board.push_san("e4")
+        cache.save_analysis(board.fen(), PARAMS, RESULT)
+        assert not cache._pending
+        count = sqlite3.connect(temp_db).execute("SELECT COUNT(*) FROM analysis").fetchone()[0]
+        assert count == 2
+
+def test_prefetch_serves_lookups_from_memory(temp_db):
+    """After prefetch() a game's lookups need no further queries."""
+    cache = AnalysisCache(temp_db)
+    board = chess.Board()
+    fens = [board.fen()]
+    cache.save_analysis(board.fen(), PARAMS, RESULT)
+    board.push_san("e4")
+    fens.append(board.fen())
+
+    with cache.batch():
+        assert cache.prefetch(fens, PARAMS) == 1
+        statements = []
+        cache.conn.set_trace_callback(statements.append)
+        assert cache.get_analysis(fens[0], PARAMS) == RESULT
+        assert cache.get_analysis(fens[1], PARAMS) is None
+        cache.conn.set_trace_callback(None)
+        assert statements == []
+    assert not cache._prefetched
+
+def test_memory_tier_serves_repeat_lookups(temp_db):
+    """Repeat lookups are answered from the LRU tier without touching SQLite."""
+    cache = AnalysisCache(temp_db)
+    cache.save_analysis(chess.STARTING_FEN, PARAMS, RESULT)
+    cache.memory.clear()
+
+    assert cache.get_analysis(chess.STARTING_FEN, PARAMS) == RESULT
+    statements = []
+    cache.conn.set_trace_callback(statements.append)
+    assert cache.get_analysis(chess.STARTING_FEN, PARAMS) == RESULT
+    cache.conn.set_trace_callback(None)
+    assert statements == []
+
+    stats = cache.stats()
+    assert stats["hits"] == 1
+    assert stats["misses"] == 1
+    assert stats["db_hits"] == 1
+
+def test_memory_tier_limits(temp_db):
+    """The LRU tier evicts the least recently used entries past its limits."""
+    cache = AnalysisCache(temp_db, memory_entries=2)
+    board = chess.Board()
+    fens = []
+    for san in ["e4", "e5", "Nf3"]:
+        board.push_san(san)
+        fens.append(board.fen())
+        cache.save_analysis(board.fen(), PARAMS, RESULT)
+    stats = cache.stats()
+    assert stats["entries"] == 2
+    assert stats["evictions"] == 1
+    # Evicted entries are still served by SQLite (write-through)
+    assert cache.get_analysis(fens[0], PARAMS) == RESULT
+
+def test_default_instance_keeps_tier_limits(temp_db):
+    """Only explicit limits resize the shared tier; a default instance leaves them alone."""
+    cache = AnalysisCache(temp_db, memory_entries=5, memory_mb=1)
+    other = AnalysisCache(temp_db)
+    assert other.memory is cache.memory
+    assert (cache.memory.max_entries, cache.memory.max_bytes) == (5, 1024 * 1024)
+    AnalysisCache(temp_db, memory_entries=7)
+    assert (cache.memory.max_entries, cache.memory.max_bytes) == (7, 1024 * 1024)
+
+def test_clear_cache_is_shared_across_instances(temp_db):
+    """Clearing through one instance empties the memory tier seen by others."""
+    cache = AnalysisCache(temp_db)
+    cache.save_analysis(chess.STARTING_FEN, PARAMS, RESULT)
+    AnalysisCache(temp_db).clear_cache()
+    assert cache.get_analysis(chess.STARTING_FEN, PARAMS) is None
+
+def _fill(cache, count, depth=18, multi_pv=1):
+    """Save `count` distinct random-walk positions and return their FENs."""
+    import random
+    rng = random.Random(count)
+    board = chess.Board()
+    fens = []
+    while len(fens) < count:
+        if board.is_game_over() or board.ply() > 60:
+            board = chess.Board()
+        board.push(rng.choice(list(board.legal_moves)))
+        if board.fen() in fens:
+            continue
+        fens.append(board.fen())
+        cache.save_analysis(board.fen(), {"depth": depth, "multi_pv": multi_pv}, RESULT * 8)
+    return fens
+
+def test_hits_are_recorded_in_bulk(temp_db):
+    """Lookups bump hits/last_access when buffered counts are flushed."""
+    cache = AnalysisCache(temp_db)
+    cache.save_analysis(chess.STARTING_FEN, PARAMS, RESULT)
+    for _ in range(3):
+        cache.get_analysis(chess.STARTING_FEN, PARAMS)
+    assert cache.conn.execute("SELECT hits FROM analysis").fetchone()[0] == 0
+    cache.flush()
+    hits, last_access = cache.conn.execute("SELECT hits, last_access FROM analysis").fetchone()
+    assert hits == 3
+    assert last_access > 0
+
+def test_maintenance_evicts_low_value_entries(temp_db):
+    """Over budget, superseded and shallow/unused entries go first and space is reclaimed."""
+    cache = AnalysisCache(temp_db)
+    fens = _fill(cache, 400)
+    keep = fens[:20]
+    for fen in keep:
+        cache.get_analysis(fen, PARAMS)
+    # Superseded: same position cached wider at equal depth
+    cache.save_analysis(fens[-1], {**PARAMS, "multi_pv": 3}, RESULT)
+    cache.flush()
+
+    size = cache.disk_stats()["file_bytes"]
+    result = cache.run_maintenance(size // 2)
+
+    assert result["evicted"] > 0
+    remaining = {row[0] for row in cache.conn.execute("SELECT zobrist FROM analysis WHERE multipv = 1")}
+    from src.backend.storage.compact import zobrist_key
+    assert all(zobrist_key(fen) in remaining for fen in keep)
+    assert zobrist_key(fens[-1]) not in remaining
+    assert cache.disk_stats()["free_bytes"] == 0
+    assert cache.disk_stats()["file_bytes"] < size
+
+def test_maintenance_noop_under_budget(temp_db):
+    cache = AnalysisCache(temp_db)
+    _fill(cache, 10)
+    assert cache.run_maintenance(64 * 1024 * 1024)["evicted"] == 0
+    assert cache.disk_stats()["entries"] == 10
+
+def test_incremental_vacuum_enabled(temp_db, tmp_path):
+    """Both new and pre-existing cache files use incremental auto-vacuum."""
+    AnalysisCache(temp_db)
+    assert sqlite3.connect(temp_db).execute("PRAGMA auto_vacuum").fetchone()[0] == 2
+
+    existing = str(tmp_path / "existing.db")
+    conn = sqlite3.connect(existing)
+    conn.execute("CREATE TABLE games (id TEXT PRIMARY KEY)")
+    conn.commit()
+    conn.close()
+    AnalysisCache(existing)
+    assert sqlite3.connect(existing).execute("PRAGMA auto_vacuum").fetchone()[0] == 2
+
+def test_result_codec_round_trip():
+    """Binary records decode to exactly the lines that were encoded."""
+    from src.backend.storage.compact import pack_result, unpack_result
+    lines = [
+        {"cp": -45, "pv": ["e7e8q", "a1a8", "0000"], "depth": 22},
+        {"mate": -3, "pv": [], "depth": 22},
+        {"pv": ["g1f3"], "depth": 7},
+    ]
+    blob = pack_result(lines, 22)
+    assert unpack_result(blob) == lines
+    assert len(blob) < len(json.dumps(lines)) / 2
+    for unsupported in ([{"cp": 1, "pv": [], "depth": 1, "extra": 1}],
+                        [{"cp": None, "pv": [], "depth": 1}],
+                        [{"cp": 1, "pv": ["e2e4"]}],
+                        [{"cp": 1, "pv": [], "depth": 300}]):
+        with pytest.raises(ValueError):
+            pack_result(unsupported)
+
+def test_results_stored_as_binary(temp_db):
+    """Engine results are stored as binary records; other shapes as JSON."""
+    cache = AnalysisCache(temp_db)
+    cache.save_analysis(chess.STARTING_FEN, PARAMS, RESULT)
+    odd = [{"score_cp": 30}]
+    other_fen = chess.Board("8/8/8/4k3/8/8/8/4K2R w K - 0 1").fen()
+    cache.save_analysis(other_fen, PARAMS, odd)
+    types = [row[0] for row in cache.conn.execute("SELECT typeof(result) FROM analysis")]
+    assert sorted(types) == ["blob", "text"]
+
+    cache.memory.clear()
+    assert cache.get_analysis(chess.STARTING_FEN, PARAMS) == RESULT
+    assert cache.get_analysis(other_fen, PARAMS) == odd
+
+def test_migrates_v2_json_results(temp_db):
+    """JSON results from schema v2 are re-encoded on open."""
+    from src.backend.storage.compact import zobrist_key
+    conn = sqlite3.connect(temp_db)
+    conn.execute("CREATE TABLE cache_meta (key TEXT PRIMARY KEY, value TEXT)")
+    conn.execute("INSERT INTO cache_meta VALUES ('schema_version', '2')")
+    conn.execute("""CREATE TABLE analysis (zobrist INTEGER NOT NULL, multipv INTEGER NOT NULL,
+                    depth INTEGER NOT NULL DEFAULT 0, result TEXT, PRIMARY KEY (zobrist, multipv)) WITHOUT ROWID""")
+    conn.execute("INSERT INTO analysis VALUES (?, 1, 18, ?)", (zobrist_key(chess.STARTING_FEN), json.dumps(RESULT)))
+    conn.commit()
+    conn.close()
+
+    cache = AnalysisCache(temp_db)
+    assert cache.conn.execute("SELECT typeof(result) FROM analysis").fetchone()[0] == "blob"
+    assert cache.get_analysis(chess.STARTING_FEN, PARAMS) == RESULT
+    version = cache.conn.execute("SELECT value FROM cache_meta WHERE key = 'schema_version'").fetchone()[0]
+    assert version == "3"
+
+MULTI_RESULT = [
+    {"cp": 30, "pv": ["e2e4", "e7e5"], "depth": 20},
+    {"cp": 25, "pv": ["d2d4", "d7d5"], "depth": 20},
+    {"cp": 20, "pv": ["c2c4"], "depth": 20},
+]
+
+def test_wider_entry_answers_narrower_lookup(temp_db):
+    """A multipv=3 entry satisfies multipv 1-3 lookups, truncated."""
+    cache = AnalysisCache(temp_db)
+    cache.save_analysis(chess.STARTING_FEN, {"depth": 20, "multi_pv": 3}, MULTI_RESULT)
+    cache.memory.clear()
+
+    assert cache.get_analysis(chess.STARTING_FEN, {"depth": 18, "multi_pv": 1}) == MULTI_RESULT[:1]
+    assert cache.get_analysis(chess.STARTING_FEN, {"depth": 20, "multi_pv": 2}) == MULTI_RESULT[:2]
+    assert cache.get_analysis(chess.STARTING_FEN, {"depth": 20, "multi_pv": 3}) == MULTI_RESULT
+    assert cache.get_analysis(chess.STARTING_FEN, {"depth": 20, "multi_pv": 4}) is None
+    assert cache.get_analysis(chess.STARTING_FEN, {"depth": 22, "multi_pv": 1}) is None
+
+def test_saves_merge_covering_entries(temp_db):
+    """Covered saves are skipped; a covering save replaces what it covers."""
+    cache = AnalysisCache(temp_db)
+    cache.save_analysis(chess.STARTING_FEN, {"depth": 18, "multi_pv": 1}, RESULT)
+    cache.save_analysis(chess.STARTING_FEN, {"depth": 20, "multi_pv": 3}, MULTI_RESULT)
+    rows = cache.conn.execute("SELECT multipv, depth FROM analysis").fetchall()
+    assert rows == [(3, 20)]
+
+    # Narrower but deeper: kept alongside the wider entry
+    deeper = [{"cp": 35, "pv": ["e2e4"], "depth": 24}]
+    cache.save_analysis(chess.STARTING_FEN, {"depth": 24, "multi_pv": 1}, deeper)
+    # Covered by the multipv=3 entry: skipped
+    cache.save_analysis(chess.STARTING_FEN, {"depth": 16, "multi_pv": 2}, MULTI_RESULT[:2])
+    rows = sorted(cache.conn.execute("SELECT multipv, depth FROM analysis").fetchall())
+    assert rows == [(1, 24), (3, 20)]
+
+    cache.memory.clear()
+    assert cache.get_analysis(chess.STARTING_FEN, {"depth": 22, "multi_pv": 1}) == deeper
+    assert cache.get_analysis(chess.STARTING_FEN, {"depth": 20, "multi_pv": 2}) == MULTI_RESULT[:2]
+
+def test_subsumption_inside_batch(temp_db):
+    """Prefetched and pending entries follow the same covering rules."""
+    cache = AnalysisCache(temp_db)
+    cache.save_analysis(chess.STARTING_FEN, {"depth": 20, "multi_pv": 3}, MULTI_RESULT)
+    with cache.batch():
+        assert cache.prefetch([chess.STARTING_FEN], {"multi_pv": 2}) == 1
+        cache.memory.clear()
+        assert cache.get_analysis(chess.STARTING_FEN, {"depth": 20, "multi_pv": 2}) == MULTI_RESULT[:2]
+        cache.save_analysis(chess.STARTING_FEN, {"depth": 24, "multi_pv": 3}, MULTI_RESULT)
+    rows = cache.conn.execute("SELECT multipv, depth FROM analysis").fetchall()
+    assert rows == [(3, 24)]
+
+def _build_base(path, entries):
+    base = AnalysisCache(path)
+    for fen, params, result in entries:
+        base.save_analysis(fen, params, result)
+    base.conn.close()  # checkpoints the WAL into the file
+
+def test_base_layer_lookups_fall_through(tmp_path):
+    """Misses in the user cache are answered by read-only bases, in order."""
+    after_e4 = chess.Board("rnbqkbnr/pppppppp/8/8/4P3/8/PPPP1PPP/RNBQKBNR b KQkq - 0 1").fen()
+    base_a, base_b = str(tmp_path / "a.db"), str(tmp_path / "b.db")
+    _build_base(base_a, [(chess.STARTING_FEN, {"depth": 20, "multi_pv": 3}, MULTI_RESULT)])
+    deep = [{"cp": 10, "pv": ["e7e5"], "depth": 30}]
+    _build_base(base_b, [(after_e4, {"depth": 30, "multi_pv": 1}, deep)])
+
+    cache = AnalysisCache(str(tmp_path / "user.db"), base_paths=[base_a, base_b, str(tmp_path / "missing.db")])
+    assert [path for path, _ in cache.bases] == [base_a, base_b]
+    assert cache.get_analysis(chess.STARTING_FEN, {"depth": 18, "multi_pv": 2}) == MULTI_RESULT[:2]
+    assert cache.get_analysis(after_e4, {"depth": 25, "multi_pv": 1}) == deep
+
+    # Covered by a base: nothing is written to the user cache
+    cache.save_analysis(chess.STARTING_FEN, {"depth": 16, "multi_pv": 1}, RESULT)
+    # Deeper than the base: written to the user cache and preferred
+    deeper = [{"cp": 33, "pv": ["e2e4"], "depth": 26}]
+    cache.save_analysis(chess.STARTING_FEN, {"depth": 26, "multi_pv": 1}, deeper)
+    cache.flush()
+    assert cache.conn.execute("SELECT multipv, depth FROM analysis").fetchall() == [(1, 26)]
+    cache.memory.clear()
+    assert cache.get_analysis(chess.STARTING_FEN, {"depth": 22, "multi_pv": 1}) == deeper
+    assert cache.disk_stats()["base_layers"] == 2
+
+    # Bases are never written, cleared or counted
+    cache.clear_cache()
+    assert cache.get_analysis(after_e4, {"depth": 25, "multi_pv": 1}) == deep
+    assert AnalysisCache(base_b).disk_stats()["entries"] == 1
+
+def test_base_layer_prefetch_and_reconfigure(tmp_path):
+    base = str(tmp_path / "base.db")
+    _build_base(base, [(chess.STARTING_FEN, PARAMS, RESULT)])
+    cache = AnalysisCache(str(tmp_path / "user.db"), base_paths=[base])
+    with cache.batch():
+        assert cache.prefetch([chess.STARTING_FEN], PARAMS) == 1
+        for _, conn in cache.bases:
+            conn.set_trace_callback(lambda sql: pytest.fail(f"unexpected base query: {sql}"))
+        assert cache.get_analysis(chess.STARTING_FEN, PARAMS) == RESULT
+
+    cache.set_base_paths([])
+    assert cache.bases == []
+    assert cache.get_analysis(chess.STARTING_FEN, PARAMS) is None
+
+def test_outdated_base_is_skipped(tmp_path):
+    base = tmp_path / "v1.db"
+    conn = sqlite3.connect(str(base))
+    conn.execute("CREATE TABLE analysis (id TEXT PRIMARY KEY, fen TEXT, engine_params TEXT, depth INTEGER, result TEXT)")
+    conn.commit()
+    conn.close()
+    cache = AnalysisCache(str(tmp_path / "user.db"), base_paths=[str(base)])
+    assert cache.bases == []
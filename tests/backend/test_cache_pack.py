@@ -0,0 +1,91 @@
+import pytest
+import chess
+from src.backend.storage.cache import AnalysisCache
+from src.backend.storage import cache_pack
+from src.backend.storage.cache_pack import (
+    PackError, export_pack, import_pack, read_pack_header, verify_pack, main,
+)
+
+PARAMS = {"depth": 18, "multi_pv": 1}
+RESULT = [{"cp": 30, "pv": ["e2e4", "e7e5"], "depth": 18}]
+AFTER_E4 = "rnbqkbnr/pppppppp/8/8/4P3/8/PPPP1PPP/RNBQKBNR b KQkq - 0 1"
+
+@pytest.fixture
+def caches(tmp_path):
+    return AnalysisCache(str(tmp_path / "a.db")), AnalysisCache(str(tmp_path / "b.db"))
+
+def test_pack_round_trip(caches, tmp_path):
+    """Exported entries, binary and JSON, come back unchanged on another cache."""
+    source, target = caches
+    source.save_analysis(chess.STARTING_FEN, PARAMS, RESULT)
+    source.save_analysis(AFTER_E4, {"depth": 12, "multi_pv": 1}, [{"score_cp": 5}])
+    path = str(tmp_path / "shared.capack")
+
+    header = export_pack(source, path, engine="stockfish")
+    assert header["entries"] == 2
+    assert read_pack_header(path)["max_depth"] == 18
+
+    progress = []
+    result = import_pack(target, path, expected_engine="stockfish",
+                         progress_callback=lambda done, total: progress.append((done, total)))
+    assert (result["read"], result["merged"]) == (2, 2)
+    assert progress[-1] == (2, 2)
+    assert target.get_analysis(chess.STARTING_FEN, PARAMS) == RESULT
+    assert target.get_analysis(AFTER_E4, {"depth": 12, "multi_pv": 1}) == [{"score_cp": 5}]
+
+def test_import_keeps_deeper_result(caches, tmp_path):
+    source, target = caches
+    deep = [{"cp": 40, "pv": ["d2d4"], "depth": 24}]
+    source.save_analysis(chess.STARTING_FEN, PARAMS, RESULT)
+    source.save_analysis(AFTER_E4, {"depth": 24, "multi_pv": 1}, deep)
+    target.save_analysis(chess.STARTING_FEN, {"depth": 22, "multi_pv": 1}, deep)
+    target.save_analysis(AFTER_E4, {"depth": 10, "multi_pv": 1}, RESULT)
+    path = str(tmp_path / "shared.capack")
+    export_pack(source, path, engine="stockfish", min_depth=0)
+
+    assert import_pack(target, path)["merged"] == 1
+    assert target.get_analysis(chess.STARTING_FEN, {"depth": 22, "multi_pv": 1}) == deep
+    assert target.get_analysis(AFTER_E4, {"depth": 24, "multi_pv": 1}) == deep
+    assert target.conn.execute("SELECT COUNT(*) FROM analysis").fetchone()[0] == 2
+
+def test_export_min_depth(caches, tmp_path):
+    source, _ = caches
+    source.save_analysis(chess.STARTING_FEN, PARAMS, RESULT)
+    source.save_analysis(AFTER_E4, {"depth": 8, "multi_pv": 1}, RESULT)
+    path = str(tmp_path / "deep.capack")
+    assert export_pack(source, path, engine="stockfish", min_depth=16)["entries"] == 1
+
+def test_corrupt_or_foreign_pack_rejected(caches, tmp_path):
+    source, target = caches
+    source.save_analysis(chess.STARTING_FEN, PARAMS, RESULT)
+    path = tmp_path / "shared.capack"
+    export_pack(source, str(path), engine="stockfish")
+
+    with pytest.raises(PackError, match="engine"):
+        import_pack(target, str(path), expected_engine="lc0")
+
+    data = bytearray(path.read_bytes())
+    data[-40] ^= 0xFF
+    path.write_bytes(bytes(data))
+    with pytest.raises(PackError, match="checksum"):
+        verify_pack(str(path))
+    with pytest.raises(PackError):
+        import_pack(target, str(path))
+    assert target.conn.execute("SELECT COUNT(*) FROM analysis").fetchone()[0] == 0
+
+    not_a_pack = tmp_path / "notes.txt"
+    not_a_pack.write_text("hello, this is not a cache pack at all")
+    with pytest.raises(PackError, match="Not an analysis cache pack"):
+        read_pack_header(str(not_a_pack))
+
+def test_cli(tmp_path, mocker, capsys):
+    mocker.patch.object(cache_pack, "engine_identity", return_value="stockfish")
+    source_db, target_db = str(tmp_path / "a.db"), str(tmp_path / "b.db")
+    AnalysisCache(source_db).save_analysis(chess.STARTING_FEN, PARAMS, RESULT)
+    path = str(tmp_path / "cli.capack")
+
+    assert main(["--db", source_db, "export", path]) == 0
+    assert main(["--db", target_db, "import", path]) == 0
+    assert "Merged 1 of 1" in capsys.readouterr().out
+    assert AnalysisCache(target_db).get_analysis(chess.STARTING_FEN, PARAMS) == RESULT
+    assert main(["info", str(tmp_path / "missing.capack")]) == 1
@@ -34,3 +34,505 @@ def test_delete_game(temp_db):
     
     manager.delete_game("test_id")
     assert manager.get_game("test_id") is None
+
+def _game(game_id, white="Player1", black="Player2"):
+    metadata = GameMetadata(white=white, black=black, result="1-0", date="2023.10.01", event="Test", headers={})
+    return GameAnalysis(game_id=game_id, metadata=metadata, moves=[], pgn_content="pgn")
+
+def test_connections_are_per_thread_and_tuned(temp_db):
+    """Each thread reuses one tuned connection, shared by managers on the same file."""
+    import threading
+    manager = GameHistoryManager(temp_db)
+    other = GameHistoryManager(temp_db)
+    conn = manager._db.connection()
+    assert other._db.connection() is conn
+    assert conn.execute("PRAGMA journal_mode").fetchone()[0] == "wal"
+    assert conn.execute("PRAGMA synchronous").fetchone()[0] == 1  # NORMAL
+    assert conn.execute("PRAGMA mmap_size").fetchone()[0] > 0
+
+    seen = []
+    thread = threading.Thread(target=lambda: seen.append(manager._db.connection()))
+    thread.start()
+    thread.join()
+    assert seen[0] is not conn
+
+def test_concurrent_readers_and_writers(temp_db):
+    """History/metrics readers run alongside game saves and analysis-cache writes."""
+    import threading
+    import chess
+    from src.backend.storage.cache import AnalysisCache
+    manager = GameHistoryManager(temp_db)
+    errors = []
+    writers_done = threading.Event()
+
+    def save_games(prefix):
+        try:
+            for i in range(40):
+                manager.save_game(_game(f"{prefix}-{i}", white=f"{prefix}"), "pgn")
+        except Exception as e:
+            errors.append(e)
+
+    def save_cache():
+        try:
+            cache = AnalysisCache(temp_db)
+            board = chess.Board()
+            for move in ["e2e4", "e7e5", "g1f3", "b8c6", "f1b5", "a7a6", "b5a4", "g8f6"] * 5:
+                cache.save_analysis(board.fen(), {"depth": 10, "multi_pv": 1},
+                                    [{"cp": 10, "pv": [move], "depth": 10}])
+                if move in {m.uci() for m in board.legal_moves}:
+                    board.push_uci(move)
+        except Exception as e:
+            errors.append(e)
+
+    def read_history():
+        try:
+            while not writers_done.is_set():
+                games = manager.get_all_games()
+                assert all(g["id"] for g in games)
+                manager.get_games_for_users(["w0", "w1"])
+                manager.game_exists("w0-0")
+        except Exception as e:
+            errors.append(e)
+
+    writers = [threading.Thread(target=save_games, args=(f"w{n}",)) for n in range(3)]
+    writers.append(threading.Thread(target=save_cache))
+    readers = [threading.Thread(target=read_history) for _ in range(3)]
+    for thread in writers + readers:
+        thread.start()
+    for thread in writers:
+        thread.join()
+    writers_done.set()
+    for thread in readers:
+        thread.join()
+
+    assert errors == []
+    assert len(manager.get_games_for_users(["w0", "w1", "w2"])) == 120
+
+def test_analysed_moves_round_trip(temp_db, sample_pgn_chesscom):
+    """Moves saved with a game come back fully annotated without a reparse."""
+    from src.backend.storage.pgn_parser import PGNParser
+    from src.backend.storage.models import PVLine
+    game = PGNParser.parse_pgn_text(sample_pgn_chesscom)[0]
+    first = game.moves[0]
+    first.eval_before_cp, first.best_move, first.pv = 25, "e2e4", ["e2e4", "e7e5"]
+    first.classification, first.is_book_move, first.opening_name = "Book", True, "King's Pawn"
+    first.multi_pvs = [PVLine(["e2e4", "e7e5"], cp=25, depth=18, move=first)]
+    manager = GameHistoryManager(temp_db)
+    manager.save_game(game, game.pgn_content)
+
+    moves = manager.get_game_moves(game.game_id)
+    assert moves == game.moves
+    assert moves[-1].fen_before == game.moves[-1].fen_before
+    assert moves[0].pv == ["e2e4", "e7e5"]
+    assert moves[0].multi_pvs[0]["pv_san"] == "1. e4 e5"
+    assert moves[0].multi_pvs[0].depth == 18
+
+    # Games saved without moves (CSV import) keep no blob; deleting drops it.
+    manager.save_game(_game("bare"), "pgn")
+    assert manager.get_game_moves("bare") is None
+    # Re-saving a game without moves drops its old ones
+    game.moves = []
+    manager.save_game(game, game.pgn_content)
+    assert manager.get_game_moves(game.game_id) is None
+    manager.delete_game(game.game_id)
+    assert manager.get_game_moves(game.game_id) is None
+
+def test_keyset_pages_cover_every_game(temp_db):
+    """Pages walk the whole history newest first, past the old 200-row cap."""
+    manager = GameHistoryManager(temp_db)
+    with manager._db.transaction() as conn:
+        conn.executemany(manager.INSERT_GAME_SQL, [
+            (f"g{i:03d}", f"Alice{i % 2}", " BOB " if i % 3 == 0 else "Carol", "1-0", "", "", "pgn", "{}",
+             float(i // 2), None, None, None, None, None, None, None, "file", 0,
+             f"alice{i % 2}", "bob" if i % 3 == 0 else "carol", i % 7, (i % 7 + 1) // 2)
+            for i in range(250)
+        ])
+
+    seen, cursor = [], None
+    while True:
+        rows, cursor = manager.get_games_page(after=cursor, limit=40)
+        seen += [(row["timestamp"], row["id"]) for row in rows]
+        if cursor is None:
+            break
+    assert len(seen) == 250 and seen == sorted(seen, reverse=True)
+    assert len(manager.get_all_games()) == 250
+
+    # Either colour, case-insensitive, listed once when matching both sides
+    users = [g["id"] for g in manager.iter_games(["ALICE1", "bob"], page_size=7)]
+    expected = {f"g{i:03d}" for i in range(250) if i % 2 == 1 or i % 3 == 0}
+    assert len(users) == len(expected) and set(users) == expected
+    assert len(manager.get_games_for_users(["Alice0"])) == 125
+
+def test_player_keys_backfilled(temp_db):
+    """Rows from before the normalized columns existed are backfilled by run_backfills()."""
+    import sqlite3
+    conn = sqlite3.connect(temp_db)
+    conn.execute("CREATE TABLE games (id TEXT PRIMARY KEY, white TEXT, black TEXT, result TEXT, "
+                 "date TEXT, event TEXT, pgn TEXT, summary_json TEXT, timestamp REAL)")
+    conn.execute("INSERT INTO games VALUES ('old', ' Magnus ', 'Hikaru', '1-0', '', '', 'pgn', '{}', 1.0)")
+    conn.commit()
+    conn.close()
+
+    manager = GameHistoryManager(temp_db)
+    assert manager.get_games_for_users(["magnus"]) == []
+    assert manager.run_backfills()
+    assert [g["id"] for g in manager.get_games_for_users(["magnus"])] == ["old"]
+    plan = manager._db.connection().execute(
+        "EXPLAIN QUERY PLAN SELECT id FROM games WHERE black_key = ? ORDER BY timestamp DESC", ("hikaru",)
+    ).fetchall()
+    assert "idx_games_black_key" in str(plan)
+
+def test_full_text_search(temp_db):
+    """Search matches word prefixes across metadata and follows saves/deletes."""
+    manager = GameHistoryManager(temp_db)
+    assert manager.has_search_index
+    game = _game("carlsen", white="Magnus Carlsen", black="Hikaru")
+    game.metadata.opening, game.metadata.eco = "Sicilian Defense: Najdorf", "B90"
+    manager.save_game(game, "pgn")
+    manager.save_game(_game("other", white="Alice", black="Bob"), "pgn")
+
+    assert [g["id"] for g in manager.search_games("carl")[0]] == ["carlsen"]
+    assert [g["id"] for g in manager.search_games("najd b90")[0]] == ["carlsen"]
+    assert len(manager.search_games("2023.10")[0]) == 2
+    assert manager.search_games("carl alice")[0] == []
+    assert manager.search_games("  ")[0] == []
+
+    # Re-saving replaces the indexed text, deleting drops it
+    game.metadata.white = "Fabiano Caruana"
+    manager.save_game(game, "pgn")
+    assert manager.search_games("carlsen")[0] == []
+    assert [g["id"] for g in manager.search_games("caru")[0]] == ["carlsen"]
+    manager.delete_game("carlsen")
+    assert manager.search_games("caru")[0] == []
+    manager.clear_history()
+    assert manager.search_games("alice")[0] == []
+
+def test_search_filters_and_pages_every_match(temp_db):
+    """Filters and order apply to all matches, paged like get_games_page()."""
+    manager = GameHistoryManager(temp_db)
+    manager.set_history_users(["me"])
+    for i in range(5):
+        game = _game(f"g{i}", white="Me", black=f"Club{i}")
+        game.metadata.result = "1-0" if i % 2 else "0-1"
+        manager.save_game(game, "pgn")
+    manager.save_game(_game("other", white="Me", black="Stranger"), "pgn")
+
+    rows, cursor = manager.search_games("club", limit=2)
+    assert [g["id"] for g in rows] == ["g4", "g3"]  # newest first
+    rows, cursor = manager.search_games("club", after=cursor, limit=2)
+    assert [g["id"] for g in rows] == ["g2", "g1"]
+    rows, cursor = manager.search_games("club", after=cursor, limit=2)
+    assert ([g["id"] for g in rows], cursor) == (["g0"], None)
+
+    rows, _ = manager.search_games("club", outcome="win", order="oldest")
+    assert [g["id"] for g in rows] == ["g1", "g3"]
+    assert manager.search_games("club", source="lichess") == ([], None)
+
+def test_search_index_built_for_existing_games(temp_db):
+    manager = GameHistoryManager(temp_db)
+    manager.save_game(_game("old", white="Magnus"), "pgn")
+    with manager._db.transaction() as conn:
+        conn.execute("DROP TABLE games_fts")
+    reopened = GameHistoryManager(temp_db)
+    # Plain matching until the index has every game
+    assert [g["id"] for g in reopened.search_games("magn")[0]] == ["old"]
+    assert reopened.run_backfills()
+    indexed = reopened._db.connection().execute("SELECT COUNT(*) FROM games_fts WHERE games_fts MATCH 'magn*'")
+    assert indexed.fetchone()[0] == 1
+    assert [g["id"] for g in reopened.search_games("magn")[0]] == ["old"]
+
+def _rated_game(game_id, white, black, result, black_elo="1500", accuracy=80.0, termination="Won on time",
+                opening="Sicilian Defense: Najdorf"):
+    import json
+    metadata = GameMetadata(white=white, black=black, result=result, date="2023.10.01", event="Test",
+                            headers={}, black_elo=black_elo, termination=termination, opening=opening)
+    summary = {"white": {"accuracy": accuracy, "Best": 3, "Great": 1, "Blunder": 2},
+               "black": {"accuracy": 50.0, "Mistake": 1}}
+    return GameAnalysis(game_id=game_id, metadata=metadata, moves=[], pgn_content="pgn", summary=summary)
+
+def test_player_stats_follow_saves_and_deletes(temp_db):
+    """Dashboard aggregates are adjusted by every save, re-save and delete."""
+    manager = GameHistoryManager(temp_db)
+    manager.save_game(_rated_game("a", "Me", "Opp", "1-0", black_elo="1800", accuracy=90.0), "pgn")
+    manager.save_game(_rated_game("b", "Me", "Opp", "1-0", black_elo="1600", accuracy=70.0), "pgn")
+    manager.save_game(_rated_game("c", "Opp", "me", "1/2-1/2", opening=None), "pgn")
+    # Re-saving a game replaces its contribution instead of adding another
+    manager.save_game(_rated_game("b", "Me", "Opp", "1-0", black_elo="1600", accuracy=70.0), "pgn")
+
+    stats = manager.get_player_stats(["ME"])
+    assert (stats["total"], stats["wins"], stats["draws"], stats["losses"]) == (3, 2, 1, 0)
+    assert stats["color_stats"]["white"] == {"wins": 2, "draws": 0, "losses": 0, "total": 2}
+    assert stats["color_stats"]["black"]["draws"] == 1
+    assert stats["best_win"] == "1800"
+    assert stats["avg_accuracy"] == pytest.approx((90 + 70 + 50) / 3)
+    assert stats["accuracy_history"] == [70.0, 50.0, 90.0]  # newest save first
+    assert stats["term_counts"]["Time"] == 2 and stats["term_counts"]["Draw"] == 1
+    assert stats["quality_counts"]["Best"] == 8 and stats["quality_counts"]["Mistake"] == 1
+    assert stats["openings"] == {"Sicilian Defense": 2}
+    assert stats["opening_wins"] == {"Sicilian Defense": 2}
+
+    manager.delete_game("a")
+    stats = manager.get_player_stats(["me"])
+    assert (stats["total"], stats["wins"], stats["best_win"]) == (2, 1, "1600")
+    assert stats["accuracy_history"] == [70.0, 50.0]
+
+    # The maintained aggregates match a full recount
+    manager.rebuild_player_stats()
+    assert manager.get_player_stats(["me"]) == stats
+
+    manager.clear_history()
+    assert manager.get_player_stats(["me"])["total"] == 0
+    assert manager.get_player_stats(["me"])["best_win"] == "N/A"
+
+def test_player_stats_built_for_existing_games(temp_db):
+    """A history from before the aggregate tables is counted by run_backfills()."""
+    manager = GameHistoryManager(temp_db)
+    for i in range(5):
+        manager.save_game(_rated_game(f"g{i}", "Me", "Opp", "0-1"), "pgn")
+    conn = manager._db.connection()
+    for table in ("player_stats", "player_openings", "player_accuracy"):
+        conn.execute(f"DROP TABLE {table}")
+    conn.commit()
+
+    reopened = GameHistoryManager(temp_db)
+    assert reopened.run_backfills()
+    stats = reopened.get_player_stats(["me"])
+    assert (stats["total"], stats["losses"]) == (5, 5)
+    assert reopened.get_player_stats(["opp"])["wins"] == 5
+
+def test_backfill_resumes_and_follows_saves(temp_db, monkeypatch):
+    """A stopped backfill resumes from its mark; saves and deletes meanwhile are counted once."""
+    from src.backend.storage import game_history
+    monkeypatch.setattr(game_history, "_BACKFILL_BATCH", 2)
+    manager = GameHistoryManager(temp_db)
+    for i in range(6):
+        manager.save_game(_rated_game(f"g{i}", "Me", "Opp", "1-0"), "pgn")
+    with manager._db.transaction() as conn:
+        for table in ("player_stats", "player_openings", "player_accuracy", "games_fts"):
+            conn.execute(f"DROP TABLE {table}")
+
+    reopened = GameHistoryManager(temp_db)
+    assert not reopened.run_backfills(should_stop=lambda: True)
+    assert reopened._mark(reopened._db.connection(), "player_stats_rowid") == 2
+    reopened.delete_game("g0")  # already counted
+    reopened.delete_game("g5")  # not yet
+    reopened.save_game(_rated_game("g1", "Me", "Opp", "0-1"), "pgn")  # counted, re-saved past the mark
+    reopened.save_game(_rated_game("new", "Me", "Opp", "0-1"), "pgn")
+    assert reopened.run_backfills()
+
+    stats = reopened.get_player_stats(["me"])
+    assert (stats["total"], stats["wins"], stats["losses"]) == (5, 3, 2)
+    reopened.rebuild_player_stats()
+    assert reopened.get_player_stats(["me"]) == stats
+    assert len(reopened.search_games("opp")[0]) == 5
+    assert reopened.run_backfills()  # nothing left
+
+def test_player_stats_count_games_between_own_accounts_once(temp_db):
+    """A game between two of the user's accounts counts once, for White."""
+    manager = GameHistoryManager(temp_db)
+    manager.save_game(_rated_game("own", "Me", "Alt", "0-1", accuracy=60.0), "pgn")
+    manager.save_game(_rated_game("other", "Me", "Opp", "1-0", black_elo="1600"), "pgn")
+
+    stats = manager.get_player_stats(["me", "alt"])
+    assert (stats["total"], stats["wins"], stats["draws"], stats["losses"]) == (2, 1, 0, 1)
+    assert stats["color_stats"]["white"] == {"wins": 1, "draws": 0, "losses": 1, "total": 2}
+    assert stats["color_stats"]["black"]["total"] == 0
+    assert stats["best_win"] == "1600"
+    assert stats["accuracy_history"] == [80.0, 60.0]
+    assert stats["openings"] == {"Sicilian Defense": 2}
+    assert stats["opening_wins"] == {"Sicilian Defense": 1}
+    # Each account on its own still sees the game
+    assert manager.get_player_stats(["alt"])["wins"] == 1
+
+def test_pgn_ply_count():
+    from src.backend.storage.game_history import pgn_ply_count
+    pgn = """[Event "Test"]
+[Result "1-0"]
+
+1. e4 {best} e5 (1... c5 2. Nf3 (2. c3)) 2. Nf3!? $1 Nc6 3. O-O-O# 1-0"""
+    assert pgn_ply_count(pgn) == 5
+    assert pgn_ply_count("12... Qxd8+ 13. exd8=Q *") == 2
+    assert pgn_ply_count("pgn") == 0 and pgn_ply_count(None) == 0
+
+def test_derived_columns_order_and_filter(temp_db):
+    """Move counts and the user's outcome are stored, indexed and queried in SQL."""
+    manager = GameHistoryManager(temp_db)
+    for i in range(30):
+        white, black = ("Me", f"o{i}") if i % 2 else (f"o{i}", "Me")
+        metadata = GameMetadata(white=white, black=black, result=["1-0", "0-1", "1/2-1/2"][i % 3],
+                                date="", event="", headers={})
+        manager.save_game(GameAnalysis(game_id=f"g{i:02d}", metadata=metadata, moves=[]),
+                          " ".join(["1. e4 e5"] * (i % 10)))
+    row = manager.get_game("g09")
+    assert (row["ply_count"], row["move_count"], row["user_color"]) == (18, 9, None)
+
+    # Outcomes follow the configured accounts, recomputed when they change
+    assert manager.set_history_users(["ME"]) and not manager.set_history_users(["me"])
+    row = manager.get_game("g09")
+    assert (row["user_color"], row["user_outcome"]) == ("white", "win")
+    wins = [g["id"] for g in manager.iter_games(outcome="win", page_size=4)]
+    assert wins == [f"g{i:02d}" for i in reversed(range(30)) if i % 3 == (0 if i % 2 else 1)]
+    manager.save_game(GameAnalysis(game_id="new", metadata=GameMetadata(
+        white="me", black="x", result="1-0", date="", event="", headers={}), moves=[]), "")
+    assert manager.get_game("new")["user_outcome"] == "win"
+
+    by_moves = [(g["ply_count"], g["timestamp"]) for g in manager.iter_games(order="most_moves", page_size=4)]
+    assert len(by_moves) == 31 and by_moves == sorted(by_moves, reverse=True)
+    fewest = [g["ply_count"] for g in manager.iter_games(order="fewest_moves", page_size=4)]
+    assert fewest == sorted(fewest)
+    plan = manager._db.connection().execute(
+        "EXPLAIN QUERY PLAN SELECT * FROM games WHERE user_outcome = 'win' ORDER BY timestamp DESC, id DESC"
+    ).fetchall()
+    assert "idx_games_user_outcome" in str(plan)
+
+def test_move_counts_backfilled(temp_db):
+    manager = GameHistoryManager(temp_db)
+    manager.save_game(_game("old"), "1. d4 d5 2. c4 *")
+    conn = manager._db.connection()
+    # As in a file from before the columns existed
+    conn.execute("UPDATE games SET ply_count = NULL, move_count = NULL")
+    conn.execute("DELETE FROM history_meta")
+    conn.commit()
+    reopened = GameHistoryManager(temp_db)
+    assert reopened.run_backfills()
+    row = reopened.get_game("old")
+    assert (row["ply_count"], row["move_count"]) == (3, 2)
+
+def test_csv_export_import_round_trip(temp_db, tmp_path):
+    """A CSV backup streams out and back in one transaction, skipping known games."""
+    source = GameHistoryManager(temp_db)
+    for i in range(25):
+        source.save_game(_rated_game(f"g{i:02d}", "Me", f"Opp{i}", "1-0"), "1. e4 e5 2. Nf3 *")
+    path = str(tmp_path / "games.csv")
+    progress = []
+    assert source.export_csv(path, progress_callback=lambda done, total: progress.append((done, total))) == 25
+    assert progress[-1] == (25, 25)
+
+    # Duplicate a row and add one without an id
+    with open(path, encoding="utf-8") as f:
+        lines = f.read().splitlines()
+    with open(path, "a", encoding="utf-8", newline="") as f:
+        f.write(lines[1] + "\r\n" + ",".join(["", "x"] + [""] * 16) + "\r\n")
+
+    target = GameHistoryManager(str(tmp_path / "other.db"))
+    target.save_game(_rated_game("g00", "Me", "Opp0", "1-0"), "pgn")
+    target.set_history_users(["me"])
+    counts = target.import_csv(path)
+    assert counts == {"read": 27, "imported": 24, "skipped": 2, "failed": 1}
+
+    imported = target.get_game("g05")
+    original = source.get_game("g05")
+    assert imported["timestamp"] == original["timestamp"]
+    assert (imported["ply_count"], imported["user_outcome"]) == (3, "win")
+    assert [g["id"] for g in target.search_games("opp5")[0]] == ["g05"]
+    assert target.get_game_pgn("g05") == "1. e4 e5 2. Nf3 *"
+    assert target.get_player_stats(["me"])["wins"] == 25
+
+    # A failing import leaves the history untouched
+    with open(path, "w", encoding="utf-8") as f:
+        f.write("id,white\nnew,A\n")
+    import sqlite3
+    target._db.connection().execute("CREATE TRIGGER boom BEFORE INSERT ON games BEGIN SELECT RAISE(ABORT, 'boom'); END")
+    with pytest.raises(sqlite3.Error):
+        target.import_csv(path)
+    assert not target.game_exists("new")
+
+def test_pgn_stored_compressed_and_migrated(temp_db, sample_pgn_chesscom):
+    """PGNs live compressed in game_pgn; older rows' text is moved there on request."""
+    from src.backend.storage.pgn_blob import pack_pgn, unpack_pgn
+    assert unpack_pgn(1, pack_pgn(sample_pgn_chesscom)) == sample_pgn_chesscom
+    with pytest.raises(ValueError):
+        unpack_pgn(1, b"not zlib")
+
+    manager = GameHistoryManager(temp_db)
+    manager.save_game(_game("new"), sample_pgn_chesscom)
+    conn = manager._db.connection()
+    assert conn.execute("SELECT pgn FROM games WHERE id = 'new'").fetchone()[0] is None
+    assert manager.get_games_page()[0][0]["pgn"] is None
+    assert manager.get_game("new")["pgn"] == manager.get_game_pgn("new") == sample_pgn_chesscom
+
+    # A row saved before game_pgn existed
+    manager.save_game(_game("old"), "1. d4 *")
+    conn.execute("DELETE FROM game_pgn WHERE game_id = 'old'")
+    conn.execute("UPDATE games SET pgn = ? WHERE id = 'old'", (sample_pgn_chesscom,))
+    conn.commit()
+    assert manager.get_game_pgn("old") == sample_pgn_chesscom
+    report = manager.storage_report()
+    assert (report["games"], report["uncompressed_pgns"]) == (2, 1)
+    assert report["pgn_text_bytes"] == 2 * len(sample_pgn_chesscom.encode("utf-8"))
+
+    assert manager.compress_pgns() == 1
+    assert manager.get_game_pgn("old") == sample_pgn_chesscom
+    manager.vacuum()
+    report = manager.storage_report()
+    assert report["uncompressed_pgns"] == 0
+    assert report["pgn_stored_bytes"] < report["pgn_text_bytes"] / 2
+    assert report["file_bytes"] > 0 and report["moves_bytes"] == 0
+
+    manager.delete_game("old")
+    assert manager.get_game_pgn("old") is None
+    manager.clear_history()
+    assert conn.execute("SELECT COUNT(*) FROM game_pgn").fetchone()[0] == 0
+
+def test_position_index_lookups(temp_db, sample_pgn_chesscom):
+    """Games reaching a position, and the moves played from it, come from the index."""
+    import chess
+    from src.backend.storage.pgn_parser import PGNParser
+    manager = GameHistoryManager(temp_db)
+    manager.save_game(_rated_game("a", "Me", "X", "1-0"), "1. e4 e5 2. Nf3 Nc6 *")
+    manager.save_game(_rated_game("b", "Me", "Y", "0-1"), "1. e4 c5 2. Nf3 *")
+    manager.save_game(_rated_game("c", "Me", "Z", "1/2-1/2"), "1. d4 d5 2. Nf3 Nf6 3. c4 *")
+    # Analysed moves are indexed from their packed replay
+    analysed = PGNParser.parse_pgn_text(sample_pgn_chesscom)[0]
+    manager.save_game(analysed, analysed.pgn_content)
+
+    board = chess.Board()
+    moves = {m["uci"]: m for m in manager.get_position_moves(board)}
+    assert (analysed.moves[0].uci, analysed.metadata.result) == ("e2e4", "1-0")
+    assert moves["e2e4"]["games"] == 3
+    assert (moves["e2e4"]["white_wins"], moves["e2e4"]["black_wins"], moves["d2d4"]["draws"]) == (2, 1, 1)
+
+    board.push_san("e4")
+    games = manager.get_position_games(board.fen())
+    assert [g["id"] for g in games if g["id"] in "ab"] == ["b", "a"]  # newest first
+    assert {g["next_move"] for g in games if g["id"] in "ab"} == {"e7e5", "c7c5"}
+    assert games[0]["ply"] == 1 and games[0]["white"] == analysed.metadata.white  # saved last
+    last = analysed.moves[-1]
+    end = chess.Board(last.fen_before)
+    end.push_uci(last.uci)
+    assert [m["uci"] for m in manager.get_position_moves(end)] == [None]
+
+    # Re-saving replaces, deleting and clearing drop a game's positions
+    manager.save_game(_rated_game("a", "Me", "X", "1-0"), "1. c4 *")
+    ids = {g["id"] for g in manager.get_position_games(board)}
+    assert "a" not in ids and "b" in ids
+    manager.delete_game("b")
+    assert "b" not in {g["id"] for g in manager.get_position_games(board)}
+    manager.clear_history()
+    assert manager.get_position_moves(chess.Board()) == []
+
+    plan = manager._db.connection().execute(
+        "EXPLAIN QUERY PLAN SELECT game_id FROM game_positions WHERE zobrist = 1 ORDER BY timestamp DESC, game_id DESC"
+    ).fetchall()
+    assert "USING PRIMARY KEY" in str(plan) and "TEMP B-TREE" not in str(plan)
+
+def test_positions_backfilled(temp_db):
+    import chess
+    manager = GameHistoryManager(temp_db)
+    for i in range(5):
+        manager.save_game(_game(f"g{i}"), "1. e4 e5 *")
+    manager.save_game(_game("broken"), "not a game")
+    conn = manager._db.connection()
+    conn.execute("DELETE FROM game_positions")
+    conn.commit()
+    assert manager.get_position_games(chess.Board()) == []
+
+    progress = []
+    assert manager.index_positions(lambda done, total: progress.append((done, total))) == 6
+    assert progress[-1] == (6, 6)
+    assert len(manager.get_position_games(chess.Board())) == 6
+    assert manager.get_position_moves(chess.Board())[0] == {
+        "uci": "e2e4", "games": 5, "white_wins": 5, "draws": 0, "black_wins": 0}
+    # Everything indexed (including the unreadable game): nothing left to do
+    assert manager.index_positions() == 0
+    assert manager.index_positions(should_stop=lambda: True) == 0
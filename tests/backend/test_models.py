@@ -1,7 +1,13 @@
 """
 Tests for data models - GameMetadata, GameAnalysis, MoveAnalysis.
 """
-from src.backend.storage.models import GameMetadata, GameAnalysis, MoveAnalysis
+import pickle
+
+import chess
+import pytest
+
+from src.backend.storage.compact import decode_uci, encode_uci, pack_moves, unpack_moves, zobrist_key, zobrist_keys
+from src.backend.storage.models import GameMetadata, GameAnalysis, GameReplay, MoveAnalysis, PVLine
 
 
 class TestGameMetadata:
@@ -129,3 +135,106 @@ class TestGameAnalysis:
         )
         
         assert game.summary["white"]["accuracy"] == 85.5
+
+
+class TestCompactModels:
+    """Tests for the slotted / packed representation."""
+
+    def test_models_have_no_instance_dict(self):
+        """Slotted dataclasses don't carry a per-instance __dict__."""
+        move = MoveAnalysis(1, 1, "e4", "e2e4", chess.STARTING_FEN)
+        assert not hasattr(move, "__dict__")
+        assert not hasattr(GameMetadata(), "__dict__")
+        with pytest.raises(AttributeError):
+            move.not_a_field = 1
+
+    @pytest.mark.parametrize("uci", ["e2e4", "e7e8q", "a2a1n", "e1h1", "0000"])
+    def test_move_codes_round_trip(self, uci):
+        code = encode_uci(uci)
+        assert 0 <= code < 1 << 16
+        assert decode_uci(code) == uci
+
+    @pytest.mark.parametrize("fen, line, chess960", [
+        # castling both ways, en passant (hashed only while capturable), promotion with capture
+        (chess.STARTING_FEN, "e2e4 g8f6 e4e5 d7d5 e5d6 e7e6 g1f3 f8e7 f1e2 e8g8 e1g1", False),
+        ("r3k2r/6P1/8/8/8/8/8/R3K2R w KQkq - 0 1", "e1g1 e8c8 g7h8q", False),
+        # Chess960 castling (king takes own rook)
+        ("1r2k1r1/pppppppp/8/8/8/8/PPPPPPPP/1R2K1R1 w GBgb - 0 1", "e1g1 e8b8", True),
+    ])
+    def test_incremental_zobrist_keys(self, fen, line, chess960):
+        board = chess.Board(fen, chess960=chess960)
+        moves = []
+        expected = [zobrist_key(board)]
+        for uci in line.split():
+            move = board.parse_uci(uci)
+            moves.append(move)
+            board.push(move)
+            expected.append(zobrist_key(board))
+        assert zobrist_keys(chess.Board(fen, chess960=chess960), moves) == expected
+
+    def test_pv_is_packed_but_reads_as_uci_list(self):
+        move = MoveAnalysis(1, 1, "e4", "e2e4", chess.STARTING_FEN)
+        move.pv = ["e2e4", "e7e5", "g1f3"]
+        assert move.pv == ["e2e4", "e7e5", "g1f3"]
+        assert unpack_moves(pack_moves(move.pv)) == move.pv
+
+    def test_fen_before_derived_from_replay(self):
+        """Moves without a stored FEN rebuild it from the shared replay."""
+        board = chess.Board()
+        replay = GameReplay(board.fen())
+        moves = []
+        expected = []
+        for uci in ["e2e4", "e7e5", "g1f3", "b8c6"]:
+            expected.append(board.fen())
+            moves.append(MoveAnalysis(board.fullmove_number, board.ply(), "", uci, None, replay=replay))
+            replay.append(chess.Move.from_uci(uci))
+            board.push_uci(uci)
+
+        assert [m.fen_before for m in moves] == expected
+        # Random (backwards) access still works
+        assert moves[1].fen_before == expected[1]
+
+        # An explicitly stored FEN wins over the replay
+        moves[0].fen_before = "custom"
+        assert moves[0].fen_before == "custom"
+
+    def test_replay_steps_backwards_from_checkpoints(self, monkeypatch):
+        board = chess.Board()
+        replay = GameReplay(board.fen())
+        expected = []
+        for _ in range(40):
+            expected.append(board.fen())
+            move = next(iter(board.legal_moves))
+            replay.append(move)
+            board.push(move)
+        expected.append(board.fen())
+        assert replay.fen_at(40) == expected[40]
+
+        # Stepping back replays from the checkpoint below, not from the start
+        pushes = []
+        push = chess.Board.push
+        monkeypatch.setattr(chess.Board, "push", lambda b, m: (pushes.append(m), push(b, m))[1])
+        assert replay.fen_at(37) == expected[37]
+        assert len(pushes) == 37 - 32
+        for index in range(36, -1, -1):
+            assert replay.fen_at(index) == expected[index]
+        assert len(pushes) == sum(i % GameReplay.CHECKPOINT_PLIES for i in range(38))
+
+    def test_pv_line_reads_like_a_dict(self):
+        move = MoveAnalysis(1, 1, "e4", "e2e4", chess.STARTING_FEN)
+        line = PVLine(["e2e4", "e7e5"], cp=32, depth=15, move=move)
+
+        assert line["pv"] == ["e2e4", "e7e5"]
+        assert line["pv_san"] == "1. e4 e5"
+        assert line.get("score_value") == "0.32"
+        assert line.get("pv_uci") is None
+        assert "depth" in line
+        assert PVLine(["e2e4"], mate=-3)["score_value"] == "M-3"
+        assert PVLine([])["score_value"] == "?"
+
+    def test_parsed_game_pickles(self, sample_pgn_chesscom):
+        from src.backend.storage.pgn_parser import PGNParser
+        game = PGNParser.parse_pgn_text(sample_pgn_chesscom)[0]
+        restored = pickle.loads(pickle.dumps(game))
+        assert restored == game
+        assert restored.moves[-1].fen_before == game.moves[-1].fen_before
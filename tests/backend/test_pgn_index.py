@@ -0,0 +1,101 @@
+"""
+Tests for the header-only PGN index - game boundaries, offsets, on-disk cache.
+"""
+import os
+
+import pytest
+
+from src.backend.storage import pgn_index
+from src.backend.storage.pgn_index import load_pgn_index, read_pgn_game, scan_pgn
+from src.backend.storage.pgn_parser import PGNParser
+
+# Multi-line comments (with a blank line and a "[" line inside), a ";" comment
+# holding a brace, "%" escape lines, a game without headers, one without
+# moves, and garbage between games.
+TRICKY_PGN = """[Event "First"]
+[White "A"]
+
+[Black "B"]
+[Result "1-0"]
+
+1. e4 { a comment
+
+[spanning lines] } e5 2. Nf3 ; rest { of line
+Nc6 3. Bb5 1-0
+
+% escaped line
+not a game at all
+
+[Event "Empty"]
+[White "C"]
+
+*
+
+1. d4 d5 2. c4 (2. Nf3 Nf6) e6 *
+
+[Event "Last"]
+[White "D"]
+[Black "E"]
+[Result "0-1"]
+[TimeControl "600+5"]
+
+1. f3 e5 2. g4 Qh4# 0-1"""
+
+
+@pytest.fixture
+def tricky_file(tmp_path):
+    path = tmp_path / "tricky.pgn"
+    path.write_bytes("\ufeff".encode("utf-8") + TRICKY_PGN.encode("utf-8"))
+    return str(path)
+
+
+def test_scan_splits_games_like_the_parser(tricky_file):
+    entries = list(scan_pgn(tricky_file))
+    parsed = PGNParser.parse_pgn_file(tricky_file)
+    assert len(entries) == len(parsed) == 3
+    for entry, game in zip(entries, parsed):
+        games = PGNParser.parse_pgn_text(read_pgn_game(tricky_file, entry))
+        assert len(games) == 1
+        assert games[0].game_id == game.game_id
+        assert entry.plies == len(game.moves)
+    assert entries[0].tags == {"Event": "First", "White": "A", "Black": "B", "Result": "1-0"}
+    assert entries[0].offset == 3  # after the BOM
+    assert entries[1].tags == {}
+    assert entries[2].tags["TimeControl"] == "600+5"
+
+
+def test_scan_reports_progress(tricky_file):
+    progress = []
+    list(scan_pgn(tricky_file, lambda done, total: progress.append((done, total))))
+    size = os.path.getsize(tricky_file)
+    assert progress[-1] == (size, size)
+
+
+def test_index_cached_until_file_changes(tricky_file, tmp_path, monkeypatch):
+    cache_dir = str(tmp_path / "cache")
+    entries = load_pgn_index(tricky_file, cache_dir=cache_dir)
+    assert len(os.listdir(cache_dir)) == 1
+
+    def no_scan(*_args, **_kwargs):
+        raise AssertionError("scanned again")
+    monkeypatch.setattr(pgn_index, "scan_pgn", no_scan)
+    assert load_pgn_index(tricky_file, cache_dir=cache_dir) == entries
+
+    # A changed file is scanned again
+    with open(tricky_file, "a", encoding="utf-8") as f:
+        f.write("\n\n1. e4 *\n")
+    with pytest.raises(AssertionError):
+        load_pgn_index(tricky_file, cache_dir=cache_dir)
+    monkeypatch.undo()
+    assert len(load_pgn_index(tricky_file, cache_dir=cache_dir)) == 4
+
+    # A corrupt cache file is ignored, and only the newest indexes are kept
+    cache_file = os.path.join(cache_dir, os.listdir(cache_dir)[0])
+    with open(cache_file, "wb") as f:
+        f.write(b"junk")
+    assert len(load_pgn_index(tricky_file, cache_dir=cache_dir)) == 4
+    monkeypatch.setattr(pgn_index, "PGN_INDEX_CACHE_FILES", 1)
+    other = tmp_path / "other.pgn"
+    other.write_text("1. e4 e5 *\n", encoding="utf-8")
+    load_pgn_index(str(other), cache_dir=cache_dir)
+    assert os.listdir(cache_dir) == [os.path.basename(pgn_index._cache_path(cache_dir, str(other)))]
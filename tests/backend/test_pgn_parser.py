@@ -1,6 +1,8 @@
 """
 Tests for PGN Parser - parsing, source detection, edge cases.
 """
+import os
+
 import pytest
 from src.backend.storage.pgn_parser import PGNParser
 from src.backend.storage.models import GameAnalysis
@@ -40,11 +42,41 @@ class TestPGNParsing:
         assert games[0].metadata.white == "Player1"
         assert games[1].metadata.white == "LichessPlayer1"
 
+    def test_iter_pgn_file_streams_with_progress(self, tmp_path, sample_pgn_chesscom, sample_pgn_lichess):
+        """Games are yielded one at a time, with (bytes read, size) progress."""
+        pgn_file = tmp_path / "many.pgn"
+        pgn_file.write_text(sample_pgn_chesscom + "\n\nnot a game\n\n" + sample_pgn_lichess, encoding="utf-8")
+        size = pgn_file.stat().st_size
+        progress = []
+        games = PGNParser.iter_pgn_file(str(pgn_file), progress_callback=lambda done, total: progress.append((done, total)))
+
+        first = next(games)
+        assert first.metadata.white == "Player1" and progress
+        assert [g.metadata.white for g in games] == ["LichessPlayer1"]
+        assert progress[-1] == (size, size)
+        assert all(total == size for _done, total in progress)
+        assert [done for done, _total in progress] == sorted(done for done, _total in progress)
+
+        progress = []
+        text = sample_pgn_chesscom + "\n\n" + sample_pgn_lichess
+        assert len(list(PGNParser.iter_pgn_text(text, lambda done, total: progress.append((done, total))))) == 2
+        assert progress[-1] == (len(text), len(text))
+
     def test_parse_empty_pgn(self):
         """Test parsing empty PGN returns empty list."""
         games = PGNParser.parse_pgn_text("")
         assert games == []
 
+    def test_fen_before_matches_replay(self, sample_pgn_chesscom):
+        """Lazily derived fen_before equals the FEN python-chess produces."""
+        import chess.pgn, io
+        games = PGNParser.parse_pgn_text(sample_pgn_chesscom)
+        game = chess.pgn.read_game(io.StringIO(sample_pgn_chesscom))
+        board = game.board()
+        for move, node in zip(games[0].moves, game.mainline()):
+            assert move.fen_before == board.fen()
+            board.push(node.move)
+
     def test_parse_invalid_pgn(self):
         """Test parsing invalid PGN is handled gracefully (returns game with no moves)."""
         games = PGNParser.parse_pgn_text("This is not a PGN")
@@ -212,3 +244,53 @@ class TestClockIntegration:
         # side so time_spent stays None.
         assert moves[1].time_left == pytest.approx(600.0)
         assert moves[1].time_spent is None
+
+
+class TestParallelParsing:
+    """Tests for the multi-process parser."""
+
+    @pytest.fixture(autouse=True)
+    def _index_cache(self, tmp_path, monkeypatch):
+        from src.backend.storage import pgn_index
+        monkeypatch.setattr(pgn_index, "_cache_dir", lambda: str(tmp_path / "index"))
+
+    def _write_games(self, tmp_path, sample_pgn_chesscom, sample_pgn_lichess, count=7):
+        # An extra tag makes every copy (and its game id) distinct
+        games = [f'[Annotator "{i}"]\n' + (sample_pgn_chesscom if i % 2 else sample_pgn_lichess).strip()
+                 for i in range(count)]
+        pgn_file = tmp_path / "many.pgn"
+        pgn_file.write_text("\n\n".join(games) + "\n", encoding="utf-8")
+        return str(pgn_file)
+
+    def test_parallel_matches_sequential_order(self, tmp_path, sample_pgn_chesscom, sample_pgn_lichess,
+                                               monkeypatch):
+        from src.backend.storage import pgn_index
+        from src.backend.storage.pgn_parallel import game_chunks, iter_pgn_file_parallel
+        path = self._write_games(tmp_path, sample_pgn_chesscom, sample_pgn_lichess)
+        sequential = PGNParser.parse_pgn_file(path)
+        assert len({g.game_id for g in sequential}) == 7
+        chunks = game_chunks(path, chunk_games=2)
+        assert len(chunks) == 4
+        # Later runs chunk the file from its cached index
+        monkeypatch.setattr(pgn_index, "scan_pgn", lambda *args: pytest.fail("rescanned"))
+        assert game_chunks(path, chunk_games=2) == chunks
+
+        progress = []
+        parallel = list(iter_pgn_file_parallel(path, workers=2, chunk_games=2,
+                                               progress_callback=lambda done, total: progress.append((done, total))))
+        assert [g.game_id for g in parallel] == [g.game_id for g in sequential]
+        assert [m.san for m in parallel[3].moves] == [m.san for m in sequential[3].moves]
+        assert parallel[3].moves[-1].fen_before == sequential[3].moves[-1].fen_before
+        size = os.path.getsize(path)
+        assert progress[-1] == (size, size)
+
+    def test_parallel_stops_early_and_falls_back(self, tmp_path, sample_pgn_chesscom, sample_pgn_lichess):
+        from src.backend.storage.pgn_parallel import iter_pgn_file_parallel, parse_pgn_file_parallel
+        path = self._write_games(tmp_path, sample_pgn_chesscom, sample_pgn_lichess)
+        games = iter_pgn_file_parallel(path, workers=2, chunk_games=1)
+        first = next(games)
+        games.close()  # shuts the pool down with chunks still queued
+        assert first.game_id == PGNParser.parse_pgn_file(path)[0].game_id
+        # One worker, or a single chunk, parses in-process
+        assert len(parse_pgn_file_parallel(path, workers=1)) == 7
+        assert len(parse_pgn_file_parallel(path, workers=2, chunk_games=100)) == 7
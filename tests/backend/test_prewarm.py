@@ -0,0 +1,117 @@
+"""Tests for the background opening-tree pre-analysis."""
+import os
+import threading
+import chess
+import chess.engine
+from src.backend.analysis.opening_db import OpeningDB, _normalize_fen
+from src.backend.analysis.prewarm import OpeningPrewarmer
+from src.backend.storage.cache import AnalysisCache
+
+SAMPLE_TSV = """eco	name	pgn
+B20	Sicilian Defense	1. e4 c5
+B21	Sicilian Defense: Grand Prix Attack	1. e4 c5 2. f4
+C20	King's Pawn Game	1. e4 e5
+C42	Petrov Defense	1. e4 e5 2. Nf3 Nf6
+D00	Queen's Pawn Game	1. d4
+"""
+
+PARAMS = {"depth": 12, "multi_pv": 1, "time_per_move": 0.1}
+
+
+class FakeEngine:
+    """EngineManager stand-in that records the searched positions."""
+
+    def __init__(self, on_search=None):
+        self.engine = None
+        self.searched = []
+        self.on_search = on_search
+
+    def start_engine(self):
+        self.engine = object()
+
+    def stop_engine(self):
+        self.engine = None
+
+    def analyze_position(self, board, time_limit=0.1, depth=None, multi_pv=1):
+        self.searched.append(_normalize_fen(board.fen()))
+        if self.on_search:
+            self.on_search(len(self.searched))
+        move = next(iter(board.legal_moves))
+        return [{"score": chess.engine.PovScore(chess.engine.Cp(20), board.turn), "pv": [move], "depth": depth}]
+
+
+def _make_db(tmp_path) -> OpeningDB:
+    with open(os.path.join(str(tmp_path), "s.tsv"), "w", newline="") as f:
+        f.write(SAMPLE_TSV)
+    db = OpeningDB(os.path.join(str(tmp_path), "openings.db"))
+    db.initialize(str(tmp_path))
+    return db
+
+
+def test_bfs_order_is_by_ply_then_popularity(tmp_path):
+    fens = _make_db(tmp_path).bfs_fens()
+    board = chess.Board()
+    assert fens[0] == _normalize_fen(board.fen())
+    board.push_san("e4")
+    # e4 starts four named lines, d4 one
+    assert fens[1] == _normalize_fen(board.fen())
+    assert len(fens) == 8
+    assert len(_make_db(tmp_path).bfs_fens(limit=3)) == 3
+
+
+def test_prewarm_caches_every_node_and_resumes(tmp_path):
+    db = _make_db(tmp_path)
+    cache = AnalysisCache(str(tmp_path / "cache.db"))
+    engine = FakeEngine()
+    prewarmer = OpeningPrewarmer(db, cache, engine, PARAMS, max_nodes=100, interval=0)
+    progress = []
+
+    stats = prewarmer.run(progress_callback=lambda done, total: progress.append(done))
+    assert stats == {"analyzed": 8, "skipped": 0, "position": 8, "total": 8}
+    assert progress == list(range(1, 9))
+    assert engine.engine is None  # stopped after the run
+    for fen in db.bfs_fens():
+        assert cache.get_analysis(f"{fen} 0 1", PARAMS)[0]["cp"] == 20
+
+    # Finished: a second run does nothing
+    assert OpeningPrewarmer(db, cache, FakeEngine(), PARAMS, interval=0).run()["position"] == 8
+    # Deeper setting: starts over, searching again
+    deeper = {**PARAMS, "depth": 16}
+    assert OpeningPrewarmer(db, cache, FakeEngine(), deeper, interval=0).run()["analyzed"] == 8
+
+
+def test_prewarm_cancel_and_resume(tmp_path):
+    db = _make_db(tmp_path)
+    cache = AnalysisCache(str(tmp_path / "cache.db"))
+    holder = {}
+    # Cancel during the first search: that node is still saved, and the
+    # throttle pause after it ends at once.
+    engine = FakeEngine(on_search=lambda n: holder["prewarmer"].cancel())
+    holder["prewarmer"] = OpeningPrewarmer(db, cache, engine, PARAMS, interval=5)
+    stats = holder["prewarmer"].run()
+    assert (stats["analyzed"], stats["position"]) == (1, 1)
+
+    # Positions cached some other way are skipped without a search.
+    fens = db.bfs_fens()
+    cache.save_analysis(f"{fens[3]} 0 1", PARAMS, [{"cp": 5, "pv": ["e7e5"], "depth": 12}])
+    engine = FakeEngine()
+    stats = OpeningPrewarmer(db, cache, engine, PARAMS, interval=0).run()
+    assert stats == {"analyzed": 6, "skipped": 1, "position": 8, "total": 8}
+    assert engine.searched == fens[1:3] + fens[4:]
+
+
+def test_prewarm_pause_blocks_until_resumed(tmp_path):
+    db = _make_db(tmp_path)
+    cache = AnalysisCache(str(tmp_path / "cache.db"))
+    engine = FakeEngine()
+    prewarmer = OpeningPrewarmer(db, cache, engine, PARAMS, interval=0)
+    prewarmer.pause()
+    result = {}
+    thread = threading.Thread(target=lambda: result.update(prewarmer.run()))
+    thread.start()
+    thread.join(0.2)
+    assert thread.is_alive() and engine.searched == []
+
+    prewarmer.resume()
+    thread.join(5)
+    assert result["position"] == 8
@@ -0,0 +1,38 @@
+"""Tests for the explorer's "My Games" panel over the history position index."""
+import chess
+from src.backend.storage.game_history import GameHistoryManager
+
+
+def test_panel_lists_games_and_indexes_old_ones(qapp, qtbot, tmp_path):
+    from src.gui.analysis.history_games_panel import HistoryGamesPanel
+    manager = GameHistoryManager(str(tmp_path / "history.db"))
+    with manager._db.transaction() as conn:
+        # Stored without positions, as before the index existed
+        conn.executemany(manager.INSERT_GAME_SQL, [
+            (f"g{i}", "Me", f"Opp{i}", ["1-0", "0-1"][i % 2], "2023.10.01", "Live",
+             ["1. e4 e5 2. Nf3 *", "1. e4 c5 *", "1. d4 d5 *"][i % 3], "{}", float(i), None, None, None,
+             None, None, None, None, "file", 0, "me", f"opp{i}", 3, 2)
+            for i in range(6)
+        ])
+
+    panel = HistoryGamesPanel(manager)
+    qtbot.addWidget(panel)
+    board = chess.Board()
+    board.push_san("e4")
+    panel.set_position(board)
+    assert panel._stale  # hidden: nothing looked up yet
+
+    panel.show()  # shows empty results, then indexes in the background
+    qtbot.waitUntil(lambda: panel._game_count == 4, timeout=10000)
+    assert "My Games  (4)" in panel.toggle.text()
+    # Two moves, then a label and the four games, newest first
+    assert len(panel._rows) == 7
+    assert panel._rows[3].findChildren(type(panel.status_label))[0].text() == "Me – Opp4"
+
+    with qtbot.waitSignal(panel.move_clicked) as blocker:
+        panel._rows[0].clicked.emit()
+    assert blocker.args[0] in ("e7e5", "c7c5")
+    with qtbot.waitSignal(panel.game_selected) as blocker:
+        panel._rows[3].clicked.emit()
+    assert blocker.args[0].game_id == "g4"
+    panel.stop()
@@ -0,0 +1,119 @@
+"""Tests for the paged history list (model, delegate and HistoryView filters)."""
+import pytest
+from src.backend.storage.game_history import GameHistoryManager
+
+
+def _fill(manager, count):
+    with manager._db.transaction() as conn:
+        conn.executemany(manager.INSERT_GAME_SQL, [
+            (f"g{i:04d}", f"Player{i % 5}", "Opp", ["1-0", "0-1", "1/2-1/2"][i % 3], "2023.10.01", "Live",
+             "1. e4 e5 " + "2. Nf3 Nc6 " * (i % 4), "{}", float(i), None, None, "180+2", "C20", None,
+             "King's Pawn", None, ["file", "lichess"][i % 2], 0, f"player{i % 5}", "opp",
+             2 + 2 * (i % 4), 1 + i % 4)
+            for i in range(count)
+        ])
+        conn.execute("INSERT INTO games_fts(games_fts) VALUES ('rebuild')")
+
+
+@pytest.fixture
+def history_view(qapp, qtbot, tmp_path, monkeypatch):
+    from src.gui.views import history_view as module
+    db_path = str(tmp_path / "history.db")
+    monkeypatch.setattr(module, "GameHistoryManager", lambda: GameHistoryManager(db_path))
+    _fill(GameHistoryManager(db_path), 350)
+
+    class Config:
+        def get(self, key, default=None):
+            return {"chesscom_username": "player0"}.get(key, default)
+
+    view = module.HistoryView(Config())
+    qtbot.addWidget(view)
+    return view
+
+
+def test_model_fetches_pages_on_demand(history_view):
+    model = history_view.game_list.model
+    assert model.rowCount() == history_view.PAGE_SIZE
+    assert model.canFetchMore()
+    while model.canFetchMore():
+        model.fetchMore()
+    assert model.rowCount() == 350
+    assert history_view.game_list.counter_label.text() == "350 games"
+    # Newest first, and a GameAnalysis is only built for the opened row
+    assert model.row_data(0)["id"] == "g0349"
+    game = model.game_at(0)
+    assert game.game_id == "g0349" and game.metadata.source == "lichess"
+
+
+def test_filters_and_sorts_run_in_sql(history_view):
+    history_view.result_filter.setCurrentText("Wins")
+    model = history_view.game_list.model
+    # player0 plays white in i % 5 == 0 games; white wins when i % 3 == 0
+    assert not model.canFetchMore()
+    assert model.rowCount() == len([i for i in range(350) if i % 15 == 0])
+
+    history_view.result_filter.setCurrentText("All")
+    history_view.source_filter.setCurrentText("File")
+    history_view.sort_dropdown.setCurrentText("Oldest First")
+    assert model.row_data(0)["id"] == "g0000"
+    assert {model.row_data(r)["source"] for r in range(model.rowCount())} == {"file"}
+
+    # Stored move counts: sorted and paged in SQL like the date orders
+    history_view.sort_dropdown.setCurrentText("Most Moves")
+    assert model.rowCount() == history_view.PAGE_SIZE and model.canFetchMore()
+    # (File games: i % 4 is 0 or 2)
+    assert model.row_data(0)["move_count"] == 3 and model.row_data(0)["ply_count"] == 6
+    history_view.sort_dropdown.setCurrentText("Fewest Moves")
+    assert model.row_data(0)["move_count"] == 1
+
+    # Search results are paged, filtered and sorted in SQL too
+    history_view.source_filter.setCurrentText("All")
+    history_view.sort_dropdown.setCurrentText("Newest First")
+    history_view.search_input.setText("player")
+    assert model.rowCount() == history_view.PAGE_SIZE and model.canFetchMore()
+    assert model.row_data(0)["id"] == "g0349"
+    while model.canFetchMore():
+        model.fetchMore()
+    assert model.rowCount() == 350
+    history_view.source_filter.setCurrentText("File")
+    history_view.search_input.setText("player3")
+    assert model.rowCount() == 35 and not model.canFetchMore()
+    assert model.row_data(0)["id"] == "g0348"
+
+
+def test_delete_removes_row(history_view, monkeypatch):
+    from PyQt6.QtWidgets import QMessageBox
+    monkeypatch.setattr(QMessageBox, "question", lambda *a, **k: QMessageBox.StandardButton.Yes)
+    game_list = history_view.game_list
+    game_list._on_delete_requested("g0349")
+    assert not history_view.history_manager.game_exists("g0349")
+    assert game_list.model.row_data(0)["id"] == "g0348"
+
+
+def test_delegate_row_card(qapp):
+    from src.gui.components.game_list_delegate import GameListDelegate, format_time_control
+    row = {"white": "A", "black": "B", "white_elo": "1500", "date": "2024.01.01", "time_control": "600",
+           "termination": "Time forfeit", "event": "Rated Blitz game", "eco": "B20", "opening": "Sicilian",
+           "summary_json": '{"white": {"accuracy": 91.2}, "black": {"accuracy": 80}}', "pgn": "1. e4 c5 2. Nf3 *", "move_count": 2}
+    card = GameListDelegate.card(row)
+    assert card["white"] == "A (1500)" and card["opening"] == "B20: Sicilian"
+    assert card["event"] == ""
+    assert [text for _, text in card["meta"]] == ["2024.01.01", "10", "2 moves", "Time forfeit", "91% / 80%"]
+    assert GameListDelegate.card(row) is card  # computed once per row
+    assert format_time_control("180+2") == "3+2"
+
+
+def test_csv_transfer_runs_on_worker(history_view, qtbot, tmp_path, monkeypatch):
+    from src.gui.views import history_view as module
+    toasts = []
+    monkeypatch.setattr(module.HistoryView, "_on_csv_done", lambda self, result: toasts.append(result))
+    path = str(tmp_path / "backup.csv")
+
+    history_view._start_csv_worker("export", path)
+    assert not history_view.btn_export.isEnabled()
+    qtbot.waitUntil(lambda: len(toasts) == 1 and history_view.btn_import.isEnabled(), timeout=10000)
+    assert toasts == [350] and history_view.btn_export.isEnabled()
+
+    history_view._start_csv_worker("import", path)
+    qtbot.waitUntil(lambda: len(toasts) == 2 and history_view.btn_import.isEnabled(), timeout=10000)
+    assert toasts[-1] == {"read": 350, "imported": 0, "skipped": 350, "failed": 0}
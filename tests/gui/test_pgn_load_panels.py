@@ -0,0 +1,97 @@
+"""Tests for reading PGN files and pasted text in the Load Game dialog off the GUI thread."""
+import time
+
+from PyQt6.QtCore import QThread
+
+from src.backend.storage import pgn_index
+
+GAME = '[Event "Club"]\n[White "W{i}"]\n[Black "B{i}"]\n[Result "1-0"]\n\n1. e4 e5 2. Nf3 Nc6 1-0\n\n'
+
+
+def test_file_panel_fills_list_from_worker(qapp, qtbot, tmp_path, monkeypatch):
+    from src.gui.dialogs.load_game import PgnFilePanel
+    monkeypatch.setattr(pgn_index, "_cache_dir", lambda: str(tmp_path / "index"))
+    path = tmp_path / "games.pgn"
+    path.write_text("".join(GAME.format(i=i) for i in range(25)), encoding="utf-8")
+
+    panel = PgnFilePanel()
+    qtbot.addWidget(panel)
+    # The first game is ready as soon as it is found
+    with qtbot.waitSignal(panel.pgn_ready) as blocker:
+        panel._load_file(str(path))
+    assert '[White "W0"]' in blocker.args[0]
+    qtbot.waitUntil(lambda: not panel._worker.isRunning(), timeout=10000)
+    qtbot.wait(50)  # queued results
+
+    assert len(panel._entries) == 25
+    assert panel._game_list._header.text() == "Select a game (25 found): - Page 1 of 3"
+    assert not panel._game_list._loading_widget.isVisibleTo(panel)
+    with qtbot.waitSignal(panel.pgn_ready) as blocker:
+        panel._game_list._on_card_selected(24)
+    assert '[White "W24"]' in blocker.args[0]
+
+
+def test_text_panel_reports_games_without_moves(qapp, qtbot, monkeypatch):
+    from src.gui.dialogs.load_game import PgnTextPanel
+    from src.gui.dialogs.load_game import pgn_text_panel
+    warnings = []
+    monkeypatch.setattr(pgn_text_panel.QMessageBox, "warning", lambda *args: warnings.append(args[1:]))
+
+    panel = PgnTextPanel()
+    qtbot.addWidget(panel)
+    panel._text_edit.setPlainText('[Event "Nothing"]\n\n*')
+    panel._parse()
+    qtbot.waitUntil(lambda: bool(warnings), timeout=10000)
+    assert warnings == [("No Games", "No valid games found in this text.")]
+    assert panel._text_edit.toPlainText()  # kept for editing
+
+
+def test_worker_stops_when_cancelled(qapp, qtbot):
+    from src.gui.dialogs.load_game import PgnLoadWorker
+
+    def items(progress_callback=None):
+        progress_callback(1, 10)
+        yield "first"
+        while not QThread.currentThread().isInterruptionRequested():
+            time.sleep(0.01)
+        yield "second"
+
+    worker = PgnLoadWorker(items)
+    batches = []
+    worker.games_found.connect(batches.append)
+    worker.games_found.connect(lambda _batch: worker.requestInterruption())
+    with qtbot.waitSignal(worker.done, timeout=10000) as blocker:
+        worker.start()
+    worker.wait()
+    assert blocker.args == [False]
+    assert batches == [["first"]]
+
+
+def test_cancel_keeps_every_entry_read(qapp, qtbot, tmp_path, monkeypatch):
+    """Entries still waiting for their batch when the list is cancelled are listed too."""
+    from src.gui.dialogs.load_game import PgnFilePanel
+    yielded = []
+
+    def entries(path, progress_callback=None):
+        for i in range(1000):
+            entry = pgn_index.PgnIndexEntry(i * 10, 10, 2, {"White": f"W{i}", "Black": f"B{i}"})
+            yielded.append(entry)
+            yield entry
+            if i == 500:
+                # Cancelled with 500 entries queued for the next batch
+                while not QThread.currentThread().isInterruptionRequested():
+                    time.sleep(0.01)
+
+    monkeypatch.setattr(pgn_index, "iter_pgn_index", entries)
+    panel = PgnFilePanel()
+    qtbot.addWidget(panel)
+    with qtbot.waitSignal(panel._game_list.cancel_requested, timeout=10000, raising=False):
+        panel._load_file(str(tmp_path / "big.pgn"))
+        qtbot.waitUntil(lambda: len(panel._entries) >= 1, timeout=10000)
+        panel.cancel_loading()
+    qtbot.waitUntil(lambda: not panel._worker.isRunning(), timeout=10000)
+    qtbot.wait(50)  # queued results
+
+    assert panel._entries == yielded
+    assert len(yielded) == 502  # stopped after the game being read
+    assert panel._game_list._header.text().startswith("Select a game (502 read before cancelling):")
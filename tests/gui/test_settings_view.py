@@ -98,3 +98,90 @@ def test_save_all_settings_flow(qapp, qtbot, isolated_config):
         view.engine_settings_changed.emit.assert_called_once()
         view.llm_config_changed.emit.assert_called_once()
         view.usernames_changed.emit.assert_called_once()
+
+def test_data_settings_cache_stats(qapp, qtbot, isolated_config, monkeypatch):
+    """The cache panel loads statistics and compacts on a worker thread."""
+    import chess
+    from src.backend.storage.cache import AnalysisCache
+    from src.gui.views.settings.data_settings import DataSettings
+    from src.utils.config import ConfigManager
+
+    monkeypatch.setattr("src.utils.path_utils.get_user_data_dir", lambda: str(isolated_config.parent))
+    AnalysisCache().save_analysis(chess.STARTING_FEN, {"depth": 18, "multi_pv": 1}, [{"pv": ["e2e4"], "cp": 20}])
+
+    panel = DataSettings(ConfigManager())
+    qtbot.addWidget(panel)
+    panel.compact_cache()
+    qtbot.waitUntil(lambda: not panel._cache_worker.isRunning() and panel.compact_cache_btn.isEnabled())
+
+    assert "Positions cached: 1" in panel.cache_stats_label.text()
+    panel.cache_budget_input.setText("64")
+    assert panel.cache_budget_mb() == 64
+
+def test_data_settings_cache_pack_round_trip(qapp, qtbot, isolated_config, monkeypatch, tmp_path):
+    """Export and import buttons run a pack worker and refresh the statistics."""
+    import chess
+    from src.backend.storage.cache import AnalysisCache
+    from src.gui.views.settings import data_settings
+    from src.utils.config import ConfigManager
+
+    monkeypatch.setattr("src.utils.path_utils.get_user_data_dir", lambda: str(isolated_config.parent))
+    cache = AnalysisCache()
+    cache.save_analysis(chess.STARTING_FEN, {"depth": 18, "multi_pv": 1}, [{"pv": ["e2e4"], "cp": 20, "depth": 18}])
+    pack_path = str(tmp_path / "shared")
+    monkeypatch.setattr(data_settings.QFileDialog, "getSaveFileName", lambda *args: (pack_path, ""))
+    monkeypatch.setattr(data_settings.QFileDialog, "getOpenFileName", lambda *args: (pack_path + ".capack", ""))
+
+    panel = data_settings.DataSettings(ConfigManager())
+    qtbot.addWidget(panel)
+    results = []
+    monkeypatch.setattr(panel, "_on_pack_done", results.append)
+    panel.export_cache_pack()
+    qtbot.waitUntil(lambda: not panel._pack_worker.isRunning() and panel.export_pack_btn.isEnabled())
+
+    cache.clear_cache()
+    panel.import_cache_pack()
+    qtbot.waitUntil(lambda: not panel._pack_worker.isRunning() and panel.import_pack_btn.isEnabled())
+    assert [r.get("merged", r["entries"]) for r in results] == [1, 1]
+    assert cache.get_analysis(chess.STARTING_FEN, {"depth": 18, "multi_pv": 1})[0]["cp"] == 20
+
+def test_data_settings_cache_pack_checks_engine(qapp, qtbot, isolated_config, monkeypatch, tmp_path):
+    """A pack from another engine is only merged after the user confirms the import."""
+    import chess
+    from PyQt6.QtWidgets import QMessageBox
+    from src.backend.storage.cache import AnalysisCache
+    from src.backend.storage.cache_pack import export_pack
+    from src.gui.views.settings import data_settings
+    from src.utils.config import ConfigManager
+
+    monkeypatch.setattr("src.utils.path_utils.get_user_data_dir", lambda: str(isolated_config.parent))
+    cache = AnalysisCache()
+    params = {"depth": 18, "multi_pv": 1}
+    cache.save_analysis(chess.STARTING_FEN, params, [{"pv": ["e2e4"], "cp": 20, "depth": 18}])
+    pack_path = str(tmp_path / "other.capack")
+    export_pack(cache, pack_path, "other-engine")
+    cache.clear_cache()
+    monkeypatch.setattr(data_settings.QFileDialog, "getOpenFileName", lambda *args: (pack_path, ""))
+
+    panel = data_settings.DataSettings(ConfigManager())
+    qtbot.addWidget(panel)
+    results = []
+    monkeypatch.setattr(panel, "_on_pack_done", results.append)
+    replies = [QMessageBox.StandardButton.No, QMessageBox.StandardButton.Yes]
+    monkeypatch.setattr(data_settings.QMessageBox, "question", lambda *args: replies.pop(0))
+
+    panel.import_cache_pack()  # declined
+    assert panel._pack_worker is None
+    panel.import_cache_pack()  # confirmed: the engine check is overridden
+    assert panel._pack_worker.engine == ""
+    qtbot.waitUntil(lambda: not panel._pack_worker.isRunning() and panel.import_pack_btn.isEnabled())
+    assert results[0]["merged"] == 1
+
+    # Without the override the worker rejects the pack itself
+    errors = []
+    cache.clear_cache()
+    monkeypatch.setattr(panel, "_on_pack_error", errors.append)
+    panel._start_pack_worker("import", pack_path, "stockfish")
+    qtbot.waitUntil(lambda: not panel._pack_worker.isRunning() and panel.import_pack_btn.isEnabled())
+    assert "other-engine" in errors[0]
+    assert cache.get_analysis(chess.STARTING_FEN, params) is None